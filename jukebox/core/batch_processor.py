@@ -1,8 +1,15 @@
 """Generic batch processor for background tasks with queue management."""
 
+import functools
+import heapq
+import itertools
 import logging
+import multiprocessing
+import os
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
 
 from PySide6.QtCore import (
@@ -19,22 +26,148 @@ from jukebox.core.event_bus import Events
 # Cleanup interval for orphan workers (in milliseconds)
 ORPHAN_CLEANUP_INTERVAL_MS = 30_000  # 30 seconds
 
+# Queue priorities (lower value = processed first)
+PRIORITY_HIGH = -1
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = 1
+
+
+@dataclass(order=True)
+class _QueueEntry:
+    """Heap entry; ``cancelled`` entries are skipped lazily when popped."""
+
+    priority: int
+    sequence: int
+    key: Hashable = field(compare=False)
+    item: Any = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class BatchQueue:
+    """Priority queue of batch items with reprioritization and cancellation by key.
+
+    Items with the same priority are processed in insertion order, except those
+    pushed with ``front=True`` which go before every item of their priority
+    (most recent first). Reprioritization and cancellation mark the old heap
+    entry as cancelled instead of searching the heap: both are O(log n).
+    """
+
+    def __init__(self, key_fn: Callable[[Any], Hashable] | None = None) -> None:
+        """Initialize queue.
+
+        Args:
+            key_fn: Function mapping an item to its unique key (default: the item itself)
+        """
+        self._key_fn: Callable[[Any], Hashable] = key_fn or (lambda item: item)
+        self._heap: list[_QueueEntry] = []
+        self._entries: dict[Hashable, _QueueEntry] = {}
+        self._counter = itertools.count()
+
+    def key_of(self, item: Any) -> Hashable:
+        """Return the key identifying an item."""
+        return self._key_fn(item)
+
+    def push(self, item: Any, priority: int = PRIORITY_NORMAL, *, front: bool = False) -> bool:
+        """Add an item, or move it if already queued.
+
+        Args:
+            item: Item to queue
+            priority: Queue priority (lower value = processed first)
+            front: Process before the other items of the same priority
+
+        Returns:
+            True if the item was new, False if an existing entry was moved
+        """
+        key = self.key_of(item)
+        existing = self._entries.pop(key, None)
+        if existing is not None:
+            existing.cancelled = True
+
+        sequence = next(self._counter)
+        entry = _QueueEntry(priority, -sequence if front else sequence, key, item)
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        return existing is None
+
+    def pop(self) -> Any | None:
+        """Remove and return the next item, or None if the queue is empty."""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if not entry.cancelled:
+                del self._entries[entry.key]
+                return entry.item
+        return None
+
+    def reprioritize(self, key: Hashable, priority: int, *, front: bool = False) -> bool:
+        """Change the priority of a queued item.
+
+        Returns:
+            True if the item was queued, False otherwise
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        self.push(entry.item, priority, front=front)
+        return True
+
+    def cancel(self, key: Hashable) -> bool:
+        """Remove a queued item.
+
+        Returns:
+            True if the item was queued, False otherwise
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        entry.cancelled = True
+        return True
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self._heap.clear()
+        self._entries.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def default_max_concurrency() -> int:
+    """Number of parallel workers when none is configured (one core kept for the UI)."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration for status messages ("42s", "3m 12s", "1h 05m")."""
+    seconds = max(0, int(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
 
 class BatchProcessor(QObject):
-    """Generic batch processor that processes items one at a time with a queue.
+    """Generic batch processor running up to N items concurrently from a priority queue.
 
     Architecture:
-    - Maintains a queue of items to process
-    - Processes one item at a time (sequential)
-    - Delegates actual work to worker threads
+    - Maintains a priority queue of items to process (``BatchQueue``)
+    - Runs up to ``max_concurrency`` items at a time
+    - Thread backend (default): one QThread per item from ``worker_factory``
+    - Process backend: ``process_function(item)`` runs in a process pool for
+      CPU-heavy jobs; results come back to the Qt thread through a signal
     - Saves progress incrementally (via callbacks)
+    - Reports throughput and ETA through STATUS_MESSAGE events
     - Can be interrupted without losing completed work
 
     Usage:
         processor = BatchProcessor(
             name="Waveform Generation",
             worker_factory=lambda item: WaveformWorker(item),
-            context=plugin_context
+            context=plugin_context,
+            max_concurrency=4,
         )
         processor.progress.connect(on_progress)
         processor.item_complete.connect(on_item_complete)
@@ -121,141 +254,244 @@ class BatchProcessor(QObject):
     item_complete = Signal(object, object)  # item, result
     item_error = Signal(object, str)  # item, error_message
     finished = Signal(int)  # number of items processed successfully
-    item_skipped = Signal(object)  # item skipped (already in queue)
+    item_skipped = Signal(object)  # item skipped (already being processed)
+    # Résultats du pool de processus, émis depuis un thread du pool → connexion queued
+    _process_done = Signal(object, object, object)  # item, result, error_message
 
     def __init__(
         self,
         name: str,
-        worker_factory: Callable[[Any], Any],
+        worker_factory: Callable[[Any], Any] | None,
         context: Any,
         parent: QObject | None = None,
+        *,
+        max_concurrency: int = 1,
+        process_function: Callable[[Any], Any] | None = None,
+        process_initializer: Callable[..., None] | None = None,
+        process_initargs: tuple[Any, ...] = (),
+        key_fn: Callable[[Any], Hashable] | None = None,
     ):
         """Initialize batch processor.
 
         Args:
             name: Human-readable name for logging (e.g., "Waveform Generation")
             worker_factory: Function that creates a worker thread for an item
+                (thread backend; unused when process_function is given)
             context: Plugin context (for event bus, status updates)
             parent: Parent QObject
+            max_concurrency: Number of items processed at the same time
+            process_function: Picklable top-level function run in a process pool
+                for each item (process backend); its return value is the result
+            process_initializer: Optional initializer run once in each pool process
+            process_initargs: Arguments for process_initializer
+            key_fn: Function mapping an item to its unique key (default: the item)
+
+        Raises:
+            ValueError: If neither worker_factory nor process_function is given
         """
         super().__init__(parent)
+        if worker_factory is None and process_function is None:
+            raise ValueError("BatchProcessor needs a worker_factory or a process_function")
+
         self.name = name
         self.worker_factory = worker_factory
         self.context = context
+        self.max_concurrency = max(1, max_concurrency)
+        self.process_function = process_function
+        self.process_initializer = process_initializer
+        self.process_initargs = process_initargs
 
         # Queue management
-        self.queue: list[Any] = []
-        self.current_index = 0
+        self.queue = BatchQueue(key_fn)
         self.total_items = 0
         self.completed_count = 0
+        self.failed_count = 0
 
-        # Worker management — Any pour accéder aux signaux custom (complete, error, progress_update)
-        self.current_worker: Any | None = None
+        # In-flight items: key → QThread worker (thread backend) or Future (process backend)
+        # Any pour accéder aux signaux custom (complete, error, progress_update)
+        self.active: dict[Hashable, Any] = {}
+        self._item_start_times: dict[Hashable, float] = {}
+        self._executor: ProcessPoolExecutor | None = None
 
         # State
         self.is_running = False
 
         # Timing
         self.batch_start_time: float = 0.0
-        self.current_item_start_time: float = 0.0
 
-    def start(self, items: list[Any]) -> None:
+        self._process_done.connect(self._on_process_done)
+
+    @property
+    def processed_count(self) -> int:
+        """Number of items finished so far (successfully or not)."""
+        return self.completed_count + self.failed_count
+
+    @property
+    def pending_count(self) -> int:
+        """Number of items still waiting in the queue."""
+        return len(self.queue)
+
+    def throughput(self) -> float:
+        """Items finished per second since the batch started."""
+        elapsed = time.time() - self.batch_start_time
+        return self.processed_count / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> float | None:
+        """Estimated remaining time in seconds, or None before the first result."""
+        rate = self.throughput()
+        if rate <= 0:
+            return None
+        return (self.total_items - self.processed_count) / rate
+
+    def start(self, items: Iterable[Any]) -> None:
         """Start batch processing.
 
         Args:
-            items: List of items to process
+            items: Items to process (in order, at normal priority)
         """
         if self.is_running:
             logging.warning(f"[{self.name}] Already running, ignoring start request")
             return
 
-        if not items:
+        self.queue.clear()
+        for item in items:
+            self.queue.push(item)
+
+        if not self.queue:
             logging.info(f"[{self.name}] No items to process")
             return
 
-        self.queue = items.copy()
-        self.total_items = len(items)
-        self.current_index = 0
+        self.total_items = len(self.queue)
         self.completed_count = 0
+        self.failed_count = 0
         self.is_running = True
         self.batch_start_time = time.time()
 
-        logging.info(f"[{self.name}] Starting: {self.total_items} items to process")
+        if self.process_function is not None:
+            # spawn : un fork d'un process Qt multi-threadé n'est pas sûr
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.process_initializer,
+                initargs=self.process_initargs,
+            )
+
+        backend = "processes" if self._executor else "threads"
+        logging.info(
+            f"[{self.name}] Starting: {self.total_items} items to process "
+            f"({self.max_concurrency} {backend})"
+        )
         self.context.emit(
             Events.STATUS_MESSAGE,
             message=f"{self.name}: Starting ({self.total_items} items)",
             color=StatusColors.SUCCESS,
         )
 
-        # Start processing first item
-        self._process_next()
+        self._fill_slots()
 
     def add_priority_item(self, item: Any) -> bool:
-        """Add an item at the front of the queue (priority processing).
+        """Move an item to the front of the queue (processed as soon as a slot frees).
 
         Args:
             item: Item to process with priority
 
         Returns:
-            True if item was added, False if already in queue or currently processing
+            True if item was added or moved, False if currently processing
         """
         if not self.is_running:
             logging.warning(f"[{self.name}] Cannot add priority item: batch not running")
             return False
 
-        # Check if already processing this exact item
-        if self.current_index < len(self.queue) and self.queue[self.current_index] == item:
+        key = self.queue.key_of(item)
+        if key in self.active:
             logging.debug(f"[{self.name}] Item already being processed, skipping")
             self.item_skipped.emit(item)
             return False
 
-        # Check if item already in remaining queue
-        remaining_queue = self.queue[self.current_index + 1 :]
-        if item in remaining_queue:
-            # Remove from its current position
-            idx = remaining_queue.index(item)
-            actual_idx = self.current_index + 1 + idx
-            self.queue.pop(actual_idx)
-            logging.debug(f"[{self.name}] Item already in queue, moving to front")
-        else:
+        if self.queue.push(item, PRIORITY_HIGH, front=True):
             # Adjust total count since we're adding a new item
             self.total_items += 1
             logging.debug(f"[{self.name}] Adding new priority item")
-
-        # Insert at front of remaining queue (right after current item)
-        self.queue.insert(self.current_index + 1, item)
+        else:
+            logging.debug(f"[{self.name}] Item already in queue, moving to front")
 
         logging.info(f"[{self.name}] Priority item added (will be processed next)")
+        self._fill_slots()
         return True
 
-    def stop(self) -> None:
-        """Stop batch processing (graceful, completes current item)."""
-        if not self.is_running:
-            return
+    def reprioritize(self, key: Hashable, priority: int) -> bool:
+        """Change the priority of a queued item.
 
-        logging.info(f"[{self.name}] Stop requested (will finish current item)")
-        self.is_running = False
+        Args:
+            key: Item key (see key_fn)
+            priority: New priority (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW or any int)
+
+        Returns:
+            True if the item was queued
+        """
+        return self.queue.reprioritize(key, priority)
 
-        # Cancel current worker
-        if self.current_worker:
-            self._cleanup_current_worker()
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel a queued or in-flight item.
 
-    def _process_next(self) -> None:
-        """Process next item in queue."""
+        An in-flight thread worker is interrupted and left to finish as an
+        orphan; an in-flight process job is cancelled if not started yet and
+        its result is ignored otherwise.
+
+        Args:
+            key: Item key (see key_fn)
+
+        Returns:
+            True if the item was queued or in flight
+        """
+        if self.queue.cancel(key):
+            self.total_items -= 1
+            logging.debug(f"[{self.name}] Cancelled queued item {key}")
+            self._fill_slots()
+            return True
+
+        job = self.active.pop(key, None)
+        if job is None:
+            return False
+        self._item_start_times.pop(key, None)
+        self._release_job(job)
+        self.total_items -= 1
+        logging.debug(f"[{self.name}] Cancelled in-flight item {key}")
+        self._fill_slots()
+        return True
+
+    def stop(self) -> None:
+        """Stop batch processing (in-flight workers finish in the background)."""
         if not self.is_running:
             return
 
-        # Check if queue is empty
-        if self.current_index >= len(self.queue):
+        logging.info(f"[{self.name}] Stop requested (will finish current items)")
+        self.is_running = False
+        self.queue.clear()
+
+        # Cancel current workers
+        for job in self.active.values():
+            self._release_job(job)
+        self.active.clear()
+        self._item_start_times.clear()
+        self._shutdown_executor()
+
+    def _fill_slots(self) -> None:
+        """Start queued items until max_concurrency items are in flight."""
+        while self.is_running and len(self.active) < self.max_concurrency:
+            item = self.queue.pop()
+            if item is None:
+                break
+            self._start_item(item)
+
+        if self.is_running and not self.active and not self.queue:
             self._finish()
-            return
-
-        # Get next item
-        item = self.queue[self.current_index]
-        current = self.current_index + 1
 
-        # Start timing this item
-        self.current_item_start_time = time.time()
+    def _start_item(self, item: Any) -> None:
+        """Start processing one item on the configured backend."""
+        key = self.queue.key_of(item)
+        current = self.processed_count + len(self.active) + 1
+        self._item_start_times[key] = time.time()
 
         # Log progress (INFO level: just the essentials)
         logging.info(f"[{self.name}] [{current}/{self.total_items}] Processing...")
@@ -265,30 +501,65 @@ class BatchProcessor(QObject):
 
         self.progress.emit(current, self.total_items, item)
 
-        # Update status bar
-        self.context.emit(
-            Events.STATUS_MESSAGE,
-            message=f"{self.name}: {current}/{self.total_items}",
-            color=StatusColors.SUCCESS,
-        )
-
-        # Create worker
         try:
+            if self._executor is not None:
+                assert self.process_function is not None
+                future = self._executor.submit(self.process_function, item)
+                self.active[key] = future
+                future.add_done_callback(functools.partial(self._emit_process_result, item))
+                return
+
+            assert self.worker_factory is not None
             worker = self.worker_factory(item)
-            self.current_worker = worker
+            self.active[key] = worker
 
             # Connect signals (worker must emit 'complete' ou 'error')
             if hasattr(worker, "complete"):
-                worker.complete.connect(lambda result: self._on_item_complete(item, result))
+                worker.complete.connect(
+                    lambda result, item=item: self._on_item_complete(item, result)
+                )
             if hasattr(worker, "error"):
-                worker.error.connect(lambda error: self._on_item_error(item, error))
+                worker.error.connect(lambda error, item=item: self._on_item_error(item, error))
 
             # Start worker
             worker.start()
 
         except Exception as e:
             logging.error(f"[{self.name}] Failed to create worker: {e}", exc_info=True)
-            self._on_item_error(item, str(e))
+            self.active.setdefault(key, None)
+            # Pas de _fill_slots récursif : la boucle appelante reprend l'item suivant
+            # (sinon un pool cassé ferait une récursion par item en file)
+            self._on_item_error(item, str(e), refill=False)
+
+    def _emit_process_result(self, item: Any, future: "Future[Any]") -> None:
+        """Forward a finished process job to the Qt thread (runs in a pool thread)."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            # Le message est celui de l'exception ("Skipping ..." → simple avertissement)
+            self._process_done.emit(item, None, str(error) or type(error).__name__)
+        else:
+            self._process_done.emit(item, future.result(), None)
+
+    def _on_process_done(self, item: Any, result: Any, error: str | None) -> None:
+        """Handle a process-pool result on the Qt thread."""
+        if error is not None:
+            self._on_item_error(item, error)
+        else:
+            self._on_item_complete(item, result)
+
+    def _take_active(self, item: Any) -> float | None:
+        """Remove an in-flight item; return its duration or None if it was not active."""
+        key = self.queue.key_of(item)
+        if key not in self.active:
+            # Résultat tardif d'un item annulé ou d'un batch arrêté
+            return None
+        job = self.active.pop(key)
+        start = self._item_start_times.pop(key, time.time())
+        if job is not None and not isinstance(job, Future):
+            self._cleanup_worker(job)
+        return time.time() - start
 
     def _on_item_complete(self, item: Any, result: Any) -> None:
         """Handle item processing completion.
@@ -297,12 +568,15 @@ class BatchProcessor(QObject):
             item: The item that was processed
             result: Result from worker
         """
-        # Calculate duration
-        duration = time.time() - self.current_item_start_time
+        duration = self._take_active(item)
+        if duration is None:
+            return
+
+        self.completed_count += 1
 
         # Log with duration (INFO level)
         logging.info(
-            f"[{self.name}] [{self.current_index + 1}/{self.total_items}] ✓ Complete ({duration:.1f}s)"
+            f"[{self.name}] [{self.processed_count}/{self.total_items}] ✓ Complete ({duration:.1f}s)"
         )
 
         # DEBUG level: show the actual item
@@ -311,33 +585,33 @@ class BatchProcessor(QObject):
         # Emit completion signal (caller handles saving to database)
         self.item_complete.emit(item, result)
 
-        self.completed_count += 1
-        self.current_index += 1
-
-        # Cleanup worker
-        self._cleanup_current_worker()
+        self._report_progress()
 
-        # Process next item
-        self._process_next()
+        # Process next items
+        self._fill_slots()
 
-    def _on_item_error(self, item: Any, error: str) -> None:
+    def _on_item_error(self, item: Any, error: str, *, refill: bool = True) -> None:
         """Handle item processing error.
 
         Args:
             item: The item that failed
             error: Error message
+            refill: Start the next items (False when called from the _fill_slots loop)
         """
-        # Calculate duration
-        duration = time.time() - self.current_item_start_time
+        duration = self._take_active(item)
+        if duration is None:
+            return
+
+        self.failed_count += 1
 
         # Use warning level for expected errors (skipped files), error level for unexpected
         if error.startswith("Skipping"):
             logging.warning(
-                f"[{self.name}] [{self.current_index + 1}/{self.total_items}] ⊘ Skipped ({duration:.1f}s): {error}"
+                f"[{self.name}] [{self.processed_count}/{self.total_items}] ⊘ Skipped ({duration:.1f}s): {error}"
             )
         else:
             logging.error(
-                f"[{self.name}] [{self.current_index + 1}/{self.total_items}] ✗ Error ({duration:.1f}s): {error}"
+                f"[{self.name}] [{self.processed_count}/{self.total_items}] ✗ Error ({duration:.1f}s): {error}"
             )
 
         # DEBUG level: show the actual item
@@ -346,19 +620,41 @@ class BatchProcessor(QObject):
         # Emit error signal
         self.item_error.emit(item, error)
 
-        self.current_index += 1
+        self._report_progress()
 
-        # Cleanup worker
-        self._cleanup_current_worker()
+        # Continue with next items
+        if refill:
+            self._fill_slots()
 
-        # Continue with next item
-        self._process_next()
-
-    def _cleanup_current_worker(self) -> None:
-        """Cleanup current worker thread."""
-        if not self.current_worker:
+    def _report_progress(self) -> None:
+        """Emit a STATUS_MESSAGE with progress, throughput and ETA."""
+        if not self.is_running:
+            return
+        message = f"{self.name}: {self.processed_count}/{self.total_items}"
+        rate = self.throughput()
+        eta = self.eta_seconds()
+        if rate > 0 and eta is not None:
+            message += f" ({rate:.1f}/s, ETA {_format_duration(eta)})"
+        self.context.emit(Events.STATUS_MESSAGE, message=message, color=StatusColors.SUCCESS)
+
+    def _release_job(self, job: Any) -> None:
+        """Abandon an in-flight job (thread → orphan list, future → cancel)."""
+        if job is None:
             return
+        if isinstance(job, Future):
+            job.cancel()
+            return
+        job.requestInterruption()
+        self._cleanup_worker(job)
+
+    def _shutdown_executor(self) -> None:
+        """Shut the process pool down without blocking the UI."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
+    def _cleanup_worker(self, worker: Any) -> None:
+        """Disconnect a worker thread and hand it over to the orphan list."""
         # Disconnect custom signals only (not Qt internal signals)
         # Qt internal signals to skip: destroyed, objectNameChanged, started, finished
         qt_internal_signals = {
@@ -371,7 +667,7 @@ class BatchProcessor(QObject):
 
         try:
             # Get all signals from the worker's metaobject
-            meta = self.current_worker.metaObject()
+            meta = worker.metaObject()
             for i in range(meta.methodCount()):
                 method = meta.method(i)
                 if method.methodType() == method.MethodType.Signal:
@@ -381,8 +677,8 @@ class BatchProcessor(QObject):
                         continue
                     # Disconnect custom signals only
                     signal_name_str = bytes(signal_name).decode()
-                    if hasattr(self.current_worker, signal_name_str):
-                        signal_obj = getattr(self.current_worker, signal_name_str)
+                    if hasattr(worker, signal_name_str):
+                        signal_obj = getattr(worker, signal_name_str)
                         try:
                             signal_obj.disconnect()
                         except (RuntimeWarning, RuntimeError, TypeError) as e:
@@ -393,27 +689,26 @@ class BatchProcessor(QObject):
             logging.warning(f"[{self.name}] Error during signal cleanup: {e}", exc_info=True)
             # Fallback: try known custom signals
             try:
-                if hasattr(self.current_worker, "complete"):
-                    self.current_worker.complete.disconnect()
-                if hasattr(self.current_worker, "error"):
-                    self.current_worker.error.disconnect()
-                if hasattr(self.current_worker, "progress_update"):
-                    self.current_worker.progress_update.disconnect()
+                if hasattr(worker, "complete"):
+                    worker.complete.disconnect()
+                if hasattr(worker, "error"):
+                    worker.error.disconnect()
+                if hasattr(worker, "progress_update"):
+                    worker.progress_update.disconnect()
             except (RuntimeWarning, RuntimeError, TypeError) as e:
                 logging.debug(f"[{self.name}] Could not disconnect fallback signals: {e}")
 
         # Move to orphan list (let it finish naturally)
-        self.current_worker.setParent(None)
-        BatchProcessor._global_orphan_workers.append(self.current_worker)
+        worker.setParent(None)
+        BatchProcessor._global_orphan_workers.append(worker)
 
         # Start periodic cleanup timer (will clean up finished workers)
         BatchProcessor._start_cleanup_timer()
 
-        self.current_worker = None
-
     def _finish(self) -> None:
         """Finish batch processing."""
         self.is_running = False
+        self._shutdown_executor()
 
         # Calculate total duration
         total_duration = time.time() - self.batch_start_time
@@ -422,17 +717,18 @@ class BatchProcessor(QObject):
 
         # Format duration
         duration_str = f"{minutes}m {seconds:.0f}s" if minutes > 0 else f"{seconds:.1f}s"
+        rate = self.processed_count / total_duration if total_duration > 0 else 0.0
 
         failed_count = self.total_items - self.completed_count
 
         # Log summary
         if failed_count > 0:
             logging.info(
-                f"[{self.name}] Complete: {self.completed_count} succeeded, {failed_count} failed ({duration_str})"
+                f"[{self.name}] Complete: {self.completed_count} succeeded, {failed_count} failed ({duration_str}, {rate:.2f} items/s)"
             )
         else:
             logging.info(
-                f"[{self.name}] Complete: {self.completed_count}/{self.total_items} successful ({duration_str})"
+                f"[{self.name}] Complete: {self.completed_count}/{self.total_items} successful ({duration_str}, {rate:.2f} items/s)"
             )
 
         # Update status bar
@@ -447,6 +743,5 @@ class BatchProcessor(QObject):
         self.finished.emit(self.completed_count)
 
         # Clear queue
-        self.queue = []
-        self.current_index = 0
+        self.queue.clear()
         self.total_items = 0
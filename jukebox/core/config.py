@@ -1,6 +1,7 @@
 """Configuration management using Pydantic and YAML."""
 
 from pathlib import Path
+from typing import Literal
 
 import yaml
 from pydantic import BaseModel, Field, field_validator
@@ -92,6 +93,38 @@ class AudioAnalysisConfig(BaseModel):
     enable_ml_features: bool = False  # Extract comprehensive ML features (slower)
 
 
+class BatchProcessingConfig(BaseModel):
+    """Background batch processing configuration (waveforms, audio analysis)."""
+
+    max_workers: int = Field(ge=0, default=0)  # 0 = one per CPU core, minus one for the UI
+    use_process_pool: bool = True  # Analyse audio dans des processus (contourne le GIL)
+    waveform_workers: int = Field(ge=1, default=2)  # Waveforms: threads (I/O + numpy)
+
+
+class AudioCacheConfig(BaseModel):
+    """Decoded-audio cache configuration (shared by waveform, analysis, fingerprinting)."""
+
+    max_memory_mb: int = Field(ge=16, default=512)
+    spill_directory: str = ""  # Empty = no on-disk spill
+    spill_dtype: Literal["int16", "float16"] = "int16"
+    max_spill_mb: int = Field(ge=0, default=4096)  # 0 = unbounded
+
+    @field_validator("spill_directory", mode="after")
+    @classmethod
+    def _expand_user(cls, value: str) -> str:
+        """Expanse les chemins `~` non résolus par Pydantic (champ stocké en str)."""
+        return str(Path(value).expanduser()) if value else value
+
+
+class FileChecksConfig(BaseModel):
+    """Track list file-existence checks (run in background, network mounts may hang)."""
+
+    max_workers: int = Field(ge=1, default=8)
+    per_mount_limit: int = Field(ge=1, default=4)  # Probes simultanées par montage
+    timeout_seconds: float = Field(gt=0, default=2.0)  # Au-delà : état inconnu, montage ignoré
+    cache_ttl_seconds: float = Field(ge=0, default=300.0)
+
+
 class MetadataFieldConfig(BaseModel):
     """Configuration for a single metadata field."""
 
@@ -231,12 +264,30 @@ class VideoExporterConfig(BaseModel):
     ffmpeg_bufsize: str = "7000k"
     # VJing simultaneous effects (how many effects are visible at once)
     vjing_simultaneous_effects: int = Field(ge=1, le=10, default=1)
+    # Rendu des frames : pool de threads, ou processus (contourne le GIL, une
+    # copie des couches par processus)
+    render_backend: Literal["threads", "processes"] = "threads"
+    # Cache de l'analyse audio VJing (.npz par mix), vide : pas de cache
+    vjing_analysis_cache_directory: str = "~/.jukebox/vjing_cache"
+    # Export en segments encodés réutilisables (reprise, réglages modifiés) ;
+    # 0 ou répertoire vide : un seul encodage
+    export_segment_seconds: float = Field(ge=0.0, le=600.0, default=10.0)
+    export_segment_cache_directory: str = "~/.jukebox/export_segments"
+    # Taille maximale du cache de segments (Go) : les exports les moins récemment
+    # utilisés sont supprimés au-delà, l'export courant est toujours gardé
+    export_segment_cache_max_gb: float = Field(ge=0.0, default=10.0)
+    # Preview : résolution interne (fraction de l'export, réduite si la lecture
+    # prend du retard) et écart maximal entre keyframes (1 : toutes les frames)
+    preview_scale: float = Field(ge=0.125, le=1.0, default=0.5)
+    preview_max_frame_step: int = Field(ge=1, le=8, default=4)
 
     @field_validator(
         "output_directory",
         "video_clips_folder",
         "intro_video_path",
         "milkdrop_preset_path",
+        "vjing_analysis_cache_directory",
+        "export_segment_cache_directory",
         mode="after",
     )
     @classmethod
@@ -292,6 +343,8 @@ class PluginsConfig(BaseModel):
     ]
     jukebox_mode: list[str] | None = None
     curating_mode: list[str] | None = None
+    # Charge les plugins déclarés dans plugins/manifest.yaml au premier usage
+    lazy: bool = False
 
 
 class JukeboxConfig(BaseModel):
@@ -304,6 +357,9 @@ class JukeboxConfig(BaseModel):
     loop_player: LoopPlayerConfig = Field(default_factory=LoopPlayerConfig)
     waveform: WaveformConfig = Field(default_factory=WaveformConfig)
     audio_analysis: AudioAnalysisConfig = Field(default_factory=AudioAnalysisConfig)
+    audio_cache: AudioCacheConfig = Field(default_factory=AudioCacheConfig)
+    batch_processing: BatchProcessingConfig = Field(default_factory=BatchProcessingConfig)
+    file_checks: FileChecksConfig = Field(default_factory=FileChecksConfig)
     metadata_editor: MetadataEditorConfig = Field(default_factory=MetadataEditorConfig)
     genre_editor: GenreEditorConfig = Field(default_factory=GenreEditorConfig)
     file_manager: FileManagerConfig = Field(default_factory=FileManagerConfig)
@@ -17,6 +17,9 @@ VLC_SEEK_DELAY_MS = 50
 WORKER_WAIT_TIMEOUT_MS = 5000
 """Timeout for waiting on worker threads during shutdown."""
 
+SETTINGS_FLUSH_DELAY_MS = 500
+"""Batching window of plugin settings writes (SettingsCache) before they hit SQLite."""
+
 # Audio processing constants
 AUDIO_SAMPLE_RATE = 22050
 """Standard sample rate for audio analysis (Hz)."""
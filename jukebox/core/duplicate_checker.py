@@ -3,7 +3,13 @@
 Checks curating tracks against the jukebox library using a three-pass strategy:
   1. Exact match on normalized (artist, title)
   2. Parse 'Artist - Title' from filename → exact match
-  3. Fuzzy filename match via token-accelerated SequenceMatcher
+  3. Fuzzy filename match (MinHash/LSH candidates verified with SequenceMatcher,
+     see jukebox.utils.fuzzy_index)
+
+The index is built once from the database, then maintained incrementally:
+add_track / remove_track / update_track / sync_index apply changes directly,
+and the notify_* methods queue them (non-blocking, safe from the UI thread or
+any EventBus callback) until the next check.
 """
 
 from __future__ import annotations
@@ -11,11 +17,27 @@ from __future__ import annotations
 import logging
 import re
 import sqlite3
+import threading
 from dataclasses import dataclass
-from difflib import SequenceMatcher
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
+
+from jukebox.utils.fuzzy_index import FuzzyIndex
+
+# SQLite limite le nombre de paramètres d'une requête (999 sur les anciennes versions)
+_SQL_BATCH_SIZE = 500
+
+_K = TypeVar("_K")
+
+
+def _discard_entry(index: dict[_K, dict[str, str]], key: _K, filepath: str) -> None:
+    """Remove filepath from index[key], dropping the key once empty."""
+    entries = index.get(key)
+    if entries is not None:
+        entries.pop(filepath, None)
+        if not entries:
+            del index[key]
 
 
 class DuplicateStatus(Enum):
@@ -34,15 +56,25 @@ class DuplicateResult:
     match_info: str | None  # Display string for the matched jukebox track
 
 
+@dataclass(frozen=True)
+class _IndexedTrack:
+    """A jukebox track as stored in the index."""
+
+    artist: str
+    title: str
+    display: str
+
+
 class DuplicateChecker:
     """Checks curating tracks for duplicates against the jukebox library.
 
-    Maintains an in-memory index of jukebox tracks for fast lookups.
-    Call rebuild_index() whenever jukebox tracks change.
+    Maintains an in-memory index of jukebox tracks for fast lookups. The index
+    is built lazily on the first check, then kept up to date incrementally
+    (notify_track_changed / notify_track_removed / notify_library_changed).
+    Call rebuild_index() to force a full rebuild.
     """
 
     FUZZY_THRESHOLD = 0.8
-    MIN_TOKEN_LENGTH = 3  # Ignore short words in fuzzy matching
 
     def __init__(self, db_path: Path) -> None:
         """Initialize the checker (index is built lazily on first check).
@@ -51,15 +83,23 @@ class DuplicateChecker:
             db_path: Path to the SQLite database file.
         """
         self._db_path = db_path
-        # (artist_norm, title_norm) -> display string "Artist - Title"
-        self._exact_index: dict[tuple[str, str], str] = {}
-        # title_norm -> display string (for title-only matching, O(1) lookup)
-        self._title_index: dict[str, str] = {}
-        # list of (filename_norm, display_string) for fuzzy matching
-        self._filenames: list[tuple[str, str]] = []
-        # inverted index: token -> list of indices in self._filenames
-        self._token_index: dict[str, list[int]] = {}
+        # Sérialise check() (thread worker) et les mises à jour de l'index
+        self._lock = threading.RLock()
+        # filepath -> indexed jukebox track
+        self._tracks: dict[str, _IndexedTrack] = {}
+        # (artist_norm, title_norm) -> {filepath: display} (last indexed wins)
+        self._exact_index: dict[tuple[str, str], dict[str, str]] = {}
+        # title_norm -> {filepath: display} (first indexed wins; title-only matching)
+        self._title_index: dict[str, dict[str, str]] = {}
+        # filepath -> normalized filename, for fuzzy matching
+        self._fuzzy_index = FuzzyIndex(self.FUZZY_THRESHOLD)
         self._index_built = False
+        # Memo of check() results, cleared whenever the index changes
+        self._results: dict[tuple[str, str, str], DuplicateResult] = {}
+        # Changes queued by notify_* (applied at the next check)
+        self._pending_lock = threading.Lock()
+        self._pending_paths: dict[str, bool] = {}  # filepath -> removed
+        self._pending_sync = False
 
     # ------------------------------------------------------------------
     # Public API
@@ -71,51 +111,40 @@ class DuplicateChecker:
         Args:
             track: Track dict with at least "artist", "title", "filename" keys.
             build_if_needed: Si True (défaut), construit l'index en synchrone si
-                absent. Les appelants exécutés sur le thread UI doivent passer
-                False pour éviter un fetch bloquant de toute la bibliothèque ;
-                un index non construit retourne alors un résultat neutre (GREEN).
+                absent et applique les changements en attente. Les appelants
+                exécutés sur le thread UI doivent passer False pour éviter un
+                fetch bloquant de la bibliothèque ; un index non construit
+                retourne alors un résultat neutre (GREEN).
 
         Returns:
             DuplicateResult with status and optional match description.
         """
-        if build_if_needed:
-            self._ensure_index()
-        elif not self._index_built:
-            # Index pas encore prêt et construction interdite (thread UI) :
-            # on ne bloque pas, on renvoie un statut neutre.
-            return DuplicateResult(DuplicateStatus.GREEN, None)
-
-        artist = track.get("artist") or ""
-        title = track.get("title") or ""
-        filename = track.get("filename") or ""
-
-        # Pass 1 — Exact (artist, title) match
-        artist_norm = self._normalize(artist)
-        title_norm = self._normalize(title)
-        if artist_norm and title_norm:
-            match = self._exact_index.get((artist_norm, title_norm))
-            if match:
-                return DuplicateResult(DuplicateStatus.RED, match)
-
-        # Pass 2 — Parse filename → exact/partial match
-        if filename:
-            result = self._check_by_filename_parse(filename)
-            if result:
-                return result
-
-        # Pass 3 — Fuzzy filename match (token-accelerated)
-        if filename:
-            result = self._check_by_fuzzy_filename(filename)
-            if result:
-                return result
-
-        return DuplicateResult(DuplicateStatus.GREEN, None)
+        with self._lock:
+            if build_if_needed:
+                self._ensure_index()
+                self._apply_pending()
+            elif not self._index_built:
+                # Index pas encore prêt et construction interdite (thread UI) :
+                # on ne bloque pas, on renvoie un statut neutre.
+                return DuplicateResult(DuplicateStatus.GREEN, None)
+
+            artist = track.get("artist") or ""
+            title = track.get("title") or ""
+            filename = track.get("filename") or ""
+
+            key = (artist, title, filename)
+            result = self._results.get(key)
+            if result is None:
+                result = self._check_uncached(artist, title, filename)
+                self._results[key] = result
+            return result
 
     def rebuild_index(self) -> None:
         """Rebuild the jukebox index from the database."""
-        if self._build_index():
-            self._index_built = True
-            logging.debug("[DuplicateChecker] Index rebuilt")
+        with self._lock:
+            if self._build_index():
+                self._index_built = True
+                logging.debug("[DuplicateChecker] Index rebuilt")
 
     def invalidate_index(self) -> None:
         """Mark the index as stale so it rebuilds lazily on next check."""
@@ -129,6 +158,78 @@ class DuplicateChecker:
         """
         return self._index_built
 
+    def add_track(self, filepath: str, artist: str | None, title: str | None) -> None:
+        """Index a jukebox track (replaces its previous entry, if any)."""
+        with self._lock:
+            self._index_track(filepath, artist or "", title or "")
+            self._results.clear()
+
+    def remove_track(self, filepath: str) -> bool:
+        """Remove a track from the index.
+
+        Returns:
+            True if the track was indexed.
+        """
+        with self._lock:
+            removed = self._unindex_track(filepath)
+            if removed:
+                self._results.clear()
+            return removed
+
+    def update_track(self, filepath: str) -> bool:
+        """Re-read one track from the database and update the index.
+
+        The track is indexed if it is a jukebox track, removed otherwise.
+
+        Returns:
+            True on success, False on database error.
+        """
+        return self._update_tracks([filepath])
+
+    def sync_index(self) -> bool:
+        """Bring the index up to date with the database without rebuilding it.
+
+        Only new, modified and removed jukebox tracks are (re)indexed.
+
+        Returns:
+            True on success, False on database error.
+        """
+        rows = self._fetch_tracks()
+        if rows is None:
+            return False
+
+        with self._lock:
+            seen: set[str] = set()
+            changed = 0
+            for filepath, artist, title, _ in rows:
+                seen.add(filepath)
+                current = self._tracks.get(filepath)
+                if current is None or current.artist != artist or current.title != title:
+                    self._index_track(filepath, artist, title)
+                    changed += 1
+            for filepath in [fp for fp in self._tracks if fp not in seen]:
+                self._unindex_track(filepath)
+                changed += 1
+            if changed:
+                self._results.clear()
+            logging.debug(f"[DuplicateChecker] Index synced: {changed} changes")
+        return True
+
+    def notify_track_changed(self, filepath: str | Path) -> None:
+        """Queue an update_track() for the next check (non-blocking)."""
+        with self._pending_lock:
+            self._pending_paths[str(filepath)] = False
+
+    def notify_track_removed(self, filepath: str | Path) -> None:
+        """Queue a remove_track() for the next check (non-blocking)."""
+        with self._pending_lock:
+            self._pending_paths[str(filepath)] = True
+
+    def notify_library_changed(self) -> None:
+        """Queue a sync_index() for the next check (non-blocking)."""
+        with self._pending_lock:
+            self._pending_sync = True
+
     def _ensure_index(self) -> None:
         """Build the index on first use (lazy initialization)."""
         if not self._index_built and self._build_index():
@@ -169,62 +270,188 @@ class DuplicateChecker:
         Returns:
             True if the index was built successfully, False on error.
         """
+        self._tracks.clear()
         self._exact_index.clear()
         self._title_index.clear()
-        self._filenames.clear()
-        self._token_index.clear()
+        self._fuzzy_index.clear()
+        self._results.clear()
+        # Une reconstruction complète rend les notifications en attente caduques
+        with self._pending_lock:
+            self._pending_paths.clear()
+            self._pending_sync = False
+
+        rows = self._fetch_tracks()
+        if rows is None:
+            return False
+
+        filenames: list[tuple[str, str]] = []
+        for filepath, artist, title, _ in rows:
+            filename_norm = self._index_exact(filepath, artist, title)
+            if filename_norm:
+                filenames.append((filepath, filename_norm))
+        # Hachage MinHash vectorisé par lots
+        self._fuzzy_index.add_many(filenames)
+
+        logging.debug(
+            f"[DuplicateChecker] Index built: {len(self._exact_index)} exact, "
+            f"{len(self._title_index)} titles, {len(self._fuzzy_index)} filenames"
+        )
+        return True
 
+    def _fetch_tracks(
+        self, filepaths: list[str] | None = None
+    ) -> list[tuple[str, str, str, str]] | None:
+        """Read (filepath, artist, title, mode) rows with a dedicated connection.
+
+        Args:
+            filepaths: Tracks to read (any mode), or None for every jukebox track.
+
+        Returns:
+            The rows, or None on database error.
+        """
         try:
             conn = sqlite3.connect(str(self._db_path))
             try:
-                conn.row_factory = sqlite3.Row
-                rows = conn.execute(
-                    "SELECT filepath, artist, title FROM tracks WHERE mode = 'jukebox'"
-                ).fetchall()
+                if filepaths is None:
+                    rows = conn.execute(
+                        "SELECT filepath, artist, title, mode FROM tracks WHERE mode = 'jukebox'"
+                    ).fetchall()
+                else:
+                    rows = []
+                    for start in range(0, len(filepaths), _SQL_BATCH_SIZE):
+                        batch = filepaths[start : start + _SQL_BATCH_SIZE]
+                        placeholders = ",".join("?" * len(batch))
+                        rows += conn.execute(
+                            "SELECT filepath, artist, title, mode FROM tracks "
+                            f"WHERE filepath IN ({placeholders})",
+                            batch,
+                        ).fetchall()
             finally:
                 conn.close()
         except Exception as e:
             logging.error(f"[DuplicateChecker] Failed to load jukebox tracks: {e}")
+            return None
+        return [
+            (filepath or "", artist or "", title or "", mode or "")
+            for filepath, artist, title, mode in rows
+        ]
+
+    def _update_tracks(self, filepaths: list[str]) -> bool:
+        """Re-read tracks from the database: index jukebox ones, remove the others."""
+        rows = self._fetch_tracks(filepaths)
+        if rows is None:
             return False
+        with self._lock:
+            jukebox = {fp: (artist, title) for fp, artist, title, mode in rows if mode == "jukebox"}
+            for filepath in filepaths:
+                if filepath in jukebox:
+                    self._index_track(filepath, *jukebox[filepath])
+                else:
+                    self._unindex_track(filepath)
+            self._results.clear()
+        return True
 
-        for track in rows:
-            artist = track["artist"] or ""
-            title = track["title"] or ""
-            filepath = track["filepath"] or ""
-            filename = Path(filepath).name if filepath else ""
-
-            display = self._make_display(artist, title, filename, filepath)
-
-            # Exact index (only when both artist and title are present)
-            artist_norm = self._normalize(artist)
-            title_norm = self._normalize(title)
-            if artist_norm and title_norm:
-                self._exact_index[(artist_norm, title_norm)] = display
-                # Title-only index (first match wins; used for partial matching)
-                if title_norm not in self._title_index:
-                    self._title_index[title_norm] = display
-
-            # Filename index for fuzzy matching
-            filename_norm = self._normalize_filename(filename)
-            if filename_norm:
-                idx = len(self._filenames)
-                self._filenames.append((filename_norm, display))
-                # Build inverted token index
-                for token in self._tokenize(filename_norm):
-                    if token not in self._token_index:
-                        self._token_index[token] = []
-                    self._token_index[token].append(idx)
+    def _apply_pending(self) -> None:
+        """Apply the changes queued by notify_* (caller holds the lock)."""
+        with self._pending_lock:
+            pending = self._pending_paths
+            sync = self._pending_sync
+            self._pending_paths = {}
+            self._pending_sync = False
+
+        removed = [fp for fp, is_removed in pending.items() if is_removed]
+        for filepath in removed:
+            if self._unindex_track(filepath):
+                self._results.clear()
+        if sync:
+            self.sync_index()
+        else:
+            changed = [fp for fp, is_removed in pending.items() if not is_removed]
+            if changed:
+                self._update_tracks(changed)
 
-        logging.debug(
-            f"[DuplicateChecker] Index built: {len(self._exact_index)} exact, "
-            f"{len(self._title_index)} titles, {len(self._filenames)} filenames"
-        )
+    def _index_track(self, filepath: str, artist: str, title: str) -> None:
+        """Add or replace one track in every index."""
+        self._unindex_track(filepath)
+        filename_norm = self._index_exact(filepath, artist, title)
+        if filename_norm:
+            self._fuzzy_index.add(filepath, filename_norm)
+
+    def _index_exact(self, filepath: str, artist: str, title: str) -> str:
+        """Add a track to the exact and title indexes.
+
+        Returns:
+            The normalized filename, to be added to the fuzzy index.
+        """
+        filename = Path(filepath).name if filepath else ""
+        display = self._make_display(artist, title, filename, filepath)
+        self._tracks[filepath] = _IndexedTrack(artist, title, display)
+
+        # Exact index (only when both artist and title are present)
+        artist_norm = self._normalize(artist)
+        title_norm = self._normalize(title)
+        if artist_norm and title_norm:
+            self._exact_index.setdefault((artist_norm, title_norm), {})[filepath] = display
+            # Title-only index (used for partial matching)
+            self._title_index.setdefault(title_norm, {})[filepath] = display
+
+        return self._normalize_filename(filename)
+
+    def _unindex_track(self, filepath: str) -> bool:
+        """Remove one track from every index."""
+        track = self._tracks.pop(filepath, None)
+        if track is None:
+            return False
+        artist_norm = self._normalize(track.artist)
+        title_norm = self._normalize(track.title)
+        if artist_norm and title_norm:
+            _discard_entry(self._exact_index, (artist_norm, title_norm), filepath)
+            _discard_entry(self._title_index, title_norm, filepath)
+        self._fuzzy_index.remove(filepath)
         return True
 
     # ------------------------------------------------------------------
     # Private — Matching passes
     # ------------------------------------------------------------------
 
+    def _check_uncached(self, artist: str, title: str, filename: str) -> DuplicateResult:
+        """Run the three matching passes (caller holds the lock)."""
+        # Pass 1 — Exact (artist, title) match
+        artist_norm = self._normalize(artist)
+        title_norm = self._normalize(title)
+        if artist_norm and title_norm:
+            match = self._exact_match((artist_norm, title_norm))
+            if match:
+                return DuplicateResult(DuplicateStatus.RED, match)
+
+        # Pass 2 — Parse filename → exact/partial match
+        if filename:
+            result = self._check_by_filename_parse(filename)
+            if result:
+                return result
+
+        # Pass 3 — Fuzzy filename match (MinHash/LSH + SequenceMatcher)
+        if filename:
+            result = self._check_by_fuzzy_filename(filename)
+            if result:
+                return result
+
+        return DuplicateResult(DuplicateStatus.GREEN, None)
+
+    def _exact_match(self, key: tuple[str, str]) -> str | None:
+        """Display of the last indexed track with this (artist, title)."""
+        entries = self._exact_index.get(key)
+        if not entries:
+            return None
+        return next(reversed(entries.values()))
+
+    def _title_match(self, title_norm: str) -> str | None:
+        """Display of the first indexed track with this title."""
+        entries = self._title_index.get(title_norm)
+        if not entries:
+            return None
+        return next(iter(entries.values()))
+
     def _check_by_filename_parse(self, filename: str) -> DuplicateResult | None:
         """Pass 2: parse 'Artist - Title' from filename and look up."""
         parsed_artist, parsed_title = self._parse_filename(filename)
@@ -233,64 +460,36 @@ class DuplicateChecker:
 
         if parsed_artist_norm and parsed_title_norm:
             # Full artist+title extracted → try exact match
-            match = self._exact_index.get((parsed_artist_norm, parsed_title_norm))
+            match = self._exact_match((parsed_artist_norm, parsed_title_norm))
             if match:
                 return DuplicateResult(DuplicateStatus.RED, match)
 
         if parsed_title_norm and not parsed_artist_norm:
             # Only title extracted → O(1) title-only lookup
-            match = self._title_index.get(parsed_title_norm)
+            match = self._title_match(parsed_title_norm)
             if match:
                 return DuplicateResult(DuplicateStatus.ORANGE, match)
 
         return None
 
     def _check_by_fuzzy_filename(self, filename: str) -> DuplicateResult | None:
-        """Pass 3: fuzzy filename match using token-accelerated SequenceMatcher.
-
-        Algorithm:
-            1. Tokenize the query filename (words ≥ MIN_TOKEN_LENGTH).
-            2. Use the inverted token index to collect candidates that share tokens
-               with the query (avoids O(n) full-scan over the whole library).
-            3. Prefer candidates sharing ≥ 2 tokens; fall back to single-token
-               candidates (capped at 50) when nothing better is found.
-            4. Run SequenceMatcher only on the candidate set and return the best
-               match if its ratio ≥ FUZZY_THRESHOLD.
+        """Pass 3: best SequenceMatcher ratio ≥ FUZZY_THRESHOLD over the library.
+
+        The FuzzyIndex only verifies the filenames sharing a MinHash band with
+        the query and whose cheap upper bounds can still reach the threshold;
+        the reported ratio is the exact SequenceMatcher(query, candidate) one.
         """
         filename_norm = self._normalize_filename(filename)
         if not filename_norm:
             return None
 
-        tokens = self._tokenize(filename_norm)
-        if not tokens:
+        match = self._fuzzy_index.best_match(filename_norm)
+        if match is None:
             return None
-
-        # Count how many tokens each candidate shares with the query
-        candidate_hits: dict[int, int] = {}
-        for token in tokens:
-            for idx in self._token_index.get(token, []):
-                candidate_hits[idx] = candidate_hits.get(idx, 0) + 1
-
-        # Require at least 2 shared tokens (avoids noisy single-token matches)
-        candidates = [idx for idx, hits in candidate_hits.items() if hits >= 2]
-
-        # If too few multi-token candidates, fall back to single-token but cap at 50
-        if not candidates:
-            candidates = list(candidate_hits.keys())[:50]
-
-        best_ratio = 0.0
-        best_display: str | None = None
-        for idx in candidates:
-            jb_filename_norm, jb_display = self._filenames[idx]
-            ratio = SequenceMatcher(None, filename_norm, jb_filename_norm).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_display = jb_display
-
-        if best_ratio >= self.FUZZY_THRESHOLD and best_display:
-            return DuplicateResult(DuplicateStatus.ORANGE, best_display)
-
-        return None
+        track = self._tracks.get(str(match[0]))
+        if track is None:
+            return None
+        return DuplicateResult(DuplicateStatus.ORANGE, track.display)
 
     # ------------------------------------------------------------------
     # Private — Normalization helpers
@@ -327,13 +526,6 @@ class DuplicateChecker:
             return (parts[0].strip(), parts[1].strip())
         return ("", stem.strip())
 
-    def _tokenize(self, text: str) -> set[str]:
-        """Split normalized text into tokens, filtering short words.
-
-        Expects text already normalized (only [a-z0-9 ]).
-        """
-        return {word for word in re.split(r"\s+", text) if len(word) >= self.MIN_TOKEN_LENGTH}
-
     @staticmethod
     def _make_display(artist: str, title: str, filename: str, filepath: str = "") -> str:
         """Build a display string for a jukebox track.
@@ -130,6 +130,8 @@ class Events:
     Plugin Events:
         PLUGIN_SETTINGS_CHANGED: Plugin settings updated via conf_manager
             kwargs: None
+        PLUGIN_SETTING_CHANGED: One plugin setting written (any caller)
+            kwargs: plugin_name (str), key (str), value (str) - stored string value
         WAVEFORM_COMPLETE: Waveform generation finished for a track
             kwargs: track_id (int) - Database ID of the track
         AUDIO_ANALYSIS_COMPLETE: Audio analysis finished for a track
@@ -177,6 +179,7 @@ class Events:
 
     # Plugin events
     PLUGIN_SETTINGS_CHANGED = "plugin_settings_changed"  # kwargs: None
+    PLUGIN_SETTING_CHANGED = "plugin_setting_changed"  # kwargs: plugin_name, key, value (str)
     WAVEFORM_COMPLETE = "waveform_complete"  # kwargs: track_id (int)
     AUDIO_ANALYSIS_COMPLETE = "audio_analysis_complete"  # kwargs: track_id (int)
 
@@ -5,10 +5,14 @@ from __future__ import annotations
 import importlib
 import inspect
 import logging
+import time
 from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Protocol
 
+from jukebox.core.plugin_manifest import PluginManifest, load_manifests
+
 if TYPE_CHECKING:
     from jukebox.core.protocols import (
         AudioPlayerProtocol,
@@ -134,7 +138,8 @@ class PluginContext:
     ) -> Any:
         """Get a plugin setting with automatic type conversion.
 
-        Retrieves a setting from the database and converts it to the specified type.
+        Reads the in-memory settings cache (``database.settings``, loaded once
+        per plugin) and converts the value to the specified type.
         Handles errors gracefully by returning the default value.
 
         Args:
@@ -159,6 +164,21 @@ class PluginContext:
             logging.warning(f"[{plugin_name}] Invalid {key} value: {value}, using default")
             return default
 
+    def set_setting(self, plugin_name: str, key: str, value: Any) -> None:
+        """Save a plugin setting (read back by get_setting).
+
+        The cache is updated at once; the database write is batched and a
+        PLUGIN_SETTING_CHANGED event is emitted if the value changed.
+
+        Args:
+            plugin_name: Name of the plugin.
+            key: Setting key.
+            value: bool (stored as "true"/"false"), int, float or str.
+        """
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        self.database.settings.save(plugin_name, key, str(value))
+
     def get_current_track_duration(self) -> float | None:
         """Get the duration of the currently loaded track.
 
@@ -177,6 +197,20 @@ class PluginContext:
         return duration
 
 
+@dataclass
+class PluginTiming:
+    """Load cost of one plugin, in seconds."""
+
+    import_s: float = 0.0
+    initialize_s: float = 0.0
+    register_ui_s: float = 0.0
+    trigger: str = "startup"
+
+    @property
+    def total_s(self) -> float:
+        return self.import_s + self.initialize_s + self.register_ui_s
+
+
 class PluginManager:
     """Manage plugins lifecycle."""
 
@@ -186,6 +220,16 @@ class PluginManager:
         self.context = context
         self.plugins: dict[str, Any] = {}
         self.current_mode: str | None = None
+        # Chargement différé (plugins.lazy) : manifestes par nom de module
+        self.manifests: dict[str, PluginManifest] = load_manifests(plugins_dir)
+        self.deferred: dict[str, PluginManifest] = {}
+        self.timings: dict[str, PluginTiming] = {}  # par nom de module
+        self.ui_builder: Any = None
+        self.shortcut_manager: Any = None
+        self._modules: dict[str, str] = {}  # plugin.name -> nom de module
+        self._startup_order: list[str] = []  # modules chargés ou différés, dans l'ordre
+        self._placeholders: dict[str, list[tuple[Any, Any]]] = {}  # module -> [(menu, action)]
+        self._event_triggers: dict[str, list[tuple[str, Callable[..., None]]]] = {}
 
     def discover_plugins(self) -> list[str]:
         """Discover available plugins.
@@ -232,15 +276,21 @@ class PluginManager:
         return isinstance(name, str) and bool(name.strip())
 
     def load_plugin(self, plugin_name: str) -> bool:
-        """Load a plugin."""
+        """Load a plugin (import and initialize are timed in ``timings``)."""
         try:
+            start = time.perf_counter()
             module = importlib.import_module(f"plugins.{plugin_name}")
+            timing = PluginTiming(import_s=time.perf_counter() - start)
 
             for _name, obj in inspect.getmembers(module, inspect.isclass):
                 if self._is_plugin_class(obj):
+                    start = time.perf_counter()
                     instance = obj()
                     instance.initialize(self.context)
+                    timing.initialize_s = time.perf_counter() - start
                     self.plugins[instance.name] = instance
+                    self._modules[instance.name] = plugin_name
+                    self.timings[plugin_name] = timing
                     logging.info(f"Loaded plugin: {instance.name} v{instance.version}")
                     return True
 
@@ -252,6 +302,9 @@ class PluginManager:
     def load_all_plugins(self, mode: str | None = None) -> int:
         """Load all plugins (called once at startup).
 
+        With ``plugins.lazy`` enabled, plugins declared in the manifest are
+        deferred (see ensure_loaded) unless one of their modes is ``mode``.
+
         Args:
             mode: Initial mode ("jukebox" or "curating")
 
@@ -261,6 +314,7 @@ class PluginManager:
         loaded = 0
         enabled_plugins = getattr(self.context.config, "plugins", None)
         enabled_list = enabled_plugins.enabled if enabled_plugins else None
+        lazy = bool(getattr(enabled_plugins, "lazy", False))
 
         # Load ALL enabled plugins regardless of mode
         for plugin_name in self.discover_plugins():
@@ -268,32 +322,206 @@ class PluginManager:
                 logging.info(f"Plugin {plugin_name} disabled")
                 continue
 
+            manifest = self.manifests.get(plugin_name) if lazy else None
+            if manifest and manifest.has_triggers and mode not in manifest.modes:
+                self._defer(plugin_name, manifest)
+                self._startup_order.append(plugin_name)
+                continue
+
             if self.load_plugin(plugin_name):
+                self._startup_order.append(plugin_name)
                 loaded += 1
 
         # Set initial mode and activate appropriate plugins
         if mode:
             self.current_mode = mode
             for plugin in self.plugins.values():
-                plugin_modes = getattr(plugin, "modes", ["jukebox", "curating"])
-                if mode in plugin_modes:
-                    if hasattr(plugin, "activate"):
-                        try:
-                            plugin.activate(mode)
-                            logging.debug(f"Initially activated plugin: {plugin.name} for {mode}")
-                        except Exception as e:
-                            logging.error(f"Error initially activating plugin {plugin.name}: {e}")
-                else:
-                    # Plugin not active in this mode, deactivate it
-                    if hasattr(plugin, "deactivate"):
-                        try:
-                            plugin.deactivate(mode)
-                            logging.debug(f"Initially deactivated plugin: {plugin.name}")
-                        except Exception as e:
-                            logging.error(f"Error initially deactivating plugin {plugin.name}: {e}")
+                self._apply_initial_mode(plugin, mode)
 
         return loaded
 
+    def _apply_initial_mode(self, plugin: Any, mode: str) -> None:
+        """Activate a freshly loaded plugin for ``mode`` (or deactivate it)."""
+        plugin_modes = getattr(plugin, "modes", ["jukebox", "curating"])
+        if mode in plugin_modes:
+            if hasattr(plugin, "activate"):
+                try:
+                    plugin.activate(mode)
+                    logging.debug(f"Initially activated plugin: {plugin.name} for {mode}")
+                except Exception as e:
+                    logging.error(f"Error initially activating plugin {plugin.name}: {e}")
+        else:
+            # Plugin not active in this mode, deactivate it
+            if hasattr(plugin, "deactivate"):
+                try:
+                    plugin.deactivate(mode)
+                    logging.debug(f"Initially deactivated plugin: {plugin.name}")
+                except Exception as e:
+                    logging.error(f"Error initially deactivating plugin {plugin.name}: {e}")
+
+    def register_all_ui(self, ui_builder: Any, shortcut_manager: Any = None) -> None:
+        """Register loaded plugins' UI and deferred plugins' placeholder menu actions.
+
+        Args:
+            ui_builder: UIBuilder, kept for plugins loaded later
+            shortcut_manager: Passed to plugins' register_shortcuts (if any)
+        """
+        self.ui_builder = ui_builder
+        self.shortcut_manager = shortcut_manager
+        # Ordre de chargement conservé : les menus apparaissent comme sans différé
+        registered = set()
+        for plugin_name in self._startup_order:
+            if plugin_name in self.deferred:
+                self._add_placeholders(plugin_name, self.deferred[plugin_name])
+            elif (plugin := self._plugin_for(plugin_name)) is not None:
+                self._register_plugin_ui(plugin)
+                registered.add(plugin.name)
+        for plugin in self.get_all_plugins():
+            if plugin.name not in registered:
+                self._register_plugin_ui(plugin)
+
+    def _register_plugin_ui(self, plugin: Any) -> None:
+        start = time.perf_counter()
+        plugin.register_ui(self.ui_builder)
+        if self.shortcut_manager is not None and hasattr(plugin, "register_shortcuts"):
+            plugin.register_shortcuts(self.shortcut_manager)
+        timing = self.timings.get(self._modules.get(plugin.name, ""))
+        if timing is not None:
+            timing.register_ui_s = time.perf_counter() - start
+
+    def _defer(self, plugin_name: str, manifest: PluginManifest) -> None:
+        """Keep a plugin unloaded until one of its triggers fires."""
+        self.deferred[plugin_name] = manifest
+        triggers = self._event_triggers[plugin_name] = []
+        for event in manifest.events:
+            callback = self._event_trigger(plugin_name, event)
+            self.context.subscribe(event, callback)
+            triggers.append((event, callback))
+        logging.info(f"Plugin {plugin_name} deferred until {manifest.describe()}")
+
+    def _add_placeholders(self, plugin_name: str, manifest: PluginManifest) -> None:
+        actions = self._placeholders.setdefault(plugin_name, [])
+        for item in manifest.menu:
+            menu = self.ui_builder.get_or_create_menu(item.menu)
+            callback = self._menu_trigger(plugin_name, item.text)
+            actions.append(
+                (menu, self.ui_builder.add_menu_action(menu, item.text, callback, item.shortcut))
+            )
+
+    def _menu_trigger(self, plugin_name: str, text: str) -> Callable[[], None]:
+        return lambda: self._on_menu_trigger(plugin_name, text)
+
+    def _event_trigger(self, plugin_name: str, event: str) -> Callable[..., None]:
+        return lambda **data: self._on_event_trigger(plugin_name, event, data)
+
+    def _on_menu_trigger(self, plugin_name: str, text: str) -> None:
+        """Load the plugin, then trigger its own action (which replaced the placeholder)."""
+        menus = [menu for menu, action in self._placeholders.get(plugin_name, ())]
+        if self.ensure_loaded(plugin_name, trigger=f"menu {text}") is None:
+            return
+        for menu in menus:
+            for action in menu.actions():
+                if action.text() == text:
+                    action.trigger()
+                    return
+        logging.warning(f"Plugin {plugin_name} did not register menu action {text!r}")
+
+    def _on_event_trigger(self, plugin_name: str, event: str, data: dict[str, Any]) -> None:
+        """Load the plugin, then deliver the event to the handlers it just subscribed."""
+        bus = getattr(self.context, "event_bus", None)
+        subscribers = getattr(bus, "subscribers", {})
+        before = list(subscribers.get(event, ()))
+        if self.ensure_loaded(plugin_name, trigger=f"event {event}") is None:
+            return
+        for callback in list(subscribers.get(event, ())):
+            if callback not in before:
+                callback(**data)
+
+    def ensure_loaded(
+        self, plugin_name: str, trigger: str = "on demand", apply_mode: bool = True
+    ) -> Any:
+        """Load a deferred plugin now (no-op if it is not deferred).
+
+        Args:
+            plugin_name: Plugin module name
+            trigger: Recorded in ``timings`` (startup report)
+            apply_mode: Activate/deactivate it for the current mode
+
+        Returns:
+            The plugin instance, or None if it is unknown or failed to load
+        """
+        if self.deferred.pop(plugin_name, None) is None:
+            return self._plugin_for(plugin_name)
+
+        bus = getattr(self.context, "event_bus", None)
+        for event, callback in self._event_triggers.pop(plugin_name, ()):
+            if bus is not None:
+                bus.unsubscribe(event, callback)
+        placeholders = self._placeholders.pop(plugin_name, [])
+        if not self.load_plugin(plugin_name):
+            for menu, placeholder in placeholders:
+                menu.removeAction(placeholder)
+            return None
+
+        self.timings[plugin_name].trigger = trigger
+        plugin = self._plugin_for(plugin_name)
+        if self.ui_builder is not None:
+            try:
+                self._register_plugin_ui(plugin)
+            except Exception:
+                logging.error(f"Failed to register UI of plugin {plugin_name}", exc_info=True)
+        # L'action du plugin (ajoutée en fin de menu) prend la place du substitut
+        for menu, placeholder in placeholders:
+            for action in menu.actions():
+                if action is not placeholder and action.text() == placeholder.text():
+                    menu.insertAction(placeholder, action)
+                    break
+            menu.removeAction(placeholder)
+        if apply_mode and self.current_mode:
+            self._apply_initial_mode(plugin, self.current_mode)
+        logging.info(f"Plugin {plugin_name} loaded on {trigger}")
+        return plugin
+
+    def _plugin_for(self, plugin_name: str) -> Any:
+        """Loaded plugin instance of a module name (None if not loaded)."""
+        for name, module in self._modules.items():
+            if module == plugin_name:
+                return self.plugins.get(name)
+        return None
+
+    def load_deferred(self) -> None:
+        """Load every deferred plugin (e.g. before listing all plugin settings)."""
+        for plugin_name in list(self.deferred):
+            self.ensure_loaded(plugin_name)
+
+    def timing_report(self) -> str:
+        """Per-plugin load times (import, initialize, register_ui), slowest first."""
+        lines = [
+            f"{'plugin':<24}{'import':>9}{'init':>9}{'ui':>9}{'total':>9}  loaded (ms)",
+        ]
+        startup = PluginTiming()
+        for name, timing in sorted(self.timings.items(), key=lambda item: -item[1].total_s):
+            lines.append(
+                f"{name:<24}{timing.import_s * 1000:>9.1f}{timing.initialize_s * 1000:>9.1f}"
+                f"{timing.register_ui_s * 1000:>9.1f}{timing.total_s * 1000:>9.1f}"
+                f"  {timing.trigger}"
+            )
+            if timing.trigger == "startup":
+                startup.import_s += timing.import_s
+                startup.initialize_s += timing.initialize_s
+                startup.register_ui_s += timing.register_ui_s
+        for name, manifest in self.deferred.items():
+            lines.append(
+                f"{name:<24}{'-':>9}{'-':>9}{'-':>9}{'-':>9}  deferred: {manifest.describe()}"
+            )
+        lines.append(
+            f"{'startup total':<24}{startup.import_s * 1000:>9.1f}"
+            f"{startup.initialize_s * 1000:>9.1f}{startup.register_ui_s * 1000:>9.1f}"
+            f"{startup.total_s * 1000:>9.1f}"
+        )
+        lines.append("(import includes the shared modules a plugin is the first to import)")
+        return "\n".join(lines)
+
     def get_all_plugins(self) -> list[Any]:
         """Get all loaded plugins."""
         return list(self.plugins.values())
@@ -308,6 +536,16 @@ class PluginManager:
                 logging.error(f"Error shutting down plugin {plugin.name}: {e}")
 
         self.plugins.clear()
+        self._modules.clear()
+        self._startup_order.clear()
+        bus = getattr(self.context, "event_bus", None)
+        for triggers in self._event_triggers.values():
+            for event, callback in triggers:
+                if bus is not None:
+                    bus.unsubscribe(event, callback)
+        self._event_triggers.clear()
+        self._placeholders.clear()
+        self.deferred.clear()
 
     def switch_mode(self, new_mode: str) -> None:
         """Switch to a different mode without reloading plugins.
@@ -321,6 +559,11 @@ class PluginManager:
 
         old_mode = self.current_mode
 
+        # Deferred plugins declaring this mode are loaded now (activated below)
+        for plugin_name, manifest in list(self.deferred.items()):
+            if new_mode in manifest.modes:
+                self.ensure_loaded(plugin_name, trigger=f"mode {new_mode}", apply_mode=False)
+
         # Deactivate plugins that were active in old mode
         if old_mode:
             for plugin in self.plugins.values():
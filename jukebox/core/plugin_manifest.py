@@ -0,0 +1,93 @@
+"""Plugin manifest: what a plugin contributes before it is imported.
+
+With ``plugins.lazy`` enabled, PluginManager does not import the plugins
+listed in ``plugins/manifest.yaml``. It creates their declared menu
+actions as placeholders and imports, initializes and registers the plugin
+the first time one of its triggers fires:
+
+- ``menu``: one of its placeholder menu actions is triggered (the action is
+  then replaced by the plugin's own and triggered again);
+- ``modes``: the application enters one of these modes (or starts in it);
+- ``events``: one of these events is emitted (the event is then delivered to
+  the handlers the plugin subscribed while initializing).
+
+Example::
+
+    stats_plugin:
+      menu:
+        - {menu: "&Library", text: "Statistics..."}
+    cue_maker:
+      modes: [cue_maker]
+      events: [cue_add_track]
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.yaml"
+
+
+@dataclass(frozen=True)
+class MenuContribution:
+    """Menu action a deferred plugin registers once loaded."""
+
+    menu: str
+    text: str
+    shortcut: str | None = None
+
+
+@dataclass(frozen=True)
+class PluginManifest:
+    """Lazy-loading declaration of one plugin (module name, not plugin.name)."""
+
+    module: str
+    menu: tuple[MenuContribution, ...] = ()
+    modes: tuple[str, ...] = ()
+    events: tuple[str, ...] = ()
+
+    @property
+    def has_triggers(self) -> bool:
+        return bool(self.menu or self.modes or self.events)
+
+    def describe(self) -> str:
+        """Short trigger summary for the startup report."""
+        parts = [f"menu {item.menu.replace('&', '')} > {item.text}" for item in self.menu]
+        parts += [f"mode {mode}" for mode in self.modes]
+        parts += [f"event {event}" for event in self.events]
+        return ", ".join(parts)
+
+    @classmethod
+    def from_dict(cls, module: str, data: dict[str, Any]) -> PluginManifest:
+        return cls(
+            module=module,
+            menu=tuple(MenuContribution(**item) for item in data.get("menu") or ()),
+            modes=tuple(data.get("modes") or ()),
+            events=tuple(data.get("events") or ()),
+        )
+
+
+def load_manifests(plugins_dir: Path) -> dict[str, PluginManifest]:
+    """Read ``plugins_dir/manifest.yaml`` (no file or invalid file: no manifest).
+
+    Returns:
+        Manifests by plugin module name
+    """
+    path = plugins_dir / MANIFEST_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        return {
+            module: PluginManifest.from_dict(module, entry or {}) for module, entry in data.items()
+        }
+    except (OSError, yaml.YAMLError, TypeError, AttributeError):
+        logger.error("Invalid plugin manifest %s, loading every plugin", path, exc_info=True)
+        return {}
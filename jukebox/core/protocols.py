@@ -81,6 +81,8 @@ class SettingsRepositoryProtocol(Protocol):
 
     def get(self, plugin_name: str, key: str) -> str | None: ...
     def save(self, plugin_name: str, key: str, value: str) -> None: ...
+    def get_all(self, plugin_name: str) -> dict[str, str]: ...
+    def flush(self) -> bool: ...
 
 
 @runtime_checkable
@@ -194,6 +196,14 @@ class AudioAnalysisConfigProtocol(Protocol):
     enable_ml_features: bool
 
 
+class BatchProcessingConfigProtocol(Protocol):
+    """Protocol for background batch processing configuration."""
+
+    max_workers: int
+    use_process_pool: bool
+    waveform_workers: int
+
+
 class FileManagerConfigProtocol(Protocol):
     """Protocol for file manager configuration."""
 
@@ -262,6 +272,13 @@ class VideoExporterConfigProtocol(Protocol):
     ffmpeg_pixel_format: str
     ffmpeg_audio_codec: str
     ffmpeg_audio_bitrate: str
+    render_backend: str
+    vjing_analysis_cache_directory: str
+    export_segment_seconds: float
+    export_segment_cache_directory: str
+    export_segment_cache_max_gb: float
+    preview_scale: float
+    preview_max_frame_step: int
 
 
 class PlaybackNavigationConfigProtocol(Protocol):
@@ -311,6 +328,7 @@ class JukeboxConfigProtocol(Protocol):
 
     waveform: WaveformConfigProtocol
     audio_analysis: AudioAnalysisConfigProtocol
+    batch_processing: BatchProcessingConfigProtocol
     file_manager: FileManagerConfigProtocol
     ui: UIConfigProtocol
     loop_player: LoopPlayerConfigProtocol
@@ -402,6 +420,10 @@ class PluginContextProtocol(Protocol):
         """Get a plugin setting with automatic type conversion."""
         ...
 
+    def set_setting(self, plugin_name: str, key: str, value: Any) -> None:
+        """Save a plugin setting (cached, batched write, change event)."""
+        ...
+
     def get_current_track_duration(self) -> float | None:
         """Get the duration of the currently loaded track."""
         ...
@@ -734,15 +734,13 @@ class PlaylistRepository(BaseRepository):
 
     def get_all_with_counts(self) -> list[dict[str, Any]]:
         """Retourne toutes les playlists avec le nombre de pistes (clé track_count)."""
-        return self._conn.execute(
-            """
+        return self._conn.execute("""
             SELECT p.*, COUNT(pt.track_id) AS track_count
             FROM playlists p
             LEFT JOIN playlist_tracks pt ON p.id = pt.playlist_id
             GROUP BY p.id
             ORDER BY p.name
-            """
-        ).fetchall()
+            """).fetchall()
 
     def delete(self, playlist_id: int) -> bool:
         """Supprime une playlist.
@@ -843,3 +841,39 @@ class PluginSettingsRepository(BaseRepository):
             (plugin_name, key, value),
         )
         self._commit()
+
+    def get_all(self, plugin_name: str) -> dict[str, str]:
+        """Get every setting of a plugin.
+
+        Args:
+            plugin_name: Plugin name
+
+        Returns:
+            Setting values by key
+        """
+        cursor = self._conn.execute(
+            "SELECT setting_key, setting_value FROM plugin_settings WHERE plugin_name = ?",
+            (plugin_name,),
+        )
+        return {row["setting_key"]: row["setting_value"] for row in cursor.fetchall()}
+
+    def plugin_names(self) -> list[str]:
+        """Get the names of the plugins having at least one setting."""
+        cursor = self._conn.execute("SELECT DISTINCT plugin_name FROM plugin_settings")
+        return [row["plugin_name"] for row in cursor.fetchall()]
+
+    def save_many(self, settings: list[tuple[str, str, str]]) -> None:
+        """Save several settings in a single transaction.
+
+        Args:
+            settings: (plugin_name, key, value) tuples
+        """
+        query = """
+            INSERT OR REPLACE INTO plugin_settings (plugin_name, setting_key, setting_value)
+            VALUES (?, ?, ?)
+        """
+        if self._db._in_transaction:
+            self._conn.executemany(query, settings)
+            return
+        with self._db.transaction():
+            self._conn.executemany(query, settings)
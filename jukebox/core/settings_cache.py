@@ -0,0 +1,116 @@
+"""In-memory plugin settings in front of PluginSettingsRepository.
+
+``Database.settings`` returns a SettingsCache: same ``get`` / ``save`` API as
+the repository, so every caller (PluginContext.get_setting, conf_manager,
+SettingsSyncMixin...) shares it and sees its own writes.
+
+- Reads: a plugin's settings are fetched in one query the first time one of
+  them is read (or all plugins at once with ``preload``), then served from
+  memory — render loops and track-change handlers no longer hit SQLite.
+- Writes: the cache is updated at once and the row queued. Without a flush
+  scheduler the queue is written immediately (write-through); MainWindow
+  installs a debounce timer so bursts of writes land in one transaction.
+  ``Database.close`` flushes what is left.
+- Notifications: ``on_change(plugin_name, key, value)`` is called after each
+  write whose value changed (MainWindow emits PLUGIN_SETTING_CHANGED).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from jukebox.core.repositories import PluginSettingsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsCache:
+    """Plugin settings cache with batched write-through."""
+
+    def __init__(self, repository: PluginSettingsRepository) -> None:
+        """Initialize cache.
+
+        Args:
+            repository: Persistent storage of the settings
+        """
+        self._repository = repository
+        self._values: dict[str, dict[str, str]] = {}  # plugin -> key -> valeur
+        self._pending: dict[tuple[str, str], str] = {}
+        self._lock = threading.RLock()
+        self.on_change: Callable[[str, str, str], None] | None = None
+        self.schedule_flush: Callable[[], None] | None = None
+
+    def _plugin_values(self, plugin_name: str) -> dict[str, str]:
+        values = self._values.get(plugin_name)
+        if values is None:
+            values = self._values[plugin_name] = self._repository.get_all(plugin_name)
+        return values
+
+    def preload(self, plugin_names: list[str] | None = None) -> None:
+        """Load settings ahead of the first read (all plugins with a setting if None)."""
+        with self._lock:
+            if plugin_names is None:
+                plugin_names = self._repository.plugin_names()
+            for plugin_name in plugin_names:
+                self._plugin_values(plugin_name)
+
+    def get(self, plugin_name: str, key: str) -> str | None:
+        """Get a plugin setting value (None if not set)."""
+        with self._lock:
+            return self._plugin_values(plugin_name).get(key)
+
+    def get_all(self, plugin_name: str) -> dict[str, str]:
+        """Get a copy of every setting of a plugin."""
+        with self._lock:
+            return dict(self._plugin_values(plugin_name))
+
+    def save(self, plugin_name: str, key: str, value: str) -> None:
+        """Save a plugin setting (cache now, database on the next flush)."""
+        with self._lock:
+            values = self._plugin_values(plugin_name)
+            changed = values.get(key) != value
+            values[key] = value
+            self._pending[(plugin_name, key)] = value
+            schedule = self.schedule_flush
+        if schedule is None:
+            self.flush()
+        else:
+            schedule()
+        if changed and self.on_change is not None:
+            self.on_change(plugin_name, key, value)
+
+    @property
+    def pending(self) -> int:
+        """Number of settings not written to the database yet."""
+        return len(self._pending)
+
+    def flush(self) -> bool:
+        """Write queued settings in one transaction.
+
+        Returns:
+            False if the write failed (logged; the settings stay queued)
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+            rows = [(plugin, key, value) for (plugin, key), value in self._pending.items()]
+            try:
+                self._repository.save_many(rows)
+            except Exception:
+                logger.error("Failed to save %d plugin settings", len(rows), exc_info=True)
+                return False
+            self._pending.clear()
+            return True
+
+    def invalidate(self, plugin_name: str | None = None) -> None:
+        """Forget cached values (re-read on next access); queued writes are kept."""
+        with self._lock:
+            self.flush()
+            if plugin_name is None:
+                self._values.clear()
+            else:
+                self._values.pop(plugin_name, None)
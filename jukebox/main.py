@@ -1,5 +1,6 @@
 """Main entry point for Jukebox application."""
 
+import argparse
 import sys
 
 from PySide6.QtWidgets import QApplication
@@ -9,23 +10,49 @@ from jukebox.ui.main_window import MainWindow
 from jukebox.utils.logger import setup_logging
 
 
+def _parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """Parse Jukebox options; unknown arguments are left to Qt."""
+    parser = argparse.ArgumentParser(prog="jukebox")
+    parser.add_argument(
+        "--plugin-timings",
+        action="store_true",
+        help="print per-plugin load times (import, initialize, register_ui) after startup and exit",
+    )
+    parser.add_argument(
+        "--lazy-plugins",
+        action="store_true",
+        help="load the plugins of plugins/manifest.yaml on first use (overrides plugins.lazy)",
+    )
+    args, qt_args = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + qt_args
+
+
 def main() -> None:
     """Application entry point."""
+    args, qt_argv = _parse_args(sys.argv)
     try:
         # Load configuration
         config = load_config()
+        if args.lazy_plugins:
+            config.plugins.lazy = True
 
         # Setup logging
         setup_logging(config.logging)
 
         # Create Qt application
-        app = QApplication(sys.argv)
+        app = QApplication(qt_argv)
         app.setApplicationName(config.ui.window_title)
 
         # Create and show main window
         window = MainWindow(config)
         window.show()
 
+        if args.plugin_timings:
+            app.processEvents()
+            print(window.plugin_manager.timing_report())
+            window.close()
+            sys.exit(0)
+
         # Run event loop
         sys.exit(app.exec())
 
@@ -1,18 +1,18 @@
 """Cell renderer for track list columns."""
 
+import itertools
 import logging
 import re
 from collections import OrderedDict
-from typing import Any, TypeVar
+from collections.abc import Hashable
+from typing import Any
 
 import numpy as np
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QPainter, QPixmap
+from PySide6.QtGui import QColor, QImage, QPixmap
 
 from jukebox.core.mode_manager import AppMode
-
-K = TypeVar("K")
-V = TypeVar("V")
+from jukebox.utils.waveform_serializer import BANDS, read_waveform_pyramid
 
 # Pattern de validation du format de genre (issu du projet PyQT)
 # Note : *0 n'est pas autorisé, uniquement *1 à *5
@@ -20,32 +20,125 @@ V = TypeVar("V")
 GENRE_PATTERN = re.compile(r"^([A-Z]+)(-[A-Z]+)*(-\*[1-5])?$")
 
 
-class LRUCache(OrderedDict[K, V]):
-    """Simple LRU cache with maximum size limit."""
+MINI_WAVEFORM_WIDTH = 200
+MINI_WAVEFORM_HEIGHT = 16
+MINI_WAVEFORM_BYTES = MINI_WAVEFORM_WIDTH * MINI_WAVEFORM_HEIGHT * 4
+"""Memory of one rendered mini waveform (32-bit pixels)."""
+
+# @hardcoded-ok: waveform preview colors match default config (0xAARRGGBB)
+_BACKGROUND_ARGB = 0xFF000000
+_BAND_ARGB = (0xFF0066FF, 0xFF00FF00, 0xFFFFFFFF)  # bass, mid, treble
+
+_waveform_versions = itertools.count(1)
+
+
+def next_waveform_version() -> int:
+    """New version number, to store in a track dict each time its waveform_data changes."""
+    return next(_waveform_versions)
+
+
+def waveform_cache_key(track: dict[str, Any]) -> tuple[Any, int]:
+    """Cache key of a track's mini waveform: (track id, waveform version)."""
+    track_id = track.get("_db_id")
+    if track_id is None:
+        track_id = str(track.get("filepath"))
+    return track_id, track.get("waveform_version", 0)
+
+
+def decode_mini_waveform(data: bytes, width: int = MINI_WAVEFORM_WIDTH) -> dict[str, np.ndarray]:
+    """Decode a serialized waveform straight to its mini waveform columns.
+
+    Reads the coarsest pyramid level with enough columns (each column is the
+    peak of the range it covers); a legacy npz waveform is converted first.
+    Safe outside the GUI thread.
+
+    Raises:
+        ValueError: Si les données sont corrompues ou dans un format non supporté
+    """
+    return read_waveform_pyramid(data).envelope(width)
 
-    def __init__(self, maxsize: int = 500) -> None:
-        """Initialize LRU cache.
+
+def render_mini_waveform(
+    waveform: dict[str, Any],
+    width: int = MINI_WAVEFORM_WIDTH,
+    height: int = MINI_WAVEFORM_HEIGHT,
+) -> QImage | None:
+    """Render the 3 stacked bands of a waveform into an image, in one numpy pass.
+
+    Pixel for pixel identical to one fillRect per column and band (treble,
+    then mid, then bass on top). QImage is safe to build outside the GUI thread.
+
+    Returns:
+        The image, or None if a band is empty
+    """
+    bands = [np.asarray(waveform.get(band, ())) for band in BANDS]
+    if any(len(band) == 0 for band in bands):
+        return None
+
+    # Downsample to fit width
+    step = max(1, len(bands[0]) // width)
+    samples = [band[::step][:width] for band in bands]
+    columns = min(len(band) for band in samples)
+    # Hauteurs cumulées (bass, bass+mid, bass+mid+treble), tronquées comme int()
+    heights = (np.cumsum([band[:columns] for band in samples], axis=0) * height).astype(np.int64)
+
+    # Profondeur de chaque ligne de pixels depuis le bas : height … 1
+    depth = np.arange(height, 0, -1)[:, None]
+    pixels = np.full((height, width), _BACKGROUND_ARGB, dtype=np.uint32)
+    pixels[:, :columns] = np.select(
+        [depth <= heights[0], depth <= heights[1], depth <= heights[2]],
+        _BAND_ARGB,
+        _BACKGROUND_ARGB,
+    )
+    image = QImage(pixels.data, width, height, width * 4, QImage.Format.Format_RGB32)
+    return image.copy()  # détache l'image du buffer numpy
+
+
+class PixmapCache:
+    """LRU cache of pixmaps bounded by memory (bytes), not by entry count."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize cache.
 
         Args:
-            maxsize: Maximum number of items to store
+            max_bytes: Maximum total size of the cached pixmaps
         """
-        super().__init__()
-        self.maxsize = maxsize
-
-    def get_item(self, key: K) -> V | None:
-        """Get item and move to end (most recently used)."""
-        if key in self:
-            self.move_to_end(key)
-            return self[key]
-        return None
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items: OrderedDict[Hashable, QPixmap] = OrderedDict()
 
-    def put(self, key: K, value: V) -> None:
-        """Add item and evict oldest if over capacity."""
-        if key in self:
-            self.move_to_end(key)
-        self[key] = value
-        if len(self) > self.maxsize:
-            self.popitem(last=False)  # Remove oldest (first) item
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> QPixmap | None:
+        """Get pixmap and mark it most recently used."""
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key)
+        return pixmap
+
+    def put(self, key: Hashable, pixmap: QPixmap) -> None:
+        """Add pixmap and evict the least recently used ones while over budget."""
+        self.pop(key)
+        self._items[key] = pixmap
+        self.nbytes += self._sizeof(pixmap)
+        while self.nbytes > self.max_bytes and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self.nbytes -= self._sizeof(evicted)
+
+    def pop(self, key: Hashable) -> QPixmap | None:
+        """Remove a pixmap from the cache."""
+        pixmap = self._items.pop(key, None)
+        if pixmap is not None:
+            self.nbytes -= self._sizeof(pixmap)
+        return pixmap
+
+    @staticmethod
+    def _sizeof(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
 
 
 class CellRenderer:
@@ -367,8 +460,8 @@ class DurationStyler(Styler):
 class WaveformStyler(Styler):
     """Styler for waveform column (mini waveform preview)."""
 
-    # LRU cache for rendered waveforms (configurable size via configure())
-    _cache: LRUCache[int, QPixmap] = LRUCache(maxsize=500)
+    # Pixmaps rendered, keyed by waveform_cache_key() (budget set via configure())
+    _cache = PixmapCache(500 * MINI_WAVEFORM_BYTES)
 
     @classmethod
     def configure(cls, cache_size: int) -> None:
@@ -377,18 +470,24 @@ class WaveformStyler(Styler):
         Should be called once at startup before any waveforms are rendered.
 
         Args:
-            cache_size: Maximum number of waveform pixmaps to cache
+            cache_size: Number of mini waveforms the memory budget is sized for
         """
-        cls._cache = LRUCache(maxsize=cache_size)
+        cls._cache = PixmapCache(cache_size * MINI_WAVEFORM_BYTES)
 
     @classmethod
-    def invalidate(cls, filepath: Any) -> None:
-        """Invalide l'entrée de cache associée à un fichier pour forcer un re-rendu.
+    def is_cached(cls, track: dict[str, Any]) -> bool:
+        """True if the track's current waveform is already rendered."""
+        return waveform_cache_key(track) in cls._cache
 
-        Args:
-            filepath: Chemin du fichier dont le rendu doit être régénéré
-        """
-        cls._cache.pop(hash(str(filepath)), None)
+    @classmethod
+    def cache_budget(cls) -> int:
+        """Number of mini waveforms that fit in the cache."""
+        return cls._cache.max_bytes // MINI_WAVEFORM_BYTES
+
+    @classmethod
+    def store(cls, key: Hashable, image: QImage) -> None:
+        """Cache an image rendered off the GUI thread (pixmaps are GUI-thread only)."""
+        cls._cache.put(key, QPixmap.fromImage(image))
 
     def display(self, data: Any, track: dict[str, Any]) -> str:
         """Display simple indicator if no waveform."""
@@ -408,59 +507,20 @@ class WaveformStyler(Styler):
         if not waveform_data:
             return None
 
-        # Cache key based on filepath hash
-        cache_key = hash(str(track.get("filepath")))
-        cached = WaveformStyler._cache.get_item(cache_key)
+        cache_key = waveform_cache_key(track)
+        cached = WaveformStyler._cache.get(cache_key)
         if cached is not None:
             return cached
 
-        # Create a mini waveform pixmap (200x16 for compact display)
-        width, height = 200, 16
-        pixmap = QPixmap(width, height)
-        pixmap.fill(Qt.GlobalColor.black)  # Black background
-
-        painter = QPainter(pixmap)
-
-        # Draw waveform (3 stacked bands)
-        bass = waveform_data.get("bass", np.array([]))
-        mid = waveform_data.get("mid", np.array([]))
-        treble = waveform_data.get("treble", np.array([]))
-
-        if len(bass) > 0 and len(mid) > 0 and len(treble) > 0:
-            # Downsample to fit width
-            step = max(1, len(bass) // width)
-            bass_samples = bass[::step][:width]
-            mid_samples = mid[::step][:width]
-            treble_samples = treble[::step][:width]
-
-            # Stack bands (cumulative)
-            for i in range(min(len(bass_samples), width)):
-                x = i
-                y_bottom = height
-
-                # Calculate cumulative heights
-                bass_h = int(bass_samples[i] * height)
-                mid_h = int((bass_samples[i] + mid_samples[i]) * height)
-                treble_h = int((bass_samples[i] + mid_samples[i] + treble_samples[i]) * height)
-
-                # @hardcoded-ok: waveform preview colors match default config
-                # Draw treble (white) - full height
-                if treble_h > 0:
-                    painter.fillRect(x, y_bottom - treble_h, 1, treble_h, QColor("#FFFFFF"))
-
-                # Draw mid (green) - covers bass+mid
-                if mid_h > 0:
-                    painter.fillRect(x, y_bottom - mid_h, 1, mid_h, QColor("#00FF00"))
-
-                # Draw bass (blue) - bottom layer
-                if bass_h > 0:
-                    painter.fillRect(x, y_bottom - bass_h, 1, bass_h, QColor("#0066FF"))
-
-        painter.end()
+        image = render_mini_waveform(waveform_data)
+        if image is None:
+            # Bandes vides : fond noir seul
+            pixmap = QPixmap(MINI_WAVEFORM_WIDTH, MINI_WAVEFORM_HEIGHT)
+            pixmap.fill(Qt.GlobalColor.black)
+        else:
+            pixmap = QPixmap.fromImage(image)
 
-        # Cache the result (LRU eviction if over capacity)
         WaveformStyler._cache.put(cache_key, pixmap)
-
         return pixmap
 
 
@@ -2,10 +2,12 @@
 
 import atexit
 import logging
+from operator import itemgetter
 from pathlib import Path
 from threading import Lock
 from typing import TYPE_CHECKING, Any, cast
 
+import numpy as np
 from PySide6.QtCore import (
     QAbstractTableModel,
     QModelIndex,
@@ -17,7 +19,7 @@ from PySide6.QtCore import (
     Signal,
     Slot,
 )
-from PySide6.QtGui import QAction, QDragEnterEvent, QDropEvent, QPalette
+from PySide6.QtGui import QAction, QDragEnterEvent, QDropEvent, QImage, QPalette
 from PySide6.QtWidgets import (
     QDialog,
     QFormLayout,
@@ -34,7 +36,21 @@ from PySide6.QtWidgets import (
 from jukebox.core.duplicate_checker import DuplicateChecker
 from jukebox.core.event_bus import Events
 from jukebox.core.mode_manager import AppMode
-from jukebox.ui.components.track_cell_renderer import CellRenderer
+from jukebox.ui.components.track_cell_renderer import (
+    CellRenderer,
+    WaveformStyler,
+    decode_mini_waveform,
+    next_waveform_version,
+    render_mini_waveform,
+    waveform_cache_key,
+)
+from jukebox.ui.components.track_sort import SORT_KEYS, TrackSortIndex
+from jukebox.utils.file_checker import (
+    CheckItem,
+    FileCheckService,
+    FileStatus,
+    get_file_check_service,
+)
 
 if TYPE_CHECKING:
     from jukebox.ui.main_window import MainWindow
@@ -70,6 +86,19 @@ COLUMN_WIDTHS = {
 # Row height
 ROW_HEIGHT = 20
 
+# Sort: keys of the previous sorts kept as secondary keys (clicked column first)
+MAX_SORT_KEYS = 3
+DEFAULT_SORT: list[tuple[str, bool]] = [("date_added", True)]  # date_added DESC
+
+# Streaming load: rows inserted per event-loop turn, tracks per waveform query
+ROW_INSERT_CHUNK = 2000
+ROW_INSERT_MAX_CHUNK = 16000
+WAVEFORM_LOAD_CHUNK = 500
+
+# Mini waveforms pre-rendered ahead of the viewport, in pages (visible row counts)
+WAVEFORM_PREFETCH_PAGES = 2
+WAVEFORM_PREFETCH_DELAY_MS = 30
+
 
 _live_workers: list[QThread] = []
 """Module-level registry of active background workers for cleanup at exit."""
@@ -95,6 +124,17 @@ def _cleanup_workers() -> None:
                 os._exit(0)
 
 
+def _hashed_path(filepath: str) -> Path:
+    """Path with its hash computed (and cached) in the calling thread.
+
+    Workers build the Path keys of their results: the UI thread then only does
+    dict lookups instead of parsing and hashing thousands of paths per batch.
+    """
+    path = Path(filepath)
+    hash(path)
+    return path
+
+
 class BackgroundCheckWorker(QThread):
     """Worker thread for duplicate checking.
 
@@ -107,27 +147,32 @@ class BackgroundCheckWorker(QThread):
     def __init__(
         self,
         duplicate_checker: DuplicateChecker,
-        track_dicts: list[dict[str, Any]],
+        tracks: list[tuple[str, str, str, str, str | None, str | None]],
     ) -> None:
+        """Initialize worker.
+
+        Args:
+            duplicate_checker: Shared checker (thread-safe)
+            tracks: (filepath, artist, title, filename, duplicate_status, duplicate_match)
+                tuples — a snapshot, the track dicts themselves stay on the UI thread
+        """
         super().__init__()
         self._duplicate_checker = duplicate_checker
-        self._track_dicts = track_dicts
+        self._tracks = tracks
         _live_workers.append(self)
 
     def run(self) -> None:
         try:
             changes: list[tuple[str, str, str | None]] = []
-            for track in self._track_dicts:
+            for filepath_str, artist, title, filename, status, match in self._tracks:
                 if self.isInterruptionRequested():
                     return
-                result = self._duplicate_checker.check(track)
+                result = self._duplicate_checker.check(
+                    {"artist": artist, "title": title, "filename": filename}
+                )
                 new_status = result.status.value
                 new_match = result.match_info
-                if (
-                    track.get("duplicate_status") != new_status
-                    or track.get("duplicate_match") != new_match
-                ):
-                    filepath_str = str(track.get("filepath", ""))
+                if status != new_status or match != new_match:
                     changes.append((filepath_str, new_status, new_match))
 
             if not self.isInterruptionRequested() and changes:
@@ -137,52 +182,106 @@ class BackgroundCheckWorker(QThread):
                 _live_workers.remove(self)
 
 
+class FileCheckWorker(QThread):
+    """Vérifie l'existence des fichiers en arrière-plan via FileCheckService.
+
+    Ne reçoit que des tuples (track_id, filepath) ; les résultats arrivent par
+    lots au fil des probes (un montage réseau lent ne retarde pas les autres).
+
+    Émet `batch_ready` après chaque lot ; les données sont récupérées via
+    `take_results()` (`[(filepath, FileStatus), ...]`, les Path déjà hachés ici
+    pour que le thread UI ne fasse plus que des lookups dans filepath_to_row).
+    """
+
+    batch_ready = Signal()  # notification — appeler take_results() pour les données
+
+    def __init__(self, service: FileCheckService, items: list[CheckItem]) -> None:
+        super().__init__()
+        self._service = service
+        self._items = items
+        self._lock = Lock()
+        self._results: list[tuple[Path, FileStatus]] = []
+        _live_workers.append(self)
+        # Libéré depuis le thread Qt principal une fois le thread terminé : le modèle
+        # peut être détruit avant la fin des probes (sinon QThread détruit en cours)
+        self.finished.connect(self._release)
+
+    @Slot()
+    def _release(self) -> None:
+        if self in _live_workers:
+            _live_workers.remove(self)
+
+    def take_results(self) -> list[tuple[Path, FileStatus]]:
+        """Return and forget the results received since the previous call."""
+        with self._lock:
+            results, self._results = self._results, []
+        return results
+
+    def run(self) -> None:
+        try:
+            for batch in self._service.check(self._items, should_stop=self.isInterruptionRequested):
+                if self.isInterruptionRequested():
+                    return
+                results = [(_hashed_path(fp), status) for _, fp, status in batch]
+                with self._lock:
+                    self._results.extend(results)
+                self.batch_ready.emit()
+        except Exception as e:
+            logging.error("[FileCheckWorker] Erreur : %s", e, exc_info=True)
+
+
 class WaveformBatchLoader(QThread):
-    """Récupère les bytes waveform et la présence de stats en arrière-plan.
+    """Charge, décode et réduit les waveforms en arrière-plan, par chunks.
 
-    Le coût qui figeait l'UI était le N+1 SELECT (3 requêtes par track) ; c'est ce
-    travail d'I/O qui est déporté ici via 2 requêtes batch. La désérialisation numpy
-    reste sur le thread Qt principal (numpy en thread secondaire segfaulte sur macOS
-    ARM, cf. bug librosa). Le worker ne renvoie donc que des bytes bruts.
+    Pour chaque chunk de tracks : 2 requêtes batch (waveform_cache, audio_analysis)
+    sur une connexion dédiée, puis décodage direct aux colonnes de la mini waveform
+    (decode_mini_waveform — frombuffer + déquantification, sans librosa). Le thread
+    Qt principal ne reçoit que des arrays prêts à peindre.
 
-    Émet `batch_ready` ; les données sont lues via `self.result`
-    (`{track_id: (waveform_bytes | None, has_stats)}`).
+    Émet `batch_ready` après chaque chunk ; les données sont récupérées via
+    `take_results()` (`[{filepath: (mini_waveform | None, has_stats)}, ...]`,
+    clés Path déjà hachées dans le worker).
     """
 
-    batch_ready = Signal()  # notification — lire self.result pour les données
+    batch_ready = Signal()  # notification — appeler take_results() pour les données
+
+    def __init__(self, db_path: Path, tracks: list[tuple[int, str]]) -> None:
+        """Initialize loader.
 
-    def __init__(self, db_path: Path, track_ids: list[int]) -> None:
+        Args:
+            db_path: Database file (the worker opens its own connection)
+            tracks: (track_id, filepath) pairs, in display order
+        """
         super().__init__()
         self._db_path = db_path
-        self._track_ids = track_ids
-        self.result: dict[int, tuple[bytes | None, bool]] = {}
+        self._tracks = tracks
+        self._lock = Lock()
+        self._results: list[dict[Path, tuple[dict[str, np.ndarray] | None, bool]]] = []
         _live_workers.append(self)
 
+    def take_results(self) -> list[dict[Path, tuple[dict[str, np.ndarray] | None, bool]]]:
+        """Return and forget the chunks loaded since the previous call."""
+        with self._lock:
+            results, self._results = self._results, []
+        return results
+
     def run(self) -> None:
         import sqlite3
 
-        result: dict[int, tuple[bytes | None, bool]] = {}
         try:
-            if not self._track_ids:
-                return
-            ph = ",".join("?" * len(self._track_ids))
             conn = sqlite3.connect(str(self._db_path))
-            conn.row_factory = sqlite3.Row
             try:
-                sql_waveforms = f"SELECT track_id, waveform_data FROM waveform_cache WHERE track_id IN ({ph})"  # noqa: S608
-                waveform_rows = conn.execute(sql_waveforms, self._track_ids).fetchall()
-                raw_map: dict[int, bytes] = {
-                    r["track_id"]: r["waveform_data"] for r in waveform_rows
-                }
-
-                sql_stats = f"SELECT track_id FROM audio_analysis WHERE track_id IN ({ph}) AND tempo IS NOT NULL"  # noqa: S608
-                stats_rows = conn.execute(sql_stats, self._track_ids).fetchall()
-                stats_set = {r["track_id"] for r in stats_rows}
-
-                for tid in self._track_ids:
+                for start in range(0, len(self._tracks), WAVEFORM_LOAD_CHUNK):
                     if self.isInterruptionRequested():
                         return
-                    result[tid] = (raw_map.get(tid), tid in stats_set)
+                    chunk = self._load_chunk(
+                        conn, self._tracks[start : start + WAVEFORM_LOAD_CHUNK]
+                    )
+                    # Un loader interrompu a été remplacé : ne plus rien livrer
+                    if chunk and not self.isInterruptionRequested():
+                        with self._lock:
+                            self._results.append(chunk)
+                        self.batch_ready.emit()
             finally:
                 conn.close()
         except Exception as e:
@@ -190,11 +289,69 @@ class WaveformBatchLoader(QThread):
         finally:
             if self in _live_workers:
                 _live_workers.remove(self)
-            # N'émettre que si le chargement a abouti : une interruption laisse `result`
-            # partiel (tracks traités avant l'arrêt), il ne faut pas l'appliquer.
+
+    def _load_chunk(
+        self, conn: Any, tracks: list[tuple[int, str]]
+    ) -> dict[Path, tuple[dict[str, np.ndarray] | None, bool]]:
+        """Fetch and decode one chunk (only rows with a waveform or stats are returned)."""
+        ids = [track_id for track_id, _ in tracks]
+        ph = ",".join("?" * len(ids))
+        sql_waveforms = f"SELECT track_id, waveform_data FROM waveform_cache WHERE track_id IN ({ph})"  # noqa: S608
+        raw_map: dict[int, bytes] = dict(conn.execute(sql_waveforms, ids).fetchall())
+        sql_stats = f"SELECT track_id FROM audio_analysis WHERE track_id IN ({ph}) AND tempo IS NOT NULL"  # noqa: S608
+        stats_set = {row[0] for row in conn.execute(sql_stats, ids)}
+
+        result: dict[Path, tuple[dict[str, np.ndarray] | None, bool]] = {}
+        for track_id, filepath in tracks:
+            waveform = None
+            raw_bytes = raw_map.get(track_id)
+            if raw_bytes is not None:
+                try:
+                    waveform = decode_mini_waveform(raw_bytes)
+                except ValueError as e:
+                    logging.warning(
+                        "[WaveformBatchLoader] Waveform invalide pour track_id=%d : %s", track_id, e
+                    )
+            has_stats = track_id in stats_set
+            if waveform is not None or has_stats:
+                result[_hashed_path(filepath)] = (waveform, has_stats)
+        return result
+
+
+class MiniWaveformPrefetcher(QThread):
+    """Pré-rend en arrière-plan les mini waveforms des lignes proches du viewport.
+
+    render_mini_waveform ne produit que des QImage (utilisables hors thread GUI) ;
+    la conversion en QPixmap et la mise en cache ont lieu sur le thread principal
+    via WaveformStyler.store(). Émet `images_ready` ; le résultat est lu via
+    `self.result` (`[(cache_key, image), ...]`).
+    """
+
+    images_ready = Signal()
+
+    def __init__(self, items: list[tuple[Any, dict[str, Any]]]) -> None:
+        super().__init__()
+        self._items = items
+        self.result: list[tuple[Any, QImage]] = []
+        _live_workers.append(self)
+
+    def run(self) -> None:
+        result: list[tuple[Any, QImage]] = []
+        try:
+            for key, waveform in self._items:
+                if self.isInterruptionRequested():
+                    return
+                image = render_mini_waveform(waveform)
+                if image is not None:
+                    result.append((key, image))
+        except Exception as e:
+            logging.error("[MiniWaveformPrefetcher] Erreur : %s", e, exc_info=True)
+        finally:
+            if self in _live_workers:
+                _live_workers.remove(self)
             if not self.isInterruptionRequested():
                 self.result = result
-                self.batch_ready.emit()
+                self.images_ready.emit()
 
 
 class TrackListModel(QAbstractTableModel):
@@ -202,6 +359,8 @@ class TrackListModel(QAbstractTableModel):
 
     # Signal emitted after a row is deleted (so others can safely query the model)
     row_deleted = Signal(int)  # deleted_row index (before deletion)
+    # Emitted once load_tracks_batch has inserted its last chunk of rows
+    loading_finished = Signal()
 
     def __init__(
         self,
@@ -231,6 +390,22 @@ class TrackListModel(QAbstractTableModel):
         self._pending_waveform: list[int] = []
         self._pending_stats: list[int] = []
 
+        # Chargement en flux (load_tracks_batch) : lignes insérées par chunks à chaque
+        # tour de boucle ; les waveforms arrivées avant leur ligne attendent ici.
+        self._load_queue: list[dict[str, Any]] = []
+        self._load_pos = 0
+        self._early_waveforms: dict[Path, tuple[dict[str, np.ndarray] | None, bool]] = {}
+        self._resort_after_load: tuple[int, Qt.SortOrder] | None = None
+        self._load_timer = QTimer(self)
+        self._load_timer.setSingleShot(True)
+        self._load_timer.setInterval(0)
+        self._load_timer.timeout.connect(self._insert_next_chunk)
+
+        # Tri : clés par colonne (numpy) alignées sur self.tracks, et tri courant
+        # [(colonne, décroissant), ...] dont les clés précédentes départagent les ex aequo
+        self._sort_index = TrackSortIndex()
+        self._sort_spec: list[tuple[str, bool]] = list(DEFAULT_SORT)
+
         # Build genre names mapping from config
         genre_names = {}
         if config and hasattr(config, "genre_editor"):
@@ -244,10 +419,12 @@ class TrackListModel(QAbstractTableModel):
         self._db_path = database.db_path if database else None
 
         # Duplicate checker — active only in curating mode
-        # Index is lazy (built on first check) and invalidated on mode switch.
+        # Index is lazy (built on first check), then kept up to date incrementally
+        # from track events (notify_* queue the changes for the next check).
         # Duplicate check runs in a background thread (thread-safe: own DB connection).
         self._duplicate_checker: DuplicateChecker | None = None
         self._bg_worker: BackgroundCheckWorker | None = None
+        self._file_worker: FileCheckWorker | None = None
         self._bg_check_pending = False
         if mode == AppMode.CURATING.value and self._db_path:
             self._duplicate_checker = DuplicateChecker(self._db_path)
@@ -262,6 +439,8 @@ class TrackListModel(QAbstractTableModel):
             event_bus.subscribe(Events.AUDIO_ANALYSIS_COMPLETE, self._on_stats_complete)
             # Listen for track deletion (emitted by file_manager)
             event_bus.subscribe(Events.TRACK_DELETED, self._on_track_deleted)
+            # Listen for imports (emitted by main_window) to sync the duplicate index
+            event_bus.subscribe(Events.TRACKS_ADDED, self._on_tracks_added)
 
     def _on_track_metadata_updated(self, filepath: Path) -> None:
         """Réceptionne l'événement EventBus (potentiellement depuis un thread background).
@@ -271,6 +450,8 @@ class TrackListModel(QAbstractTableModel):
         """
         if not isinstance(filepath, Path):
             filepath = Path(filepath)
+        if self._duplicate_checker is not None:
+            self._duplicate_checker.notify_track_changed(filepath)
         with self._event_lock:
             self._pending_metadata.append(filepath)
         QTimer.singleShot(0, self._process_metadata_updates)
@@ -283,6 +464,9 @@ class TrackListModel(QAbstractTableModel):
             self._pending_metadata = []
         for filepath in pending:
             self._apply_metadata_update(filepath)
+        # Artist/title changes can change duplicate statuses
+        if pending and self._duplicate_checker and self._mode == AppMode.CURATING.value:
+            self._schedule_background_checks()
 
     def _apply_metadata_update(self, filepath: Path) -> None:
         """Applique une mise à jour de métadonnées pour un fichier (thread Qt principal)."""
@@ -306,6 +490,7 @@ class TrackListModel(QAbstractTableModel):
                 track_db["genre"] or ""
             )  # intentional: rating parsed from genre
             self.tracks[row]["duration_seconds"] = track_db["duration_seconds"]
+            self._sort_index.update(row, self.tracks[row])
 
             # Emit dataChanged to update the view
             left_index = self.index(row, 0)
@@ -359,17 +544,11 @@ class TrackListModel(QAbstractTableModel):
         ).fetchone()
 
         if waveform_cache:
-            from jukebox.utils.waveform_serializer import deserialize_waveform
-
             try:
-                waveform = deserialize_waveform(waveform_cache["waveform_data"])
-                # Update track data
+                waveform = decode_mini_waveform(waveform_cache["waveform_data"])
+                # Update track data (nouvelle version → nouvelle clé de cache du rendu)
                 self.tracks[row]["waveform_data"] = waveform
-
-                # Invalide le cache pour ce fichier afin de forcer un re-rendu
-                from jukebox.ui.components.track_cell_renderer import WaveformStyler
-
-                WaveformStyler.invalidate(filepath)
+                self.tracks[row]["waveform_version"] = next_waveform_version()
 
                 # Emit dataChanged to refresh the waveform column only
                 waveform_index = self.index(row, 0)  # Waveform is column 0
@@ -442,6 +621,12 @@ class TrackListModel(QAbstractTableModel):
             deleted_row: Row that was deleted (optional, for logging)
         """
         logging.info(f"[TrackListModel] Received TRACK_DELETED for: {filepath}")
+        get_file_check_service().invalidate(str(filepath))
+
+        # The track left the library, or moved to jukebox under a new path
+        # (file_manager, indexed by the TRACKS_ADDED sync): incremental removal only
+        if self._duplicate_checker is not None:
+            self._duplicate_checker.notify_track_removed(filepath)
 
         # Find the row
         row = self.find_row_by_filepath(filepath)
@@ -468,6 +653,7 @@ class TrackListModel(QAbstractTableModel):
         # Remove from model
         self.beginRemoveRows(QModelIndex(), row, row)
         self.tracks.pop(row)
+        self._sort_index.remove(row)
         self.endRemoveRows()
 
         logging.info(f"[TrackListModel] Row deleted, remaining rows: {len(self.tracks)}")
@@ -480,6 +666,14 @@ class TrackListModel(QAbstractTableModel):
         # Emit signal so MainWindow can safely query the updated model
         self.row_deleted.emit(deleted_row_index)
 
+        if self._duplicate_checker and self._mode == AppMode.CURATING.value:
+            self._schedule_background_checks()
+
+    def _on_tracks_added(self) -> None:
+        """Queue a duplicate index sync (the list reload reruns the checks)."""
+        if self._duplicate_checker is not None:
+            self._duplicate_checker.notify_library_changed()
+
     def rowCount(self, parent: QModelIndex | QPersistentModelIndex | None = None) -> int:
         """Get number of rows."""
         return len(self.tracks)
@@ -524,40 +718,61 @@ class TrackListModel(QAbstractTableModel):
         column: int,
         order: Qt.SortOrder = Qt.SortOrder.AscendingOrder,
     ) -> None:
-        """Sort tracks by column. column == -1 resets to date_added DESC order."""
+        """Sort tracks by column. column == -1 resets to date_added DESC order.
+
+        The keys of the previous sorts break ties (up to MAX_SORT_KEYS), so
+        sorting by artist then by rating orders each rating by artist.
+        """
         columns = self.cell_renderer.columns
+        if column == -1 or column >= len(columns) or columns[column] not in SORT_KEYS:
+            # Tri par défaut : date_added DESC (ordre d'insertion)
+            spec = list(DEFAULT_SORT)
+        else:
+            name = columns[column]
+            previous = [key for key in self._sort_spec if key[0] != name]
+            spec = [(name, order == Qt.SortOrder.DescendingOrder), *previous]
+            spec = spec[:MAX_SORT_KEYS]
 
-        sort_key_map: dict[str, Any] = {
-            "artist": lambda t: (t.get("artist") or "").lower(),
-            "title": lambda t: (t.get("title") or "").lower(),
-            "filename": lambda t: (t.get("filename") or "").lower(),
-            "genre": lambda t: (t.get("genre") or "").lower(),
-            "duration": lambda t: t.get("duration_seconds") or 0.0,
-            "rating": lambda t: next(
-                (
-                    int(p[1:])
-                    for p in (t.get("genre") or "").split("-")
-                    if p.startswith("*") and p[1:].isdigit()
-                ),
-                0,
-            ),
-            "path": lambda t: str(Path(t.get("filepath") or "").parent).lower(),
-        }
+        if self.is_loading:
+            # Les chunks restants arrivent en fin de liste : retrier à la fin du chargement
+            self._resort_after_load = (column, order)
 
-        if column == -1 or column >= len(columns) or columns[column] not in sort_key_map:
-            # Tri par défaut : date_added DESC (ordre d'insertion)
-            def _default_key(t: dict[str, Any]) -> str:
-                return t.get("date_added") or ""
+        self.sort_by(spec)
 
-            key_fn: Any = _default_key
-            reverse = True
-        else:
-            key_fn = sort_key_map[columns[column]]
-            reverse = order == Qt.SortOrder.DescendingOrder
+    def sort_by(self, spec: list[tuple[str, bool]]) -> None:
+        """Stable multi-column sort.
+
+        Rows move with layoutChanged (persistent indexes, hence selection and
+        current row, follow their track) rather than a model reset.
+
+        Args:
+            spec: (column name, descending) pairs, primary key first
+                (names from track_sort.SORT_KEYS: "artist", "rating", "date_added"...)
+        """
+        self._sort_spec = list(spec)
+        if not self.tracks:
+            return
+        order = self._sort_index.order(self.tracks, spec)
+        if np.array_equal(order, np.arange(len(order))):
+            self._sort_index.mark_sorted(spec)
+            return
 
         self.layoutAboutToBeChanged.emit()
-        self.tracks.sort(key=key_fn, reverse=reverse)
-        self.filepath_to_row = {t["filepath"]: i for i, t in enumerate(self.tracks)}
+        old_rows = order.tolist()
+        self.tracks = [self.tracks[row] for row in old_rows]
+        self._sort_index.reorder(order, spec)
+        self.filepath_to_row = dict(
+            zip(map(itemgetter("filepath"), self.tracks), range(len(self.tracks)), strict=True)
+        )
+
+        persistent = self.persistentIndexList()
+        if persistent:
+            new_row = np.empty(len(order), dtype=np.int64)
+            new_row[order] = np.arange(len(order))
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(int(new_row[index.row()]), index.column()) for index in persistent],
+            )
         self.layoutChanged.emit()
 
     def add_track(
@@ -573,6 +788,7 @@ class TrackListModel(QAbstractTableModel):
         # Load waveform and stats info from cache if available
         waveform = None
         has_stats = False
+        track_id: int | None = None
         if self.database and self.database.conn is not None:
             # Get track_id from filepath
             track_db = self.database.conn.execute(
@@ -589,10 +805,8 @@ class TrackListModel(QAbstractTableModel):
                 ).fetchone()
 
                 if waveform_cache:
-                    from jukebox.utils.waveform_serializer import deserialize_waveform
-
                     try:
-                        waveform = deserialize_waveform(waveform_cache["waveform_data"])
+                        waveform = decode_mini_waveform(waveform_cache["waveform_data"])
                     except (ValueError, Exception) as e:
                         logging.warning(
                             f"[TrackListModel] Cache waveform invalide pour {filepath}"
@@ -619,15 +833,18 @@ class TrackListModel(QAbstractTableModel):
             "duration_seconds": duration_seconds,
             "date_added": date_added,
             "waveform_data": waveform,
+            "waveform_version": next_waveform_version() if waveform is not None else 0,
             "has_stats": has_stats,  # For StatsStyler
             "duplicate_status": "pending",  # Updated by background worker
             "duplicate_match": None,
             "file_missing": False,  # Updated asynchronously after UI display
+            "_db_id": track_id,
         }
 
         row = len(self.tracks)
         self.beginInsertRows(QModelIndex(), row, row)
         self.tracks.append(track_dict)
+        self._sort_index.append([track_dict])
         self.filepath_to_row[filepath] = row
         self.endInsertRows()
 
@@ -635,79 +852,110 @@ class TrackListModel(QAbstractTableModel):
         self._schedule_background_checks()
 
     def load_tracks_batch(self, tracks: list[dict[str, Any]]) -> None:
-        """Charge toutes les tracks en une seule opération (sans waveforms).
+        """Charge toutes les tracks en flux, par chunks de lignes (sans waveforms).
 
-        Les waveforms sont chargées séparément en arrière-plan par WaveformBatchLoader.
-        Élimine le N+1 SELECT en remplaçant N beginInsertRows par un seul beginResetModel.
+        Le premier chunk est inséré immédiatement (premier affichage), les suivants
+        à chaque tour de boucle d'événements via beginInsertRows : la vue peint dès
+        le premier chunk et l'UI reste réactive sur une grosse bibliothèque. Les
+        waveforms arrivent séparément, déjà décodées, via apply_waveform_batch.
+        `loading_finished` est émis après le dernier chunk.
         """
+        self._load_timer.stop()
         self.beginResetModel()
         self.tracks = []
         self.filepath_to_row = {}
-        for track in tracks:
-            filepath = Path(track["filepath"])
-            self.tracks.append(
-                {
-                    "filepath": filepath,
-                    "filename": filepath.name,
-                    "title": track.get("title"),
-                    "artist": track.get("artist"),
-                    "genre": track.get("genre") or "",
-                    "rating": track.get("genre") or "",
-                    "duration_seconds": track.get("duration_seconds"),
-                    "date_added": track.get("date_added"),
-                    "waveform_data": None,
-                    "has_stats": False,
-                    "duplicate_status": "pending",
-                    "duplicate_match": None,
-                    "file_missing": False,
-                    "_db_id": track.get("id"),
-                }
-            )
-            self.filepath_to_row[filepath] = len(self.tracks) - 1
+        self._sort_index.clear()
         self.endResetModel()
+        self._early_waveforms = {}
+        self._resort_after_load = None
+        self._load_queue = tracks
+        self._load_pos = 0
+        self._insert_next_chunk()
+
+    @property
+    def is_loading(self) -> bool:
+        """True while load_tracks_batch still has rows to insert."""
+        return self._load_pos < len(self._load_queue)
+
+    @Slot()
+    def _insert_next_chunk(self) -> None:
+        """Insère le chunk de lignes suivant puis se replanifie (thread Qt principal)."""
+        # Premier chunk petit (premier affichage rapide), puis taille doublée à chaque
+        # tour : chaque beginInsertRows coûte à la vue un passage sur toutes ses lignes.
+        start = self._load_pos
+        size = min(max(ROW_INSERT_CHUNK, len(self.tracks)), ROW_INSERT_MAX_CHUNK)
+        batch = self._load_queue[start : start + size]
+        self._load_pos = start + len(batch)
+        if batch:
+            first = len(self.tracks)
+            rows = [self._make_track_row(track) for track in batch]
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.tracks.extend(rows)
+            self._sort_index.append(rows)
+            for row, track in enumerate(rows, first):
+                self.filepath_to_row[track["filepath"]] = row
+            self.endInsertRows()
+
+        if self.is_loading:
+            self._load_timer.start()
+            return
+        self._load_queue = []
+        self._load_pos = 0
+        self._early_waveforms = {}
+        if self._resort_after_load is not None:
+            column, order = self._resort_after_load
+            self._resort_after_load = None
+            self.sort(column, order)
         self._schedule_background_checks()
+        self.loading_finished.emit()
 
-    def apply_waveform_batch(self, data: dict[int, tuple[bytes | None, bool]]) -> None:
-        """Désérialise et applique waveforms + stats (thread Qt principal).
+    def _make_track_row(self, track: dict[str, Any]) -> dict[str, Any]:
+        """Track dict of a row loaded by load_tracks_batch."""
+        filepath = Path(track["filepath"])
+        waveform, has_stats = self._early_waveforms.pop(filepath, (None, False))
+        return {
+            "filepath": filepath,
+            "filename": filepath.name,
+            "title": track.get("title"),
+            "artist": track.get("artist"),
+            "genre": track.get("genre") or "",
+            "rating": track.get("genre") or "",
+            "duration_seconds": track.get("duration_seconds"),
+            "date_added": track.get("date_added"),
+            "waveform_data": waveform,
+            "waveform_version": next_waveform_version() if waveform is not None else 0,
+            "has_stats": has_stats,
+            "duplicate_status": "pending",
+            "duplicate_match": None,
+            "file_missing": False,
+            "_db_id": track.get("id"),
+        }
 
-        `data` contient les bytes bruts récupérés par WaveformBatchLoader ; la
-        désérialisation numpy a lieu ici, sur le thread principal (jamais en thread
-        secondaire — voir WaveformBatchLoader). Émet un seul dataChanged couvrant
-        toutes les lignes modifiées.
+    def apply_waveform_batch(
+        self, data: dict[Path, tuple[dict[str, np.ndarray] | None, bool]]
+    ) -> None:
+        """Applique des mini waveforms déjà décodées + stats (thread Qt principal).
+
+        `data` provient de WaveformBatchLoader (`{filepath: (mini_waveform, has_stats)}`) :
+        décodage et réduction ont eu lieu dans le worker, il ne reste qu'à affecter.
+        Une ligne pas encore insérée (chargement en flux) reçoit ses données à son
+        insertion. Émet un seul dataChanged couvrant toutes les lignes modifiées.
         """
-        if not data or not self.tracks:
+        if not data:
             return
-        id_to_row: dict[int, int] = {}
-        for row, track in enumerate(self.tracks):
-            db_id = track.get("_db_id")
-            if db_id is not None:
-                id_to_row[db_id] = row
-
-        from jukebox.ui.components.track_cell_renderer import WaveformStyler
-        from jukebox.utils.waveform_serializer import deserialize_waveform
-
-        # Ne repeindre que les lignes réellement modifiées (waveform ou stats présents).
-        # Une ligne dont les deux restent à leur valeur par défaut (None/False) n'a pas
-        # changé visuellement : l'inclure ne ferait que provoquer un repaint inutile.
+
         min_row, max_row = len(self.tracks), -1
-        for track_id, (raw_bytes, has_stats) in data.items():
-            target_row = id_to_row.get(track_id)
+        for filepath, (waveform, has_stats) in data.items():
+            target_row = self.filepath_to_row.get(filepath)
             if target_row is None:
+                if self.is_loading:
+                    self._early_waveforms[filepath] = (waveform, has_stats)
                 continue
-            waveform = None
-            if raw_bytes is not None:
-                try:
-                    waveform = deserialize_waveform(raw_bytes)
-                except Exception as e:
-                    logging.warning(
-                        "[TrackListModel] Waveform invalide pour track_id=%d : %s", track_id, e
-                    )
-            if waveform is None and not has_stats:
-                continue
-            self.tracks[target_row]["waveform_data"] = waveform
-            self.tracks[target_row]["has_stats"] = has_stats
+            track = self.tracks[target_row]
+            track["waveform_data"] = waveform
+            track["has_stats"] = has_stats
             if waveform is not None:
-                WaveformStyler.invalidate(self.tracks[target_row]["filepath"])
+                track["waveform_version"] = next_waveform_version()
             min_row = min(min_row, target_row)
             max_row = max(max_row, target_row)
 
@@ -723,9 +971,16 @@ class TrackListModel(QAbstractTableModel):
         return self._db_path
 
     def clear(self) -> None:
-        """Clear all tracks."""
+        """Clear all tracks (and cancel a streaming load and file checks)."""
+        self._load_timer.stop()
+        self._cancel_file_checks()
+        self._load_queue = []
+        self._load_pos = 0
+        self._early_waveforms = {}
+        self._resort_after_load = None
         self.beginResetModel()
         self.tracks.clear()
+        self._sort_index.clear()
         self.filepath_to_row.clear()
         self.endResetModel()
 
@@ -754,19 +1009,20 @@ class TrackListModel(QAbstractTableModel):
             self.cell_renderer.set_mode(mode)
             self.endResetModel()
 
-            # Activate or invalidate duplicate checker when switching to curating
-            # Index rebuilds lazily on first check (in background thread)
+            # Activate or resync duplicate checker when switching to curating
+            # Index builds lazily / syncs incrementally on next check (in background thread)
             if mode == AppMode.CURATING.value and self._db_path:
                 if self._duplicate_checker is None:
                     self._duplicate_checker = DuplicateChecker(self._db_path)
                 else:
-                    self._duplicate_checker.invalidate_index()
+                    self._duplicate_checker.notify_library_changed()
 
     def _schedule_background_checks(self) -> None:
         """Schedule file-existence and duplicate checks.
 
-        File check runs inline (fast for local files).
-        Duplicate check runs in a background thread (slow: DB + fuzzy matching).
+        Both run in background threads: file checks through FileCheckService
+        (bounded, per-mount limits and timeouts — network mounts may hang),
+        duplicate check through BackgroundCheckWorker (DB + fuzzy matching).
         Coalesced via _bg_check_pending flag + QTimer.singleShot(0).
         """
         if not self._bg_check_pending:
@@ -774,22 +1030,13 @@ class TrackListModel(QAbstractTableModel):
             QTimer.singleShot(0, self._run_background_checks)
 
     def _run_background_checks(self) -> None:
-        """Run file check inline, then launch background worker for duplicates."""
+        """Launch background workers for file existence and duplicates."""
         self._bg_check_pending = False
         if not self.tracks:
             return
 
-        # Phase 1: file existence check (inline — fast for local files)
-        changed = False
-        for track in self.tracks:
-            missing = not Path(track["filepath"]).exists()
-            if track.get("file_missing") != missing:
-                track["file_missing"] = missing
-                changed = True
-        if changed:
-            top_left = self.index(0, 0)
-            bottom_right = self.index(len(self.tracks) - 1, self.columnCount() - 1)
-            self.dataChanged.emit(top_left, bottom_right)
+        # Phase 1: file existence check (results streamed back by batches)
+        self._start_file_checks()
 
         # Phase 2: duplicate check in background thread (slow)
         if not self._duplicate_checker or self._mode != AppMode.CURATING.value:
@@ -808,10 +1055,20 @@ class TrackListModel(QAbstractTableModel):
                 logging.debug(f"[TrackListModel] Déconnexion worker précédent ignorée: {e}")
         self._bg_worker = None
 
-        # Deep-copy track data for thread-safe duplicate check
-        track_dicts = [dict(t) for t in self.tracks]
+        # Snapshot of the fields the check reads (the dicts stay on the UI thread)
+        snapshot = [
+            (
+                str(t["filepath"]),
+                t.get("artist") or "",
+                t.get("title") or "",
+                t.get("filename") or "",
+                t.get("duplicate_status"),
+                t.get("duplicate_match"),
+            )
+            for t in self.tracks
+        ]
 
-        worker = BackgroundCheckWorker(self._duplicate_checker, track_dicts)
+        worker = BackgroundCheckWorker(self._duplicate_checker, snapshot)
         # QueuedConnection explicite : le slot s'exécute dans le thread Qt principal
         # même si le signal est émis depuis run() du worker thread.
         worker.results.connect(self._on_duplicate_check_results, Qt.ConnectionType.QueuedConnection)
@@ -821,6 +1078,47 @@ class TrackListModel(QAbstractTableModel):
             f"[TrackListModel] Background duplicate check started: {len(self.tracks)} tracks"
         )
 
+    def _start_file_checks(self) -> None:
+        """Check every row's file in background (replaces a check in progress)."""
+        self._cancel_file_checks()
+        items = [(t.get("_db_id"), str(t["filepath"])) for t in self.tracks]
+        worker = FileCheckWorker(get_file_check_service(), items)
+        worker.batch_ready.connect(self._on_file_check_batch, Qt.ConnectionType.QueuedConnection)
+        self._file_worker = worker
+        worker.start()
+
+    def _cancel_file_checks(self) -> None:
+        """Stop the running file check without blocking (its results are dropped)."""
+        if self._file_worker is not None:
+            self._file_worker.requestInterruption()
+            try:
+                self._file_worker.batch_ready.disconnect(self._on_file_check_batch)
+            except (RuntimeError, TypeError) as e:
+                logging.debug(f"[TrackListModel] Déconnexion file check précédent ignorée: {e}")
+            self._file_worker = None
+
+    @Slot()
+    def _on_file_check_batch(self) -> None:
+        """Apply a batch of file statuses (unknown ones keep the previous state)."""
+        if self._file_worker is None:
+            return
+        changed: list[int] = []
+        for filepath, status in self._file_worker.take_results():
+            if status.unknown:
+                continue
+            row = self.filepath_to_row.get(filepath)
+            if row is None:
+                continue
+            track = self.tracks[row]
+            if track.get("file_missing") != status.missing:
+                track["file_missing"] = status.missing
+                changed.append(row)
+        if changed:
+            self.dataChanged.emit(
+                self.index(min(changed), 0),
+                self.index(max(changed), self.columnCount() - 1),
+            )
+
     def _on_duplicate_check_results(self, results: list[tuple[str, str, str | None]]) -> None:
         """Apply duplicate-check results from the background worker.
 
@@ -875,6 +1173,8 @@ class TrackList(QTableView):
     add_to_playlist_requested = Signal(Path, int)  # filepath, playlist_id
     create_playlist_requested = Signal(Path)  # filepath
     files_dropped = Signal(list)  # List of Path objects (files and directories)
+    # Emitted when load_tracks_batch has inserted every row and applied every waveform
+    tracks_loaded = Signal()
 
     def __init__(
         self,
@@ -939,6 +1239,24 @@ class TrackList(QTableView):
 
         # Background waveform loader (annulé et remplacé à chaque batch load)
         self._waveform_loader: WaveformBatchLoader | None = None
+        # Sélection demandée pour une ligne pas encore insérée (chargement en flux)
+        self._pending_selection: Path | None = None
+        # Connexion différée : un proxy éventuel doit d'abord avoir mappé les lignes
+        self._track_model.rowsInserted.connect(
+            self._apply_pending_selection, Qt.ConnectionType.QueuedConnection
+        )
+        self._track_model.loading_finished.connect(self._on_model_loading_finished)
+
+        # Pré-rendu des mini waveforms autour du viewport (coalescé pendant le scroll)
+        self._prefetcher: MiniWaveformPrefetcher | None = None
+        self._last_scroll_value = 0
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(WAVEFORM_PREFETCH_DELAY_MS)
+        self._prefetch_timer.timeout.connect(self._prefetch_mini_waveforms)
+        self.verticalScrollBar().valueChanged.connect(self._schedule_waveform_prefetch)
+        self._track_model.modelReset.connect(self._schedule_waveform_prefetch)
+        self._track_model.layoutChanged.connect(self._schedule_waveform_prefetch)
 
     @property
     def track_model(self) -> TrackListModel:
@@ -959,39 +1277,148 @@ class TrackList(QTableView):
         self.setModel(self._track_model)
 
     def load_tracks_batch(self, tracks: list[dict[str, Any]]) -> None:
-        """Charge les tracks en batch et lance le loader de waveforms en arrière-plan."""
+        """Charge les tracks en flux et lance le loader de waveforms en arrière-plan.
+
+        Les lignes apparaissent par chunks (TrackListModel.load_tracks_batch) pendant
+        que WaveformBatchLoader décode les waveforms ; `tracks_loaded` est émis quand
+        les deux sont terminés.
+        """
         # Annuler le loader précédent s'il tourne encore
         if self._waveform_loader is not None and self._waveform_loader.isRunning():
             self._waveform_loader.requestInterruption()
             self._waveform_loader.quit()
             self._waveform_loader.wait(500)
-
-        self._track_model.load_tracks_batch(tracks)
+        self._waveform_loader = None
+        self._pending_selection = None
 
         # Lancer le chargement async des waveforms si la DB est accessible
         db_path = self._track_model.db_path
-        track_ids: list[int] = []
-        for t in tracks:
-            tid = t.get("id")
-            if tid is not None:
-                track_ids.append(int(tid))
-        if db_path and track_ids:
-            loader = WaveformBatchLoader(db_path, track_ids)
+        entries = [(int(t["id"]), str(t["filepath"])) for t in tracks if t.get("id") is not None]
+        if db_path and entries:
+            loader = WaveformBatchLoader(db_path, entries)
             self._waveform_loader = loader
             # Connexion par méthode liée (pas de lambda) : Qt déconnecte automatiquement
             # quand ce TrackList est détruit, évitant tout use-after-free si le loader
             # se termine après la destruction du widget.
             loader.batch_ready.connect(self._on_waveform_batch_loaded)
-            loader.start()
+            loader.finished.connect(self._on_waveform_loader_finished)
+
+        self._track_model.load_tracks_batch(tracks)
+        if self._waveform_loader is not None:
+            self._waveform_loader.start()
 
     @Slot()
     def _on_waveform_batch_loaded(self) -> None:
-        """Applique le résultat du loader émetteur, sauf s'il a été remplacé entre-temps."""
+        """Applique les chunks du loader émetteur, sauf s'il a été remplacé entre-temps."""
+        loader = self.sender()
+        # Ignorer un loader obsolète : un rechargement l'a remplacé et ses lignes
+        # ne correspondraient plus au modèle.
+        if isinstance(loader, WaveformBatchLoader) and loader is self._waveform_loader:
+            for chunk in loader.take_results():
+                self._track_model.apply_waveform_batch(chunk)
+            self._schedule_waveform_prefetch()
+
+    @Slot()
+    def _on_waveform_loader_finished(self) -> None:
         loader = self.sender()
-        # Ignorer un loader obsolète : un rechargement l'a remplacé et les _db_id
-        # ne correspondraient plus aux lignes actuelles du modèle.
         if isinstance(loader, WaveformBatchLoader) and loader is self._waveform_loader:
-            self._track_model.apply_waveform_batch(loader.result)
+            for chunk in loader.take_results():
+                self._track_model.apply_waveform_batch(chunk)
+            self._waveform_loader = None
+            if not self._track_model.is_loading:
+                self.tracks_loaded.emit()
+
+    @Slot()
+    def _on_model_loading_finished(self) -> None:
+        # Toutes les lignes sont là (et mappées par un éventuel proxy)
+        self._apply_pending_selection()
+        self._pending_selection = None
+        if self._waveform_loader is None:
+            self.tracks_loaded.emit()
+
+    @Slot()
+    def _apply_pending_selection(self) -> None:
+        """Select the track requested before its row was inserted, once it is."""
+        if self._pending_selection is not None:
+            filepath = self._pending_selection
+            if self._track_model.find_row_by_filepath(filepath) >= 0:
+                self._pending_selection = None
+                self.select_track_by_filepath(filepath)
+
+    @Slot()
+    def _schedule_waveform_prefetch(self) -> None:
+        """Coalesce prefetch requests (scroll, reset, sort) into one pass."""
+        # Pas de connexion directe à QTimer.start : valueChanged(int) passerait la
+        # position du scroll comme intervalle.
+        self._prefetch_timer.start()
+
+    def _prefetch_rows(self) -> list[int]:
+        """View rows to pre-render, nearest to the viewport first.
+
+        Covers the visible rows, WAVEFORM_PREFETCH_PAGES pages ahead in the
+        scroll direction and one page behind, within half the cache budget so
+        prefetching never evicts what is on screen.
+        """
+        row_count = self.model().rowCount()
+        if row_count == 0 or not self.isVisible():
+            return []
+        first = max(self.rowAt(0), 0)
+        last = self.rowAt(self.viewport().height() - 1)
+        if last < 0:
+            last = row_count - 1
+        page = last - first + 1
+        # visible + ahead + behind ≤ la moitié du cache
+        room = max(WaveformStyler.cache_budget() // 2 - 2 * page, 0)
+        ahead = min(page * WAVEFORM_PREFETCH_PAGES, room)
+        behind = min(page, ahead)
+
+        value = self.verticalScrollBar().value()
+        downwards = value >= self._last_scroll_value
+        self._last_scroll_value = value
+        if downwards:
+            after, before = last + ahead, first - behind
+        else:
+            after, before = last + behind, first - ahead
+        rows = list(range(first, min(after, row_count - 1) + 1))
+        rows += range(first - 1, max(before, 0) - 1, -1)
+        return rows
+
+    @Slot()
+    def _prefetch_mini_waveforms(self) -> None:
+        """Render off the GUI thread the mini waveforms about to scroll into view."""
+        columns = self._track_model.cell_renderer.columns
+        if "waveform" not in columns or self.isColumnHidden(columns.index("waveform")):
+            return
+        model = self.model()
+        proxy = model if isinstance(model, QSortFilterProxyModel) else None
+        tracks = self._track_model.tracks
+
+        items: list[tuple[Any, dict[str, Any]]] = []
+        for row in self._prefetch_rows():
+            source_row = proxy.mapToSource(proxy.index(row, 0)).row() if proxy else row
+            if not 0 <= source_row < len(tracks):
+                continue
+            track = tracks[source_row]
+            if track.get("waveform_data") and not WaveformStyler.is_cached(track):
+                items.append((waveform_cache_key(track), track["waveform_data"]))
+        if not items:
+            return
+
+        # Le précédent est abandonné (son résultat ignoré), il se termine seul
+        if self._prefetcher is not None and self._prefetcher.isRunning():
+            self._prefetcher.requestInterruption()
+        prefetcher = MiniWaveformPrefetcher(items)
+        self._prefetcher = prefetcher
+        prefetcher.images_ready.connect(self._on_mini_waveforms_prefetched)
+        prefetcher.start()
+
+    @Slot()
+    def _on_mini_waveforms_prefetched(self) -> None:
+        """Cache the pre-rendered images (QPixmap conversion on the GUI thread)."""
+        prefetcher = self.sender()
+        if isinstance(prefetcher, MiniWaveformPrefetcher):
+            for key, image in prefetcher.result:
+                WaveformStyler.store(key, image)
 
     def select_track_by_filepath(self, filepath: Path) -> None:
         """Select a track by its filepath, handling proxy mapping if needed.
@@ -1001,6 +1428,8 @@ class TrackList(QTableView):
         """
         source_row = self._track_model.find_row_by_filepath(filepath)
         if source_row < 0:
+            if self._track_model.is_loading:
+                self._pending_selection = filepath  # sélectionnée à son insertion
             return
 
         model = self.model()
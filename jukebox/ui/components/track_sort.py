@@ -0,0 +1,159 @@
+"""Sort keys of the track list, kept as numpy arrays in row order.
+
+TrackListModel.sort used to rebuild Python keys for every row on each sort
+(re-parsing the rating out of the genre string, lowercasing every string)
+and sort the dicts with ``list.sort``. TrackSortIndex extracts each column's
+keys once, keeps them aligned with the model rows (patched on append, remove,
+update and reorder) and computes the permutation with ``np.lexsort``:
+
+- numeric columns (duration, rating) are float64/int8 arrays;
+- text columns are casefolded strings, compared through integer ranks
+  (``np.unique``) computed on first use and kept until the column changes.
+
+``np.lexsort`` is stable: rows equal on every key keep their current order,
+so a multi-column sort behaves like successive stable sorts.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+
+
+def parse_rating(genre: str | None) -> int:
+    """Rating encoded in a genre string ("C-D-*3" -> 3, 0 if none)."""
+    for part in (genre or "").split("-"):
+        if part.startswith("*") and part[1:].isdigit():
+            return int(part[1:])
+    return 0
+
+
+def _text(field: str) -> Callable[[dict[str, Any]], str]:
+    return lambda track: (track.get(field) or "").casefold()
+
+
+def _parent(track: dict[str, Any]) -> str:
+    return os.path.dirname(str(track.get("filepath") or "")).casefold()
+
+
+TEXT_KEYS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "artist": _text("artist"),
+    "title": _text("title"),
+    "filename": _text("filename"),
+    "genre": _text("genre"),
+    "path": _parent,
+    "date_added": lambda track: track.get("date_added") or "",
+}
+
+NUMERIC_KEYS: dict[str, tuple[Callable[[dict[str, Any]], float], type[np.generic]]] = {
+    "duration": (lambda track: track.get("duration_seconds") or 0.0, np.float64),
+    "rating": (lambda track: parse_rating(track.get("genre")), np.int8),
+}
+
+SORT_KEYS = frozenset(TEXT_KEYS) | frozenset(NUMERIC_KEYS)
+"""Column names TrackSortIndex can sort by."""
+
+
+class TrackSortIndex:
+    """Per-column sort keys of the model rows (built lazily, one column at a time)."""
+
+    def __init__(self) -> None:
+        self._keys: dict[str, np.ndarray] = {}
+        self._ranks: dict[str, np.ndarray] = {}
+        # Tri dans lequel sont les lignes (None dès qu'une ligne change)
+        self._sorted_by: tuple[tuple[str, bool], ...] | None = None
+
+    def __len__(self) -> int:
+        return len(next(iter(self._keys.values()), ()))
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._ranks.clear()
+        self._sorted_by = None
+
+    def order(
+        self, tracks: Sequence[dict[str, Any]], spec: Sequence[tuple[str, bool]]
+    ) -> np.ndarray:
+        """Permutation sorting ``tracks`` (new row i is current row ``order[i]``).
+
+        Args:
+            tracks: Model rows, in current order
+            spec: (column, descending) pairs, primary key first
+        """
+        if len(self) != len(tracks):
+            self.clear()
+        if self._sorted_by == tuple(spec):
+            return np.arange(len(tracks))
+        # lexsort : la dernière clé est la clé primaire
+        keys = []
+        for column, descending in reversed(spec):
+            key = self._sort_key(column, tracks)
+            keys.append(-key if descending else key)
+        if not keys:
+            return np.arange(len(tracks))
+        order: np.ndarray = np.lexsort(keys)
+        return order
+
+    def reorder(self, order: np.ndarray, spec: Sequence[tuple[str, bool]] | None = None) -> None:
+        """Follow a permutation of the rows (ranks stay valid).
+
+        Args:
+            order: Permutation returned by order()
+            spec: The sort it applies: sorting again by it is then a no-op
+        """
+        self._keys = {column: keys[order] for column, keys in self._keys.items()}
+        self._ranks = {column: ranks[order] for column, ranks in self._ranks.items()}
+        self._sorted_by = None if spec is None else tuple(spec)
+
+    def mark_sorted(self, spec: Sequence[tuple[str, bool]]) -> None:
+        """The rows already are in ``spec`` order (sorting again by it is a no-op)."""
+        self._sorted_by = tuple(spec)
+
+    def append(self, tracks: Sequence[dict[str, Any]]) -> None:
+        """Rows appended at the end of the model."""
+        self._sorted_by = None
+        for column, keys in self._keys.items():
+            self._keys[column] = np.concatenate([keys, self._extract(column, tracks)])
+            self._ranks.pop(column, None)
+
+    def remove(self, row: int) -> None:
+        """Row removed from the model."""
+        for column, keys in self._keys.items():
+            self._keys[column] = np.delete(keys, row)
+            if column in self._ranks:
+                self._ranks[column] = np.delete(self._ranks[column], row)
+
+    def update(self, row: int, track: dict[str, Any]) -> None:
+        """Row whose data changed."""
+        self._sorted_by = None
+        for column, keys in self._keys.items():
+            value = self._extract(column, [track])[0]
+            if keys[row] != value:
+                keys[row] = value
+                self._ranks.pop(column, None)
+
+    def _sort_key(self, column: str, tracks: Sequence[dict[str, Any]]) -> np.ndarray:
+        """Numeric key of a column: the values, or string ranks (ties share a rank)."""
+        keys = self._keys.get(column)
+        if keys is None:
+            keys = self._keys[column] = self._extract(column, tracks)
+        if column in NUMERIC_KEYS:
+            return keys
+        ranks = self._ranks.get(column)
+        if ranks is None:
+            _, inverse = np.unique(keys, return_inverse=True)
+            ranks = self._ranks[column] = inverse.astype(np.int32)
+        return ranks
+
+    @staticmethod
+    def _extract(column: str, tracks: Sequence[dict[str, Any]]) -> np.ndarray:
+        if column in NUMERIC_KEYS:
+            key_fn, dtype = NUMERIC_KEYS[column]
+            return np.fromiter(map(key_fn, tracks), dtype=dtype, count=len(tracks))
+        text_fn = TEXT_KEYS[column]
+        keys = np.empty(len(tracks), dtype=object)
+        keys[:] = [text_fn(track) for track in tracks]
+        return keys
@@ -4,7 +4,7 @@ import logging
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QThread, QTimer
 from PySide6.QtWidgets import (
     QInputDialog,
     QMainWindow,
@@ -15,6 +15,7 @@ from PySide6.QtWidgets import (
 
 from jukebox.core.audio_player import AudioPlayer, PlayerState
 from jukebox.core.config import JukeboxConfig
+from jukebox.core.constants import SETTINGS_FLUSH_DELAY_MS
 from jukebox.core.database import Database
 from jukebox.core.event_bus import EventBus, Events
 from jukebox.core.mode_manager import AppMode, ModeManager
@@ -26,6 +27,8 @@ from jukebox.ui.components.search_bar import SearchBar
 from jukebox.ui.components.track_cell_renderer import WaveformStyler
 from jukebox.ui.components.track_list import TrackList
 from jukebox.ui.ui_builder import UIBuilder
+from jukebox.utils.audio_cache import configure_audio_cache
+from jukebox.utils.file_checker import configure_file_check_service
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +60,15 @@ class MainWindow(QMainWindow):
         # Event bus
         self.event_bus = EventBus()
 
+        # Plugin settings: read from memory, written in batches (SettingsCache)
+        self._settings_flush_timer = QTimer(self)
+        self._settings_flush_timer.setSingleShot(True)
+        self._settings_flush_timer.setInterval(SETTINGS_FLUSH_DELAY_MS)
+        self._settings_flush_timer.timeout.connect(self.database.settings.flush)
+        self.database.settings.schedule_flush = self._schedule_settings_flush
+        self.database.settings.on_change = self._on_plugin_setting_changed
+        self.database.settings.preload()
+
         # Playback controller — owns position polling and POSITION_UPDATE emission
         self.playback = PlaybackController(self.player, self.event_bus, self.database, parent=self)
 
@@ -110,6 +122,24 @@ class MainWindow(QMainWindow):
         # Configure waveform cache size from config
         WaveformStyler.configure(self.config.ui.waveform_cache_size)
 
+        # Shared decoded-audio cache (must be configured before any worker decodes)
+        cache_config = self.config.audio_cache
+        configure_audio_cache(
+            max_memory_mb=cache_config.max_memory_mb,
+            spill_directory=cache_config.spill_directory or None,
+            spill_dtype=cache_config.spill_dtype,
+            max_spill_mb=cache_config.max_spill_mb,
+        )
+
+        # File-existence checks of the track list (background, per-mount limits)
+        checks_config = self.config.file_checks
+        configure_file_check_service(
+            max_workers=checks_config.max_workers,
+            per_mount_limit=checks_config.per_mount_limit,
+            timeout=checks_config.timeout_seconds,
+            ttl=checks_config.cache_ttl_seconds,
+        )
+
         # Track list (with stretch to take all available space)
         self.track_list = TrackList(
             database=self.database,
@@ -491,6 +521,24 @@ class MainWindow(QMainWindow):
             playlist_name=playlist_name,
         )
 
+    def _schedule_settings_flush(self) -> None:
+        """Write pending plugin settings after the batching window (UI thread timer)."""
+        if QThread.currentThread() is not self.thread():
+            # Un QTimer ne se démarre que depuis son thread : écriture directe
+            self.database.settings.flush()
+        elif not self._settings_flush_timer.isActive():
+            self._settings_flush_timer.start()
+
+    def _on_plugin_setting_changed(self, plugin_name: str, key: str, value: str) -> None:
+        self.event_bus.emit(
+            Events.PLUGIN_SETTING_CHANGED, plugin_name=plugin_name, key=key, value=value
+        )
+
+    def closeEvent(self, event: Any) -> None:  # noqa: N802 - Qt override
+        """Write pending plugin settings before closing."""
+        self.database.settings.flush()
+        super().closeEvent(event)
+
     def _load_plugins(self) -> None:
         """Load all plugins."""
         plugins_dir = Path(__file__).parent.parent.parent / "plugins"
@@ -503,11 +551,9 @@ class MainWindow(QMainWindow):
         loaded = self.plugin_manager.load_all_plugins(mode=current_mode)
         logger.info("Loaded %s plugins for %s mode", loaded, current_mode)
 
-        # Register plugin UIs and shortcuts
-        for plugin in self.plugin_manager.get_all_plugins():
-            plugin.register_ui(self.ui_builder)
-            if hasattr(plugin, "register_shortcuts"):
-                plugin.register_shortcuts(self.shortcut_manager)
+        # Register plugin UIs and shortcuts (placeholder menu actions for deferred plugins)
+        self.plugin_manager.register_all_ui(self.ui_builder, self.shortcut_manager)
+        logger.debug("Plugin load times:\n%s", self.plugin_manager.timing_report())
 
         # Add fallback position slider if no plugin provides position seeking
         if not self._position_seeking_provided:
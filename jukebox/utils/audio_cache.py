@@ -0,0 +1,524 @@
+"""Process-wide cache of decoded audio (mono PCM).
+
+Standalone module (no PySide6) so it can be safely imported in subprocesses.
+
+Several components decode the same file right after a track is loaded
+(waveform worker, audio analysis, cue maker fingerprinting). The cache decodes
+each file once at its native sample rate, derives the requested sample rates
+by resampling that single decode, and shares the results:
+
+- bounded in-memory LRU (in bytes, not entries);
+- optional on-disk spill of evicted entries (int16 or float16 ``.npy``);
+- concurrent requests for the same (file, sample rate) wait on a single
+  in-flight decode instead of decoding in parallel.
+
+Entries are keyed by real path + mtime + size: a modified file is decoded
+again and stale entries simply age out of the LRU.
+
+``stream`` serves consumers that process a file front to back (waveform
+generation): blocks come from the cached array when it is there, otherwise
+from a single block-wise decode (soundfile + streaming soxr resampler) that
+never holds the whole file and is not cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FileKey = tuple[str, int, int]
+"""(real path, mtime_ns, size) identifying one version of a file on disk."""
+
+EntryKey = tuple[FileKey, int]
+"""(file key, sample rate) identifying one decoded array."""
+
+Decoder = Callable[[str], tuple[np.ndarray, int]]
+"""Decode a file to (mono float32 samples, native sample rate)."""
+
+Resampler = Callable[[np.ndarray, int, int], np.ndarray]
+"""Resample (samples, orig_sr, target_sr) -> samples."""
+
+NATIVE_SR = 0
+"""Sample-rate marker used in cache keys for the native-rate decode."""
+
+DEFAULT_MAX_MEMORY_BYTES = 512 * 1024 * 1024
+SPILL_DTYPES = ("int16", "float16")
+_INT16_SCALE = 32767.0
+
+
+def _librosa_decode(filepath: str) -> tuple[np.ndarray, int]:
+    """Decode a file at its native sample rate with librosa."""
+    import librosa
+
+    y, sr = librosa.load(filepath, sr=None, mono=True)
+    return np.asarray(y, dtype=np.float32), int(sr)
+
+
+def _librosa_resample(y: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """Resample with librosa's default resampler (same as ``librosa.load(sr=...)``)."""
+    import librosa
+
+    return np.asarray(librosa.resample(y, orig_sr=orig_sr, target_sr=target_sr), dtype=np.float32)
+
+
+@dataclass
+class AudioCacheStats:
+    """Counters exposed for diagnostics and tests."""
+
+    hits: int = 0
+    misses: int = 0
+    decodes: int = 0
+    resamples: int = 0
+    spill_hits: int = 0
+    spill_writes: int = 0
+    evictions: int = 0
+
+
+class _InFlight:
+    """A decode/resample in progress that other threads can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: np.ndarray | None = None
+        self.error: BaseException | None = None
+
+
+class DecodedAudioCache:
+    """Thread-safe cache of decoded mono audio keyed by file version and sample rate."""
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        spill_directory: Path | None = None,
+        spill_dtype: str = "int16",
+        max_spill_bytes: int = 0,
+        decoder: Decoder | None = None,
+        resampler: Resampler | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_memory_bytes: Upper bound of decoded samples kept in memory
+            spill_directory: Directory for the on-disk spill (None = disabled)
+            spill_dtype: Storage dtype for spilled arrays ("int16" or "float16")
+            max_spill_bytes: Upper bound of the spill directory (0 = unbounded)
+            decoder: Native-rate decoder (defaults to librosa)
+            resampler: Resampler (defaults to librosa)
+
+        Raises:
+            ValueError: If spill_dtype is not supported
+        """
+        if spill_dtype not in SPILL_DTYPES:
+            raise ValueError(f"Unsupported spill dtype: {spill_dtype}")
+
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_directory = spill_directory
+        self.spill_dtype = spill_dtype
+        self.max_spill_bytes = max_spill_bytes
+        self._decode = decoder or _librosa_decode
+        self._resample = resampler or _librosa_resample
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[EntryKey, np.ndarray] = OrderedDict()
+        self._native_rates: dict[FileKey, int] = {}
+        self._in_flight: dict[EntryKey, _InFlight] = {}
+        self._memory_bytes = 0
+        self.stats = AudioCacheStats()
+
+        if self.spill_directory is not None:
+            self.spill_directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes currently held in memory."""
+        return self._memory_bytes
+
+    def load(
+        self,
+        filepath: str | Path,
+        sr: int | None = None,
+        offset: float = 0.0,
+        duration: float | None = None,
+    ) -> tuple[np.ndarray, int]:
+        """Return decoded mono audio, mirroring ``librosa.load(mono=True)``.
+
+        Args:
+            filepath: Path to audio file
+            sr: Target sample rate (None = native rate)
+            offset: Start offset in seconds
+            duration: Duration in seconds (None = until the end)
+
+        Returns:
+            Tuple of (float32 samples, sample rate). The array is read-only and
+            shared with other callers: copy it before modifying in place.
+
+        Raises:
+            Exception: Any error raised by the decoder (e.g. missing file)
+        """
+        try:
+            file_key = self._file_key(str(filepath))
+        except OSError:
+            # Pas de clé de version (fichier absent, chemin virtuel) : décodage
+            # direct sans cache, le décodeur remonte lui-même l'erreur éventuelle.
+            y, actual_sr = self._load_uncached(str(filepath), sr)
+        else:
+            y, actual_sr = self._get(file_key, sr)
+
+        if offset > 0 or duration is not None:
+            start = int(round(offset * actual_sr))
+            end = None if duration is None else start + int(round(duration * actual_sr))
+            y = y[start:end]
+        return y, actual_sr
+
+    def stream(
+        self, filepath: str | Path, sr: int, block_duration: float = 10.0
+    ) -> tuple[int, Iterator[np.ndarray]]:
+        """Decode a file once, front to back, in mono float32 blocks at ``sr``.
+
+        Args:
+            filepath: Path to audio file
+            sr: Target sample rate
+            block_duration: Approximate block length in seconds
+
+        Returns:
+            Tuple of (estimated total samples, block iterator). The estimate
+            comes from the file header; the blocks are the exact samples.
+
+        Raises:
+            Exception: Any error raised by the decoder (e.g. missing file)
+        """
+        block = max(int(block_duration * sr), 1)
+        if not self.contains(filepath, sr):
+            try:
+                import soundfile as sf
+
+                sound_file = sf.SoundFile(str(filepath))
+            except (ImportError, RuntimeError, TypeError) as e:
+                # Format non géré par libsndfile (m4a...) : décodage complet via le cache
+                logger.debug("[AudioCache] No streaming decoder for %s: %s", filepath, e)
+            else:
+                total = -(-sound_file.frames * sr // sound_file.samplerate)
+                return total, _stream_blocks(sound_file, sr, block)
+
+        y, _ = self.load(filepath, sr=sr)
+        return len(y), (y[start : start + block] for start in range(0, len(y), block))
+
+    def get_duration(self, filepath: str | Path) -> float:
+        """Return the duration in seconds of a cached (or newly decoded) file."""
+        y, sr = self.load(filepath)
+        return len(y) / sr if sr else 0.0
+
+    def contains(self, filepath: str | Path, sr: int | None = None) -> bool:
+        """Return True if the array is available in memory without decoding."""
+        try:
+            file_key = self._file_key(str(filepath))
+        except OSError:
+            return False
+        with self._lock:
+            native_sr = self._native_rates.get(file_key)
+            if sr is None or sr == native_sr:
+                return (file_key, NATIVE_SR) in self._entries
+            return (file_key, sr) in self._entries
+
+    def invalidate(self, filepath: str | Path) -> None:
+        """Drop every in-memory entry for a file (all versions, all sample rates)."""
+        path = os.path.realpath(str(filepath))
+        with self._lock:
+            for key in [k for k in self._entries if k[0][0] == path]:
+                self._memory_bytes -= self._entries.pop(key).nbytes
+            for file_key in [k for k in self._native_rates if k[0] == path]:
+                del self._native_rates[file_key]
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (the spill directory is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._native_rates.clear()
+            self._memory_bytes = 0
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _file_key(filepath: str) -> FileKey:
+        stat = os.stat(filepath)
+        return (os.path.realpath(filepath), stat.st_mtime_ns, stat.st_size)
+
+    def _load_uncached(self, filepath: str, sr: int | None) -> tuple[np.ndarray, int]:
+        y, native_sr = self._decode(filepath)
+        if sr is None or sr == native_sr:
+            return y, native_sr
+        return self._resample(y, native_sr, sr), sr
+
+    def _get(self, file_key: FileKey, sr: int | None) -> tuple[np.ndarray, int]:
+        """Return the array for (file, sr), decoding/resampling at most once."""
+        native = self._get_entry((file_key, NATIVE_SR), lambda: self._decode_native(file_key))
+        with self._lock:
+            native_sr = self._native_rates.get(file_key)
+        if native_sr is None:
+            # clear()/invalidate() entre-temps : traité comme un échec de cache
+            return self._load_uncached(file_key[0], sr)
+        if sr is None or sr == native_sr:
+            return native, native_sr
+
+        resampled = self._get_entry(
+            (file_key, sr), lambda: self._resample_from(native, native_sr, sr)
+        )
+        return resampled, sr
+
+    def _get_entry(self, key: EntryKey, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Look up memory, then in-flight work, then spill, then compute."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return cached
+
+            pending = self._in_flight.get(key)
+            owner = pending is None
+            if pending is None:
+                pending = _InFlight()
+                self._in_flight[key] = pending
+                self.stats.misses += 1
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            assert pending.result is not None
+            return pending.result
+
+        try:
+            result = self._read_spill(key)
+            if result is None:
+                result = compute()
+            result.setflags(write=False)
+            pending.result = result
+            with self._lock:
+                to_spill = self._store(key, result)
+            for spill_key, value, native_sr in to_spill:
+                self._write_spill(spill_key, value, native_sr)
+            return result
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            pending.done.set()
+
+    def _decode_native(self, file_key: FileKey) -> np.ndarray:
+        y, sr = self._decode(file_key[0])
+        with self._lock:
+            self.stats.decodes += 1
+            self._native_rates[file_key] = sr
+        return np.ascontiguousarray(y, dtype=np.float32)
+
+    def _resample_from(self, y: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+        with self._lock:
+            self.stats.resamples += 1
+        return np.ascontiguousarray(self._resample(y, orig_sr, target_sr), dtype=np.float32)
+
+    def _store(self, key: EntryKey, value: np.ndarray) -> list[tuple[EntryKey, np.ndarray, int]]:
+        """Insert an entry and evict LRU entries over budget (lock held).
+
+        Returns:
+            Entries to write to the spill directory once the lock is released,
+            as (key, samples, native sample rate) tuples
+        """
+        to_spill: list[tuple[EntryKey, np.ndarray, int]] = []
+        if value.nbytes > self.max_memory_bytes:
+            # Trop gros pour la mémoire : on le garde seulement sur disque.
+            to_spill.append((key, value, self._native_rates.get(key[0], 0)))
+            return to_spill
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.nbytes
+        self._entries[key] = value
+        self._memory_bytes += value.nbytes
+
+        while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+            self.stats.evictions += 1
+            to_spill.append((evicted_key, evicted, self._native_rates.get(evicted_key[0], 0)))
+        return to_spill
+
+    # ------------------------------------------------------------------
+    # On-disk spill
+    # ------------------------------------------------------------------
+
+    def _spill_path(self, key: EntryKey) -> Path | None:
+        if self.spill_directory is None:
+            return None
+        (path, mtime_ns, size), sr = key
+        digest = hashlib.sha1(f"{path}|{mtime_ns}|{size}".encode()).hexdigest()
+        return self.spill_directory / f"{digest}_{sr}.npy"
+
+    def _rate_path(self, key: EntryKey) -> Path | None:
+        spill_path = self._spill_path(key)
+        return spill_path.with_suffix(".sr") if spill_path is not None else None
+
+    def _write_spill(self, key: EntryKey, value: np.ndarray, native_sr: int) -> None:
+        """Persist an array to the spill directory (best effort)."""
+        spill_path = self._spill_path(key)
+        if spill_path is None or spill_path.exists():
+            return
+        try:
+            if self.spill_dtype == "int16":
+                stored = np.clip(value * _INT16_SCALE, -_INT16_SCALE, _INT16_SCALE).astype(np.int16)
+            else:
+                stored = value.astype(np.float16)
+            tmp_path = spill_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, stored, allow_pickle=False)
+            os.replace(tmp_path, spill_path)
+            if key[1] == NATIVE_SR:
+                rate_path = self._rate_path(key)
+                assert rate_path is not None
+                rate_path.write_text(str(native_sr))
+            with self._lock:
+                self.stats.spill_writes += 1
+            self._prune_spill()
+        except OSError as e:
+            logger.warning("[AudioCache] Spill write failed for %s: %s", key[0][0], e)
+
+    def _read_spill(self, key: EntryKey) -> np.ndarray | None:
+        """Load an array from the spill directory, or None if absent/unreadable."""
+        spill_path = self._spill_path(key)
+        if spill_path is None or not spill_path.exists():
+            return None
+        try:
+            if key[1] == NATIVE_SR:
+                rate_path = self._rate_path(key)
+                assert rate_path is not None
+                native_sr = int(rate_path.read_text())
+                with self._lock:
+                    self._native_rates[key[0]] = native_sr
+            stored: np.ndarray = np.load(spill_path, allow_pickle=False)
+        except (OSError, ValueError) as e:
+            logger.warning("[AudioCache] Ignoring unreadable spill file %s: %s", spill_path, e)
+            return None
+
+        with self._lock:
+            self.stats.spill_hits += 1
+        samples = stored.astype(np.float32)
+        if stored.dtype == np.int16:
+            samples /= _INT16_SCALE
+        return samples
+
+    def _prune_spill(self) -> None:
+        """Delete the oldest spill files when the directory exceeds its budget."""
+        if self.spill_directory is None or self.max_spill_bytes <= 0:
+            return
+        files = sorted(self.spill_directory.glob("*.npy"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.max_spill_bytes:
+                break
+            total -= path.stat().st_size
+            try:
+                path.unlink()
+                path.with_suffix(".sr").unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug("[AudioCache] Could not prune %s: %s", path, e)
+
+
+_cache: DecodedAudioCache | None = None
+_cache_lock = threading.Lock()
+
+
+def _stream_blocks(sound_file: Any, sr: int, block: int) -> Iterator[np.ndarray]:
+    """Mono blocks of an open SoundFile, resampled to ``sr`` (closes the file)."""
+    with sound_file:
+        resampler = None
+        if sound_file.samplerate != sr:
+            import soxr
+
+            # Même qualité que librosa.load (res_type="soxr_hq"), état conservé entre blocs
+            resampler = soxr.ResampleStream(sound_file.samplerate, sr, 1, dtype="float32")
+        native_block = max(block * sound_file.samplerate // sr, 1)
+        # Mixage mono par produit matriciel : mean(axis=1) sur des trames entrelacées est lent
+        weights = np.full(sound_file.channels, 1.0 / sound_file.channels, dtype=np.float32)
+        for frames in sound_file.blocks(native_block, dtype="float32", always_2d=True):
+            y = frames @ weights if frames.shape[1] > 1 else frames[:, 0]
+            if resampler is not None:
+                y = resampler.resample_chunk(y)
+            if len(y):
+                yield y
+        if resampler is not None:
+            tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+            if len(tail):
+                yield tail
+
+
+def get_audio_cache() -> DecodedAudioCache:
+    """Return the process-wide decoded-audio cache (created with defaults if needed)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DecodedAudioCache()
+        return _cache
+
+
+def configure_audio_cache(
+    max_memory_mb: int = DEFAULT_MAX_MEMORY_BYTES // (1024 * 1024),
+    spill_directory: str | Path | None = None,
+    spill_dtype: str = "int16",
+    max_spill_mb: int = 0,
+) -> DecodedAudioCache:
+    """Replace the process-wide cache with a configured instance.
+
+    Should be called once at startup before any audio is decoded.
+
+    Args:
+        max_memory_mb: In-memory budget in MiB
+        spill_directory: Spill directory (None or "" = no spill)
+        spill_dtype: "int16" or "float16"
+        max_spill_mb: Spill directory budget in MiB (0 = unbounded)
+
+    Returns:
+        The new cache instance
+    """
+    global _cache
+    directory = Path(spill_directory).expanduser() if spill_directory else None
+    cache = DecodedAudioCache(
+        max_memory_bytes=max_memory_mb * 1024 * 1024,
+        spill_directory=directory,
+        spill_dtype=spill_dtype,
+        max_spill_bytes=max_spill_mb * 1024 * 1024,
+    )
+    with _cache_lock:
+        _cache = cache
+    return cache
+
+
+def load_audio(
+    filepath: str | Path,
+    sr: int | None = None,
+    offset: float = 0.0,
+    duration: float | None = None,
+) -> tuple[np.ndarray, int]:
+    """Shortcut for ``get_audio_cache().load(...)``."""
+    return get_audio_cache().load(filepath, sr=sr, offset=offset, duration=duration)
+
+
+def stream_audio(
+    filepath: str | Path, sr: int, block_duration: float = 10.0
+) -> tuple[int, Iterator[np.ndarray]]:
+    """Shortcut for ``get_audio_cache().stream(...)``."""
+    return get_audio_cache().stream(filepath, sr=sr, block_duration=block_duration)
@@ -114,13 +114,17 @@ class BatchProcessingHelper:
         self,
         items: list[tuple[int, str]],
         needs_processing_fn: Callable[[int, str], bool],
-        worker_factory: Callable[[tuple[int, str]], QThread],
+        worker_factory: Callable[[tuple[int, str]], QThread] | None,
         on_complete: Callable[[tuple[int, str], Any], None],
         on_error: Callable[[tuple[int, str], str], None],
         *,
         no_work_message: str | None = None,
         success_status_color: str = StatusColors.SUCCESS,
         log_status: bool = True,
+        max_concurrency: int = 1,
+        process_function: Callable[[tuple[int, str]], Any] | None = None,
+        process_initializer: Callable[..., None] | None = None,
+        process_initargs: tuple[Any, ...] = (),
     ) -> BatchProcessor | None:
         """Start batch processing.
 
@@ -133,6 +137,11 @@ class BatchProcessingHelper:
             no_work_message: Message to show when all items already processed
             success_status_color: Color for status message when all done
             log_status: Whether to log detailed status for each item
+            max_concurrency: Number of items processed at the same time
+            process_function: Picklable function run in a process pool instead
+                of worker threads (see BatchProcessor)
+            process_initializer: Optional initializer for the pool processes
+            process_initargs: Arguments for process_initializer
 
         Returns:
             BatchProcessor instance if started, None if no work to do
@@ -167,6 +176,12 @@ class BatchProcessingHelper:
             name=self.name,
             worker_factory=worker_factory,
             context=self.context,
+            max_concurrency=max_concurrency,
+            process_function=process_function,
+            process_initializer=process_initializer,
+            process_initargs=process_initargs,
+            # Items are (track_id, filepath) tuples: track_id identifies them
+            key_fn=lambda item: item[0],
         )
 
         # Store reference
@@ -188,7 +203,7 @@ def start_batch_processing(
     context: Any,
     items: list[tuple[int, str]],
     needs_processing_fn: Callable[[int, str], bool],
-    worker_factory: Callable[[tuple[int, str]], QThread],
+    worker_factory: Callable[[tuple[int, str]], QThread] | None,
     on_complete: Callable[[tuple[int, str], Any], None],
     on_error: Callable[[tuple[int, str], str], None],
     *,
@@ -196,6 +211,10 @@ def start_batch_processing(
     no_work_message: str | None = None,
     success_status_color: str = StatusColors.SUCCESS,
     log_status: bool = True,
+    max_concurrency: int = 1,
+    process_function: Callable[[tuple[int, str]], Any] | None = None,
+    process_initializer: Callable[..., None] | None = None,
+    process_initargs: tuple[Any, ...] = (),
 ) -> BatchProcessor | None:
     """Convenience function to start batch processing.
 
@@ -215,6 +234,10 @@ def start_batch_processing(
         no_work_message: Message when all items already processed
         success_status_color: Color for completion status message
         log_status: Whether to log detailed status for each item
+        max_concurrency: Number of items processed at the same time
+        process_function: Picklable function run in a process pool instead of threads
+        process_initializer: Optional initializer for the pool processes
+        process_initargs: Arguments for process_initializer
 
     Returns:
         BatchProcessor instance if started, None if no work to do
@@ -234,4 +257,8 @@ def start_batch_processing(
         no_work_message=no_work_message,
         success_status_color=success_status_color,
         log_status=log_status,
+        max_concurrency=max_concurrency,
+        process_function=process_function,
+        process_initializer=process_initializer,
+        process_initargs=process_initargs,
     )
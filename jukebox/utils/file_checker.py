@@ -0,0 +1,412 @@
+"""Asynchronous file existence/size/mtime probes for the track list.
+
+Standalone module (no PySide6): the Qt side drives ``FileCheckService.check``
+from a worker thread and applies the yielded batches on the UI thread.
+
+A ``stat`` on an unreachable network mount can block for tens of seconds, so
+probes never run on the caller's thread:
+
+- a bounded pool of daemon threads runs the probes, in small chunks of files
+  from the same mount;
+- at most ``per_mount_limit`` chunks are in flight per mount (a slow NAS does
+  not take every worker, other disks keep being checked);
+- a chunk whose current probe has not returned after ``timeout`` seconds
+  (the deadline starts when each probe of the chunk starts: time spent queued
+  behind other chunks does not count, and a slow but responsive mount is not
+  mistaken for a stalled one) is reported as unknown and its mount is
+  considered stalled: its remaining files are reported unknown without
+  probing until the stuck probe returns (a blocked ``stat`` cannot be
+  cancelled, the pool grows to replace the stuck thread);
+- the chunks of a stopped check are dropped by the workers instead of probed;
+- known results are cached for ``ttl`` seconds, unknown ones are not cached.
+
+Mounts are derived from the path string only (``/proc/self/mounts`` on Linux,
+``/Volumes/<name>`` on macOS, drive/UNC share on Windows): finding the mount
+of a path must not touch the file system.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import PurePath
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_MOUNT_LIMIT = 4
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_TTL = 300.0
+
+PROBE_CHUNK = 64
+"""Files probed by one task (same mount)."""
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+FLUSH_INTERVAL = 0.1
+"""Pending results are yielded at least this often (seconds), even below batch_size."""
+
+
+@dataclass(frozen=True, slots=True)
+class FileStatus:
+    """Result of one probe.
+
+    ``exists`` is None when the file could not be checked (timeout, stalled
+    mount, permission error): callers should keep their previous state.
+    """
+
+    exists: bool | None
+    size: int | None = None
+    mtime_ns: int | None = None
+
+    @property
+    def missing(self) -> bool:
+        return self.exists is False
+
+    @property
+    def unknown(self) -> bool:
+        return self.exists is None
+
+
+MISSING = FileStatus(False)
+UNKNOWN = FileStatus(None)
+
+CheckItem = tuple[int | None, str]
+"""(track id, filepath) — the only data the service receives."""
+
+CheckResult = tuple[int | None, str, FileStatus]
+
+Probe = Callable[[str], FileStatus]
+
+
+def probe_file(filepath: str) -> FileStatus:
+    """Stat one file (existence, size, mtime)."""
+    try:
+        st = os.stat(filepath)
+    except (FileNotFoundError, NotADirectoryError):
+        return MISSING
+    except (OSError, ValueError) as e:
+        logger.debug("[FileCheck] Could not stat %s: %s", filepath, e)
+        return UNKNOWN
+    return FileStatus(True, st.st_size, st.st_mtime_ns)
+
+
+def _read_mount_points() -> list[str]:
+    """Mount points from /proc/self/mounts, longest first (empty if unavailable)."""
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as f:
+            # Espaces, tabulations... des points de montage encodés en octal (\040)
+            points = {
+                _OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), line.split()[1])
+                for line in f
+                if line.strip()
+            }
+    except (OSError, IndexError, UnicodeDecodeError):
+        return []
+    return sorted(points, key=len, reverse=True)
+
+
+def mount_key(filepath: str, mount_points: list[str]) -> str:
+    """Mount a path belongs to, from its string only.
+
+    Args:
+        filepath: Absolute path
+        mount_points: Known mount points, longest first
+    """
+    for point in mount_points:
+        if filepath == point or filepath.startswith(point.rstrip("/") + "/"):
+            return point
+    parts = PurePath(filepath).parts
+    if len(parts) > 2 and parts[1] == "Volumes":
+        return "/Volumes/" + parts[2]
+    return PurePath(filepath).anchor
+
+
+class FileCheckService:
+    """Bounded, mount-aware file prober with a TTL cache (thread-safe)."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        per_mount_limit: int = DEFAULT_PER_MOUNT_LIMIT,
+        timeout: float = DEFAULT_TIMEOUT,
+        ttl: float = DEFAULT_TTL,
+        probe: Probe = probe_file,
+        clock: Callable[[], float] = time.monotonic,
+        mount_points: list[str] | None = None,
+    ) -> None:
+        """Initialize the service (threads are started on first use).
+
+        Args:
+            max_workers: Probe threads (not counting threads stuck on a stalled mount)
+            per_mount_limit: Chunks in flight per mount
+            timeout: Seconds a single probe may take before its chunk is reported unknown
+            ttl: Seconds a known result stays cached
+            probe: Function probing one file
+            clock: Monotonic clock (injectable for tests)
+            mount_points: Known mount points (read from the system if None)
+        """
+        self.max_workers = max(1, max_workers)
+        self.per_mount_limit = max(1, per_mount_limit)
+        self.timeout = timeout
+        self.ttl = ttl
+        self._probe = probe
+        self._clock = clock
+        self._mount_points = sorted(
+            _read_mount_points() if mount_points is None else mount_points,
+            key=len,
+            reverse=True,
+        )
+
+        self._lock = threading.Lock()
+        self._cache: dict[str, tuple[FileStatus, float]] = {}
+        self._tasks: queue.SimpleQueue = queue.SimpleQueue()
+        self._threads = 0
+        self._tokens = itertools.count()
+        # Tâches expirées dont le stat est toujours bloqué : token -> mount
+        self._stuck: dict[int, str] = {}
+        # Tâches commencées : token -> début du probe en cours (échéance par probe)
+        self._progress: dict[int, float] = {}
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def cached(self, filepath: str) -> FileStatus | None:
+        """Cached status of a file, None if absent or expired."""
+        with self._lock:
+            return self._fresh(filepath, self._clock())
+
+    def invalidate(self, filepath: str | None = None) -> None:
+        """Forget the cached status of one file (or of every file)."""
+        with self._lock:
+            if filepath is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(filepath, None)
+
+    def _fresh(self, filepath: str, now: float) -> FileStatus | None:
+        entry = self._cache.get(filepath)
+        if entry is None or now - entry[1] > self.ttl:
+            return None
+        return entry[0]
+
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+
+    def is_stalled(self, mount: str) -> bool:
+        """True while a timed-out probe of this mount is still blocked."""
+        with self._lock:
+            return mount in self._stuck.values()
+
+    def check(
+        self,
+        items: Iterable[CheckItem],
+        batch_size: int = 500,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> Iterator[list[CheckResult]]:
+        """Probe files and yield results in batches as they complete.
+
+        Cached results come first; the others are yielded in completion order,
+        at most ``batch_size`` at a time and at least every FLUSH_INTERVAL.
+
+        Args:
+            items: (track id, filepath) tuples
+            batch_size: Maximum results per yielded batch
+            should_stop: Polled between batches; the check ends when it returns True
+        """
+        batch: list[CheckResult] = []
+        pending: dict[str, deque[list[CheckItem]]] = {}
+        with self._lock:
+            now = self._clock()
+            for track_id, filepath in items:
+                status = self._fresh(filepath, now)
+                if status is not None:
+                    batch.append((track_id, filepath, status))
+                    continue
+                chunks = pending.setdefault(mount_key(filepath, self._mount_points), deque())
+                if not chunks or len(chunks[-1]) >= PROBE_CHUNK:
+                    chunks.append([])
+                chunks[-1].append((track_id, filepath))
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+
+        results: queue.SimpleQueue = queue.SimpleQueue()
+        # Levé à l'arrêt : les workers abandonnent les chunks de ce check
+        stopped = threading.Event()
+        # token -> (chunk, mount)
+        in_flight: dict[int, tuple[list[CheckItem], str]] = {}
+        per_mount: Counter[str] = Counter()
+        last_flush = self._clock()
+
+        while pending or in_flight:
+            if should_stop is not None and should_stop():
+                stopped.set()
+                with self._lock:
+                    for token in in_flight:
+                        self._progress.pop(token, None)
+                return
+
+            # Soumission : fenêtre = max_workers chunks, per_mount_limit par montage
+            for mount in list(pending):
+                chunks = pending[mount]
+                if self.is_stalled(mount):
+                    for chunk in chunks:
+                        batch.extend((track_id, fp, UNKNOWN) for track_id, fp in chunk)
+                    del pending[mount]
+                    continue
+                while (
+                    chunks
+                    and per_mount[mount] < self.per_mount_limit
+                    and len(in_flight) < self.max_workers
+                ):
+                    chunk = chunks.popleft()
+                    token = next(self._tokens)
+                    in_flight[token] = (chunk, mount)
+                    per_mount[mount] += 1
+                    self._submit(token, [fp for _, fp in chunk], results, stopped)
+                if not chunks:
+                    del pending[mount]
+
+            # Collecte : attendre le premier résultat ou la prochaine échéance
+            if in_flight:
+                with self._lock:
+                    # Chunk encore en file (pas de probe commencé) : pas d'échéance
+                    deadlines = [
+                        self._progress[token] + self.timeout
+                        for token in in_flight
+                        if token in self._progress
+                    ]
+                wait = min(deadlines, default=self._clock() + FLUSH_INTERVAL) - self._clock()
+                wait = min(max(wait, 0.0), FLUSH_INTERVAL)
+                try:
+                    done = [results.get(timeout=wait)]
+                except queue.Empty:
+                    done = []
+                while True:
+                    try:
+                        done.append(results.get_nowait())
+                    except queue.Empty:
+                        break
+                now = self._clock()
+                with self._lock:
+                    for token, statuses in done:
+                        self._progress.pop(token, None)
+                        entry = in_flight.pop(token, None)
+                        if entry is None:
+                            continue
+                        chunk, mount = entry
+                        per_mount[mount] -= 1
+                        for (track_id, fp), status in zip(chunk, statuses, strict=True):
+                            if not status.unknown:
+                                self._cache[fp] = (status, now)
+                            batch.append((track_id, fp, status))
+                    for token, (chunk, mount) in list(in_flight.items()):
+                        # Échéance relue : un probe a pu se terminer entre-temps
+                        started = self._progress.get(token)
+                        if started is not None and started + self.timeout <= now:
+                            del in_flight[token]
+                            self._progress.pop(token, None)
+                            per_mount[mount] -= 1
+                            self._stuck[token] = mount
+                            batch.extend((track_id, fp, UNKNOWN) for track_id, fp in chunk)
+                            logger.warning("[FileCheck] Mount %s not responding", mount)
+                self._ensure_threads()
+
+            while len(batch) >= batch_size:
+                yield batch[:batch_size]
+                batch = batch[batch_size:]
+                last_flush = self._clock()
+            if batch and self._clock() - last_flush >= FLUSH_INTERVAL:
+                yield batch
+                batch = []
+                last_flush = self._clock()
+
+        if batch:
+            yield batch
+
+    # ------------------------------------------------------------------
+    # Worker pool
+    # ------------------------------------------------------------------
+
+    def _submit(
+        self,
+        token: int,
+        filepaths: list[str],
+        results: queue.SimpleQueue,
+        stopped: threading.Event,
+    ) -> None:
+        self._ensure_threads()
+        self._tasks.put((token, filepaths, results, stopped))
+
+    def _ensure_threads(self) -> None:
+        """Keep max_workers free threads, plus one per probe stuck on a stalled mount."""
+        with self._lock:
+            target = min(self.max_workers + len(self._stuck), 4 * self.max_workers)
+            while self._threads < target:
+                self._threads += 1
+                # Daemon : un stat bloqué sur un montage réseau ne doit pas bloquer la sortie
+                threading.Thread(target=self._worker, name="FileCheck", daemon=True).start()
+
+    def _worker(self) -> None:
+        while True:
+            token, filepaths, results, stopped = self._tasks.get()
+            try:
+                statuses = []
+                for fp in filepaths:
+                    with self._lock:
+                        # Check arrêté : reste du chunk abandonné, personne n'attend le résultat
+                        if stopped.is_set():
+                            break
+                        if token not in self._stuck:
+                            self._progress[token] = self._clock()
+                    statuses.append(self._probe(fp))
+            except Exception as e:  # un probe défaillant ne doit pas tuer le pool
+                logger.debug("[FileCheck] Probe failed: %s", e)
+                statuses = [UNKNOWN] * len(filepaths)
+            with self._lock:
+                self._stuck.pop(token, None)
+            if not stopped.is_set():
+                results.put((token, statuses))
+
+
+_service: FileCheckService | None = None
+_service_lock = threading.Lock()
+
+
+def get_file_check_service() -> FileCheckService:
+    """Return the process-wide file check service (created with defaults if needed)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = FileCheckService()
+        return _service
+
+
+def configure_file_check_service(
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_mount_limit: int = DEFAULT_PER_MOUNT_LIMIT,
+    timeout: float = DEFAULT_TIMEOUT,
+    ttl: float = DEFAULT_TTL,
+) -> FileCheckService:
+    """Replace the process-wide service with a configured instance.
+
+    Should be called once at startup, before the track list is loaded.
+    """
+    global _service
+    service = FileCheckService(
+        max_workers=max_workers, per_mount_limit=per_mount_limit, timeout=timeout, ttl=ttl
+    )
+    with _service_lock:
+        _service = service
+    return service
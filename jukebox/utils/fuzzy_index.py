@@ -0,0 +1,413 @@
+"""Fuzzy string index: character n-gram MinHash/LSH with exact verification.
+
+Finds the indexed string most similar to a query according to
+``difflib.SequenceMatcher.ratio()``, without comparing the query with every
+indexed string:
+
+  1. Candidates: strings sharing at least one LSH band with the query's MinHash
+     signature (character n-grams, multiply-shift hashing, vectorized with numpy).
+  2. Vectorized upper bounds of ``ratio() = 2*M/T`` (M = characters in matching
+     blocks), computed for all candidates at once with numpy:
+       - character counts (``SequenceMatcher.quick_ratio()``), then
+       - the longest common subsequence length (bit-parallel, Hyyrö 2004): the
+         matching blocks form a common subsequence, so M <= LCS.
+     Candidates that cannot reach the threshold are dropped, the others are
+     ordered best-first.
+  3. Exact verification: ``SequenceMatcher.ratio()`` on the remaining candidates,
+     stopping as soon as the bound of the next candidate cannot beat the best ratio.
+
+Steps 2 and 3 keep the SequenceMatcher threshold semantics exactly; step 1 is
+probabilistic (see DEFAULT_BANDS for the recall of the default banding).
+
+Storage is an LSM-style layout: a sorted numpy table of bucket keys covers the
+bulk of the index, recent additions go to a small dict of buckets, and removals
+only zero the slot length. The table is rebuilt (one argsort) once the
+additions or removals exceed a fraction of the index, so ``add`` / ``remove``
+stay cheap and a full rebuild of 80k strings takes well under a second.
+
+Not thread-safe: callers serialize access (see DuplicateChecker).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+from difflib import SequenceMatcher
+
+import numpy as np
+
+DEFAULT_NGRAM = 3
+"""Character n-gram size of the MinHash shingles."""
+
+DEFAULT_BANDS = 32
+DEFAULT_ROWS = 2
+"""LSH banding: a pair with n-gram Jaccard similarity J becomes a candidate with
+probability 1 - (1 - J**ROWS)**BANDS (J=0.3: 95%, J=0.4: 99.5%, J=0.5: >99.9%)."""
+
+CHAR_BINS = 64
+"""Number of character-count bins of the quick_ratio upper bound."""
+
+
+def _char_bin_table() -> np.ndarray:
+    """Code point (mod 256) → bin: one bin per character of normalized filenames."""
+    table = 37 + np.arange(256) % (CHAR_BINS - 37)
+    table[ord("a") : ord("z") + 1] = np.arange(26)
+    table[ord("0") : ord("9") + 1] = np.arange(26, 36)
+    table[ord(" ")] = 36
+    return table
+
+
+_CHAR_BIN = _char_bin_table()
+
+LCS_WIDTH = 64
+"""Maximum indexed text length (characters) for the bit-parallel LCS bound."""
+
+_BAND_MIX = np.uint64(0x9E3779B97F4A7C15)
+"""Odd 64-bit constant mixing the rows of a band into one bucket key."""
+
+_HASH_CHUNK = 1024
+"""Strings hashed per numpy batch (bounds the (num_perm × shingles) temporary)."""
+
+_MIN_DELTA = 1024
+"""Recent additions kept out of the sorted table before it is rebuilt."""
+
+
+class FuzzyIndex:
+    """Incremental MinHash/LSH index returning the best SequenceMatcher match."""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        *,
+        ngram: int = DEFAULT_NGRAM,
+        bands: int = DEFAULT_BANDS,
+        rows: int = DEFAULT_ROWS,
+        seed: int = 1,
+    ) -> None:
+        """Initialize an empty index.
+
+        Args:
+            threshold: Minimum SequenceMatcher ratio of a match
+            ngram: Character n-gram size of the MinHash shingles (1-8 bytes)
+            bands: Number of LSH bands
+            rows: MinHash values per band (bands × rows permutations)
+            seed: Seed of the hash permutations
+        """
+        self.threshold = threshold
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = rows
+
+        rng = np.random.default_rng(seed)
+        num_perm = bands * rows
+        # Multiply-shift hashing: h(x) = (a*x + b) >> 32 (mod 2^64), a odd
+        self._a = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self._band_salt = rng.integers(0, 2**63, size=bands, dtype=np.uint64)
+
+        self.clear()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index ``text`` under ``key`` (replaces a previous text for the key)."""
+        self.add_many([(key, text)])
+
+    def add_many(self, items: Iterable[tuple[Hashable, str]]) -> None:
+        """Index several ``(key, text)`` pairs, hashing them in numpy batches."""
+        batch: list[tuple[Hashable, str]] = []
+        for key, text in items:
+            self._discard(key)
+            if text:
+                batch.append((key, text))
+            if len(batch) >= _HASH_CHUNK:
+                self._append(batch)
+                batch = []
+        if batch:
+            self._append(batch)
+        self._maybe_compact()
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove a key from the index.
+
+        Returns:
+            True if the key was indexed
+        """
+        removed = self._discard(key)
+        if removed:
+            self._maybe_compact()
+        return removed
+
+    def clear(self) -> None:
+        """Remove every key."""
+        self._slot_of: dict[Hashable, int] = {}
+        self._keys: list[Hashable | None] = []
+        self._texts: list[str] = []
+        self._dead = 0
+        capacity = 64
+        self._lengths = np.zeros(capacity, dtype=np.int32)
+        self._char_counts = np.zeros((capacity, CHAR_BINS), dtype=np.uint16)
+        self._char_codes = np.zeros((capacity, LCS_WIDTH), dtype=np.uint8)
+        self._band_keys = np.zeros((capacity, self.bands), dtype=np.uint64)
+        # Sorted table (slots < _table_end) + recent additions (slots >= _table_end)
+        self._table_keys = np.empty(0, dtype=np.uint64)
+        self._table_slots = np.empty(0, dtype=np.int64)
+        self._table_end = 0
+        self._delta_buckets: dict[int, list[int]] = {}
+
+    def best_match(self, text: str) -> tuple[Hashable, float] | None:
+        """Return ``(key, ratio)`` of the most similar indexed text, if any.
+
+        Only texts whose ``SequenceMatcher(None, text, other).ratio()`` reaches
+        the threshold are returned.
+        """
+        if not text or not self._slot_of:
+            return None
+
+        candidates = self._candidates(text)
+
+        # Borne 0 : longueurs (real_quick_ratio) ; élimine aussi les slots morts (longueur 0)
+        lengths = self._lengths[candidates]
+        keep = 2.0 * np.minimum(lengths, len(text)) >= self.threshold * (lengths + len(text))
+        candidates = candidates[keep]
+
+        # Borne 1 : quick_ratio sur histogrammes de caractères (regrouper des
+        # caractères dans un même bin ne peut qu'augmenter le minimum)
+        query_counts, _ = self._char_profiles([text])
+        common = np.minimum(self._char_counts[candidates], query_counts[0]).sum(axis=1)
+        total = self._lengths[candidates] + len(text)
+        candidates = np.unique(candidates[2.0 * common >= self.threshold * total])
+        if candidates.size == 0:
+            return None
+        total = self._lengths[candidates] + len(text)
+        common = np.zeros(candidates.size, dtype=np.int64)
+        long_texts = self._lengths[candidates] > LCS_WIDTH
+        if long_texts.any():
+            counts = self._char_counts[candidates[long_texts]]
+            common[long_texts] = np.minimum(counts, query_counts[0]).sum(axis=1)
+
+        # Borne 2 : LCS (plus serrée) pour les textes indexés d'au plus LCS_WIDTH caractères
+        common[~long_texts] = self._lcs_lengths(text, candidates[~long_texts])
+        bounds = 2.0 * common / total
+        keep = bounds >= self.threshold
+        candidates, bounds = candidates[keep], bounds[keep]
+        order = np.argsort(-bounds, kind="stable")
+
+        best_ratio = 0.0
+        best_slot = -1
+        matcher = SequenceMatcher(None, a=text)
+        for slot, bound in zip(candidates[order].tolist(), bounds[order].tolist(), strict=True):
+            if bound <= best_ratio:
+                break
+            matcher.set_seq2(self._texts[slot])
+            ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best_ratio, best_slot = ratio, slot
+
+        if best_slot < 0 or best_ratio < self.threshold:
+            return None
+        return self._keys[best_slot], best_ratio
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slot_of
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    # ------------------------------------------------------------------
+    # Private — hashing
+    # ------------------------------------------------------------------
+
+    def _band_keys_for(self, texts: list[str]) -> np.ndarray:
+        """Compute the LSH bucket keys (len(texts) × bands) of non-empty texts."""
+        n = self.ngram
+        encoded = [text.encode("utf-8") for text in texts]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+
+        # Textes séparés par n-1 octets nuls : un texte plus court que n donne un
+        # seul n-gramme complété par des zéros, sans déborder sur le suivant
+        buffer = np.frombuffer((b"\0" * (n - 1)).join(encoded) + b"\0" * n, dtype=np.uint8)
+        buffer = buffer.astype(np.uint64)
+        starts = np.concatenate(([0], np.cumsum(lengths + n - 1)[:-1]))
+        counts = np.maximum(lengths - n + 1, 1)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        positions = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+        shingles = np.zeros(len(positions), dtype=np.uint64)
+        for i in range(n):
+            shingles = (shingles << np.uint64(8)) | buffer[positions + i]
+
+        # (num_perm, n_shingles) puis minimum par texte → signatures (n_texts, num_perm)
+        hashed = np.multiply.outer(self._a, shingles)
+        hashed += self._b[:, None]
+        hashed >>= np.uint64(32)
+        signatures = np.minimum.reduceat(hashed, offsets, axis=1).T
+
+        rows = signatures.reshape(len(texts), self.bands, self.rows)
+        keys = np.broadcast_to(self._band_salt, (len(texts), self.bands)).copy()
+        for r in range(self.rows):
+            keys = (keys ^ rows[:, :, r]) * _BAND_MIX
+        return keys
+
+    @staticmethod
+    def _char_profiles(texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Character data of texts for the vectorized bounds.
+
+        Returns:
+            (counts, codes): character counts binned with _CHAR_BIN
+            (len(texts) × CHAR_BINS, uint16) and the first LCS_WIDTH code points
+            modulo 256 (len(texts) × LCS_WIDTH, uint8, zero-padded). Folding code
+            points can only merge characters, which keeps both bounds valid.
+        """
+        n_texts = len(texts)
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=n_texts)
+        codepoints = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+        text_ids = np.repeat(np.arange(n_texts), lengths)
+
+        bins = text_ids * CHAR_BINS + _CHAR_BIN[codepoints % 256]
+        counts = np.bincount(bins, minlength=n_texts * CHAR_BINS)
+        counts = np.minimum(counts, np.iinfo(np.uint16).max).astype(np.uint16)
+
+        positions = np.arange(len(codepoints)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        in_width = positions < LCS_WIDTH
+        codes = np.zeros((n_texts, LCS_WIDTH), dtype=np.uint8)
+        codes[text_ids[in_width], positions[in_width]] = codepoints[in_width] % 256
+        return counts.reshape(n_texts, CHAR_BINS), codes
+
+    def _lcs_lengths(self, text: str, slots: np.ndarray) -> np.ndarray:
+        """LCS length between ``text`` and the (<= LCS_WIDTH chars) texts of slots.
+
+        Bit-parallel algorithm (Allison-Dix / Hyyrö), one uint64 per candidate:
+        for each query character c, V = (V + (V & M_c)) | (V & ~M_c) where M_c has
+        the bits of the candidate positions holding c; LCS = zero bits of V.
+        """
+        if slots.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        query = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32) % 256
+        alphabet, query_index = np.unique(query, return_inverse=True)
+
+        # Masques de positions (n_slots × len(alphabet)) : un bit par position du candidat
+        matches = self._char_codes[slots][:, None, :] == alphabet[None, :, None]
+        packed = np.packbits(matches, axis=2, bitorder="little")
+        masks = packed.view("<u8")[:, :, 0].astype(np.uint64)
+        # Les positions de padding (au-delà de la longueur) ne doivent rien matcher
+        width = self._lengths[slots].astype(np.uint64)
+        valid = np.where(width >= LCS_WIDTH, ~np.uint64(0), (np.uint64(1) << width) - np.uint64(1))
+        masks &= valid[:, None]
+
+        v = np.full(slots.size, ~np.uint64(0), dtype=np.uint64)
+        for j in query_index.tolist():
+            m = masks[:, j]
+            u = v & m
+            v = (v + u) | (v & ~m)
+        zeros = np.unpackbits((~v & valid).view(np.uint8).reshape(-1, 8), axis=1)
+        lengths: np.ndarray = zeros.sum(axis=1, dtype=np.int64)
+        return lengths
+
+    # ------------------------------------------------------------------
+    # Private — storage
+    # ------------------------------------------------------------------
+
+    def _append(self, batch: list[tuple[Hashable, str]]) -> None:
+        """Store a batch of new (key, non-empty text) pairs as recent additions."""
+        texts = [text for _, text in batch]
+        first = len(self._keys)
+        last = first + len(batch)
+        self._reserve(last)
+
+        self._lengths[first:last] = [len(text) for text in texts]
+        self._char_counts[first:last], self._char_codes[first:last] = self._char_profiles(texts)
+        self._band_keys[first:last] = self._band_keys_for(texts)
+        for slot, (key, text) in enumerate(batch, start=first):
+            self._slot_of[key] = slot
+            self._keys.append(key)
+            self._texts.append(text)
+
+        # Petites insertions : buckets en dict ; au-delà de _MIN_DELTA, _maybe_compact
+        # reconstruit la table triée juste après
+        if last - self._table_end <= _MIN_DELTA:
+            for slot in range(first, last):
+                for bucket_key in self._band_keys[slot].tolist():
+                    self._delta_buckets.setdefault(bucket_key, []).append(slot)
+
+    def _discard(self, key: Hashable) -> bool:
+        """Mark a key's slot as dead (its table entries are filtered at query time)."""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        self._lengths[slot] = 0  # dead slot: filtered by the length bound
+        self._keys[slot] = None
+        self._texts[slot] = ""
+        self._dead += 1
+        return True
+
+    def _reserve(self, size: int) -> None:
+        """Grow the per-slot arrays to hold at least ``size`` slots."""
+        capacity = len(self._lengths)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        grow = capacity - len(self._lengths)
+        self._lengths = np.concatenate((self._lengths, np.zeros(grow, dtype=np.int32)))
+        self._char_counts = np.concatenate(
+            (self._char_counts, np.zeros((grow, CHAR_BINS), dtype=np.uint16))
+        )
+        self._char_codes = np.concatenate(
+            (self._char_codes, np.zeros((grow, LCS_WIDTH), dtype=np.uint8))
+        )
+        self._band_keys = np.concatenate(
+            (self._band_keys, np.zeros((grow, self.bands), dtype=np.uint64))
+        )
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the sorted table when recent additions or dead slots pile up."""
+        size = len(self._keys)
+        if size - self._table_end > _MIN_DELTA or self._dead > max(_MIN_DELTA, size // 4):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop dead slots and rebuild the sorted bucket table over every slot."""
+        live = np.flatnonzero(self._lengths[: len(self._keys)])
+        self._keys = [self._keys[slot] for slot in live.tolist()]
+        self._texts = [self._texts[slot] for slot in live.tolist()]
+        self._slot_of = {key: slot for slot, key in enumerate(self._keys)}
+        self._lengths = self._lengths[live]
+        self._char_counts = self._char_counts[live]
+        self._char_codes = self._char_codes[live]
+        self._band_keys = self._band_keys[live]
+        self._dead = 0
+
+        flat_keys = self._band_keys.ravel()
+        order = np.argsort(flat_keys)
+        self._table_keys = flat_keys[order]
+        self._table_slots = order // self.bands
+        self._table_end = len(self._keys)
+        self._delta_buckets = {}
+
+    def _candidates(self, text: str) -> np.ndarray:
+        """Slots sharing at least one LSH bucket with the text.
+
+        May contain duplicates and dead slots (length 0): filtering the bounds
+        first and deduplicating the survivors is cheaper on large buckets.
+        """
+        query_keys = self._band_keys_for([text])[0]
+        parts: list[np.ndarray | list[int]] = []
+
+        lo = np.searchsorted(self._table_keys, query_keys, side="left")
+        hi = np.searchsorted(self._table_keys, query_keys, side="right")
+        for start, stop in zip(lo.tolist(), hi.tolist(), strict=True):
+            if stop > start:
+                parts.append(self._table_slots[start:stop])
+
+        delta = self._delta_buckets
+        for bucket_key in query_keys.tolist():
+            bucket = delta.get(bucket_key)
+            if bucket:
+                parts.append(bucket)
+
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        slots: np.ndarray = np.concatenate(parts).astype(np.int64, copy=False)
+        return slots
@@ -1,40 +1,243 @@
 """Waveform serialization using numpy (format sûr, sans pickle).
 
 pickle peut exécuter du code arbitraire à la désérialisation — interdit
-pour des données provenant de la base SQLite. On utilise uniquement
-numpy.savez_compressed / numpy.load(allow_pickle=False).
+pour des données provenant de la base SQLite. Deux formats sont lus :
+
+- **pyramid** (écrit par serialize_waveform) : format binaire versionné, en-tête
+  fixe puis, pour chaque niveau de zoom, le min/max uint8 de chaque bande
+  (pyramide mip, facteur 2 entre niveaux). Un lecteur accède directement au
+  niveau et à la plage voulus (vues numpy sans copie, rien à décompresser).
+- **npz** (ancien format) : numpy.savez_compressed des arrays float complets,
+  lu avec numpy.load(allow_pickle=False) et converti par upgrade_waveform().
+
+Layout (little-endian)::
+
+    header   magic "JKWF", version u16, band mask u8, factor u8, length u32,
+             level count u16, reserved u16, scale f32 × 3, padding → 32 bytes
+    levels   level count × (offset u32, length u32)
+    data     level 0: length × present bands uint8 (full resolution, min = max)
+             level i ≥ 1: length × present bands × (min, max) uint8
+
+Values are non-negative envelopes: band i is quantized as
+``round(value / scale_i * 255)`` and read back as ``q * scale_i / 255``.
 """
 
+from __future__ import annotations
+
 import io
+import struct
 from typing import Any
 
 import numpy as np
 
+BANDS = ("bass", "mid", "treble")
+
+WAVEFORM_MAGIC = b"JKWF"
+WAVEFORM_FORMAT_VERSION = 1
+
+PYRAMID_FACTOR = 2
+"""Length ratio between two consecutive levels."""
+
+MIN_LEVEL_LENGTH = 64
+"""No level is built below this length (the coarsest level is the last one above it)."""
+
+_HEADER = struct.Struct("<4sHBBIHH3f4x")
+_LEVEL = struct.Struct("<II")
+_MAX_LEVELS = 32
+_NPZ_MAGIC = b"PK\x03\x04"
+
+# Bande absente : array vide partagé, en lecture seule
+_EMPTY_BAND = np.zeros(0, dtype=np.float32)
+_EMPTY_BAND.flags.writeable = False
+
+
+class WaveformPyramid:
+    """Read-only view of a serialized waveform pyramid.
+
+    Level 0 is full resolution; level i has ``ceil(length / factor**i)``
+    columns. Level arrays are zero-copy views over the serialized bytes.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """Parse the header and level table.
+
+        Args:
+            data: Bytes produced by serialize_waveform()
+
+        Raises:
+            ValueError: If the data is not a valid pyramid
+        """
+        if len(data) < _HEADER.size or data[:4] != WAVEFORM_MAGIC:
+            raise ValueError("Not a waveform pyramid")
+        magic, version, band_mask, factor, length, n_levels, _, *scales = _HEADER.unpack_from(data)
+        if version != WAVEFORM_FORMAT_VERSION:
+            raise ValueError(f"Unsupported waveform format version: {version}")
+        if band_mask >= 1 << len(BANDS) or factor < 2 or n_levels > _MAX_LEVELS:
+            raise ValueError("Corrupt waveform pyramid header")
+
+        self._data = data
+        self.length: int = length
+        self.factor: int = factor
+        self.bands = tuple(band for i, band in enumerate(BANDS) if band_mask >> i & 1)
+        scale_array = np.array(
+            [scale for i, scale in enumerate(scales) if band_mask >> i & 1], dtype=np.float32
+        )
+        self._dequantize = scale_array / 255.0
+
+        table_end = _HEADER.size + n_levels * _LEVEL.size
+        if len(data) < table_end:
+            raise ValueError("Truncated waveform pyramid")
+        self._levels: list[tuple[int, int]] = []
+        for i in range(n_levels):
+            offset, level_length = _LEVEL.unpack_from(data, _HEADER.size + i * _LEVEL.size)
+            size = level_length * len(self.bands) * (1 if i == 0 else 2)
+            if offset < table_end or offset + size > len(data):
+                raise ValueError("Truncated waveform pyramid")
+            self._levels.append((offset, level_length))
+
+    @property
+    def num_levels(self) -> int:
+        return len(self._levels)
+
+    def level_length(self, level: int) -> int:
+        """Number of columns of a level."""
+        return self._levels[level][1]
+
+    def level_for(self, width: int) -> int:
+        """Coarsest level with at least ``width`` columns (level 0 if none)."""
+        for level in range(self.num_levels - 1, 0, -1):
+            if self.level_length(level) >= width:
+                return level
+        return 0
+
+    def minmax(self, level: int, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Quantized (min, max) of columns ``start:stop`` of a level.
+
+        Returns:
+            uint8 array of shape (columns, len(bands), 2): a view on the bytes,
+            except for level 0 (min = max, stored once)
+        """
+        if level == 0:
+            values = self._values(0, start, stop)
+            return np.stack((values, values), axis=2)
+        return self._values(level, start, stop)
+
+    def peaks(
+        self, level: int, start: int = 0, stop: int | None = None, step: int = 1
+    ) -> dict[str, np.ndarray]:
+        """Dequantized maxima of columns ``start:stop:step`` of a level, per band (float32)."""
+        values = self._values(level, start, stop)[::step]
+        maxima = (values if level == 0 else values[:, :, 1]) * self._dequantize
+        result = dict.fromkeys(BANDS, _EMPTY_BAND)
+        for i, band in enumerate(self.bands):
+            result[band] = maxima[:, i]
+        return result
+
+    def envelope(self, width: int) -> dict[str, np.ndarray]:
+        """Dequantized maxima of the whole waveform in at most ``width`` columns, per band.
+
+        Read from the coarsest level with at least ``width`` columns: each
+        output column is the max of the level columns it covers, so short
+        peaks stay visible. Fewer columns are returned if the waveform is shorter.
+        """
+        level = self.level_for(width)
+        maxima = self.minmax(level)[:, :, 1]
+        if len(maxima) > width:
+            bounds = np.arange(width) * len(maxima) // width
+            maxima = np.maximum.reduceat(maxima, bounds, axis=0)
+        maxima = maxima * self._dequantize
+        result = dict.fromkeys(BANDS, _EMPTY_BAND)
+        for i, band in enumerate(self.bands):
+            result[band] = maxima[:, i]
+        return result
+
+    def _values(self, level: int, start: int, stop: int | None) -> np.ndarray:
+        offset, level_length = self._levels[level]
+        shape = (
+            (level_length, len(self.bands)) if level == 0 else (level_length, len(self.bands), 2)
+        )
+        count = level_length * len(self.bands) * (1 if level == 0 else 2)
+        values = np.frombuffer(self._data, dtype=np.uint8, count=count, offset=offset)
+        return values.reshape(shape)[start:stop]
+
+    def to_waveform(self) -> dict[str, np.ndarray]:
+        """Full-resolution arrays, as produced by the npz format."""
+        return self.peaks(0)
+
 
 def serialize_waveform(waveform: dict[str, Any]) -> bytes:
-    """Sérialise les données waveform en bytes (format numpy compressé).
+    """Sérialise les données waveform au format pyramide.
 
     Args:
-        waveform: Dict avec les arrays 'bass', 'mid', 'treble'
+        waveform: Dict avec les arrays 'bass', 'mid', 'treble' (enveloppes
+            positives, de même longueur ; une bande absente ou vide est omise)
 
     Returns:
-        Bytes au format npz compressé
+        Bytes au format pyramide (voir l'en-tête du module)
+
+    Raises:
+        ValueError: Si les bandes présentes n'ont pas la même longueur
     """
-    buffer = io.BytesIO()
-    np.savez_compressed(
-        buffer,
-        bass=waveform.get("bass", np.array([])),
-        mid=waveform.get("mid", np.array([])),
-        treble=waveform.get("treble", np.array([])),
-    )
-    return buffer.getvalue()
+    present = [
+        (i, np.asarray(waveform[band], dtype=np.float64))
+        for i, band in enumerate(BANDS)
+        if band in waveform and np.size(waveform[band]) > 0
+    ]
+    band_mask = sum(1 << i for i, _ in present)
+    length = len(present[0][1]) if present else 0
+    if any(len(values) != length for _, values in present):
+        raise ValueError("Waveform bands must have the same length")
+
+    scales = [0.0] * len(BANDS)
+    columns = np.zeros((length, len(present)), dtype=np.uint8)
+    for column, (i, values) in enumerate(present):
+        scale = float(np.max(values))
+        if scale > 0:
+            scales[i] = scale
+            columns[:, column] = np.round(np.clip(values / scale, 0.0, 1.0) * 255)
+
+    levels = [columns]
+    if length > MIN_LEVEL_LENGTH:
+        levels.append(_reduce_level(np.stack((columns, columns), axis=2)))
+        while len(levels[-1]) > MIN_LEVEL_LENGTH:
+            levels.append(_reduce_level(levels[-1]))
+
+    offset = _HEADER.size + len(levels) * _LEVEL.size
+    parts = [_HEADER.pack(WAVEFORM_MAGIC, WAVEFORM_FORMAT_VERSION, band_mask, PYRAMID_FACTOR,
+                          length, len(levels), 0, *scales)]  # fmt: skip
+    for level in levels:
+        parts.append(_LEVEL.pack(offset, len(level)))
+        offset += level.nbytes
+    parts.extend(level.tobytes() for level in levels)
+    return b"".join(parts)
+
+
+def _reduce_level(level: np.ndarray) -> np.ndarray:
+    """Next pyramid level: min of mins and max of maxes of PYRAMID_FACTOR columns."""
+    remainder = len(level) % PYRAMID_FACTOR
+    if remainder:
+        # Compléter avec la dernière colonne : ne change ni le min ni le max
+        level = np.concatenate([level, np.repeat(level[-1:], PYRAMID_FACTOR - remainder, axis=0)])
+    grouped = level.reshape(-1, PYRAMID_FACTOR, *level.shape[1:])
+    return np.stack((grouped[..., 0].min(axis=1), grouped[..., 1].max(axis=1)), axis=2)
+
+
+def read_waveform_pyramid(data: bytes) -> WaveformPyramid:
+    """Open a serialized waveform for level/range reads (legacy npz is converted).
+
+    Raises:
+        ValueError: Si les données sont corrompues ou dans un format non supporté
+    """
+    if data[:4] == WAVEFORM_MAGIC:
+        return WaveformPyramid(data)
+    return WaveformPyramid(serialize_waveform(_deserialize_npz(data)))
 
 
 def deserialize_waveform(data: bytes) -> dict[str, np.ndarray]:
-    """Désérialise les données waveform depuis bytes.
+    """Désérialise les données waveform (pyramide ou ancien npz) à pleine résolution.
 
     Args:
-        data: Bytes produits par serialize_waveform()
+        data: Bytes produits par serialize_waveform() (ou l'ancien format npz)
 
     Returns:
         Dict avec les arrays numpy 'bass', 'mid', 'treble'
@@ -42,6 +245,40 @@ def deserialize_waveform(data: bytes) -> dict[str, np.ndarray]:
     Raises:
         ValueError: Si les données sont corrompues ou dans un format non supporté
     """
+    if data[:4] == WAVEFORM_MAGIC:
+        return WaveformPyramid(data).to_waveform()
+    return _deserialize_npz(data)
+
+
+def is_legacy_waveform(data: bytes) -> bool:
+    """True for the former npz format (to be migrated with upgrade_waveform)."""
+    return data[:4] == _NPZ_MAGIC
+
+
+def upgrade_waveform(data: bytes) -> bytes | None:
+    """Convert a legacy npz waveform to the pyramid format (None if not legacy).
+
+    Raises:
+        ValueError: Si les données npz sont corrompues
+    """
+    if not is_legacy_waveform(data):
+        return None
+    return serialize_waveform(_deserialize_npz(data))
+
+
+def _serialize_npz(waveform: dict[str, Any]) -> bytes:
+    """Ancien format (npz compressé), conservé pour les tests et benchmarks."""
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        bass=waveform.get("bass", np.array([])),
+        mid=waveform.get("mid", np.array([])),
+        treble=waveform.get("treble", np.array([])),
+    )
+    return buffer.getvalue()
+
+
+def _deserialize_npz(data: bytes) -> dict[str, np.ndarray]:
     buffer = io.BytesIO(data)
     try:
         with np.load(buffer, allow_pickle=False) as npz:
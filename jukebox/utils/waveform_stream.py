@@ -0,0 +1,134 @@
+"""Streaming bass/mid/treble waveform reduction.
+
+Standalone module (no PySide6): CompleteWaveformWorker feeds it decoded blocks
+and forwards each returned delta to the UI.
+
+Each band is filtered with ``sosfilt`` whose state (``zi``) is carried from
+one block to the next, so the output is identical to filtering the whole
+track at once (no transient at block boundaries). Filtered samples are then
+pooled by frames of ``hop`` samples (a frame straddling two blocks waits for
+the next one):
+
+- peak (max |x|) per frame: the displayed waveform, which no longer misses
+  transients the way ``[::hop]`` decimation did;
+- RMS per frame: the band energies stored with the audio analysis.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from jukebox.core.constants import AUDIO_HOP_LENGTH, FREQ_BASS_HIGH, FREQ_MID_HIGH
+
+BANDS = ("bass", "mid", "treble")
+
+
+@dataclass(frozen=True)
+class WaveformDelta:
+    """Frames ``start .. start + len(peaks[0])`` of the three bands (raw peaks)."""
+
+    start: int
+    peaks: np.ndarray  # shape (3, n), float32, unnormalized
+
+    def __len__(self) -> int:
+        return int(self.peaks.shape[1])
+
+    def as_dict(self, length: int) -> dict[str, object]:
+        """Payload of CompleteWaveformWorker.progress_update.
+
+        Args:
+            length: Expected total frames (for a stable display while generating)
+        """
+        bass, mid, treble = self.peaks
+        return {"start": self.start, "length": length, "bass": bass, "mid": mid, "treble": treble}
+
+
+class BandWaveformBuilder:
+    """Accumulates the 3-band peak/RMS waveform of a track, block by block."""
+
+    def __init__(self, sr: int, hop: int = AUDIO_HOP_LENGTH) -> None:
+        """Initialize filters.
+
+        Args:
+            sr: Sample rate of the blocks
+            hop: Samples per waveform frame
+        """
+        from scipy import signal
+
+        self.sr = sr
+        self.hop = hop
+        self._filters = [
+            signal.butter(4, FREQ_BASS_HIGH, "lp", fs=sr, output="sos"),
+            signal.butter(4, [FREQ_BASS_HIGH, FREQ_MID_HIGH], "bandpass", fs=sr, output="sos"),
+            signal.butter(4, FREQ_MID_HIGH, "hp", fs=sr, output="sos"),
+        ]
+        # État initial nul : identique à un sosfilt sur le morceau entier
+        self._zi = [np.zeros((sos.shape[0], 2)) for sos in self._filters]
+        self._pending = np.zeros((3, 0))
+        self._peaks: list[np.ndarray] = []
+        self._rms: list[np.ndarray] = []
+        self.samples = 0
+        self.frames = 0
+
+    def feed(self, y: np.ndarray) -> WaveformDelta | None:
+        """Filter one block; returns the frames it completed (None if none)."""
+        from scipy import signal
+
+        if len(y) == 0:
+            return None
+        self.samples += len(y)
+        filtered = np.empty((3, len(y)))
+        for band, sos in enumerate(self._filters):
+            filtered[band], self._zi[band] = signal.sosfilt(sos, y, zi=self._zi[band])
+        if self._pending.shape[1]:
+            filtered = np.concatenate([self._pending, filtered], axis=1)
+        complete = filtered.shape[1] // self.hop * self.hop
+        self._pending = filtered[:, complete:]
+        if complete == 0:
+            return None
+        return self._pool(filtered[:, :complete].reshape(3, -1, self.hop))
+
+    def finish(self) -> WaveformDelta | None:
+        """Pool the last, partial frame (call once, after the last block)."""
+        pending, self._pending = self._pending, np.zeros((3, 0))
+        if pending.shape[1] == 0:
+            return None
+        return self._pool(pending[:, np.newaxis, :])
+
+    def _pool(self, frames: np.ndarray) -> WaveformDelta:
+        """frames: (3, n, samples per frame)."""
+        peaks = np.abs(frames).max(axis=2).astype(np.float32)
+        self._peaks.append(peaks)
+        self._rms.append(np.sqrt(np.mean(np.square(frames), axis=2)).astype(np.float32))
+        delta = WaveformDelta(self.frames, peaks)
+        self.frames += peaks.shape[1]
+        return delta
+
+    def result(self) -> dict[str, object]:
+        """Normalized waveform and analysis metrics of everything fed so far.
+
+        Returns:
+            Dict with waveform_data (bass/mid/treble peaks normalized to 0-1),
+            duration, energy, bass_energy, mid_energy, treble_energy, dynamic_range
+        """
+        peaks = np.concatenate(self._peaks, axis=1) if self._peaks else np.zeros((3, 0))
+        rms = np.concatenate(self._rms, axis=1) if self._rms else np.zeros((3, 0))
+        band_energy = rms.mean(axis=1) if rms.shape[1] else np.zeros(3)
+        total_peak = float(peaks.sum(axis=0).max()) if peaks.shape[1] else 0.0
+        total_rms = float(rms.sum(axis=0).mean()) if rms.shape[1] else 0.0
+
+        maxima = peaks.max(axis=1, keepdims=True) if peaks.shape[1] else np.ones((3, 1))
+        normalized = np.divide(peaks, maxima, out=np.zeros_like(peaks), where=maxima > 0)
+        return {
+            "waveform_data": dict(zip(BANDS, normalized, strict=True)),
+            "duration": self.samples / self.sr,
+            "energy": float(band_energy.sum()),
+            "bass_energy": float(band_energy[0]),
+            "mid_energy": float(band_energy[1]),
+            "treble_energy": float(band_energy[2]),
+            "dynamic_range": float(
+                20 * np.log10(total_peak + 1e-10) - 20 * np.log10(total_rms + 1e-10)
+            ),
+        }
@@ -170,6 +170,55 @@ def cmd_info(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_profile(args: argparse.Namespace) -> int:
+    """Show the per-stage timing of ML feature extraction for one file."""
+    import time
+
+    import librosa
+
+    from jukebox.utils.audio_features import (
+        _extract_ml_features,
+        _extract_ml_features_reference,
+        analyze_audio_file,
+    )
+
+    if not args.audio_file.exists():
+        print(f"Error: File not found: {args.audio_file}", file=sys.stderr)
+        return 1
+
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+    features = analyze_audio_file(str(args.audio_file), extract_ml_features=True, timings=timings)
+    total = time.perf_counter() - start
+
+    print(f"=== Feature extraction profile: {args.audio_file.name} ===")
+    for stage, seconds in sorted(timings.items(), key=lambda kv: kv[1], reverse=True):
+        print(f"  {stage:<12} {seconds * 1000:9.1f} ms  ({seconds / total:5.1%})")
+    print(f"  {'total':<12} {total * 1000:9.1f} ms  ({len(features)} features)")
+
+    if args.compare:
+        # Same input for both extractors: only the extraction strategy differs
+        y, sr = librosa.load(str(args.audio_file), sr=args.sample_rate, mono=True)
+        start = time.perf_counter()
+        pipeline = _extract_ml_features(y, int(sr))
+        pipeline_time = time.perf_counter() - start
+        start = time.perf_counter()
+        reference = _extract_ml_features_reference(y, int(sr))
+        reference_time = time.perf_counter() - start
+
+        print()
+        print(f"Pipeline: {pipeline_time:.2f}s  Reference: {reference_time:.2f}s")
+        worst = sorted(
+            ((abs(pipeline[k] - v) / (abs(v) + 1e-10), k) for k, v in reference.items()),
+            reverse=True,
+        )[:5]
+        print("Largest relative differences:")
+        for rel, key in worst:
+            print(f"  {key:<24} {rel:.2e}")
+
+    return 0
+
+
 def _analyze_track(args: tuple[int, str]) -> tuple[int, str, dict | None, str | None]:
     """Analyze a single track (worker function for multiprocessing).
 
@@ -460,6 +509,24 @@ def main(argv: list[str] | None = None) -> int:
     )
     info_parser.set_defaults(func=cmd_info)
 
+    # profile command
+    profile_parser = subparsers.add_parser(
+        "profile", help="Show per-stage timing of feature extraction for one file"
+    )
+    profile_parser.add_argument("audio_file", type=Path, help="Audio file to analyze")
+    profile_parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Also run the reference extractor and report the largest differences",
+    )
+    profile_parser.add_argument(
+        "--sample-rate",
+        type=int,
+        default=None,
+        help="Sample rate used for --compare (default: the file's native rate)",
+    )
+    profile_parser.set_defaults(func=cmd_profile)
+
     # analyze command
     analyze_parser = subparsers.add_parser("analyze", help="Analyze tracks (extract ML features)")
     analyze_parser.add_argument(
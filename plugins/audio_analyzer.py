@@ -10,7 +10,11 @@ from PySide6.QtCore import QThread, Signal
 from PySide6.QtWidgets import QHBoxLayout, QLabel, QWidget
 
 from jukebox.core.event_bus import Events
-from jukebox.utils.audio_features import analyze_audio_file
+from jukebox.utils.audio_features import (
+    analyze_audio_file,
+    analyze_track_item,
+    init_analysis_process,
+)
 
 if TYPE_CHECKING:
     from jukebox.core.protocols import PluginContextProtocol, UIBuilderProtocol
@@ -248,6 +252,7 @@ class AudioAnalyzerPlugin:
 
     def _start_batch_analysis(self) -> None:
         """Start batch analysis of all tracks in the current mode."""
+        from jukebox.core.batch_processor import default_max_concurrency
         from jukebox.utils.batch_helper import start_batch_processing
 
         # Get current mode
@@ -284,6 +289,11 @@ class AudioAnalyzerPlugin:
             track_id, filepath = item
             return AnalysisWorker(track_id=track_id, filepath=filepath)
 
+        # Analysis is CPU-bound (librosa/numpy hold the GIL between kernels):
+        # one process per core scales, threads do not.
+        batch_config = self.context.config.batch_processing
+        max_workers = batch_config.max_workers or default_max_concurrency()
+
         start_batch_processing(
             name="Audio Analysis",
             batch_processor_holder=AudioAnalyzerPlugin,
@@ -294,6 +304,9 @@ class AudioAnalyzerPlugin:
             on_complete=self._on_batch_analysis_complete,
             on_error=self._on_batch_analysis_error,
             no_work_message="All tracks analyzed",
+            max_concurrency=max_workers,
+            process_function=analyze_track_item if batch_config.use_process_pool else None,
+            process_initializer=init_analysis_process,
         )
 
     def _on_batch_analysis_complete(self, item: tuple[int, str], result: dict[str, float]) -> None:
@@ -316,8 +316,7 @@ class ConfigDialog(QDialog):
 
         # Apply minimal styling (works for both light and dark themes)
         # Don't hardcode colors - let Qt use the system palette
-        self.setStyleSheet(
-            """
+        self.setStyleSheet("""
             QTabBar::tab {
                 padding: 8px 20px;
             }
@@ -333,8 +332,7 @@ class ConfigDialog(QDialog):
             QHeaderView::section {
                 padding: 6px;
             }
-            """
-        )
+            """)
 
         # Main layout
         layout = QVBoxLayout()
@@ -390,6 +388,9 @@ class ConfigDialog(QDialog):
             return
 
         plugin_manager = self.context.app.plugin_manager
+        # Les plugins différés doivent exposer leur schéma de réglages
+        if hasattr(plugin_manager, "load_deferred"):
+            plugin_manager.load_deferred()
 
         # Iterate through all plugins
         for plugin_name, plugin in plugin_manager.plugins.items():
@@ -618,6 +619,9 @@ class ConfigDialog(QDialog):
 
                     # Save to database
                     self._set_setting(plugin_name, setting_key, value)
+            # Écriture groupée immédiate : un échec ne doit pas fermer le dialogue
+            if not self.context.database.settings.flush():
+                return
         except Exception:
             # Une erreur DB en cours de boucle laisserait une sauvegarde partielle :
             # on logue avec la stack trace et on n'acquitte pas le dialogue.
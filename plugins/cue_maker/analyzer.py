@@ -80,6 +80,7 @@ class AnalyzeWorker(QThread):
         Emits error signal if analysis fails.
         """
         try:
+            from jukebox.utils.audio_cache import load_audio
             from plugins.cue_maker.cache import (
                 load_cached_fingerprints,
                 save_fingerprints_cache,
@@ -92,7 +93,8 @@ class AnalyzeWorker(QThread):
 
             # Initialize shazamix
             db = FingerprintDB(self.db_path)
-            fingerprinter = Fingerprinter()
+            # Références décodées via le cache partagé de l'application
+            fingerprinter = Fingerprinter(load_audio=load_audio)
             matcher = Matcher(db, fingerprinter)
 
             # Progress callback — always emit the signal so the UI stays informed
@@ -205,6 +207,7 @@ class TargetedMatchWorker(QThread):
         Emits error signal if the analysis raises an exception.
         """
         try:
+            from jukebox.utils.audio_cache import load_audio
             from shazamix.database import FingerprintDB
             from shazamix.fingerprint import Fingerprinter
             from shazamix.matcher import Matcher
@@ -217,7 +220,8 @@ class TargetedMatchWorker(QThread):
             )
 
             db = FingerprintDB(self.db_path)
-            fingerprinter = Fingerprinter()
+            # Références décodées via le cache partagé de l'application
+            fingerprinter = Fingerprinter(load_audio=load_audio)
             matcher = Matcher(db, fingerprinter)
 
             def progress_callback(current: int, total: int, message: str) -> None:
@@ -829,11 +829,9 @@ class CueMakerWidget(QWidget):
         logger.info("[Cue Maker] Waveform generation started for %s", filepath)
 
     def _on_waveform_progress(self, _track_id: int, partial_waveform: dict) -> None:
-        """Update waveform display progressively."""
-        self.waveform_widget.display_waveform(partial_waveform)
-        # Re-add highlight region (display_waveform clears all plot items)
-        if self._selected_row >= 0:
-            self._update_highlight_region()
+        """Update waveform display progressively (the worker sends new frames only)."""
+        # Les autres items du plot (région surlignée) sont conservés
+        self.waveform_widget.apply_waveform_delta(partial_waveform)
 
     def _on_waveform_complete(self, result: dict) -> None:
         """Handle waveform generation complete and save to cache."""
@@ -849,7 +847,7 @@ class CueMakerWidget(QWidget):
 
                 save_waveform_cache(self._mix_filepath, waveform_data)
 
-        # Re-add highlight region (display_waveform clears all plot items)
+        # Re-place highlight region (mix duration / waveform length may have changed)
         if self._selected_row >= 0:
             self._update_highlight_region()
 
@@ -15,7 +15,10 @@ Usage:
     Click on any tree node to filter the track list.
 
 Architecture:
-    - DirectoryTreeWidget: Qt tree view widget showing directory structure
+    - PathTrie: In-memory directory tree of the tracks, with per-node counts,
+      updated incrementally from track events
+    - DirectoryTreeWidget: Qt tree view widget showing the trie (directory items
+      are created when their parent is expanded)
     - DirectoryNavigatorPlugin: Plugin entry point and lifecycle manager
 
 Tree Structure:
@@ -25,16 +28,20 @@ Tree Structure:
     - "Playlists (N)": List of playlists with track counts (if any exist)
 
 Events:
-    - Subscribes to: TRACKS_ADDED, TRACK_DELETED, TRACK_METADATA_UPDATED
+    - Subscribes to: TRACKS_ADDED, TRACK_DELETED, TRACK_METADATA_UPDATED,
+      PLAYLIST_CHANGED
     - Emits: LOAD_TRACK_LIST (with filepaths to display)
 
 Filtering:
+    Clicking a directory emits the filepaths of its subtree, read as a slice of
+    the trie's depth-first track order (no database query).
     The plugin works transparently with other filters (genre filter, search).
     It emits LOAD_TRACK_LIST events which replace the current track list,
     and other filters then apply on top of that base list.
 """
 
 import logging
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
@@ -52,11 +59,212 @@ ROLE_PATH = Qt.ItemDataRole.UserRole  # Full path string or "playlist:{id}"
 ROLE_NODE_TYPE = Qt.ItemDataRole.UserRole + 1  # "root", "directory", "playlist"
 
 
+class DirectoryNode:
+    """One directory of the path trie.
+
+    ``count`` includes the tracks of every descendant. ``start``/``end`` are
+    the node's range in the trie's depth-first track order (valid while the
+    order is up to date).
+    """
+
+    __slots__ = ("name", "path", "parent", "children", "tracks", "count", "start", "end")
+
+    def __init__(self, name: str, path: str, parent: "DirectoryNode | None") -> None:
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.children: dict[str, DirectoryNode] = {}
+        self.tracks: dict[int, str] = {}  # track id -> filepath, tracks directly in this dir
+        self.count = 0
+        self.start = 0
+        self.end = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} ({self.count})"
+
+    def chain(self) -> list["DirectoryNode"]:
+        """This node and its ancestors, trie root excluded (deepest first)."""
+        nodes = []
+        node: DirectoryNode | None = self
+        while node is not None and node.parent is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes
+
+    def sorted_children(self) -> list["DirectoryNode"]:
+        return sorted(self.children.values(), key=lambda child: child.name)
+
+
+def _directory_names(filepath: str) -> list[str]:
+    """Directory components of a POSIX filepath ("/a/b/c.mp3" -> ["/", "a", "b"])."""
+    parts = filepath.split("/")[:-1]
+    if filepath.startswith("/"):
+        return ["/", *(part for part in parts[1:] if part)]
+    return [part for part in parts if part]
+
+
+class PathTrie:
+    """In-memory directory tree of the tracks of one mode, with per-node counts.
+
+    Updated one track at a time (add, remove, move): only the nodes on the
+    track's path are touched. Every mutating method returns those nodes so the
+    view can refresh just their items.
+
+    Folder filtering reads the filepaths of a node as a slice of the depth-first
+    track order (children sorted by name), recomputed on first use after a change.
+    """
+
+    def __init__(self) -> None:
+        self.root = DirectoryNode("", "", None)
+        self.max_id = 0
+        self._nodes: dict[str, DirectoryNode] = {}
+        self._track_dirs: dict[int, DirectoryNode] = {}
+        self._ids: dict[str, int] = {}
+        self._order: list[str] | None = None
+
+    @classmethod
+    def from_filepaths(cls, filepaths: Iterable[str]) -> "PathTrie":
+        """Trie of plain filepaths (ids assigned in order, starting at 1)."""
+        trie = cls()
+        trie.add_many(enumerate(filepaths, start=1))
+        return trie
+
+    def __len__(self) -> int:
+        return self.root.count
+
+    def node(self, path: str) -> DirectoryNode | None:
+        return self._nodes.get(path)
+
+    def add(self, track_id: int, filepath: str) -> list[DirectoryNode]:
+        """Add a track, or move it if its id is already known.
+
+        Returns:
+            Nodes whose count or children changed (root excluded)
+        """
+        touched: list[DirectoryNode] = []
+        known = self._track_dirs.get(track_id)
+        if known is not None:
+            if known.tracks[track_id] == filepath:
+                return touched
+            touched += self.remove(track_id)
+        other_id = self._ids.get(filepath)
+        if other_id is not None:
+            touched += self.remove(other_id)
+
+        node = self._directory(filepath)
+        chain = node.chain()
+        for ancestor in chain:
+            ancestor.count += 1
+        self.root.count += 1
+        touched += chain
+        node.tracks[track_id] = filepath
+        self._track_dirs[track_id] = node
+        self._ids[filepath] = track_id
+        self.max_id = max(self.max_id, track_id)
+        self._order = None
+        return touched
+
+    def add_many(self, tracks: Iterable[tuple[int, str]]) -> list[DirectoryNode]:
+        """Add (track id, filepath) pairs; returns the touched nodes, once each."""
+        touched: dict[int, DirectoryNode] = {}
+        for track_id, filepath in tracks:
+            for node in self.add(track_id, filepath):
+                touched[id(node)] = node
+        return list(touched.values())
+
+    def remove(self, track_id: int) -> list[DirectoryNode]:
+        """Remove a track; directories left empty are pruned.
+
+        Returns:
+            Nodes whose count or children changed, pruned ones included
+        """
+        node = self._track_dirs.pop(track_id, None)
+        if node is None:
+            return []
+        del self._ids[node.tracks.pop(track_id)]
+        touched = node.chain()
+        for ancestor in touched:
+            ancestor.count -= 1
+            if ancestor.count == 0:
+                # Nœud vide : ses enfants ont déjà été élagués
+                del ancestor.parent.children[ancestor.name]  # type: ignore[union-attr]
+                del self._nodes[ancestor.path]
+        self.root.count -= 1
+        self._order = None
+        return touched
+
+    def _directory(self, filepath: str) -> DirectoryNode:
+        """Node of a file's directory, created with its missing ancestors."""
+        node = self._nodes.get(filepath.rpartition("/")[0])
+        if node is not None:
+            return node
+        node = self.root
+        for name in _directory_names(filepath):
+            child = node.children.get(name)
+            if child is None:
+                path = name if node is self.root else f"{node.path.rstrip('/')}/{name}"
+                child = node.children[name] = self._nodes[path] = DirectoryNode(name, path, node)
+            node = child
+        return node
+
+    def remove_path(self, filepath: str) -> list[DirectoryNode]:
+        track_id = self._ids.get(filepath)
+        return [] if track_id is None else self.remove(track_id)
+
+    def display_roots(self) -> list[DirectoryNode]:
+        """Top-level nodes of the view: the common ancestor of every directory
+        is skipped unless it holds tracks itself."""
+        node = self.root
+        while len(node.children) == 1 and not node.tracks:
+            node = next(iter(node.children.values()))
+        if node is self.root or (node.children and not node.tracks):
+            return node.sorted_children()
+        return [node]
+
+    def find(self, name: str) -> DirectoryNode | None:
+        """First displayed node (depth-first, by name) whose name starts with ``name``."""
+        prefix = name.lower()
+        stack = list(reversed(self.display_roots()))
+        while stack:
+            node = stack.pop()
+            if node.name.lower().startswith(prefix):
+                return node
+            stack.extend(reversed(node.sorted_children()))
+        return None
+
+    def filepaths(self, path: str) -> list[str]:
+        """Filepaths of every track under a directory (recursive)."""
+        node = self._nodes.get(path)
+        if node is None:
+            return []
+        if self._order is None:
+            self._order = []
+            self._number(self.root, self._order)
+        return self._order[node.start : node.end]
+
+    def _number(self, node: DirectoryNode, order: list[str]) -> None:
+        node.start = len(order)
+        order.extend(node.tracks.values())
+        for child in node.sorted_children():
+            self._number(child, order)
+        node.end = len(order)
+
+
 class DirectoryTreeWidget(QWidget):
-    """Tree view widget showing directory structure from database."""
+    """Tree view widget showing a PathTrie.
+
+    Directory items are created lazily: a collapsed directory holds a
+    placeholder child until it is expanded.
+    """
 
     def __init__(self) -> None:
         super().__init__()
+        self.trie = PathTrie()
+        self._playlists: list[dict[str, Any]] = []
+        self._items: dict[str, QStandardItem] = {}  # path -> item (directories créés)
+        self._populated: set[str] = set()
+        self._top_paths: list[str] = []
         self._init_ui()
 
     def _init_ui(self) -> None:
@@ -70,6 +278,7 @@ class DirectoryTreeWidget(QWidget):
 
         self.model = QStandardItemModel()
         self.tree_view.setModel(self.model)
+        self.tree_view.expanded.connect(self._on_expanded)
 
         layout.addWidget(self.tree_view)
         self.setLayout(layout)
@@ -80,208 +289,252 @@ class DirectoryTreeWidget(QWidget):
         playlists: list[dict[str, Any]],
         default_directory: str = "",
     ) -> None:
-        """Build the directory tree from database filepaths and playlists.
+        """Build the directory tree from plain filepaths and playlists.
 
         Args:
             filepaths: List of all track filepaths from database
             playlists: List of playlist dicts with 'id', 'name', 'track_count'
             default_directory: Directory name to select by default
         """
+        self.show_trie(PathTrie.from_filepaths(filepaths), playlists, default_directory)
+
+    def show_trie(
+        self,
+        trie: PathTrie,
+        playlists: list[dict[str, Any]],
+        default_directory: str = "",
+    ) -> None:
+        """Display a directory trie and playlists.
+
+        Only the top-level directories are created; expanded and selected
+        nodes are restored (creating the items on their path).
+
+        Args:
+            trie: Directory trie of the tracks to show
+            playlists: List of playlist dicts with 'id', 'name', 'track_count'
+            default_directory: Directory name to select by default
+        """
         # Save expanded state and current selection before clearing
-        expanded_texts = self._get_expanded_texts()
-        selected_path = self._get_selected_path()
+        expanded_keys = self._get_expanded_keys()
+        selected_key = self._get_selected_path()
 
+        self.trie = trie
+        self._playlists = playlists
+        self._items.clear()
+        self._populated.clear()
         self.model.clear()
         root = self.model.invisibleRootItem()
 
-        # Build directory tree
         dir_node = QStandardItem("Directories")
         dir_node.setData("all_directories", ROLE_NODE_TYPE)
         dir_node.setData("", ROLE_PATH)
         root.appendRow(dir_node)
 
-        # Parse filepaths into directory structure
-        dir_counts: dict[str, int] = {}
-        for fp in filepaths:
-            parent = str(Path(fp).parent)
-            dir_counts[parent] = dir_counts.get(parent, 0) + 1
-
-        # Build tree structure from directory paths
-        self._build_directory_nodes(dir_node, dir_counts)
+        top = trie.display_roots()
+        self._top_paths = [node.path for node in top]
+        for node in top:
+            dir_node.appendRow(self._make_item(node))
 
-        # Playlists node
-        if playlists:
-            pl_node = QStandardItem(f"Playlists ({len(playlists)})")
-            pl_node.setData("root", ROLE_NODE_TYPE)
-            pl_node.setData("", ROLE_PATH)
-            root.appendRow(pl_node)
-
-            for pl in playlists:
-                pl_item = QStandardItem(f"{pl['name']} ({pl['track_count']})")
-                pl_item.setData("playlist", ROLE_NODE_TYPE)
-                pl_item.setData(f"playlist:{pl['id']}", ROLE_PATH)
-                pl_node.appendRow(pl_item)
+        self._set_playlist_rows(playlists)
 
         # Restore expanded state, or expand "Directories" by default
-        if expanded_texts:
-            self._restore_expanded_texts(expanded_texts)
+        if expanded_keys:
+            for key in expanded_keys:
+                item = self._item_for_key(key)
+                if item is not None:
+                    self.tree_view.expand(self.model.indexFromItem(item))
         else:
-            dir_index = self.model.indexFromItem(dir_node)
-            self.tree_view.expand(dir_index)
+            self.tree_view.expand(self.model.indexFromItem(dir_node))
 
         # Restore selection
-        if selected_path is not None:
-            self._restore_selected_path(selected_path)
-        elif not expanded_texts and default_directory:
-            target = self._find_item_by_name(dir_node, default_directory)
-            if target is not None:
-                target_index = self.model.indexFromItem(target)
+        if selected_key is not None:
+            item = self._item_for_key(selected_key)
+            if item is not None:
+                self.tree_view.setCurrentIndex(self.model.indexFromItem(item))
+        elif not expanded_keys and default_directory:
+            target = trie.find(default_directory)
+            item = None if target is None else self._ensure_item(target.path)
+            if item is not None:
+                target_index = self.model.indexFromItem(item)
                 self.tree_view.setCurrentIndex(target_index)
                 self.tree_view.clicked.emit(target_index)
                 return
             self.tree_view.setCurrentIndex(self.model.indexFromItem(dir_node))
 
-    def _get_selected_path(self) -> str | None:
-        """Get the ROLE_PATH data of the currently selected item."""
-        index = self.tree_view.currentIndex()
-        if not index.isValid():
-            return None
-        item = self.model.itemFromIndex(index)
-        if item is None:
-            return None
-        node_type = item.data(ROLE_NODE_TYPE)
-        path_data = item.data(ROLE_PATH)
-        # Encode both type and path for unambiguous restore
-        return f"{node_type}:{path_data}" if node_type else None
-
-    def _restore_selected_path(self, selected_key: str) -> None:
-        """Restore selection by matching ROLE_NODE_TYPE:ROLE_PATH."""
-        self._find_and_select(self.model.invisibleRootItem(), selected_key)
-
-    def _find_and_select(self, item: QStandardItem, selected_key: str) -> bool:
-        """Recursively find and select item matching the key."""
-        for i in range(item.rowCount()):
-            child = item.child(i)
-            node_type = child.data(ROLE_NODE_TYPE)
-            path_data = child.data(ROLE_PATH)
-            key = f"{node_type}:{path_data}"
-            if key == selected_key:
-                idx = self.model.indexFromItem(child)
-                self.tree_view.setCurrentIndex(idx)
-                return True
-            if self._find_and_select(child, selected_key):
-                return True
-        return False
-
-    def _get_expanded_texts(self) -> set[str]:
-        """Get the base names of all currently expanded nodes."""
-        expanded: set[str] = set()
-        self._collect_expanded(self.model.invisibleRootItem(), expanded)
-        return expanded
+    def apply_changes(self, touched: Iterable[DirectoryNode]) -> None:
+        """Refresh the items of trie nodes changed by add/remove.
 
-    def _collect_expanded(self, item: QStandardItem, expanded: set[str]) -> None:
-        """Recursively collect expanded node names."""
-        for i in range(item.rowCount()):
-            child = item.child(i)
-            idx = self.model.indexFromItem(child)
-            if self.tree_view.isExpanded(idx):
-                # Strip count suffix: "Playlists (3)" -> "Playlists"
-                text = child.text().rsplit(" (", 1)[0]
-                expanded.add(text)
-            self._collect_expanded(child, expanded)
-
-    def _restore_expanded_texts(self, expanded_texts: set[str]) -> None:
-        """Restore expanded state by matching node names."""
-        self._expand_matching(self.model.invisibleRootItem(), expanded_texts)
-
-    def _expand_matching(self, item: QStandardItem, expanded_texts: set[str]) -> None:
-        """Recursively expand nodes whose base name is in the set."""
-        for i in range(item.rowCount()):
-            child = item.child(i)
-            text = child.text().rsplit(" (", 1)[0]
-            if text in expanded_texts:
-                self.tree_view.expand(self.model.indexFromItem(child))
-            self._expand_matching(child, expanded_texts)
+        Items not created yet are left alone (they will be built from the
+        trie when expanded).
+        """
+        if [node.path for node in self.trie.display_roots()] != self._top_paths:
+            # La racine affichée a changé (premier dossier, dernier supprimé...)
+            self.show_trie(self.trie, self._playlists)
+            return
+        for node in touched:
+            item = self._items.get(node.path)
+            if item is None or self.trie.node(node.path) is not node:
+                continue
+            item.setText(node.label)
+            if node.path in self._populated:
+                self._sync_children(item, node)
+            elif node.children and not item.hasChildren():
+                item.appendRow(self._placeholder())
+            elif not node.children and item.hasChildren():
+                item.removeRows(0, item.rowCount())
+
+    def set_playlists(self, playlists: list[dict[str, Any]]) -> None:
+        """Replace the playlist section (directories are untouched)."""
+        self._playlists = playlists
+        self._set_playlist_rows(playlists)
+
+    def _set_playlist_rows(self, playlists: list[dict[str, Any]]) -> None:
+        root = self.model.invisibleRootItem()
+        pl_node = self._find_child(root, "root")
+        was_expanded = pl_node is not None and self.tree_view.isExpanded(pl_node.index())
+        if pl_node is not None:
+            root.removeRow(pl_node.row())
+        if not playlists:
+            return
+
+        pl_node = QStandardItem(f"Playlists ({len(playlists)})")
+        pl_node.setData("root", ROLE_NODE_TYPE)
+        pl_node.setData("", ROLE_PATH)
+        for pl in playlists:
+            pl_item = QStandardItem(f"{pl['name']} ({pl['track_count']})")
+            pl_item.setData("playlist", ROLE_NODE_TYPE)
+            pl_item.setData(f"playlist:{pl['id']}", ROLE_PATH)
+            pl_node.appendRow(pl_item)
+        root.appendRow(pl_node)
+        if was_expanded:
+            self.tree_view.expand(pl_node.index())
 
     @staticmethod
-    def _find_item_by_name(parent: QStandardItem, name: str) -> QStandardItem | None:
-        """Recursively find a child item whose text starts with the given name."""
-        name_lower = name.lower()
+    def _find_child(parent: QStandardItem, node_type: str, path: str = "") -> QStandardItem | None:
         for i in range(parent.rowCount()):
             child = parent.child(i)
-            # Item text is like "NORMALIZED (42)", match on the directory name part
-            if child.text().lower().startswith(name_lower):
+            if child.data(ROLE_NODE_TYPE) == node_type and child.data(ROLE_PATH) == path:
                 return child
-            found = DirectoryTreeWidget._find_item_by_name(child, name)
-            if found is not None:
-                return found
         return None
 
-    def _build_directory_nodes(
-        self, parent_item: QStandardItem, dir_counts: dict[str, int]
-    ) -> None:
-        """Build hierarchical directory nodes from flat directory paths.
-
-        Finds the common prefix among all directories and builds a tree
-        from the remaining path components.
+    # ------------------------------------------------------------------
+    # Lazy directory items
+    # ------------------------------------------------------------------
 
-        Args:
-            parent_item: Parent tree item to attach nodes to
-            dir_counts: Map of directory path -> track count
-        """
-        if not dir_counts:
+    @staticmethod
+    def _placeholder() -> QStandardItem:
+        item = QStandardItem("…")
+        item.setData("placeholder", ROLE_NODE_TYPE)
+        item.setEnabled(False)
+        return item
+
+    def _make_item(self, node: DirectoryNode) -> QStandardItem:
+        item = QStandardItem(node.label)
+        item.setData("directory", ROLE_NODE_TYPE)
+        item.setData(node.path, ROLE_PATH)
+        if node.children:
+            item.appendRow(self._placeholder())
+        self._items[node.path] = item
+        return item
+
+    def _on_expanded(self, index) -> None:  # type: ignore[no-untyped-def]
+        item = self.model.itemFromIndex(index)
+        if item is not None and item.data(ROLE_NODE_TYPE) == "directory":
+            self._populate(item)
+
+    def _populate(self, item: QStandardItem) -> None:
+        """Replace the placeholder of a directory item by its children."""
+        path = item.data(ROLE_PATH)
+        node = self.trie.node(path)
+        if path in self._populated or node is None:
             return
-
-        dirs = sorted(dir_counts.keys())
-
-        # Find common prefix (parent of all directories)
-        common = Path(dirs[0])
-        for d in dirs[1:]:
-            # Walk up until we find a common ancestor
-            while not str(d).startswith(str(common)):
-                common = common.parent
-                if common == common.parent:
+        self._populated.add(path)
+        item.removeRows(0, item.rowCount())
+        for child in node.sorted_children():
+            item.appendRow(self._make_item(child))
+
+    def _sync_children(self, item: QStandardItem, node: DirectoryNode) -> None:
+        """Add/remove child items of a populated directory (kept sorted by name)."""
+        row = 0
+        for child in node.sorted_children():
+            while row < item.rowCount():
+                existing = item.child(row).data(ROLE_PATH)
+                existing_node = self.trie.node(existing)
+                if existing_node is not None and existing_node.parent is node:
                     break
-
-        # Build tree from relative paths
-        tree: dict[str, QStandardItem] = {}
-
-        for dir_path in dirs:
-            try:
-                rel = Path(dir_path).relative_to(common)
-            except ValueError:
-                rel = Path(dir_path)
-
-            parts = rel.parts
-            if not parts:
-                # This directory IS the common prefix
-                count = dir_counts[dir_path]
-                item = QStandardItem(f"{Path(dir_path).name} ({count})")
-                item.setData("directory", ROLE_NODE_TYPE)
-                item.setData(dir_path, ROLE_PATH)
-                parent_item.appendRow(item)
-                tree[dir_path] = item
+                self._forget(existing)
+                item.removeRow(row)
+            if row < item.rowCount() and item.child(row).data(ROLE_PATH) == child.path:
+                row += 1
                 continue
+            item.insertRow(row, self._make_item(child))
+            row += 1
+        while item.rowCount() > row:
+            self._forget(item.child(row).data(ROLE_PATH))
+            item.removeRow(row)
+
+    def _forget(self, path: str) -> None:
+        """Drop the bookkeeping of a removed item and of its descendants."""
+        prefix = path.rstrip("/") + "/"
+        for known in [p for p in self._items if p == path or p.startswith(prefix)]:
+            del self._items[known]
+            self._populated.discard(known)
+
+    def _ensure_item(self, path: str) -> QStandardItem | None:
+        """Item of a directory, creating the items of its ancestors if needed."""
+        node = self.trie.node(path)
+        chain: list[DirectoryNode] = []
+        while node is not None and node.path not in self._items:
+            chain.append(node)
+            node = node.parent
+        if node is None:
+            return None  # au-dessus des dossiers affichés
+        for child in reversed(chain):
+            self._populate(self._items[child.parent.path])  # type: ignore[union-attr]
+        return self._items.get(path)
+
+    # ------------------------------------------------------------------
+    # Expanded state and selection
+    # ------------------------------------------------------------------
 
-            # Walk the path, creating intermediate nodes as needed
-            current_parent = parent_item
-            for i, part in enumerate(parts):
-                key = str(common / Path(*parts[: i + 1]))
-                if key not in tree:
-                    # Count for this node: direct count + sum of descendants
-                    node_count = dir_counts.get(key, 0)
-                    # Also count all descendant directories
-                    for d, c in dir_counts.items():
-                        if d != key and d.startswith(key + "/"):
-                            node_count += c
-
-                    label = f"{part} ({node_count})" if node_count > 0 else part
-                    item = QStandardItem(label)
-                    item.setData("directory", ROLE_NODE_TYPE)
-                    item.setData(key, ROLE_PATH)
-                    current_parent.appendRow(item)
-                    tree[key] = item
-                current_parent = tree[key]
+    @staticmethod
+    def _item_key(item: QStandardItem) -> str | None:
+        node_type = item.data(ROLE_NODE_TYPE)
+        # Encode both type and path for unambiguous restore
+        return f"{node_type}:{item.data(ROLE_PATH)}" if node_type else None
+
+    def _item_for_key(self, key: str) -> QStandardItem | None:
+        node_type, _, path = key.partition(":")
+        if node_type == "directory":
+            return self._ensure_item(path)
+        root = self.model.invisibleRootItem()
+        if node_type == "playlist":
+            pl_node = self._find_child(root, "root")
+            return None if pl_node is None else self._find_child(pl_node, "playlist", path)
+        return self._find_child(root, node_type, path)
+
+    def _get_selected_path(self) -> str | None:
+        """Get the ROLE_NODE_TYPE:ROLE_PATH key of the currently selected item."""
+        index = self.tree_view.currentIndex()
+        if not index.isValid():
+            return None
+        item = self.model.itemFromIndex(index)
+        return None if item is None else self._item_key(item)
+
+    def _get_expanded_keys(self) -> list[str]:
+        """Keys of the expanded items, parents first."""
+        expanded: list[str] = []
+        stack = [self.model.invisibleRootItem()]
+        while stack:
+            item = stack.pop()
+            for i in range(item.rowCount()):
+                child = item.child(i)
+                if self.tree_view.isExpanded(child.index()):
+                    key = self._item_key(child)
+                    if key is not None:
+                        expanded.append(key)
+                    stack.append(child)
+        return expanded
 
 
 class DirectoryNavigatorPlugin:
@@ -297,11 +550,13 @@ class DirectoryNavigatorPlugin:
         self.context = context
         self.widget: DirectoryTreeWidget | None = None
         self.dock: QWidget | None = None
+        self.trie: PathTrie | None = None
+        self._trie_mode: str | None = None
 
-        context.subscribe(Events.TRACKS_ADDED, self._rebuild_tree)
-        context.subscribe(Events.TRACK_DELETED, self._on_track_changed)
+        context.subscribe(Events.TRACKS_ADDED, self._on_tracks_added)
+        context.subscribe(Events.TRACK_DELETED, self._on_track_deleted)
         context.subscribe(Events.TRACK_METADATA_UPDATED, self._on_track_changed)
-        context.subscribe(Events.PLAYLIST_CHANGED, self._rebuild_tree)
+        context.subscribe(Events.PLAYLIST_CHANGED, self._refresh_playlists)
 
     def register_ui(self, ui_builder: UIBuilderProtocol) -> None:
         """Register left sidebar widget.
@@ -346,50 +601,104 @@ class DirectoryNavigatorPlugin:
                 dock.setVisible(False)
         logger.debug("[Directory Navigator] Deactivated for %s mode", mode)
 
-    def _on_track_changed(self, **kwargs) -> None:  # type: ignore[no-untyped-def]
-        """Handle track deletion or metadata update - rebuild tree."""
-        self._rebuild_tree()
+    def _is_hidden(self) -> bool:
+        """True when the dock is hidden (curating mode): activate() will rebuild."""
+        dock = self.widget.parent() if self.widget is not None else None
+        return bool(dock and hasattr(dock, "isVisible") and not dock.isVisible())
 
-    def _rebuild_tree(self) -> None:
-        """Rebuild the directory tree from database."""
-        if self.widget is None:
+    def _current_mode(self) -> str:
+        return self.context.app.mode_manager.get_mode().value  # type: ignore[attr-defined, no-any-return]
+
+    def _trie_is_current(self) -> bool:
+        """True when incremental updates can be applied to the displayed trie."""
+        if self.widget is None or self._is_hidden():
+            return False
+        if self.trie is None or self._trie_mode != self._current_mode():
+            self._rebuild_tree()
+            return False
+        return True
+
+    def _on_tracks_added(self) -> None:
+        """Add the tracks inserted since the trie was built."""
+        if not self._trie_is_current():
             return
+        rows = self.context.database.conn.execute(  # type: ignore[attr-defined]
+            "SELECT id, filepath FROM tracks WHERE mode = ? AND id > ? ORDER BY id",
+            (self._trie_mode, self.trie.max_id),  # type: ignore[union-attr]
+        ).fetchall()
+        touched = self.trie.add_many((row["id"], row["filepath"]) for row in rows)  # type: ignore[union-attr]
+        self.widget.apply_changes(touched)  # type: ignore[union-attr]
+        logger.debug("[Directory Navigator] %d track(s) added to the tree", len(rows))
 
-        # Skip rebuild when dock is hidden (curating/cue_maker mode).
-        # activate() will rebuild the tree when switching back to jukebox.
-        dock = self.widget.parent()
-        if dock and hasattr(dock, "isVisible") and not dock.isVisible():
+    def _on_track_deleted(self, filepath: Path | str, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        """Remove a deleted track from the tree."""
+        if not self._trie_is_current():
             return
+        touched = self.trie.remove_path(Path(filepath).as_posix())  # type: ignore[union-attr]
+        self.widget.apply_changes(touched)  # type: ignore[union-attr]
 
-        db = self.context.database
+    def _on_track_changed(self, filepath: Path | str | None = None, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        """Re-read one track: follows moves (new path for a known id) and mode changes.
 
-        # Get filepaths for current mode only
-        mode = self.context.app.mode_manager.get_mode().value  # type: ignore[attr-defined]
-        rows = db.conn.execute(  # type: ignore[attr-defined]
-            "SELECT filepath FROM tracks WHERE mode = ?", (mode,)
-        ).fetchall()
-        filepaths = [row["filepath"] for row in rows]
+        Metadata updates that keep the path leave the tree untouched.
+        """
+        if filepath is None or not self._trie_is_current():
+            return
+        filepath = Path(filepath).as_posix()
+        row = self.context.database.conn.execute(  # type: ignore[attr-defined]
+            "SELECT id, filepath, mode FROM tracks WHERE filepath = ?", (filepath,)
+        ).fetchone()
+        if row is not None and row["mode"] == self._trie_mode:
+            touched = self.trie.add(row["id"], row["filepath"])  # type: ignore[union-attr]
+        else:
+            touched = self.trie.remove_path(filepath)  # type: ignore[union-attr]
+        self.widget.apply_changes(touched)  # type: ignore[union-attr]
 
-        # Get playlists with track counts
-        playlist_rows = db.conn.execute(  # type: ignore[attr-defined]
-            """
+    def _load_playlists(self) -> list[dict[str, Any]]:
+        """Playlists with their track counts."""
+        playlist_rows = self.context.database.conn.execute("""
             SELECT p.id, p.name, COUNT(pt.track_id) as track_count
             FROM playlists p
             LEFT JOIN playlist_tracks pt ON p.id = pt.playlist_id
             GROUP BY p.id
             ORDER BY p.name
-            """
-        ).fetchall()
-        playlists = [
+            """).fetchall()  # type: ignore[attr-defined]
+        return [
             {"id": row["id"], "name": row["name"], "track_count": row["track_count"]}
             for row in playlist_rows
         ]
 
+    def _refresh_playlists(self) -> None:
+        """Reload the playlist section only."""
+        if self.widget is None or self._is_hidden():
+            return
+        self.widget.set_playlists(self._load_playlists())
+
+    def _rebuild_tree(self) -> None:
+        """Rebuild the directory trie from database."""
+        if self.widget is None:
+            return
+
+        # Skip rebuild when dock is hidden (curating/cue_maker mode).
+        # activate() will rebuild the tree when switching back to jukebox.
+        if self._is_hidden():
+            return
+
+        # Get tracks for current mode only
+        mode = self._current_mode()
+        rows = self.context.database.conn.execute(  # type: ignore[attr-defined]
+            "SELECT id, filepath FROM tracks WHERE mode = ? ORDER BY id", (mode,)
+        ).fetchall()
+        self.trie = PathTrie()
+        self.trie.add_many((row["id"], row["filepath"]) for row in rows)
+        self._trie_mode = mode
+
+        playlists = self._load_playlists()
         default_dir = self.context.config.directory_navigator.default_directory
-        self.widget.build_tree(filepaths, playlists, default_directory=default_dir)
+        self.widget.show_trie(self.trie, playlists, default_directory=default_dir)
         logger.info(
             "[Directory Navigator] Tree built: %d tracks, %d playlists",
-            len(filepaths),
+            len(self.trie),
             len(playlists),
         )
 
@@ -418,12 +727,9 @@ class DirectoryNavigatorPlugin:
             return
 
         if node_type == "directory":
-            # Filter by directory (recursive: LIKE 'path%')
-            rows = db.conn.execute(  # type: ignore[attr-defined]
-                "SELECT filepath FROM tracks WHERE filepath LIKE ?",
-                (path_data + "/%",),
-            ).fetchall()
-            filepaths = [Path(row["filepath"]) for row in rows]
+            # Sous-arbre du dossier : tranche de l'ordre en profondeur du trie
+            trie = self.trie if self.trie is not None else self.widget.trie  # type: ignore[union-attr]
+            filepaths = [Path(fp) for fp in trie.filepaths(path_data)]
 
         elif node_type == "playlist":
             # Load playlist tracks
@@ -509,8 +815,9 @@ class DirectoryNavigatorPlugin:
             "[Directory Navigator] Deleted playlist '%s' (id=%d)", playlist_name, playlist_id
         )
         self.context.emit(Events.PLAYLIST_CHANGED)
-        self._rebuild_tree()
+        self._refresh_playlists()
 
     def shutdown(self) -> None:
         """Cleanup references."""
         self.widget = None
+        self.trie = None
@@ -1,6 +1,8 @@
 """Genre Suggester Plugin - ML-based genre predictions for current track."""
 
 import logging
+import threading
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -27,13 +29,18 @@ class PredictionWorker(QThread):
     # (predictions, error_message) — l'un des deux est None
     finished_prediction = Signal(object, object)
 
-    def __init__(self, model: Any, track_id: int) -> None:
+    def __init__(self, get_model: Callable[[], Any], track_id: int) -> None:
         super().__init__()
-        self._model = model
+        self._get_model = get_model
         self._track_id = track_id
 
     def run(self) -> None:
-        """Charge les features puis prédit, en propageant les erreurs via le signal."""
+        """Charge le modèle (1re fois), les features puis prédit ; erreurs via le signal."""
+        model = self._get_model()
+        if model is None:
+            self.finished_prediction.emit(None, "Model not found")
+            return
+
         try:
             from ml.genre_classifier.data_loader import load_track_features
 
@@ -50,7 +57,7 @@ class PredictionWorker(QThread):
             return
 
         try:
-            predictions = self._model.predict_top_n(features, n=TOP_N)
+            predictions = model.predict_top_n(features, n=TOP_N)
             self.finished_prediction.emit(predictions, None)
         except Exception:
             logger.exception("[genre_suggester] Prediction failed for track %d", self._track_id)
@@ -125,31 +132,40 @@ class GenreSuggesterPlugin:
     modes = ["jukebox", "curating"]
 
     def initialize(self, context: PluginContextProtocol) -> None:
-        """Initialize plugin and load ML model."""
+        """Initialize plugin (the ML model is loaded by the first prediction)."""
         self.context = context
         self.widget: GenreSuggestionWidget | None = None
         self._worker: PredictionWorker | None = None
-
-        # Load model
-        try:
-            from ml.genre_classifier.trainer import TrainedModel
-
-            self.model: TrainedModel | None = TrainedModel.load(MODEL_PATH)
-            logger.info("[genre_suggester] Model loaded from %s", MODEL_PATH)
-        except FileNotFoundError:
-            self.model = None
-            logger.warning("[genre_suggester] Model not found at %s", MODEL_PATH)
-        except ImportError as e:
-            # Dépendances ML optionnelles non installées (pandas, sklearn…)
-            # Installer avec : uv sync --all-extras
-            self.model = None
-            logger.warning("[genre_suggester] ML deps not available, suggestions disabled (%s)", e)
-        except Exception:
-            self.model = None
-            logger.exception("[genre_suggester] Failed to load model")
+        self.model: Any = None
+        # Import pandas/sklearn + chargement du modèle : ~2 s, hors démarrage et hors thread UI
+        self._model_loaded = False
+        self._model_lock = threading.Lock()
 
         context.subscribe(Events.TRACK_LOADED, self._on_track_loaded)
 
+    def _load_model(self) -> Any:
+        """ML model, loaded on first call (from the prediction worker); None if unavailable."""
+        with self._model_lock:
+            if self._model_loaded:
+                return self.model
+            self._model_loaded = True
+            try:
+                from ml.genre_classifier.trainer import TrainedModel
+
+                self.model = TrainedModel.load(MODEL_PATH)
+                logger.info("[genre_suggester] Model loaded from %s", MODEL_PATH)
+            except FileNotFoundError:
+                logger.warning("[genre_suggester] Model not found at %s", MODEL_PATH)
+            except ImportError as e:
+                # Dépendances ML optionnelles non installées (pandas, sklearn…)
+                # Installer avec : uv sync --all-extras
+                logger.warning(
+                    "[genre_suggester] ML deps not available, suggestions disabled (%s)", e
+                )
+            except Exception:
+                logger.exception("[genre_suggester] Failed to load model")
+            return self.model
+
     def register_ui(self, ui_builder: UIBuilderProtocol) -> None:
         """Register bottom widget."""
         self.widget = GenreSuggestionWidget()
@@ -160,7 +176,7 @@ class GenreSuggesterPlugin:
         if self.widget is None:
             return
 
-        if self.model is None:
+        if self._model_loaded and self.model is None:
             self.widget.show_unavailable("Model not found")
             return
 
@@ -170,7 +186,7 @@ class GenreSuggesterPlugin:
         # Affiche l'état de chargement pendant l'inférence asynchrone
         self.widget.show_loading()
 
-        self._worker = PredictionWorker(self.model, track_id)
+        self._worker = PredictionWorker(self._load_model, track_id)
         self._worker.finished_prediction.connect(self._on_prediction_ready)
         self._worker.start()
 
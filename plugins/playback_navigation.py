@@ -59,7 +59,7 @@ class PlaybackNavigationPlugin(SettingsSyncMixin):
 
     def _persist_setting(self, key: str, value: bool) -> None:
         """Persiste un réglage booléen dans la table plugin_settings."""
-        self.context.database.settings.save(self.name, key, "true" if value else "false")
+        self.context.set_setting(self.name, key, value)
 
     def register_ui(self, ui_builder: UIBuilderProtocol) -> None:
         """Register auto-play and random mode menu and buttons."""
@@ -21,6 +21,10 @@ Advanced filter mode allows arbitrary boolean expressions like
 filtering. Both modes are saveable as presets (button presets store genre states;
 expression presets store the ``_expr`` key).
 
+Filtering is vectorized: the proxy keeps a TrackFilterIndex (lowercased search
+text, genre-code bitmasks, ratings) of the source rows in sync with the model signals,
+computes one numpy accept mask per filter change and only reads it per row.
+
 Events:
 - Subscribes to: TRACKS_ADDED
 - Emits: GENRE_FILTER_CHANGED
@@ -30,11 +34,13 @@ from __future__ import annotations
 
 import json
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from enum import IntEnum
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from PySide6.QtCore import (  # pyright: ignore[reportMissingImports]
+    QAbstractItemModel,
     QModelIndex,
     QPersistentModelIndex,
     QSortFilterProxyModel,
@@ -54,6 +60,7 @@ from PySide6.QtWidgets import (  # pyright: ignore[reportMissingImports]
 )
 
 from jukebox.core.event_bus import Events
+from jukebox.ui.components.track_sort import parse_rating
 
 if TYPE_CHECKING:
     from jukebox.core.protocols import PluginContextProtocol, UIBuilderProtocol
@@ -63,8 +70,26 @@ if TYPE_CHECKING:
 # Genre expression parser
 # ============================================================================
 
-# A compiled genre filter: takes the set of genre codes for a track, returns bool.
-GenreEval = Callable[[set[str]], bool]
+# A parsed expression node: given a "has code" lookup (bool for one track, bool
+# array for many rows), returns the expression value (bool or bool array).
+_HasCode = Callable[[str], Any]
+_ExprNode = Callable[[_HasCode], Any]
+
+
+class GenreExpr:
+    """A compiled genre filter, evaluated on one track or on a whole filter index."""
+
+    def __init__(self, node: _ExprNode) -> None:
+        self._node = node
+
+    def __call__(self, genres: set[str]) -> bool:
+        """Evaluate on the set of genre codes of one track."""
+        return bool(self._node(lambda code: code in genres))
+
+    def mask(self, index: TrackFilterIndex, rows: np.ndarray | None = None) -> np.ndarray:
+        """Evaluate on index rows (all rows if None) with bitmask operations."""
+        result = self._node(lambda code: index.has_code(code, rows))
+        return np.broadcast_to(result, (len(index) if rows is None else len(rows),))
 
 
 class _TokenStream:
@@ -111,33 +136,35 @@ def _tokenize_expr(expr: str) -> list[str]:
     return tokens
 
 
-def _parse_or(stream: _TokenStream, valid: set[str]) -> GenreEval:
+# np.logical_* opèrent aussi bien sur des bool que sur des tableaux de bool :
+# le même arbre sert au test d'une track et au calcul vectorisé du masque.
+def _parse_or(stream: _TokenStream, valid: set[str]) -> _ExprNode:
     left = _parse_and(stream, valid)
     while stream.peek() == "OR":
         stream.consume()
         right = _parse_and(stream, valid)
-        left = (lambda lhs, rhs: lambda g: lhs(g) or rhs(g))(left, right)
+        left = (lambda lhs, rhs: lambda has: np.logical_or(lhs(has), rhs(has)))(left, right)
     return left
 
 
-def _parse_and(stream: _TokenStream, valid: set[str]) -> GenreEval:
+def _parse_and(stream: _TokenStream, valid: set[str]) -> _ExprNode:
     left = _parse_not(stream, valid)
     while stream.peek() == "AND":
         stream.consume()
         right = _parse_not(stream, valid)
-        left = (lambda lhs, rhs: lambda g: lhs(g) and rhs(g))(left, right)
+        left = (lambda lhs, rhs: lambda has: np.logical_and(lhs(has), rhs(has)))(left, right)
     return left
 
 
-def _parse_not(stream: _TokenStream, valid: set[str]) -> GenreEval:
+def _parse_not(stream: _TokenStream, valid: set[str]) -> _ExprNode:
     if stream.peek() == "NOT":
         stream.consume()
         operand = _parse_not(stream, valid)
-        return (lambda o: lambda g: not o(g))(operand)
+        return (lambda o: lambda has: np.logical_not(o(has)))(operand)
     return _parse_atom(stream, valid)
 
 
-def _parse_atom(stream: _TokenStream, valid: set[str]) -> GenreEval:
+def _parse_atom(stream: _TokenStream, valid: set[str]) -> _ExprNode:
     token = stream.peek()
     if token == "(":  # noqa: S105
         stream.consume()
@@ -148,15 +175,17 @@ def _parse_atom(stream: _TokenStream, valid: set[str]) -> GenreEval:
         stream.consume()
         if token not in valid:
             raise ValueError(f"Unknown genre code: '{token}'")
-        return (lambda t: lambda g: t in g)(token)
+        return (lambda t: lambda has: has(t))(token)
     raise ValueError(f"Unexpected token: '{token}'")
 
 
-def compile_genre_expr(expr: str, valid_codes: set[str]) -> GenreEval:
-    """Compile a boolean genre expression string into a callable.
+def compile_genre_expr(expr: str, valid_codes: set[str]) -> GenreExpr:
+    """Compile a boolean genre expression string into a GenreExpr.
 
     Syntax: ``CODE``, ``not EXPR``, ``EXPR and EXPR``, ``EXPR or EXPR``,
     ``( EXPR )``. Codes are case-insensitive. Raises ``ValueError`` on error.
+    The result is callable on a set of codes, and ``mask()`` evaluates it on
+    every row of a TrackFilterIndex at once.
     """
     tokens = _tokenize_expr(expr)
     if not tokens:
@@ -165,7 +194,242 @@ def compile_genre_expr(expr: str, valid_codes: set[str]) -> GenreEval:
     result = _parse_or(stream, {c.upper() for c in valid_codes})
     if not stream.is_empty():
         raise ValueError(f"Unexpected token after expression: '{stream.peek()}'")
-    return result
+    return GenreExpr(result)
+
+
+# ============================================================================
+# Filter index
+# ============================================================================
+
+
+def _parse_genre_codes(genre: str) -> list[str]:
+    """Genre codes of a genre string (``"H-W-*3"`` → ``["H", "W"]``, ``*N`` is the rating)."""
+    codes = []
+    for part in genre.split("-"):
+        code = part.strip()
+        if code and not code.startswith("*"):
+            codes.append(code)
+    return codes
+
+
+def _char_signatures(texts: Sequence[str]) -> np.ndarray:
+    """64-bit character signature of each (non-empty) text: bit ``ord(c) % 64`` per character.
+
+    A text can only contain a word whose signature bits are all set in its own.
+    """
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    codepoints = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+    bits = np.left_shift(np.uint64(1), (codepoints % 64).astype(np.uint64))
+    starts = np.cumsum(lengths) - lengths
+    signatures: np.ndarray = np.bitwise_or.reduceat(bits, starts) if len(texts) else bits
+    return signatures
+
+
+class TrackFilterIndex:
+    """Filter data of every row of a track list, precomputed for the proxy.
+
+    - ``search_text``: lowercased ``"artist title filename"`` per row (numpy
+      str array, searched with ``np.char.find``), with a 64-bit character
+      signature per row that skips the rows which cannot contain a search
+      word before the substring test;
+    - genre codes as bitmasks: one uint64 column per 64 distinct codes;
+    - ratings (``*N`` in the genre string, 0 if none) as an int8 array.
+
+    Built once per model load, then patched on row insertions, removals, data
+    changes and sorts (rows are matched by track dict identity).
+    """
+
+    def __init__(self) -> None:
+        self.search_text = np.zeros(0, dtype=str)
+        self._genres: list[str] = []
+        self._signatures = np.zeros(0, dtype=np.uint64)
+        self._genre_bits = np.zeros((0, 1), dtype=np.uint64)
+        self._ratings = np.zeros(0, dtype=np.int8)
+        self._row_ids = np.zeros(0, dtype=np.int64)
+        # code → (column, bit) in _genre_bits
+        self._code_bits: dict[str, tuple[int, np.uint64]] = {}
+
+    def __len__(self) -> int:
+        return len(self.search_text)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def rebuild(self, tracks: Sequence[dict[str, Any]]) -> None:
+        """Index every row of ``tracks``."""
+        (
+            self.search_text,
+            self._genres,
+            self._signatures,
+            self._genre_bits,
+            self._ratings,
+            self._row_ids,
+        ) = self._rows_data(tracks)
+
+    def insert_rows(self, tracks: Sequence[dict[str, Any]], first: int, last: int) -> None:
+        """Index rows ``first..last`` just inserted into ``tracks``."""
+        text, genres, signatures, genre_bits, ratings, row_ids = self._rows_data(
+            tracks[first : last + 1]
+        )
+        # concatenate (et non np.insert) élargit le dtype str si les textes sont plus longs
+        self.search_text = np.concatenate(
+            (self.search_text[:first], text, self.search_text[first:])
+        )
+        self._genres[first:first] = genres
+        self._signatures = np.insert(self._signatures, first, signatures)
+        self._genre_bits = np.insert(self._genre_bits, first, genre_bits, axis=0)
+        self._ratings = np.insert(self._ratings, first, ratings)
+        self._row_ids = np.insert(self._row_ids, first, row_ids)
+
+    def remove_rows(self, first: int, last: int) -> None:
+        """Drop rows ``first..last``."""
+        del self._genres[first : last + 1]
+        rows = np.arange(first, last + 1)
+        self.search_text = np.delete(self.search_text, rows)
+        self._signatures = np.delete(self._signatures, rows)
+        self._genre_bits = np.delete(self._genre_bits, rows, axis=0)
+        self._ratings = np.delete(self._ratings, rows)
+        self._row_ids = np.delete(self._row_ids, rows)
+
+    def update_rows(self, tracks: Sequence[dict[str, Any]], first: int, last: int) -> np.ndarray:
+        """Re-read rows ``first..last``.
+
+        Returns:
+            The rows whose search text or genre changed.
+        """
+        changed = [
+            row
+            for row in range(first, last + 1)
+            if self._row_text(tracks[row]) != self.search_text[row]
+            or (tracks[row].get("genre") or "") != self._genres[row]
+        ]
+        if changed:
+            text, genres, signatures, genre_bits, ratings, row_ids = self._rows_data(
+                [tracks[row] for row in changed]
+            )
+            if text.dtype.itemsize > self.search_text.dtype.itemsize:
+                # L'affectation tronquerait les textes plus longs que le dtype courant
+                self.search_text = self.search_text.astype(text.dtype)
+            self.search_text[changed] = text
+            for row, genre in zip(changed, genres, strict=True):
+                self._genres[row] = genre
+            self._signatures[changed] = signatures
+            self._genre_bits[changed] = genre_bits
+            self._ratings[changed] = ratings
+            self._row_ids[changed] = row_ids
+        return np.array(changed, dtype=np.int64)
+
+    def reorder(self, tracks: Sequence[dict[str, Any]]) -> np.ndarray | None:
+        """Follow a reordering of the same tracks (sort).
+
+        Returns:
+            ``order`` such that new row i was row ``order[i]``, or None if
+            ``tracks`` is not a permutation of the indexed rows.
+        """
+        if len(tracks) != len(self):
+            return None
+        new_ids = np.fromiter((id(t) for t in tracks), dtype=np.int64, count=len(tracks))
+        by_id = np.argsort(self._row_ids)
+        pos = np.searchsorted(self._row_ids, new_ids, sorter=by_id)
+        order: np.ndarray = by_id[np.minimum(pos, len(by_id) - 1)] if len(by_id) else by_id
+        if not np.array_equal(self._row_ids[order], new_ids):
+            return None
+        self.search_text = self.search_text[order]
+        self._genres = [self._genres[row] for row in order.tolist()]
+        self._signatures = self._signatures[order]
+        self._genre_bits = self._genre_bits[order]
+        self._ratings = self._ratings[order]
+        self._row_ids = new_ids
+        return order
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def has_code(self, code: str, rows: np.ndarray | None = None) -> np.ndarray:
+        """Rows (all rows if None) whose genre contains ``code``."""
+        bits = self._genre_bits if rows is None else self._genre_bits[rows]
+        location = self._code_bits.get(code)
+        if location is None:
+            return np.zeros(len(bits), dtype=bool)
+        column, bit = location
+        result: np.ndarray = (bits[:, column] & bit) != 0
+        return result
+
+    def rating_at_least(self, rating: int, rows: np.ndarray | None = None) -> np.ndarray:
+        """Rows (all rows if None) rated ``rating`` or more."""
+        ratings = self._ratings if rows is None else self._ratings[rows]
+        result: np.ndarray = ratings >= rating
+        return result
+
+    def search(self, words: list[str], rows: np.ndarray) -> np.ndarray:
+        """Which of ``rows`` contain every (lowercase) word in their search text."""
+        matched = np.ones(len(rows), dtype=bool)
+        for word in words:
+            candidates = np.flatnonzero(matched)
+            signature = _char_signatures([word])[0]
+            candidates = candidates[(self._signatures[rows[candidates]] & signature) == signature]
+            hits = np.char.find(self.search_text[rows[candidates]], word) >= 0
+            matched[:] = False
+            matched[candidates[hits]] = True
+        return matched
+
+    # ------------------------------------------------------------------
+    # Private
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row_text(track: dict[str, Any]) -> str:
+        artist = track.get("artist") or ""
+        title = track.get("title") or ""
+        filename = track.get("filename") or ""
+        return f"{artist} {title} {filename}".lower()
+
+    def _rows_data(
+        self, tracks: Sequence[dict[str, Any]]
+    ) -> tuple[np.ndarray, list[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(search texts, genre strings, signatures, genre bitmasks, ratings, row ids) of tracks."""
+        text = [self._row_text(track) for track in tracks]
+        genres = [track.get("genre") or "" for track in tracks]
+
+        # Chaque chaîne de genre distincte n'est parsée qu'une fois
+        genre_ids: dict[str, int] = {}
+        ids = np.fromiter(
+            (genre_ids.setdefault(genre, len(genre_ids)) for genre in genres),
+            dtype=np.int64,
+            count=len(genres),
+        )
+        parsed = [_parse_genre_codes(genre) for genre in genre_ids]
+        for codes in parsed:
+            for code in codes:
+                self._register_code(code)
+        table = np.zeros((len(parsed), self._genre_bits.shape[1]), dtype=np.uint64)
+        for genre_id, codes in enumerate(parsed):
+            for code in codes:
+                column, bit = self._code_bits[code]
+                table[genre_id, column] |= bit
+        ratings = np.array([parse_rating(genre) for genre in genre_ids], dtype=np.int8)
+
+        row_ids = np.fromiter((id(t) for t in tracks), dtype=np.int64, count=len(tracks))
+        return (
+            np.array(text, dtype=str),
+            genres,
+            _char_signatures(text),
+            table[ids],
+            ratings[ids],
+            row_ids,
+        )
+
+    def _register_code(self, code: str) -> None:
+        """Assign a bit to a new genre code, adding a bitmask column when needed."""
+        if code in self._code_bits:
+            return
+        position = len(self._code_bits)
+        column = position // 64
+        if column >= self._genre_bits.shape[1]:
+            self._genre_bits = np.pad(self._genre_bits, ((0, 0), (0, 1)))
+        self._code_bits[code] = (column, np.uint64(1) << np.uint64(position % 64))
 
 
 # ============================================================================
@@ -182,19 +446,60 @@ class GenreFilterState(IntEnum):
 
 
 class GenreFilterProxyModel(QSortFilterProxyModel):
-    """Proxy model that filters tracks by genre and search."""
+    """Proxy model that filters tracks by genre and search.
+
+    Filtering is vectorized: a TrackFilterIndex of the source rows is kept in
+    sync with the source model signals, each filter change computes one numpy
+    accept mask, and filterAcceptsRow only reads it.
+    """
 
     def __init__(self, parent: Any = None) -> None:
         super().__init__(parent)
         self._on_genres: set[str] = set()
         self._off_genres: set[str] = set()
         self._search_text: str = ""
-        self._expr_fn: GenreEval | None = None
+        self._expr_fn: GenreExpr | None = None
+        self._min_rating: int = 0
         self._sort_column: int = -1
         self._sort_order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+        self._index = TrackFilterIndex()
+        self._index_stale = True
+        self._accept: np.ndarray | None = None  # accept mask, None = to recompute
+        self._accept_rows: list[bool] | None = None  # same, for filterAcceptsRow
+        # Masque précédent quand la recherche ne fait que s'allonger (frappe) :
+        # les lignes acceptées ne peuvent que diminuer
+        self._narrow_from: np.ndarray | None = None
         # Réappliquer le tri après un rechargement complet (changement de répertoire).
         self.modelReset.connect(self._schedule_reapply_sort)
 
+    def setSourceModel(self, source_model: QAbstractItemModel) -> None:  # noqa: N802
+        """Track source changes to keep the filter index up to date.
+
+        The slots are connected before QSortFilterProxyModel's own ones so the
+        index is patched before the proxy re-filters the changed rows.
+        """
+        previous = self.sourceModel()
+        if previous is not None:
+            for signal, slot in self._source_connections(previous):
+                try:
+                    signal.disconnect(slot)
+                except (RuntimeError, TypeError) as e:
+                    logging.debug("[Search & Filter] Déconnexion ignorée : %s", e)
+        if source_model is not None:
+            for signal, slot in self._source_connections(source_model):
+                signal.connect(slot)
+        self._mark_index_stale()
+        super().setSourceModel(source_model)
+
+    def _source_connections(self, model: QAbstractItemModel) -> list[tuple[Any, Any]]:
+        return [
+            (model.modelReset, self._mark_index_stale),
+            (model.layoutChanged, self._on_source_layout_changed),
+            (model.rowsInserted, self._on_source_rows_inserted),
+            (model.rowsRemoved, self._on_source_rows_removed),
+            (model.dataChanged, self._on_source_data_changed),
+        ]
+
     def _schedule_reapply_sort(self) -> None:
         """Diffère _reapply_sort : modelReset se déclenche avant le rechargement des tracks."""
         QTimer.singleShot(0, self._reapply_sort)
@@ -209,19 +514,32 @@ class GenreFilterProxyModel(QSortFilterProxyModel):
             self.invalidate()
 
     def set_search_text(self, text: str) -> None:
-        self._search_text = text.lower()
+        text = text.lower()
+        if self._accept is not None and text.startswith(self._search_text):
+            self._narrow_from = self._accept
+        self._search_text = text
+        self._invalidate_accept(keep_narrowing=True)
         self.invalidateFilter()
         self._reapply_sort()
 
     def set_genre_filter(self, on_genres: set[str], off_genres: set[str]) -> None:
         self._on_genres = on_genres
         self._off_genres = off_genres
+        self._invalidate_accept()
         self.invalidateFilter()
         self._reapply_sort()
 
-    def set_genre_expr(self, expr_fn: GenreEval | None) -> None:
+    def set_genre_expr(self, expr_fn: GenreExpr | None) -> None:
         """Set a compiled expression filter (overrides ON/OFF buttons when not None)."""
         self._expr_fn = expr_fn
+        self._invalidate_accept()
+        self.invalidateFilter()
+        self._reapply_sort()
+
+    def set_min_rating(self, rating: int) -> None:
+        """Only accept tracks rated ``rating`` or more (0 = no rating filter)."""
+        self._min_rating = rating
+        self._invalidate_accept()
         self.invalidateFilter()
         self._reapply_sort()
 
@@ -230,45 +548,126 @@ class GenreFilterProxyModel(QSortFilterProxyModel):
         source_row: int,
         source_parent: QModelIndex | QPersistentModelIndex,
     ) -> bool:
+        # Appelé une fois par ligne par Qt : une simple lecture de liste
+        accept = self._accept_rows
+        if accept is None:
+            accept = self._accept_mask(self._source_tracks()).tolist()
+            self._accept_rows = accept
+        return accept[source_row] if source_row < len(accept) else True
+
+    # ------------------------------------------------------------------
+    # Accept mask
+    # ------------------------------------------------------------------
+
+    def _source_tracks(self) -> list[dict[str, Any]]:
         source_model = self.sourceModel()
         if source_model is None:
-            return True
-
+            return []
         tracks: list[dict[str, Any]] = getattr(source_model, "tracks", [])
-        if source_row >= len(tracks):
-            return True
+        return tracks
+
+    def _accept_mask(self, tracks: list[dict[str, Any]]) -> np.ndarray:
+        """Accept mask of every source row (rebuilds the index if stale)."""
+        if self._index_stale or len(self._index) != len(tracks):
+            self._index.rebuild(tracks)
+            self._index_stale = False
+            self._invalidate_accept()
+        if self._accept is None:
+            self._accept = self._compute_accept(np.arange(len(self._index)), self._narrow_from)
+            self._narrow_from = None
+        return self._accept
+
+    def _compute_accept(self, rows: np.ndarray, narrow_from: np.ndarray | None) -> np.ndarray:
+        """Evaluate the current filters on index rows."""
+        index = self._index
+        accept = np.ones(len(rows), dtype=bool)
+        if narrow_from is not None and len(narrow_from) == len(rows):
+            accept &= narrow_from
 
-        track = tracks[source_row]
+        # Advanced expression filter (overrides ON/OFF when active)
+        if self._expr_fn is not None:
+            accept &= self._expr_fn.mask(index, rows)
+        else:
+            for code in self._on_genres:
+                accept &= index.has_code(code, rows)
+            for code in self._off_genres:
+                accept &= ~index.has_code(code, rows)
+
+        # Rating filter
+        if self._min_rating > 0:
+            accept &= index.rating_at_least(self._min_rating, rows)
 
         # Search filter: every word must appear in at least one field
-        if self._search_text:
-            artist = (track.get("artist") or "").lower()
-            title = (track.get("title") or "").lower()
-            filename = (track.get("filename") or "").lower()
-            haystack = f"{artist} {title} {filename}"
-            for word in self._search_text.split():
-                if word not in haystack:
-                    return False
-
-        # Parse track genre codes
-        genre_str = track.get("genre", "") or ""
-        track_genres: set[str] = set()
-        for part in genre_str.split("-"):
-            code = part.strip()
-            if code and not code.startswith("*"):
-                track_genres.add(code)
+        words = self._search_text.split()
+        if words:
+            candidates = np.flatnonzero(accept)
+            accept[candidates] = index.search(words, rows[candidates])
+        return accept
+
+    def _invalidate_accept(self, *, keep_narrowing: bool = False) -> None:
+        self._accept = None
+        self._accept_rows = None
+        if not keep_narrowing:
+            self._narrow_from = None
+
+    def _mark_index_stale(self) -> None:
+        self._index_stale = True
+        self._invalidate_accept()
 
-        # Advanced expression filter (overrides ON/OFF when active)
-        if self._expr_fn is not None:
-            return self._expr_fn(track_genres)
+    # ------------------------------------------------------------------
+    # Source model changes
+    # ------------------------------------------------------------------
 
-        # Button-based ON/OFF filter
-        if not self._on_genres and not self._off_genres:
-            return True
-        for g in self._on_genres:
-            if g not in track_genres:
-                return False
-        return all(g not in track_genres for g in self._off_genres)
+    def _on_source_layout_changed(self, *_args: Any) -> None:
+        """Sort: permute the index and the accept mask instead of rebuilding them."""
+        if self._index_stale:
+            return
+        order = self._index.reorder(self._source_tracks())
+        if order is None:
+            self._mark_index_stale()
+        elif self._accept is not None:
+            self._accept = self._accept[order]
+            self._accept_rows = None
+
+    def _on_source_rows_inserted(
+        self, _parent: QModelIndex | QPersistentModelIndex, first: int, last: int
+    ) -> None:
+        if self._index_stale:
+            return
+        self._index.insert_rows(self._source_tracks(), first, last)
+        if self._accept is not None:
+            accept = self._compute_accept(np.arange(first, last + 1), None)
+            self._accept = np.insert(self._accept, first, accept)
+            self._accept_rows = None
+
+    def _on_source_rows_removed(
+        self, _parent: QModelIndex | QPersistentModelIndex, first: int, last: int
+    ) -> None:
+        if self._index_stale:
+            return
+        self._index.remove_rows(first, last)
+        if self._accept is not None:
+            self._accept = np.delete(self._accept, np.arange(first, last + 1))
+            self._accept_rows = None
+
+    def _on_source_data_changed(
+        self, top_left: QModelIndex, bottom_right: QModelIndex, *_roles: Any
+    ) -> None:
+        tracks = self._source_tracks()
+        if self._index_stale or len(self._index) != len(tracks):
+            self._mark_index_stale()
+            return
+        first, last = top_left.row(), bottom_right.row()
+        if first < 0 or last < first:
+            return
+        if last - first + 1 > len(tracks) // 2:
+            # Mise à jour globale (ex. vérification des fichiers manquants) : reconstruire
+            self._mark_index_stale()
+            return
+        changed = self._index.update_rows(tracks, first, last)
+        if changed.size and self._accept is not None:
+            self._accept[changed] = self._compute_accept(changed, None)
+            self._accept_rows = None
 
     def sort(
         self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
@@ -357,7 +756,7 @@ class SearchAndFilterPlugin:
 
     Both sets share ``_genre_states`` and the advanced expression ``_advanced_expr``
     across mode switches. When ``_advanced_active`` is True the proxy uses a
-    compiled ``GenreEval`` instead of the ON/OFF sets.
+    compiled ``GenreExpr`` instead of the ON/OFF sets.
 
     Active in: jukebox, cue_maker modes
     """
@@ -41,7 +41,11 @@ from jukebox.core.event_bus import Events
 from plugins.video_exporter.layers.vjing_layer import VJingLayer
 
 if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
     from jukebox.core.protocols import PluginContextProtocol
+    from plugins.video_exporter.preview_worker import PreviewPlaybackWorker
+    from plugins.video_exporter.renderers.preview_renderer import PreviewRenderer
 
 
 # Resolution presets: name -> (width, height)
@@ -70,6 +74,16 @@ PALETTE_NAMES: dict[str, str] = {
 }
 
 
+def _format_duration(seconds: float) -> str:
+    """Format a duration as "1 h 02 min", "3 min 05 s" or "12 s"."""
+    seconds = round(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+    if seconds >= 60:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds} s"
+
+
 class PaletteButton(QPushButton):
     """Button showing color palette preview."""
 
@@ -87,8 +101,7 @@ class PaletteButton(QPushButton):
             stops.append(f"stop:{pos:.2f} rgb({r},{g},{b})")
 
         gradient = ", ".join(stops)
-        self.setStyleSheet(
-            f"""
+        self.setStyleSheet(f"""
             QPushButton {{
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:0, {gradient});
                 border: 2px solid #444;
@@ -100,8 +113,7 @@ class PaletteButton(QPushButton):
             QPushButton:hover {{
                 border: 2px solid #888;
             }}
-        """
-        )
+        """)
 
 
 class EffectPreviewDialog(QDialog):
@@ -171,8 +183,7 @@ class EffectPreviewDialog(QDialog):
 
     def _setup_ui(self) -> None:
         """Set up the dialog UI."""
-        self.setStyleSheet(
-            """
+        self.setStyleSheet("""
             QDialog { background: #2b2b2b; }
             QLabel { color: #ffffff; }
             QPushButton {
@@ -184,8 +195,7 @@ class EffectPreviewDialog(QDialog):
             }
             QPushButton:hover { background: #4a4a4a; }
             QPushButton:pressed { background: #0078d4; }
-        """
-        )
+        """)
 
         layout = QVBoxLayout(self)
 
@@ -458,12 +468,14 @@ class ExportDialog(QDialog):
 
         # Preview state
         self._preview_renderer = None
+        self._preview: PreviewRenderer | None = None
+        self._preview_worker: PreviewPlaybackWorker | None = None
+        # Résolution interne de la preview (fraction de l'export), réduite si trop lente
+        self._preview_scale = context.config.video_exporter.preview_scale
         self._preview_audio = None
         self._preview_sr = AUDIO_SAMPLE_RATE
         self._preview_playing = False
         self._preview_frame = 0
-        self._preview_timer = QTimer(self)
-        self._preview_timer.timeout.connect(self._update_preview_frame)
 
         # Local VLC player for preview (independent from main app player)
         self._vlc_instance = vlc.Instance()
@@ -501,44 +513,49 @@ class ExportDialog(QDialog):
         if self._preview_renderer is None or self._preview_audio is None:
             return
 
+        # Le thread de lecture utilise l'ancien renderer : arrêté avant remplacement
+        playing = self._stop_preview_worker()
+        self._create_preview_renderer()
+        if playing:
+            self._start_preview_worker()
+        else:
+            self._refresh_preview_frame()
+
+    def _create_preview_renderer(self) -> None:
+        """Build the preview renderer from the current settings (audio loaded)."""
         from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+        from plugins.video_exporter.renderers.preview_renderer import (
+            PreviewRenderer,
+            preview_size,
+        )
 
+        config = self.context.config.video_exporter
         duration = self.loop_end - self.loop_start
         fps = self.fps_spin.value()
         resolution = RESOLUTION_PRESETS[self.resolution_combo.currentText()]
-        scale = min(1.0, 480 / resolution[1])
+        preview_width, preview_height = preview_size(*resolution, self._preview_scale)
 
-        self._preview_renderer = FrameRenderer(
-            width=int(resolution[0] * scale),
-            height=int(resolution[1] * scale),
+        renderer = FrameRenderer(
+            width=preview_width,
+            height=preview_height,
             fps=fps,
-            audio=self._preview_audio,
+            audio=self._preview_audio,  # type: ignore[arg-type]
             sr=int(self._preview_sr),
             duration=duration,
-            layers_config={
-                "waveform": self.waveform_check.isChecked(),
-                "text": self.text_check.isChecked(),
-                "dynamics": self.dynamics_check.isChecked(),
-                "vjing": self.vjing_check.isChecked(),
-                "video_background": self.video_bg_check.isChecked(),
-            },
+            layers_config=self._get_preview_layers_config(),
             track_metadata=self.track_metadata,
             video_clips_folder=self.video_folder_edit.text(),
-            vjing_mappings={
-                m.letter: m.get_effects() for m in self.context.config.video_exporter.vjing_mappings
-            },
+            vjing_mappings={m.letter: m.get_effects() for m in config.vjing_mappings},
             vjing_preset=self.vjing_preset_combo.currentData(),
-            vjing_presets={
-                p.name: p.effects for p in self.context.config.video_exporter.vjing_presets
-            },
+            vjing_presets={p.name: p.effects for p in config.vjing_presets},
             waveform_config={
-                "height_ratio": self.context.config.video_exporter.waveform_height_ratio,
-                "bass_color": self.context.config.video_exporter.waveform_bass_color,
-                "mid_color": self.context.config.video_exporter.waveform_mid_color,
-                "treble_color": self.context.config.video_exporter.waveform_treble_color,
-                "cursor_color": self.context.config.video_exporter.waveform_cursor_color,
+                "height_ratio": config.waveform_height_ratio,
+                "bass_color": config.waveform_bass_color,
+                "mid_color": config.waveform_mid_color,
+                "treble_color": config.waveform_treble_color,
+                "cursor_color": config.waveform_cursor_color,
             },
-            use_gpu=True,
+            use_gpu=True,  # GPU shaders now support dynamic palettes
             effect_intensities=self._get_effect_intensities(),
             color_palette=self._get_selected_palette(),
             audio_sensitivity=self._get_audio_sensitivity(),
@@ -550,13 +567,35 @@ class ExportDialog(QDialog):
             ],
             intro_video_path=self.intro_video_edit.text(),
             rng_seed=self._rng_seed,
+            vjing_analysis_cache_dir=config.vjing_analysis_cache_directory,
+        )
+        self._preview_renderer = renderer
+        # Keyframes toutes les N frames (adapté au coût mesuré), frames intermédiaires
+        # interpolées
+        self._preview = PreviewRenderer(
+            renderer,
+            total_frames=int(duration * fps),
+            max_frame_step=config.preview_max_frame_step,
         )
-        self._refresh_preview_frame()
+
+    def _get_preview_layers_config(self) -> dict[str, Any]:
+        """Get the layer settings of the preview (same layers as the export)."""
+        config = self.context.config.video_exporter
+        return {
+            "waveform": self.waveform_check.isChecked(),
+            "text": self.text_check.isChecked(),
+            "dynamics": self.dynamics_check.isChecked(),
+            "vjing": self.vjing_check.isChecked(),
+            "video_background": self.video_bg_check.isChecked(),
+            "milkdrop_enabled": self.milkdrop_check.isChecked(),
+            "milkdrop_preset_path": config.milkdrop_preset_path,
+            "milkdrop_preset_duration": config.milkdrop_preset_duration,
+            "milkdrop_hard_cut_on_beat": config.milkdrop_hard_cut_on_beat,
+        }
 
     def _apply_dark_style(self) -> None:
         """Apply dark mode compatible styling."""
-        self.setStyleSheet(
-            """
+        self.setStyleSheet("""
             QTabWidget::pane {
                 border: 1px solid #555;
                 background: #2b2b2b;
@@ -624,8 +663,7 @@ class ExportDialog(QDialog):
                 background: #0078d4;
                 border-radius: 3px;
             }
-        """
-        )
+        """)
 
     def _get_metadata(self, key: str, default: str = "Unknown") -> str:
         """Get metadata value safely from sqlite3.Row or dict.
@@ -1180,25 +1218,20 @@ class ExportDialog(QDialog):
         """Load audio and initialize preview renderer."""
         try:
             import librosa  # type: ignore[import-untyped]
-
-            from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
         except ImportError as e:
             self.preview_info_label.setText(f"Error: {e}")
             return
 
+        self._stop_preview_playback()
+        self._vlc_player.stop()
         self.preview_load_btn.setEnabled(False)
         self.preview_info_label.setText("Loading audio...")
         self.preview_label.setText("Loading...")
         self._update_preview_label_size()
 
-        # Get preview settings
         duration = self.loop_end - self.loop_start
         fps = self.fps_spin.value()
-        resolution = RESOLUTION_PRESETS[self.resolution_combo.currentText()]
-        # Use smaller resolution for preview (max 480p)
-        scale = min(1.0, 480 / resolution[1])
-        preview_width = int(resolution[0] * scale) // 4 * 4
-        preview_height = int(resolution[1] * scale) // 4 * 4
+        self._preview_scale = self.context.config.video_exporter.preview_scale
 
         try:
             # Load audio
@@ -1209,61 +1242,7 @@ class ExportDialog(QDialog):
                 duration=duration,
                 mono=True,
             )
-
-            # Build config for renderer
-            layers_config = {
-                "waveform": self.waveform_check.isChecked(),
-                "text": self.text_check.isChecked(),
-                "dynamics": self.dynamics_check.isChecked(),
-                "vjing": self.vjing_check.isChecked(),
-                "video_background": self.video_bg_check.isChecked(),
-                "milkdrop_enabled": self.milkdrop_check.isChecked(),
-                "milkdrop_preset_path": self.context.config.video_exporter.milkdrop_preset_path,
-                "milkdrop_preset_duration": self.context.config.video_exporter.milkdrop_preset_duration,
-                "milkdrop_hard_cut_on_beat": self.context.config.video_exporter.milkdrop_hard_cut_on_beat,
-            }
-
-            waveform_config = {
-                "height_ratio": self.context.config.video_exporter.waveform_height_ratio,
-                "bass_color": self.context.config.video_exporter.waveform_bass_color,
-                "mid_color": self.context.config.video_exporter.waveform_mid_color,
-                "treble_color": self.context.config.video_exporter.waveform_treble_color,
-                "cursor_color": self.context.config.video_exporter.waveform_cursor_color,
-            }
-
-            # Create renderer
-            self._preview_renderer = FrameRenderer(
-                width=preview_width,
-                height=preview_height,
-                fps=fps,
-                audio=self._preview_audio,
-                sr=int(self._preview_sr),
-                duration=duration,
-                layers_config=layers_config,
-                track_metadata=self.track_metadata,
-                video_clips_folder=self.video_folder_edit.text(),
-                vjing_mappings={
-                    m.letter: m.get_effects()
-                    for m in self.context.config.video_exporter.vjing_mappings
-                },
-                vjing_preset=self.vjing_preset_combo.currentData(),
-                vjing_presets={
-                    p.name: p.effects for p in self.context.config.video_exporter.vjing_presets
-                },
-                waveform_config=waveform_config,
-                use_gpu=True,  # GPU shaders now support dynamic palettes
-                effect_intensities=self._get_effect_intensities(),
-                color_palette=self._get_selected_palette(),
-                audio_sensitivity=self._get_audio_sensitivity(),
-                transitions_enabled=True,
-                simultaneous_effects=self.simultaneous_effects_spin.value(),
-                use_all_effects=self.use_all_effects_check.isChecked(),
-                enabled_post_processing=[
-                    eid for eid, cb in self.pp_effect_checks.items() if cb.isChecked()
-                ],
-                intro_video_path=self.intro_video_edit.text(),
-                rng_seed=self._rng_seed,
-            )
+            self._create_preview_renderer()
 
             # Update UI
             total_frames = int(duration * fps)
@@ -1277,9 +1256,6 @@ class ExportDialog(QDialog):
             self.preview_refresh_btn.setEnabled(True)
             self.preview_load_btn.setEnabled(True)
             self.preview_load_btn.setText("Reload")
-            self.preview_info_label.setText(
-                f"Preview ready: {preview_width}x{preview_height} @ {fps}fps"
-            )
 
             # Render first frame
             self._refresh_preview_frame()
@@ -1294,14 +1270,12 @@ class ExportDialog(QDialog):
         """Handle tab change - stop preview playback when leaving Preview tab."""
         # Preview tab is at index 2
         if index != 2 and self._preview_playing:
-            self._preview_timer.stop()
+            self._stop_preview_playback()
             self._vlc_player.stop()
-            self._preview_playing = False
-            self.preview_play_btn.setText("Play")
 
     def _on_preview_time_changed(self, value: int) -> None:
         """Handle preview time slider change."""
-        if self._preview_renderer is None:
+        if self._preview is None:
             return
 
         self._preview_frame = value
@@ -1309,28 +1283,23 @@ class ExportDialog(QDialog):
         time_pos = value / fps
         self.preview_time_label.setText(f"{time_pos:.1f}s")
 
-        # Reposition local VLC player if playing
         if self._preview_playing:
+            # Reposition local VLC player and restart playback from the new frame
             position_ms = int((self.loop_start + time_pos) * 1000)
             self._vlc_player.set_time(position_ms)
-
-        # Only refresh if not playing (to avoid double rendering)
-        if not self._preview_playing:
+            self._stop_preview_worker()
+            self._start_preview_worker()
+        else:
             self._refresh_preview_frame()
 
     def _toggle_preview_playback(self) -> None:
         """Toggle preview playback."""
         if self._preview_playing:
-            # Stop
-            self._preview_timer.stop()
-            self._preview_playing = False
-            self.preview_play_btn.setText("Play")
+            self._stop_preview_playback()
             # Pause local VLC player
             self._vlc_player.pause()
         else:
-            # Start
             fps = self.fps_spin.value()
-            interval = int(1000 / fps)  # milliseconds per frame
 
             # Load audio file in local VLC player
             media = self._vlc_instance.media_new(str(self.filepath))  # type: ignore[attr-defined]
@@ -1341,65 +1310,142 @@ class ExportDialog(QDialog):
             position_ms = int((self.loop_start + preview_time) * 1000)
             QTimer.singleShot(VLC_SEEK_DELAY_MS, lambda: self._vlc_player.set_time(position_ms))
 
-            self._preview_timer.start(interval)
-            self._preview_playing = True
+            self._start_preview_worker()
             self.preview_play_btn.setText("Pause")
 
-    def _update_preview_frame(self) -> None:
-        """Update preview frame (called by timer)."""
-        if self._preview_renderer is None:
+    def _start_preview_worker(self) -> None:
+        """Stream preview frames from the current frame, rendered in a thread."""
+        from plugins.video_exporter.preview_worker import PreviewPlaybackWorker
+
+        if self._preview is None:
             return
+        self._preview_worker = PreviewPlaybackWorker(self._preview, self._preview_frame)
+        self._preview_worker.frame_ready.connect(self._on_preview_frame_ready)
+        self._preview_worker.looped.connect(self._on_preview_looped)
+        self._preview_worker.too_slow.connect(self._on_preview_too_slow)
+        self._preview_worker.error.connect(self._on_preview_error)
+        self._preview_worker.start()
+        self._preview_playing = True
 
-        # Advance frame
-        self._preview_frame += 1
-        max_frame = self.preview_time_slider.maximum()
-        if self._preview_frame > max_frame:
-            self._preview_frame = 0  # Loop
-            # Reposition local VLC player to loop start
-            self._vlc_player.set_time(int(self.loop_start * 1000))
+    def _stop_preview_worker(self) -> bool:
+        """Stop the playback thread (VLC is left as is).
+
+        Returns:
+            Whether playback was running.
+        """
+        worker, self._preview_worker = self._preview_worker, None
+        if worker is not None:
+            worker.stop()
+            worker.wait()
+            # Frames encore en file : ignorées par _on_preview_frame_ready
+            worker.frame_ready.disconnect(self._on_preview_frame_ready)
+        return worker is not None
+
+    def _stop_preview_playback(self) -> None:
+        """Stop preview playback (VLC is left as is)."""
+        self._stop_preview_worker()
+        self._preview_playing = False
+        self.preview_play_btn.setText("Play")
+
+    def _on_preview_frame_ready(self, frame_idx: int, frame: NDArray[np.uint8]) -> None:
+        """Show a frame streamed by the playback thread."""
+        self._preview_frame = frame_idx
 
         # Update slider (without triggering refresh)
         self.preview_time_slider.blockSignals(True)
-        self.preview_time_slider.setValue(self._preview_frame)
+        self.preview_time_slider.setValue(frame_idx)
         self.preview_time_slider.blockSignals(False)
 
-        # Update time label
         fps = self.fps_spin.value()
-        time_pos = self._preview_frame / fps
-        self.preview_time_label.setText(f"{time_pos:.1f}s")
+        self.preview_time_label.setText(f"{frame_idx / fps:.1f}s")
+        self._show_preview_frame(frame)
+        if self._preview_worker is not None:
+            self._preview_worker.frame_shown()
+        # Pas de keyframe ni de projection à chaque frame : une mise à jour par seconde
+        if frame_idx % fps == 0:
+            self._update_preview_info()
+
+    def _on_preview_looped(self) -> None:
+        """Reposition local VLC player to loop start."""
+        self._vlc_player.set_time(int(self.loop_start * 1000))
+
+    def _on_preview_too_slow(self) -> None:
+        """Halve the preview resolution when keyframes cannot keep up."""
+        from plugins.video_exporter.renderers.preview_renderer import MIN_PREVIEW_SCALE
+
+        if self._preview_scale / 2 < MIN_PREVIEW_SCALE:
+            return
+        self._preview_scale /= 2
+        logging.info(f"[Export Dialog] Preview too slow, scale reduced to {self._preview_scale}")
+        self._reload_preview_if_active()
 
-        # Render frame
-        self._refresh_preview_frame()
+    def _on_preview_error(self, error: str) -> None:
+        """Stop playback after a rendering error."""
+        self._stop_preview_playback()
+        self._vlc_player.pause()
+        self.preview_info_label.setText(f"Error: {error}")
 
     def _refresh_preview_frame(self) -> None:
         """Render and display the current preview frame."""
-        if self._preview_renderer is None:
+        if self._preview is None or self._preview_worker is not None:
             return
 
         try:
-            fps = self.fps_spin.value()
-            time_pos = self._preview_frame / fps
+            self._show_preview_frame(self._preview.render(self._preview_frame))
+            self._update_preview_info()
+        except Exception:
+            logging.exception("[Export Dialog] Preview render failed")
 
-            # Render frame
-            frame = self._preview_renderer.render_frame(self._preview_frame, time_pos)
+    def _show_preview_frame(self, frame: NDArray[np.uint8]) -> None:
+        """Display a preview frame, upscaled to the preview label."""
+        # Convert numpy array to QPixmap
+        height, width, channels = frame.shape
+        bytes_per_line = channels * width
+        qimage = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
+        pixmap = QPixmap.fromImage(qimage)
+
+        # Scale to fit label while preserving aspect ratio
+        label_size = self.preview_label.size()
+        pixmap = pixmap.scaled(
+            label_size,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        self.preview_label.setPixmap(pixmap)
 
-            # Convert numpy array to QPixmap
-            height, width, channels = frame.shape
-            bytes_per_line = channels * width
-            qimage = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-            pixmap = QPixmap.fromImage(qimage)
+    def _update_preview_info(self) -> None:
+        """Show the preview settings and the export time projected from layer costs."""
+        from plugins.video_exporter.export_worker import export_worker_count
+        from plugins.video_exporter.renderers.preview_renderer import project_export_time
 
-            # Scale to fit label while preserving aspect ratio
-            label_size = self.preview_label.size()
-            pixmap = pixmap.scaled(
-                label_size,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
+        if self._preview is None:
+            return
+        renderer = self._preview.renderer
+        fps = renderer.fps
+        info = (
+            f"Preview: {renderer.width}x{renderer.height} "
+            f"({self._preview_scale:.0%} of export) @ {fps}fps, "
+            f"keyframe every {self._preview.frame_step} frame(s)"
+        )
+        timings = renderer.layer_timings()
+        if timings:
+            workers = export_worker_count(self._get_preview_layers_config())
+            projected = project_export_time(
+                timings,
+                (renderer.width, renderer.height),
+                RESOLUTION_PRESETS[self.resolution_combo.currentText()],
+                self._preview.total_frames,
+                workers,
             )
-            self.preview_label.setPixmap(pixmap)
-
-        except Exception:
-            logging.exception("[Export Dialog] Preview render failed")
+            info += f" — projected export rendering: {_format_duration(sum(projected.values()))}"
+            self.preview_info_label.setToolTip(
+                f"Projected rendering time per layer ({workers} worker(s), encoding excluded):\n"
+                + "\n".join(
+                    f"{name}: {_format_duration(seconds)}"
+                    for name, seconds in sorted(projected.items(), key=lambda item: -item[1])
+                )
+            )
+        self.preview_info_label.setText(info)
 
     def _preview_single_effect(self, effect_id: str, effect_name: str) -> None:
         """Open a preview dialog for a single effect.
@@ -1546,6 +1592,20 @@ class ExportDialog(QDialog):
             "ffmpeg_pixel_format": self.context.config.video_exporter.ffmpeg_pixel_format,
             "ffmpeg_audio_codec": self.context.config.video_exporter.ffmpeg_audio_codec,
             "ffmpeg_audio_bitrate": self.context.config.video_exporter.ffmpeg_audio_bitrate,
+            # Frame rendering backend (threads / processes)
+            "render_backend": self.context.config.video_exporter.render_backend,
+            # Cache de l'analyse audio VJing
+            "vjing_analysis_cache_directory": (
+                self.context.config.video_exporter.vjing_analysis_cache_directory
+            ),
+            # Segments encodés réutilisables (reprise d'un export interrompu)
+            "export_segment_seconds": self.context.config.video_exporter.export_segment_seconds,
+            "export_segment_cache_directory": (
+                self.context.config.video_exporter.export_segment_cache_directory
+            ),
+            "export_segment_cache_max_gb": (
+                self.context.config.video_exporter.export_segment_cache_max_gb
+            ),
         }
 
     def reject(self) -> None:
@@ -1553,8 +1613,7 @@ class ExportDialog(QDialog):
         if self.worker and self.worker.isRunning():
             self._on_cancel()
             return
-        if self._preview_timer.isActive():
-            self._preview_timer.stop()
+        self._stop_preview_worker()
         try:
             self._vlc_player.stop()
         except Exception as e:
@@ -1568,8 +1627,7 @@ class ExportDialog(QDialog):
             event.ignore()
             self._on_cancel()
             return
-        if self._preview_timer.isActive():
-            self._preview_timer.stop()
+        self._stop_preview_worker()
         try:
             self._vlc_player.stop()
             self._vlc_player.release()  # type: ignore[attr-defined]
@@ -1577,14 +1635,14 @@ class ExportDialog(QDialog):
         except Exception as e:
             logging.debug(f"VLC cleanup error: {e}")
         self._preview_renderer = None
+        self._preview = None
         self._preview_audio = None
         super().closeEvent(event)
 
     def _start_export(self) -> None:
         """Start the video export process."""
         # Stop preview playback
-        if self._preview_timer.isActive():
-            self._preview_timer.stop()
+        self._stop_preview_worker()
         self._vlc_player.stop()
         self._preview_playing = False
         self.preview_play_btn.setText("Play")
@@ -1729,8 +1787,7 @@ class ExportDialog(QDialog):
     def _on_cancel(self) -> None:
         """Handle cancel button click."""
         # Stop preview playback
-        if self._preview_timer.isActive():
-            self._preview_timer.stop()
+        self._stop_preview_worker()
         self._vlc_player.stop()
 
         if self.worker and self.worker.isRunning():
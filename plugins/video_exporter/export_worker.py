@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
@@ -14,11 +15,27 @@ from PySide6.QtCore import QThread, Signal
 from jukebox.core.constants import AUDIO_SAMPLE_RATE
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from numpy.typing import NDArray
 
     from jukebox.core.protocols import PluginContextProtocol
 
 
+def export_worker_count(layers_config: dict[str, Any]) -> int:
+    """Get the number of frames an export renders in parallel.
+
+    Args:
+        layers_config: Layer settings of the export ("layers" of the config).
+    """
+    # MilkDrop exige un rendu séquentiel : le pré-rendu full-résolution
+    # cacherait des Go de frames PIL et crasherait projectM (SIGSEGV).
+    # L'ordre des presets dépend aussi du séquencement des frames.
+    if layers_config.get("milkdrop_enabled", False):
+        return 1
+    return min(os.cpu_count() or 4, 8)
+
+
 class VideoExportWorker(QThread):
     """Worker thread for rendering and encoding video frames."""
 
@@ -43,14 +60,11 @@ class VideoExportWorker(QThread):
         self.config = config
         self.context = context
         self._cancelled = False
-        # MilkDrop exige un rendu séquentiel : le pré-rendu full-résolution
-        # cacherait des Go de frames PIL et crasherait projectM (SIGSEGV).
-        # L'ordre des presets dépend aussi du séquencement des frames.
-        milkdrop_active = config.get("layers", {}).get("milkdrop_enabled", False)
-        if milkdrop_active:
-            self._num_workers = 1
-        else:
-            self._num_workers = min(os.cpu_count() or 4, 8)
+        self._num_workers = export_worker_count(config.get("layers", {}))
+        # "threads" ou "processes" (RenderFarm : pas de GIL partagé entre workers)
+        self._use_processes = (
+            config.get("render_backend", "threads") == "processes" and self._num_workers > 1
+        )
 
     def run(self) -> None:
         """Run the export process."""
@@ -73,8 +87,16 @@ class VideoExportWorker(QThread):
             self.error.emit(f"Missing dependency: {e}. Install with: pip install librosa")
             return
 
-        from plugins.video_exporter.renderers.ffmpeg_encoder import FFmpegEncoder
+        from plugins.video_exporter.renderers.ffmpeg_encoder import FFmpegEncoder, mux_segments
         from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+        from plugins.video_exporter.renderers.segment_cache import (
+            DEFAULT_CACHE_MAX_GB,
+            SegmentCache,
+            SegmentWriter,
+            export_fingerprint,
+            export_name,
+            plan_segments,
+        )
 
         # Extract config
         filepath = self.config["filepath"]
@@ -120,11 +142,10 @@ class VideoExportWorker(QThread):
                 "treble_color": self.config.get("waveform_treble_color"),
                 "cursor_color": self.config.get("waveform_cursor_color"),
             }
-            renderer = FrameRenderer(
+            renderer_kwargs = dict(
                 width=width,
                 height=height,
                 fps=fps,
-                audio=audio,
                 sr=int(sr),  # librosa.load() renvoie int | float, FrameRenderer attend int
                 duration=duration,
                 layers_config=layers_config,
@@ -143,56 +164,153 @@ class VideoExportWorker(QThread):
                 enabled_post_processing=self.config.get("enabled_post_processing", []),
                 intro_video_path=self.config.get("intro_video_path", ""),
                 rng_seed=self.config.get("rng_seed", 42),
+                vjing_analysis_cache_dir=self.config.get("vjing_analysis_cache_directory", ""),
             )
+            renderer = FrameRenderer(audio=audio, **renderer_kwargs)
         except Exception as e:
             self.error.emit(f"Failed to initialize renderer: {e}")
             return
 
         # Pre-render GPU effects before parallel workers start
-        # (OpenGL contexts are not thread-safe, so we cache GPU frames first)
-        if self._num_workers > 1:
+        # (OpenGL contexts are not thread-safe, so we cache GPU frames first;
+        # render processes each have their own context)
+        if self._num_workers > 1 and not self._use_processes:
             self.status.emit("Pre-rendering GPU effects...")
             gpu_frames = renderer.prerender_gpu()
             if gpu_frames > 0:
                 logging.info(f"[Video Export Worker] Pre-rendered {gpu_frames} GPU frames")
 
+        fade_duration = self.config.get("fade_duration", 1.0)
+        video_kwargs = {
+            "video_codec": self.config.get("ffmpeg_video_codec", "libx264"),
+            "preset": self.config.get("ffmpeg_preset", "medium"),
+            "crf": self.config.get("ffmpeg_crf", 23),
+            "pixel_format": self.config.get("ffmpeg_pixel_format", "yuv420p"),
+            # Constrained CRF : débit minimum Instagram Reels (3500 kbps)
+            "min_video_bitrate": self.config.get("ffmpeg_min_video_bitrate", "3500k"),
+            "max_video_bitrate": self.config.get("ffmpeg_max_video_bitrate", "5000k"),
+            "bufsize": self.config.get("ffmpeg_bufsize", "7000k"),
+        }
+        audio_kwargs = {
+            "audio_codec": self.config.get("ffmpeg_audio_codec", "aac"),
+            "audio_bitrate": self.config.get("ffmpeg_audio_bitrate", "192k"),
+        }
+
+        # Export en segments réutilisables (reprise après arrêt, réglages modifiés)
+        segments = None
+        frame_ranges = [(0, total_frames)]
+        segment_seconds = self.config.get("export_segment_seconds", 0.0)
+        segment_directory = self.config.get("export_segment_cache_directory", "")
+        if segment_seconds > 0 and segment_directory:
+            cache = SegmentCache(
+                Path(segment_directory),
+                export_name(Path(filepath), loop_start, loop_end, width, height),
+                Path(output_path).suffix or ".mp4",
+            )
+            export_key = export_fingerprint(
+                audio,
+                {
+                    "width": width,
+                    "height": height,
+                    "fps": fps,
+                    "duration": duration,
+                    "fade_duration": fade_duration,
+                    **video_kwargs,
+                },
+            )
+            segments = cache.plan(
+                plan_segments(total_frames, fps, segment_seconds, fade_duration),
+                export_key,
+                renderer.layer_fingerprints(),
+            )
+            cache.prepare(
+                segments, self.config.get("export_segment_cache_max_gb", DEFAULT_CACHE_MAX_GB)
+            )
+            missing = [segment for segment in segments if not segment.path.exists()]
+            frame_ranges = [(segment.start, segment.end) for segment in missing]
+            logging.info(
+                f"[Video Export Worker] {len(segments) - len(missing)}/{len(segments)} "
+                f"segments cached in {cache.directory}"
+            )
+            if len(missing) < len(segments):
+                self.status.emit(
+                    f"Reusing {len(segments) - len(missing)}/{len(segments)} rendered segments"
+                )
+
         self.status.emit("Starting FFmpeg encoder...")
 
         # Initialize FFmpeg encoder
+        encoder: FFmpegEncoder | SegmentWriter
         try:
-            encoder = FFmpegEncoder(
-                output_path=Path(output_path),
-                width=width,
-                height=height,
-                fps=fps,
-                audio_path=Path(filepath),
-                audio_start=loop_start,
-                audio_duration=duration,
-                fade_duration=self.config.get("fade_duration", 1.0),
-                video_codec=self.config.get("ffmpeg_video_codec", "libx264"),
-                preset=self.config.get("ffmpeg_preset", "medium"),
-                crf=self.config.get("ffmpeg_crf", 23),
-                pixel_format=self.config.get("ffmpeg_pixel_format", "yuv420p"),
-                audio_codec=self.config.get("ffmpeg_audio_codec", "aac"),
-                audio_bitrate=self.config.get("ffmpeg_audio_bitrate", "192k"),
-                # Constrained CRF : débit minimum Instagram Reels (3500 kbps)
-                min_video_bitrate=self.config.get("ffmpeg_min_video_bitrate", "3500k"),
-                max_video_bitrate=self.config.get("ffmpeg_max_video_bitrate", "5000k"),
-                bufsize=self.config.get("ffmpeg_bufsize", "7000k"),
-            )
-            encoder.start()
+            if segments is not None:
+                encoder = SegmentWriter(
+                    missing,
+                    width,
+                    height,
+                    lambda segment: FFmpegEncoder(
+                        output_path=segment.partial_path,
+                        width=width,
+                        height=height,
+                        fps=fps,
+                        audio_path=None,
+                        audio_start=loop_start,
+                        audio_duration=duration,
+                        fade_duration=fade_duration,
+                        timeline_start=segment.start / fps,
+                        timeline_end=segment.end / fps,
+                        **video_kwargs,
+                    ),
+                )
+            else:
+                full_encoder = FFmpegEncoder(
+                    output_path=Path(output_path),
+                    width=width,
+                    height=height,
+                    fps=fps,
+                    audio_path=Path(filepath),
+                    audio_start=loop_start,
+                    audio_duration=duration,
+                    fade_duration=fade_duration,
+                    **video_kwargs,
+                    **audio_kwargs,
+                )
+                full_encoder.start()
+                encoder = full_encoder
         except Exception as e:
             self.error.emit(f"Failed to start encoder: {e}")
             return
 
-        self.status.emit(f"Rendering frames ({self._num_workers} threads)...")
+        frames_to_render = sum(end - first for first, end in frame_ranges)
+        self.status.emit(f"Rendering frames ({self._num_workers} {self._workers_label})...")
         logging.info(
-            f"[Video Export Worker] Starting parallel render with {self._num_workers} workers"
+            f"[Video Export Worker] Starting parallel render of {frames_to_render}/"
+            f"{total_frames} frames with {self._num_workers} {self._workers_label}"
         )
 
         # Parallel rendering with ordered output
         try:
-            self._render_parallel(renderer, encoder, total_frames, fps)
+            if frames_to_render == 0:
+                pass
+            elif self._use_processes:
+                self._render_processes(
+                    renderer_kwargs,
+                    audio,
+                    renderer.analysis_arrays(),
+                    encoder,
+                    total_frames,
+                    fps,
+                    frame_ranges,
+                )
+            else:
+                frames = [idx for first, end in frame_ranges for idx in range(first, end)]
+                self._render_parallel(renderer, encoder, frames, fps)
+                for name, (render, composite) in renderer.layer_timings().items():
+                    logging.info(
+                        "[Video Export Worker] %s: render %.1f ms, composite %.1f ms per frame",
+                        name,
+                        render * 1000,
+                        composite * 1000,
+                    )
         except Exception as e:
             encoder.cancel()
             self.error.emit(f"Rendering failed: {e}")
@@ -204,54 +322,98 @@ class VideoExportWorker(QThread):
         # Finish encoding
         self.status.emit(f"Finalizing video... ({encoder.frame_count} frames written)")
         logging.info(
-            f"[Video Export Worker] Finishing, {encoder.frame_count}/{total_frames} frames"
+            f"[Video Export Worker] Finishing, {encoder.frame_count}/{frames_to_render} frames"
         )
         try:
-            output = encoder.finish()
+            if isinstance(encoder, SegmentWriter):
+                # Segments vidéo joints sans ré-encodage, audio ajouté
+                output = mux_segments(
+                    encoder.finish(),
+                    Path(output_path),
+                    Path(filepath),
+                    loop_start,
+                    duration,
+                    fade_duration,
+                    **audio_kwargs,
+                )
+            else:
+                output = encoder.finish()
             self.finished.emit(str(output))
         except Exception as e:
             logging.exception("[Video Export Worker] Finish failed")
             self.error.emit(f"Encoding failed: {e}")
 
+    @property
+    def _workers_label(self) -> str:
+        return "processes" if self._use_processes else "threads"
+
+    def _report_progress(self, frames_written: int, total_frames: int, fps: int) -> None:
+        """Emit progress, and a status line every second of video."""
+        self.progress.emit(int(frames_written / total_frames * 100))
+        if frames_written % fps == 0 or frames_written == total_frames:
+            self.status.emit(
+                f"Rendering: {frames_written}/{total_frames} frames "
+                f"({self._num_workers} {self._workers_label})"
+            )
+
     def _render_parallel(
         self,
         renderer: Any,
         encoder: Any,
-        total_frames: int,
+        frames: Sequence[int],
         fps: int,
     ) -> None:
         """Render frames in parallel and write to encoder in order.
 
         Args:
             renderer: FrameRenderer instance.
-            encoder: FFmpegEncoder instance.
-            total_frames: Total number of frames to render.
+            encoder: FFmpegEncoder (or SegmentWriter) instance.
+            frames: Frames to render, in increasing order (the layers advance
+                over the others).
             fps: Frames per second.
         """
-        # Buffer to store rendered frames waiting to be written
+        total_frames = len(frames)
+        # Buffer to store rendered frames waiting to be written (par rang dans ``frames``)
         frame_buffer: dict[int, NDArray[np.uint8]] = {}
         next_frame_to_write = 0
+        # Frame suivante à faire avancer (frames sautées : état seul, sans dessin)
+        next_frame_to_advance = 0
 
         # Maximum frames to buffer (prevent memory issues)
         max_buffer_size = self._num_workers * 4
 
-        def render_frame(frame_idx: int) -> tuple[int, NDArray[np.uint8]]:
+        def render_frame(
+            frame_idx: int, time_pos: float, states: list[Any], out: NDArray[np.uint8]
+        ) -> tuple[int, NDArray[np.uint8]]:
             """Render a single frame (called in thread pool)."""
-            time_pos = frame_idx / fps
-            frame = renderer.render_frame(frame_idx, time_pos)
+            frame = renderer.render_frame(frame_idx, time_pos, states, out=out)
             return frame_idx, frame
 
         with ThreadPoolExecutor(max_workers=self._num_workers) as executor:
             pending_futures: set = set()
-            future_to_idx: dict = {}
+            future_to_position: dict = {}
             frames_submitted = 0
 
+            def submit(position: int) -> None:
+                nonlocal next_frame_to_advance
+                frame_idx = frames[position]
+                for skipped_idx in range(next_frame_to_advance, frame_idx):
+                    renderer.advance(skipped_idx, skipped_idx / fps)
+                next_frame_to_advance = frame_idx + 1
+                # L'état des couches avance ici, dans l'ordre des frames ; les
+                # workers ne font que dessiner (frames identiques au rendu séquentiel)
+                time_pos = frame_idx / fps
+                states = renderer.advance(frame_idx, time_pos)
+                # Rendu dans un tampon de l'encodeur, recyclé une fois écrit
+                out = encoder.frame_buffer()
+                future = executor.submit(render_frame, frame_idx, time_pos, states, out)
+                pending_futures.add(future)
+                future_to_position[future] = position
+
             # Submit first batch
             batch_size = min(max_buffer_size, total_frames)
-            for frame_idx in range(batch_size):
-                future = executor.submit(render_frame, frame_idx)
-                pending_futures.add(future)
-                future_to_idx[future] = frame_idx
+            for position in range(batch_size):
+                submit(position)
                 frames_submitted += 1
 
             # Process completed frames and submit new ones
@@ -270,12 +432,12 @@ class VideoExportWorker(QThread):
 
                 # Process completed futures
                 for future in done:
-                    frame_idx = future_to_idx.pop(future)
+                    position = future_to_position.pop(future)
                     try:
-                        idx, frame = future.result()
-                        frame_buffer[idx] = frame
+                        _idx, frame = future.result()
+                        frame_buffer[position] = frame
                     except Exception as e:
-                        logging.error(f"[Video Export Worker] Frame {frame_idx} failed: {e}")
+                        logging.error(f"[Video Export Worker] Frame {frames[position]} failed: {e}")
                         raise
 
                 # Write consecutive frames from buffer
@@ -284,24 +446,14 @@ class VideoExportWorker(QThread):
                     encoder.write_frame(frame)
                     next_frame_to_write += 1
 
-                # Update progress
-                progress_pct = int(next_frame_to_write / total_frames * 100)
-                self.progress.emit(progress_pct)
-
-                if next_frame_to_write % fps == 0 or not pending_futures:
-                    self.status.emit(
-                        f"Rendering: {next_frame_to_write}/{total_frames} frames "
-                        f"({self._num_workers} threads)"
-                    )
+                self._report_progress(next_frame_to_write, total_frames, fps)
 
                 # Submit more frames if buffer has room
                 while (
                     frames_submitted < total_frames
                     and len(frame_buffer) + len(pending_futures) < max_buffer_size
                 ):
-                    future = executor.submit(render_frame, frames_submitted)
-                    pending_futures.add(future)
-                    future_to_idx[future] = frames_submitted
+                    submit(frames_submitted)
                     frames_submitted += 1
 
         # Write any remaining buffered frames
@@ -309,3 +461,72 @@ class VideoExportWorker(QThread):
             frame = frame_buffer.pop(next_frame_to_write)
             encoder.write_frame(frame)
             next_frame_to_write += 1
+
+    def _render_processes(
+        self,
+        renderer_kwargs: dict[str, Any],
+        audio: NDArray[np.floating],
+        layer_analysis: dict[str, dict[str, NDArray]],
+        encoder: Any,
+        total_frames: int,
+        fps: int,
+        frame_ranges: list[tuple[int, int]] | None = None,
+    ) -> None:
+        """Render frames in worker processes and write them to encoder in order.
+
+        Args:
+            renderer_kwargs: FrameRenderer arguments except audio.
+            audio: Audio samples.
+            layer_analysis: Audio analysis of the layers (FrameRenderer.analysis_arrays()).
+            encoder: FFmpegEncoder (or SegmentWriter) instance.
+            total_frames: Total number of frames in the export.
+            fps: Frames per second.
+            frame_ranges: (first, end) frame ranges to render (default: all).
+        """
+        from plugins.video_exporter.renderers.render_farm import RenderFarm
+
+        frame_ranges = frame_ranges if frame_ranges is not None else [(0, total_frames)]
+        farm = RenderFarm(
+            renderer_kwargs,
+            audio,
+            layer_analysis,
+            total_frames,
+            self._num_workers,
+            frame_ranges=frame_ranges,
+        )
+        frames = [idx for first, end in frame_ranges for idx in range(first, end)]
+        with farm:
+            try:
+                self._write_farm_frames(farm, encoder, frames, fps)
+            except BaseException:
+                # Le writer de l'encodeur lit les slots : l'arrêter avant de fermer la ferme
+                encoder.cancel()
+                raise
+
+    def _write_farm_frames(self, farm: Any, encoder: Any, frames: Sequence[int], fps: int) -> None:
+        """Write the render farm's frames (``frames``, in order) to the encoder."""
+        total_frames = len(frames)
+        # Frames rendues en attente d'écriture (elles restent dans leur slot)
+        frame_buffer: set[int] = set()
+        next_frame_to_write = 0
+        while next_frame_to_write < total_frames:
+            if self._cancelled:
+                encoder.cancel()
+                self.status.emit("Export cancelled")
+                return
+
+            frame_buffer.update(farm.poll(timeout=0.5))
+
+            # Write consecutive frames from buffer (le slot est rendu une fois écrit)
+            while (
+                next_frame_to_write < total_frames
+                and (frame_idx := frames[next_frame_to_write]) in frame_buffer
+            ):
+                frame_buffer.remove(frame_idx)
+                encoder.write_frame(
+                    farm.frame(frame_idx), on_written=functools.partial(farm.release, frame_idx)
+                )
+                next_frame_to_write += 1
+
+            self._report_progress(next_frame_to_write, total_frames, fps)
+        encoder.drain()
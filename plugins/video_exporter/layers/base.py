@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Hashable
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
 from PIL import Image
 
+from plugins.video_exporter.renderers.compositor import LayerPixels
+
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from numpy.typing import NDArray
 
 
@@ -18,6 +23,18 @@ class BaseVisualLayer(ABC):
     # Z-index for layer ordering (lower = background, higher = foreground)
     z_index: int = 0
 
+    # Attributs numpy calculés par _analyze_audio() à partir de l'audio seul :
+    # un processus de rendu les reçoit déjà calculés (voir analysis_arrays())
+    ANALYSIS_ARRAYS: tuple[str, ...] = ()
+
+    # Fusion dans la frame (voir compositor.BLEND_MODES) et opacité de la couche
+    blend_mode: str = "normal"
+    opacity: float = 1.0
+
+    # Niveaux de qualité proposés au FrameRenderer sous budget de temps
+    # (0 = qualité d'export ; voir set_quality())
+    QUALITY_LEVELS: int = 1
+
     def __init__(
         self,
         width: int,
@@ -26,6 +43,7 @@ class BaseVisualLayer(ABC):
         audio: NDArray[np.floating],
         sr: int,
         duration: float,
+        analysis: dict[str, NDArray] | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the visual layer.
@@ -37,6 +55,8 @@ class BaseVisualLayer(ABC):
             audio: Audio samples as numpy array.
             sr: Sample rate.
             duration: Duration in seconds.
+            analysis: Arrays returned by analysis_arrays() on a layer built with
+                the same audio and settings (skips _analyze_audio()).
             **kwargs: Additional layer-specific parameters.
         """
         self.width = width
@@ -46,10 +66,30 @@ class BaseVisualLayer(ABC):
         self.sr = sr
         self.duration = duration
         self.total_frames = int(duration * fps)
+        self.quality = 0
 
         # Pre-compute features if needed
+        if analysis is None:
+            self._analyze_audio()
+        else:
+            for name in self.ANALYSIS_ARRAYS:
+                setattr(self, name, analysis[name])
         self._precompute()
 
+    def _analyze_audio(self) -> None:  # noqa: B027
+        """Compute the ANALYSIS_ARRAYS attributes from the audio.
+
+        Runs before _precompute(), unless the arrays were given to __init__.
+        """
+
+    def analysis_arrays(self) -> dict[str, NDArray]:
+        """Get the audio analysis arrays, to build the same layer elsewhere.
+
+        Returns:
+            ANALYSIS_ARRAYS attribute name -> array (pass as ``analysis``).
+        """
+        return {name: np.asarray(getattr(self, name)) for name in self.ANALYSIS_ARRAYS}
+
     def _precompute(self) -> None:  # noqa: B027
         """Pre-compute features or data needed for rendering.
 
@@ -71,6 +111,148 @@ class BaseVisualLayer(ABC):
         """
         pass
 
+    def advance(self, frame_idx: int, time_pos: float) -> Any:
+        """Move the layer's per-frame state forward (called in frame order).
+
+        Layers whose frames depend on the previous ones override this and
+        render_state() so that frames can then be drawn in parallel. Default:
+        nothing to snapshot.
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+
+        Returns:
+            Snapshot handed to render_state() for this frame (None by default).
+        """
+        return None
+
+    def render_state(self, frame_idx: int, time_pos: float, state: Any) -> Image.Image:
+        """Render a frame from the snapshot returned by advance().
+
+        Default: render(frame_idx, time_pos).
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+            state: Value returned by advance() for this frame.
+
+        Returns:
+            PIL Image in RGBA mode.
+        """
+        return self.render(frame_idx, time_pos)
+
+    def render_pixels(self, frame_idx: int, time_pos: float, state: Any) -> LayerPixels | None:
+        """Render a frame as numpy pixels for the compositor.
+
+        Layers drawing with numpy override this. Default: render_state() image,
+        cropped to its non-transparent area.
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+            state: Value returned by advance() for this frame.
+
+        Returns:
+            Drawn pixels, or None if the layer is fully transparent.
+        """
+        image = self.render_state(frame_idx, time_pos, state)
+        if image.mode == "RGB":
+            return LayerPixels(np.asarray(image))
+        if image.mode != "RGBA":
+            image = image.convert("RGBA")
+        region = self.dirty_region(frame_idx, time_pos)
+        box = image.getbbox() if region is None else image.crop(region).getbbox()
+        if box is not None and region is not None:
+            box = (box[0] + region[0], box[1] + region[1], box[2] + region[0], box[3] + region[1])
+        if box is None:
+            return None
+        if box != (0, 0, image.width, image.height):
+            image = image.crop(box)
+        return LayerPixels(np.asarray(image), box[0], box[1])
+
+    def is_visible(self, frame_idx: int, time_pos: float) -> bool:
+        """Whether the layer can draw anything on a frame (render-time culling).
+
+        False must only be returned for frames that would come out fully
+        transparent: the renderer then skips render_pixels(). advance() is
+        still called on every frame. Default: inside active_frames() with a
+        non-zero opacity.
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+
+        Returns:
+            False if the frame is transparent for sure.
+        """
+        first, last = self.active_frames()
+        return first <= frame_idx < last and self.opacity > 0
+
+    def content_key(self, frame_idx: int, time_pos: float) -> Hashable | None:
+        """Get a key of what the layer draws on a frame (static layer reuse).
+
+        Frames with equal keys must draw the same pixels: the renderer then
+        reuses the pixels of the last frame rendered with that key, so
+        render_pixels() must not hand out buffers it later overwrites.
+        Default: None (render every frame).
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+
+        Returns:
+            Hashable key, or None if the frame must be rendered.
+        """
+        return None
+
+    def dirty_region(self, frame_idx: int, time_pos: float) -> tuple[int, int, int, int] | None:
+        """Get the area the layer can draw in on a frame.
+
+        The default render_pixels() only scans that area of the rendered
+        image; layers drawing into a canvas of that size override
+        render_pixels(). Default: None (whole frame).
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+
+        Returns:
+            (left, top, right, bottom) in frame pixels, or None for the whole frame.
+        """
+        return None
+
+    def set_quality(self, level: int) -> None:
+        """Set the rendering quality (FrameRenderer frame-time budget).
+
+        Level 0 is the export quality; higher levels, up to
+        QUALITY_LEVELS - 1, trade detail for speed (preview only: exports
+        never lower it).
+
+        Args:
+            level: Quality level, clamped to the supported levels.
+        """
+        self.quality = max(0, min(level, self.QUALITY_LEVELS - 1))
+
+    def active_frames(self) -> tuple[int, int]:
+        """Get the frames the layer can draw on (segment cache invalidation).
+
+        Frames outside this range must come out transparent whatever the
+        layer's settings. Default: the whole export.
+
+        Returns:
+            (first frame, frame after the last one).
+        """
+        return 0, self.total_frames
+
+    def source_files(self) -> list[Path]:
+        """Get the files the layer reads its pixels from (segment cache keys).
+
+        Returns:
+            File paths, in a stable order (none by default).
+        """
+        return []
+
     def prerender_gpu_frames(self) -> int:  # noqa: B027
         """Pré-calcule les effets GPU pour toutes les frames.
 
@@ -17,6 +17,7 @@ class DynamicsLayer(BaseVisualLayer):
     """Dynamic visual effects based on audio energy (pulse, brightness, vignette)."""
 
     z_index = 3
+    ANALYSIS_ARRAYS = ("energy_envelope", "bass_energy_envelope")
 
     def __init__(
         self,
@@ -50,7 +51,7 @@ class DynamicsLayer(BaseVisualLayer):
         self.vignette_intensity = vignette_intensity
         super().__init__(width, height, fps, audio, sr, duration, **kwargs)
 
-    def _precompute(self) -> None:
+    def _analyze_audio(self) -> None:
         """Pre-compute energy envelope and bass energy."""
         # Compute energy per frame
         samples_per_frame = len(self.audio) / self.total_frames
@@ -85,7 +86,8 @@ class DynamicsLayer(BaseVisualLayer):
         self.energy_envelope = np.array(self.energy_envelope) / max_energy
         self.bass_energy_envelope = np.array(self.bass_energy_envelope) / max_bass
 
-        # Pre-compute vignette mask
+    def _precompute(self) -> None:
+        """Pre-compute the vignette mask."""
         self._create_vignette_mask()
 
     def _create_vignette_mask(self) -> None:
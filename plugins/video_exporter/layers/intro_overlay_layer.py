@@ -145,6 +145,14 @@ class IntroOverlayLayer(BaseVisualLayer):
 
         return img
 
+    def active_frames(self) -> tuple[int, int]:
+        """Get the frames the intro plays on."""
+        return 0, min(self.video_duration_frames, self.total_frames)
+
+    def source_files(self) -> list[Path]:
+        """Get the intro video file."""
+        return [self.video_path] if self.video_path else []
+
     def __del__(self) -> None:
         if self._cap is not None:
             try:
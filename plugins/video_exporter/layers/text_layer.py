@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Hashable
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 from plugins.video_exporter.layers.base import BaseVisualLayer
+from plugins.video_exporter.renderers.compositor import LayerPixels
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
@@ -99,6 +101,14 @@ class TextLayer(BaseVisualLayer):
             self.title_font = ImageFont.load_default()
             self.artist_font = ImageFont.load_default()
 
+        # Mesure du texte hors rendu (boîtes à l'origine, décalées par frame)
+        measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        title_bbox = measure.textbbox((0, 0), self.title, font=self.title_font)
+        artist_bbox = measure.textbbox((0, 0), self.artist, font=self.artist_font)
+        self._title_box = tuple(math.floor(v) for v in title_bbox)
+        self._artist_box = tuple(math.floor(v) for v in artist_bbox)
+        self._title_height = self._title_box[3] - self._title_box[1]
+
     def render(self, frame_idx: int, time_pos: float) -> Image.Image:
         """Render text overlay for the current frame.
 
@@ -110,11 +120,46 @@ class TextLayer(BaseVisualLayer):
             RGBA image with text overlay.
         """
         img = self.create_transparent_image()
-        draw = ImageDraw.Draw(img)
+        self._draw_text(ImageDraw.Draw(img), time_pos, 0, 0)
+        return img
 
-        # Calculate fade alpha
-        alpha = self._calculate_alpha(time_pos)
+    def render_pixels(self, frame_idx: int, time_pos: float, state: Any) -> LayerPixels | None:
+        """Render the text only, on a canvas the size of dirty_region().
 
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+            state: Unused (the text layer has no per-frame state).
+
+        Returns:
+            Drawn pixels, or None if the text is fully transparent.
+        """
+        left, top, right, bottom = self._text_region(time_pos)
+        if right <= left or bottom <= top:
+            return None
+        canvas = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+        self._draw_text(ImageDraw.Draw(canvas), time_pos, left, top)
+        box = canvas.getbbox()
+        if box is None:
+            return None
+        if box != (0, 0, canvas.width, canvas.height):
+            canvas = canvas.crop(box)
+        return LayerPixels(np.asarray(canvas), left + box[0], top + box[1])
+
+    def is_visible(self, frame_idx: int, time_pos: float) -> bool:
+        """Whether the text is not fully faded out."""
+        return any(self._text_alphas(time_pos))
+
+    def content_key(self, frame_idx: int, time_pos: float) -> Hashable:
+        """Get the text alphas and bounce offset (the text is static otherwise)."""
+        return (*self._text_alphas(time_pos), self._calculate_bounce(time_pos))
+
+    def dirty_region(self, frame_idx: int, time_pos: float) -> tuple[int, int, int, int]:
+        """Get the area covered by the text and its shadow."""
+        return self._text_region(time_pos)
+
+    def _text_positions(self, time_pos: float) -> tuple[tuple[int, int], tuple[int, int]]:
+        """Get the (x, y) of the title and of the artist on a frame."""
         # Apply subtle bounce animation at start
         y_offset = self._calculate_bounce(time_pos)
 
@@ -125,19 +170,43 @@ class TextLayer(BaseVisualLayer):
         margin_top = max(110, int(self.height * 0.15))
         text_y = margin_top + y_offset
 
-        # Get text bounding boxes
-        title_bbox = draw.textbbox((0, 0), self.title, font=self.title_font)
-        title_height = title_bbox[3] - title_bbox[1]
-
         # Position text (top-left with margin)
-        title_x = margin
-        artist_x = margin
-        artist_y = text_y + title_height + 10
+        return (margin, text_y), (margin, text_y + self._title_height + 10)
+
+    def _text_alphas(self, time_pos: float) -> tuple[int, int, int]:
+        """Get the title, artist and shadow alpha on a frame."""
+        alpha = self._calculate_alpha(time_pos)
+        return (
+            int(self.TITLE_COLOR[3] * alpha),
+            int(self.ARTIST_COLOR[3] * alpha),
+            int(self.SHADOW_COLOR[3] * alpha),
+        )
+
+    def _text_region(self, time_pos: float) -> tuple[int, int, int, int]:
+        """Get the frame area the text and its shadow cover (may be empty)."""
+        (title_x, title_y), (artist_x, artist_y) = self._text_positions(time_pos)
+        # Ombre décalée de 2 px, marge de 2 px pour l'anticrénelage
+        left = min(title_x + self._title_box[0], artist_x + self._artist_box[0]) - 2
+        top = min(title_y + self._title_box[1], artist_y + self._artist_box[1]) - 2
+        right = max(title_x + self._title_box[2], artist_x + self._artist_box[2]) + 4
+        bottom = max(title_y + self._title_box[3], artist_y + self._artist_box[3]) + 4
+        return max(0, left), max(0, top), min(self.width, right), min(self.height, bottom)
+
+    def _draw_text(self, draw: ImageDraw.ImageDraw, time_pos: float, dx: int, dy: int) -> None:
+        """Draw the shadowed title and artist, shifted by (-dx, -dy)."""
+        (title_x, text_y), (artist_x, artist_y) = self._text_positions(time_pos)
+        title_x, text_y, artist_x, artist_y = (
+            title_x - dx,
+            text_y - dy,
+            artist_x - dx,
+            artist_y - dy,
+        )
 
         # Apply alpha to colors
-        title_color = (*self.TITLE_COLOR[:3], int(self.TITLE_COLOR[3] * alpha))
-        artist_color = (*self.ARTIST_COLOR[:3], int(self.ARTIST_COLOR[3] * alpha))
-        shadow_color = (*self.SHADOW_COLOR[:3], int(self.SHADOW_COLOR[3] * alpha))
+        title_alpha, artist_alpha, shadow_alpha = self._text_alphas(time_pos)
+        title_color = (*self.TITLE_COLOR[:3], title_alpha)
+        artist_color = (*self.ARTIST_COLOR[:3], artist_alpha)
+        shadow_color = (*self.SHADOW_COLOR[:3], shadow_alpha)
 
         # Draw shadow (offset by 2 pixels)
         shadow_offset = 2
@@ -158,8 +227,6 @@ class TextLayer(BaseVisualLayer):
         draw.text((title_x, text_y), self.title, font=self.title_font, fill=title_color)
         draw.text((artist_x, artist_y), self.artist, font=self.artist_font, fill=artist_color)
 
-        return img
-
     def _calculate_alpha(self, time_pos: float) -> float:
         """Calculate fade alpha based on time position.
 
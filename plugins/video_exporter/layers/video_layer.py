@@ -11,6 +11,8 @@ import numpy as np
 from PIL import Image
 
 from plugins.video_exporter.layers.base import BaseVisualLayer
+from plugins.video_exporter.layers.video_stream import VideoFrameStream, plan_clips
+from plugins.video_exporter.renderers.compositor import LayerPixels
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
@@ -19,7 +21,9 @@ if TYPE_CHECKING:
 class VideoBackgroundLayer(BaseVisualLayer):
     """Video background layer that plays video clips from a folder.
 
-    Thread-safe: All frames are pre-loaded during initialization.
+    Clips are decoded while rendering by a VideoFrameStream (bounded
+    read-ahead); advance() takes each frame in order and hands it to the
+    drawing threads, so memory does not grow with the export duration.
     """
 
     z_index = 0  # Lowest z-index, renders first (background)
@@ -39,6 +43,7 @@ class VideoBackgroundLayer(BaseVisualLayer):
         opacity: float = 0.5,
         blend_mode: str = "normal",
         fade_duration: float = 1.0,
+        rng_seed: int = 42,
         **kwargs: Any,
     ) -> None:
         """Initialize video background layer.
@@ -52,24 +57,28 @@ class VideoBackgroundLayer(BaseVisualLayer):
             duration: Duration in seconds.
             video_folder: Path to folder containing video clips.
             opacity: Opacity of the video background (0.0 to 1.0).
-            blend_mode: Blend mode (normal, multiply, screen).
+            blend_mode: Blend mode (normal, add, screen, multiply).
             fade_duration: Duration of fade in/out between clips in seconds.
+            rng_seed: Seed of the clip order (same seed, same clips in each segment).
             **kwargs: Additional parameters.
         """
         self.video_folder = Path(video_folder).expanduser() if video_folder else None
         self.opacity = opacity
         self.blend_mode = blend_mode
         self.fade_duration = fade_duration
+        self.rng_seed = rng_seed
         self.video_clips: list[Path] = []
-        # Pre-loaded frames for the entire duration (thread-safe access)
-        self.all_frames: list[Image.Image] = []
+        # Clips décodés au fil du rendu (None : OpenCV absent ou aucun clip lisible)
+        self.stream: VideoFrameStream | None = None
+        # Images fixes de repli, affichées à tour de rôle
+        self.still_frames: list[NDArray[np.uint8]] = []
         # Clip boundaries: list of (start_frame, end_frame) for each clip
         self.clip_boundaries: list[tuple[int, int]] = []
 
         super().__init__(width, height, fps, audio, sr, duration, **kwargs)
 
     def _precompute(self) -> None:
-        """Load video clips from folder and pre-cache all needed frames."""
+        """Find video clips in the folder and plan them over the export."""
         if not self.video_folder or not self.video_folder.exists():
             logging.warning(f"[Video Layer] Video folder not found: {self.video_folder}")
             return
@@ -83,65 +92,34 @@ class VideoBackgroundLayer(BaseVisualLayer):
             logging.warning(f"[Video Layer] No video clips found in {self.video_folder}")
             return
 
-        # Shuffle clips for variety
-        random.shuffle(self.video_clips)
+        # Shuffle clips for variety (ordre reproductible : un export repris
+        # retrouve les mêmes clips dans ses segments)
+        self.video_clips.sort()
+        random.Random(self.rng_seed).shuffle(self.video_clips)  # noqa: S311
 
         logging.info(f"[Video Layer] Found {len(self.video_clips)} video clips")
 
-        # Pre-load all frames needed for the entire duration
-        self._preload_all_frames()
+        self._open_stream()
 
-    def _preload_all_frames(self) -> None:
-        """Pre-load all frames needed for the export duration."""
+    def _open_stream(self) -> None:
+        """Plan the clips over the export duration and set up their decoder."""
         try:
-            import cv2
+            import cv2  # noqa: F401
         except ImportError:
             logging.warning("[Video Layer] OpenCV not available, using static images")
             self._load_as_images()
             return
 
-        clip_idx = 0
-        frames_loaded = 0
-
-        while frames_loaded < self.total_frames and clip_idx < len(self.video_clips) * 3:
-            clip_path = self.video_clips[clip_idx % len(self.video_clips)]
-            logging.info(f"[Video Layer] Loading clip: {clip_path}")
-
-            clip_start_frame = frames_loaded
-
-            try:
-                cap = cv2.VideoCapture(str(clip_path))
-
-                while frames_loaded < self.total_frames:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-
-                    # Convert BGR to RGB
-                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                    # Resize to match output dimensions
-                    frame = cv2.resize(frame, (self.width, self.height))
-
-                    # Convert to PIL Image and store
-                    img = Image.fromarray(frame)
-                    self.all_frames.append(img)
-                    frames_loaded += 1
-
-                cap.release()
-
-                # Record clip boundaries
-                if frames_loaded > clip_start_frame:
-                    self.clip_boundaries.append((clip_start_frame, frames_loaded - 1))
-
-            except Exception as e:
-                logging.error(f"[Video Layer] Error loading video {clip_path}: {e}")
-
-            clip_idx += 1
-
+        spans = plan_clips(self.video_clips, self.total_frames)
+        if not spans:
+            logging.warning(f"[Video Layer] No readable video clip in {self.video_folder}")
+            return
+        self.clip_boundaries = [(span.start, span.start + span.length - 1) for span in spans]
+        self.stream = VideoFrameStream(spans, self.width, self.height, self.total_frames)
         logging.info(
-            f"[Video Layer] Pre-loaded {len(self.all_frames)} frames "
-            f"for {self.total_frames} total needed, {len(self.clip_boundaries)} clips"
+            f"[Video Layer] {self.stream.planned_frames} frames planned from "
+            f"{len(spans)} clips for {self.total_frames} total needed, "
+            f"decoded {self.stream.read_ahead} frames ahead"
         )
 
     def _load_as_images(self) -> None:
@@ -154,59 +132,83 @@ class VideoBackgroundLayer(BaseVisualLayer):
                     img = Image.open(img_path)
                     img = img.convert("RGB")
                     img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    self.all_frames.append(img)
+                    self.still_frames.append(np.asarray(img))
                 except Exception as e:
                     logging.warning(f"[Video Layer] Could not load image {img_path}: {e}")
 
-        # If we don't have enough images, repeat them
-        if self.all_frames and len(self.all_frames) < self.total_frames:
-            original_count = len(self.all_frames)
-            while len(self.all_frames) < self.total_frames:
-                self.all_frames.append(self.all_frames[len(self.all_frames) % original_count])
+    def source_files(self) -> list[Path]:
+        """Get the video clips, in play order."""
+        return list(self.video_clips)
 
-    def render(self, frame_idx: int, _time_pos: float) -> Image.Image:
+    def advance(self, frame_idx: int, time_pos: float) -> NDArray[np.uint8] | None:
+        """Take the frame's video image from the decoder (called in frame order).
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+
+        Returns:
+            RGB frame, or None if there is nothing to show.
+        """
+        if self.stream is not None:
+            return self.stream.frame(frame_idx)
+        if self.still_frames:
+            return self.still_frames[frame_idx % len(self.still_frames)]
+        return None
+
+    def render(self, frame_idx: int, time_pos: float) -> Image.Image:
         """Render video background frame.
 
-        Thread-safe: Only reads from pre-loaded frames.
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+
+        Returns:
+            RGBA image with video frame.
+        """
+        return self.render_state(frame_idx, time_pos, self.advance(frame_idx, time_pos))
+
+    def render_state(
+        self, frame_idx: int, _time_pos: float, state: NDArray[np.uint8] | None
+    ) -> Image.Image:
+        """Render the frame returned by advance() as an RGBA image.
 
         Args:
             frame_idx: Frame index.
             _time_pos: Time position in seconds (unused).
+            state: RGB frame from advance().
 
         Returns:
             RGBA image with video frame.
         """
-        if not self.all_frames:
+        if state is None:
             # Return transparent frame if no video loaded
             return self.create_transparent_image()
 
-        # Get frame (loop if needed)
-        actual_idx = frame_idx % len(self.all_frames)
-        frame = self.all_frames[actual_idx].copy()
-
-        # Convert to RGBA
-        if frame.mode != "RGBA":
-            frame = frame.convert("RGBA")
+        # Opacité × fondu : canal alpha constant (les images vidéo sont opaques)
+        alpha = int(255 * min(1.0, self.opacity * self._get_fade_factor(frame_idx)))
+        rgba = np.empty((*state.shape[:2], 4), dtype=np.uint8)
+        rgba[..., :3] = state
+        rgba[..., 3] = alpha
+        return Image.fromarray(rgba, "RGBA")
 
-        # Calculate fade factor based on clip boundaries
-        fade_factor = self._get_fade_factor(actual_idx)
+    def render_pixels(
+        self, frame_idx: int, time_pos: float, state: NDArray[np.uint8] | None
+    ) -> LayerPixels | None:
+        """Hand the decoded RGB frame to the compositor (no PIL copy).
 
-        # Apply opacity with fade
-        effective_opacity = self.opacity * fade_factor
-        if effective_opacity < 1.0:
-            alpha = int(255 * effective_opacity)
-            # Create alpha mask
-            r, g, b, a = frame.split()
-            a = a.point(lambda x: min(x, alpha))
-            frame = Image.merge("RGBA", (r, g, b, a))
-
-        return frame
+        The compositor applies the layer opacity and blend mode; the clip fade
+        is the frame's own opacity.
+        """
+        if state is None:
+            return None
+        return LayerPixels(state, opacity=self._get_fade_factor(frame_idx))
 
     def _get_fade_factor(self, frame_idx: int) -> float:
         """Calculate fade factor for the given frame index.
 
         Args:
-            frame_idx: Frame index within all_frames.
+            frame_idx: Frame index in the export.
 
         Returns:
             Fade factor between 0.0 and 1.0.
@@ -214,6 +216,9 @@ class VideoBackgroundLayer(BaseVisualLayer):
         if not self.clip_boundaries or self.fade_duration <= 0:
             return 1.0
 
+        # Le plan de clips boucle s'il est plus court que l'export
+        frame_idx %= self.clip_boundaries[-1][1] + 1
+
         fade_frames = int(self.fade_duration * self.fps)
 
         # Find which clip this frame belongs to
@@ -238,30 +243,3 @@ class VideoBackgroundLayer(BaseVisualLayer):
                 return 1.0
 
         return 1.0
-
-    def _apply_blend(self, background: Image.Image, foreground: Image.Image) -> Image.Image:
-        """Apply blend mode to combine images.
-
-        Args:
-            background: Background image.
-            foreground: Foreground image.
-
-        Returns:
-            Blended image.
-        """
-        if self.blend_mode == "normal":
-            return Image.alpha_composite(background, foreground)
-
-        elif self.blend_mode == "multiply":
-            bg_arr = np.array(background, dtype=float) / 255
-            fg_arr = np.array(foreground, dtype=float) / 255
-            result = (bg_arr * fg_arr * 255).astype(np.uint8)
-            return Image.fromarray(result, mode="RGBA")
-
-        elif self.blend_mode == "screen":
-            bg_arr = np.array(background, dtype=float) / 255
-            fg_arr = np.array(foreground, dtype=float) / 255
-            result = (1 - (1 - bg_arr) * (1 - fg_arr)) * 255
-            return Image.fromarray(result.astype(np.uint8), mode="RGBA")
-
-        return Image.alpha_composite(background, foreground)
@@ -0,0 +1,259 @@
+"""Streaming decoder for the video background layer.
+
+The export timeline is planned as a list of clip spans (ClipSpan) that play
+one after the other, looping over the plan if it is shorter than the export.
+VideoFrameStream decodes that timeline in a background thread, in frame
+order, into a bounded read-ahead queue of RGB numpy frames: memory use
+depends on the read-ahead, not on the export duration.
+
+Clips are read from their first frame to the end of their span, never
+seeked: looping back to the start of the plan reopens the first clip. Only a
+request for an earlier frame than the last one (a restart) seeks, inside the
+clip holding that frame.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+# Frames décodées d'avance : ~1/2 s à 30 fps, 100 Mo en 1080p
+DEFAULT_READ_AHEAD = 16
+
+
+@dataclass(frozen=True)
+class ClipSpan:
+    """Part of a clip played in the export timeline."""
+
+    path: Path
+    # Première frame de l'export montrant ce clip
+    start: int
+    # Frames lues depuis le début du clip
+    length: int
+
+
+def plan_clips(clips: list[Path], total_frames: int, max_passes: int = 3) -> list[ClipSpan]:
+    """Lay clips end to end until the export is covered.
+
+    Clips are played whole, in order, for at most ``max_passes`` passes over
+    the list; the last span is cut at ``total_frames``.
+
+    Args:
+        clips: Video files, in play order.
+        total_frames: Frames in the export.
+        max_passes: Passes over the clip list before giving up.
+
+    Returns:
+        Spans in timeline order (empty if no clip could be read).
+    """
+    lengths: dict[Path, int] = {}
+    spans: list[ClipSpan] = []
+    planned = 0
+    for clip_idx in range(len(clips) * max_passes):
+        if planned >= total_frames:
+            break
+        path = clips[clip_idx % len(clips)]
+        if path not in lengths:
+            lengths[path] = _clip_length(path)
+        length = min(lengths[path], total_frames - planned)
+        if length > 0:
+            spans.append(ClipSpan(path, planned, length))
+            planned += length
+    return spans
+
+
+def _clip_length(path: Path) -> int:
+    """Get a clip's frame count (counted by grabbing if the header has none)."""
+    import cv2
+
+    cap = cv2.VideoCapture(str(path))
+    try:
+        if not cap.isOpened():
+            logging.error(f"[Video Stream] Cannot open video {path}")
+            return 0
+        count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if count <= 0:
+            count = 0
+            while cap.grab():
+                count += 1
+        return count
+    finally:
+        cap.release()
+
+
+class VideoFrameStream:
+    """Decode planned clip spans ahead of the renderer, in frame order."""
+
+    def __init__(
+        self,
+        spans: list[ClipSpan],
+        width: int,
+        height: int,
+        total_frames: int,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+    ) -> None:
+        """Initialize stream (decoding starts with the first frame() call).
+
+        Args:
+            spans: Timeline from plan_clips().
+            width: Output frame width (frames are resized).
+            height: Output frame height.
+            total_frames: Frames in the export; the spans loop to fill it.
+            read_ahead: Frames decoded ahead of the last one requested.
+        """
+        self.spans = spans
+        self.width = width
+        self.height = height
+        self.total_frames = total_frames
+        self.read_ahead = max(1, read_ahead)
+        self.planned_frames = spans[-1].start + spans[-1].length if spans else 0
+
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[tuple[int, NDArray[np.uint8] | None] | None] | None = None
+        self._stop: threading.Event | None = None
+        self._thread: threading.Thread | None = None
+        # Prochaine frame attendue par frame() ; fin du flux atteinte
+        self._next = 0
+        self._ended = False
+
+    def frame(self, frame_idx: int) -> NDArray[np.uint8] | None:
+        """Get an export frame, waiting for the decoder if needed.
+
+        Frames are meant to be requested in increasing order (skipped frames
+        are dropped); an earlier frame restarts decoding from it.
+
+        Args:
+            frame_idx: Frame index in the export.
+
+        Returns:
+            RGB frame (height, width, 3), or None if the clip could not be read
+            there or frame_idx is outside the export.
+        """
+        if not self.spans or not 0 <= frame_idx < self.total_frames:
+            return None
+        with self._lock:
+            if self._queue is None or frame_idx < self._next:
+                self._start(frame_idx)
+            assert self._queue is not None
+            while not self._ended:
+                item = self._queue.get()
+                if item is None:
+                    self._ended = True
+                    break
+                decoded_idx, frame = item
+                if decoded_idx == frame_idx:
+                    self._next = frame_idx + 1
+                    return frame
+            return None
+
+    def close(self) -> None:
+        """Stop the decoder thread."""
+        with self._lock:
+            self._stop_thread()
+
+    def _start(self, frame_idx: int) -> None:
+        self._stop_thread()
+        self._queue = queue.Queue(maxsize=self.read_ahead)
+        self._stop = threading.Event()
+        self._next = frame_idx
+        self._ended = False
+        self._thread = threading.Thread(
+            target=_decode,
+            args=(self.spans, (self.width, self.height), self.total_frames, frame_idx),
+            kwargs={"out": self._queue, "stop": self._stop},
+            name="video-stream",
+            daemon=True,
+        )
+        self._thread.start()
+        # Le thread ne référence pas le flux : il s'arrête si le flux est abandonné
+        weakref.finalize(self, self._stop.set)
+
+    def _stop_thread(self) -> None:
+        if self._thread is None or self._stop is None or self._queue is None:
+            return
+        self._stop.set()
+        # Débloque un put() en attente de place
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        self._thread.join()
+        self._thread = self._queue = self._stop = None
+
+
+def _decode(
+    spans: list[ClipSpan],
+    size: tuple[int, int],
+    total_frames: int,
+    frame_idx: int,
+    out: queue.Queue[tuple[int, NDArray[np.uint8] | None] | None],
+    stop: threading.Event,
+) -> None:
+    """Decoder thread: push (frame_idx, frame) from frame_idx to the end, then None."""
+    import cv2
+
+    width, height = size
+    planned_frames = spans[-1].start + spans[-1].length
+
+    try:
+        while frame_idx < total_frames and not stop.is_set():
+            position = frame_idx % planned_frames
+            span = next(s for s in reversed(spans) if s.start <= position)
+            offset = position - span.start
+            cap = cv2.VideoCapture(str(span.path))
+            if offset:
+                # Reprise au milieu d'un clip (seul cas de seek)
+                cap.set(cv2.CAP_PROP_POS_FRAMES, offset)
+            readable = cap.isOpened()
+            try:
+                for clip_frame in range(offset, span.length):
+                    if frame_idx >= total_frames or stop.is_set():
+                        break
+                    frame: NDArray[np.uint8] | None = None
+                    if readable:
+                        readable, bgr = cap.read()
+                        if readable:
+                            # Resize avant la conversion : moins de pixels à permuter
+                            if bgr.shape[:2] != (height, width):
+                                bgr = cv2.resize(bgr, (width, height))
+                            frame = np.asarray(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB), np.uint8)
+                        else:
+                            logging.warning(
+                                f"[Video Stream] {span.path} ended early at frame "
+                                f"{clip_frame}, transparent until next clip"
+                            )
+                    if not _put(out, stop, (frame_idx, frame)):
+                        return
+                    frame_idx += 1
+            finally:
+                cap.release()
+    except Exception:
+        logging.exception("[Video Stream] Decoding failed")
+    _put(out, stop, None)
+
+
+def _put(
+    out: queue.Queue[tuple[int, NDArray[np.uint8] | None] | None],
+    stop: threading.Event,
+    item: tuple[int, NDArray[np.uint8] | None] | None,
+) -> bool:
+    """Queue an item, waiting for room; False if the stream is stopping."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
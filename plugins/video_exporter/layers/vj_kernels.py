@@ -0,0 +1,244 @@
+"""Vectorized kernels of the heaviest VJing effects (numpy only).
+
+The effects draw on low-resolution grids that are upscaled afterwards. These
+kernels compute those grids without per-pixel Python work nor (effects, h, w)
+temporaries:
+
+- julia_escape(): escape-time iterations of a Julia set on the pixels still
+  bounded only (escaped pixels leave the working set, early-out once none is
+  left);
+- nearest_seed() and metaball_field(): the grid coordinates are separable
+  (column x, row y), so squared distances to each seed are built from a row
+  vector and a column vector, with a running minimum / sum in one buffer;
+- plasma_field(): the column-only and row-only sine terms are computed on
+  vectors, the diagonal one through sin(a + b) = sin a cos b + cos a sin b;
+- palette_lerp(): cyclic palette interpolation, per channel.
+
+Buffers come from scratch(): reused from one frame to the next but local to
+each thread, since frames are drawn in parallel. A kernel's result is only
+valid until the next call of the same kernel on the same thread.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import DTypeLike, NDArray
+
+_local = threading.local()
+
+
+def scratch(name: str, shape: tuple[int, ...], dtype: DTypeLike = np.float64) -> NDArray:
+    """Get a per-thread buffer, reused across calls with the same name and shape.
+
+    Args:
+        name: Buffer name (one buffer per name, shape and dtype).
+        shape: Buffer shape.
+        dtype: Buffer dtype.
+
+    Returns:
+        Uninitialized array.
+    """
+    buffers: dict[tuple, NDArray] = _local.__dict__.setdefault("buffers", {})
+    key = (name, shape, np.dtype(dtype).str)
+    buffer = buffers.get(key)
+    if buffer is None:
+        buffer = buffers[key] = np.empty(shape, dtype=dtype)
+    return buffer
+
+
+def julia_escape(
+    x: NDArray[np.floating],
+    y: NDArray[np.floating],
+    cos_r: float,
+    sin_r: float,
+    zoom: float,
+    c: complex,
+    max_iter: int,
+) -> NDArray[np.int32]:
+    """Escape iteration of each point of a rotated and zoomed Julia set grid.
+
+    Args:
+        x: Real part of the grid (h, w), before rotation and zoom.
+        y: Imaginary part of the grid (h, w).
+        cos_r: Cosine of the rotation.
+        sin_r: Sine of the rotation.
+        zoom: Zoom factor (coordinates are divided by it).
+        c: Julia set parameter.
+        max_iter: Iteration limit.
+
+    Returns:
+        (h, w) iteration at which |z| exceeded 4, max_iter if it never did.
+    """
+    iterations = scratch("julia_iterations", x.shape, np.int32)
+    iterations.fill(max_iter)
+    flat_iterations = iterations.reshape(-1)
+
+    z = np.empty(x.size, dtype=np.complex128)
+    z.real = ((x * cos_r - y * sin_r) / zoom).reshape(-1)
+    z.imag = ((x * sin_r + y * cos_r) / zoom).reshape(-1)
+    # Points encore bornés : seuls itérés, retirés dès qu'ils s'échappent
+    active = np.arange(x.size)
+    modulus = np.empty(x.size)
+    for i in range(max_iter):
+        np.square(z, out=z)
+        z += c
+        np.abs(z, out=modulus[: len(z)])
+        escaped = modulus[: len(z)] > 4
+        if escaped.any():
+            flat_iterations[active[escaped]] = i
+            bounded = ~escaped
+            active = active[bounded]
+            z = z[bounded]
+            if not len(active):
+                break
+    return iterations
+
+
+def nearest_seed(
+    seeds_x: NDArray[np.floating],
+    seeds_y: NDArray[np.floating],
+    xs: NDArray,
+    ys: NDArray,
+) -> NDArray[np.int32]:
+    """Index of the nearest seed of each point of a grid (Voronoi cells).
+
+    Ties go to the lowest seed index, as with argmin.
+
+    Args:
+        seeds_x: Seed x coordinates (n,).
+        seeds_y: Seed y coordinates (n,).
+        xs: x coordinate of each grid column (w,).
+        ys: y coordinate of each grid row (h,).
+
+    Returns:
+        (h, w) seed index.
+    """
+    shape = (len(ys), len(xs))
+    nearest = scratch("voronoi_nearest", shape, np.int32)
+    best = scratch("voronoi_best", shape)
+    distance = scratch("voronoi_distance", shape)
+    closer = scratch("voronoi_closer", shape, bool)
+    nearest.fill(0)
+    best.fill(np.inf)
+    for index, (seed_x, seed_y) in enumerate(zip(seeds_x, seeds_y, strict=True)):
+        # Distance séparable : colonnes (w,) + lignes (h,) diffusées
+        np.add((xs - seed_x)[np.newaxis, :] ** 2, ((ys - seed_y) ** 2)[:, np.newaxis], out=distance)
+        np.less(distance, best, out=closer)
+        np.copyto(best, distance, where=closer)
+        np.copyto(nearest, index, where=closer)
+    return nearest
+
+
+def metaball_field(
+    balls_x: NDArray[np.floating],
+    balls_y: NDArray[np.floating],
+    radii: NDArray[np.floating],
+    xs: NDArray[np.floating],
+    ys: NDArray[np.floating],
+) -> NDArray[np.float64]:
+    """Metaball field: sum over balls of radius² / (distance² + 1).
+
+    Args:
+        balls_x: Ball centre x coordinates (n,).
+        balls_y: Ball centre y coordinates (n,).
+        radii: Ball radii (n,).
+        xs: x coordinate of each grid column (w,).
+        ys: y coordinate of each grid row (h,).
+
+    Returns:
+        (h, w) field.
+    """
+    shape = (len(ys), len(xs))
+    field = scratch("metaball_field", shape)
+    term = scratch("metaball_term", shape)
+    field.fill(0.0)
+    for ball_x, ball_y, radius in zip(balls_x, balls_y, radii, strict=True):
+        np.add((xs - ball_x)[np.newaxis, :] ** 2, ((ys - ball_y) ** 2)[:, np.newaxis], out=term)
+        term += 1
+        np.divide(radius**2, term, out=term)
+        field += term
+    return field
+
+
+def plasma_field(
+    xs: NDArray[np.floating],
+    ys: NDArray[np.floating],
+    radial: NDArray[np.floating],
+    t: float,
+    bass: float,
+    mid: float,
+    energy: float,
+) -> NDArray[np.float64]:
+    """Classic plasma: mean of four sine waves, scaled to 0..1.
+
+    Args:
+        xs: x phase of each grid column (w,).
+        ys: y phase of each grid row (h,).
+        radial: Distance of each grid point to the plasma centre (h, w).
+        t: Animation time.
+        bass: Bass energy (shifts the column wave).
+        mid: Mid energy (shifts the row wave).
+        energy: Overall energy (shifts the radial wave).
+
+    Returns:
+        (h, w) plasma value.
+    """
+    plasma = scratch("plasma_field", radial.shape)
+    cross = scratch("plasma_cross", radial.shape)
+    # Onde radiale : seul sinus calculé sur toute la grille
+    np.add(radial, t + energy * np.pi, out=plasma)
+    np.sin(plasma, out=plasma)
+    # Ondes des colonnes et des lignes : sinus sur des vecteurs
+    plasma += np.sin(xs + t + bass * np.pi)[np.newaxis, :]
+    plasma += np.sin(ys + t * 0.7 + mid * np.pi)[:, np.newaxis]
+    # sin((x + y + t/2) / 2) = sin(x/2) cos(y'/2) + cos(x/2) sin(y'/2), y' = y + t/2
+    half_x = xs * 0.5
+    half_y = (ys + t * 0.5) * 0.5
+    np.multiply(np.sin(half_x)[np.newaxis, :], np.cos(half_y)[:, np.newaxis], out=cross)
+    plasma += cross
+    np.multiply(np.cos(half_x)[np.newaxis, :], np.sin(half_y)[:, np.newaxis], out=cross)
+    plasma += cross
+    # Moyenne des 4 ondes, ramenée de [-1, 1] à [0, 1]
+    plasma *= 0.125
+    plasma += 0.5
+    return plasma
+
+
+def palette_lerp(
+    values: NDArray[np.floating],
+    palette: list[tuple[int, int, int]],
+    offset: float = 0.0,
+) -> NDArray[np.uint8]:
+    """Color values through a cyclic palette, interpolating between colors.
+
+    A value v sits at (v * len(palette) + offset) mod len(palette) in the
+    palette; the color after the last one is the first one.
+
+    Args:
+        values: Values (h, w), one palette cycle per unit.
+        palette: RGB colors.
+        offset: Palette rotation, in colors.
+
+    Returns:
+        (h, w, 3) RGB.
+    """
+    n_colors = len(palette)
+    colors = np.array([*palette, palette[0]], dtype=np.float64)
+    stops = np.arange(n_colors + 1, dtype=np.float64)
+    position = scratch("palette_position", values.shape)
+    np.multiply(values, n_colors, out=position)
+    position += offset
+    np.mod(position, n_colors, out=position)
+
+    rgb = scratch("palette_rgb", (*values.shape, 3), np.uint8)
+    for channel in range(3):
+        # Troncature comme astype(np.uint8)
+        np.copyto(
+            rgb[..., channel], np.interp(position, stops, colors[:, channel]), casting="unsafe"
+        )
+    return rgb
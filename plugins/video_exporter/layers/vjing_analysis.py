@@ -0,0 +1,253 @@
+"""Audio analysis of the VJing layer: per-frame energies, spectrum bands, beats.
+
+Every frame covers audio[int(i * spf):int((i + 1) * spf)], with spf samples
+per frame. Frames of the same length are gathered into 2D blocks through a
+stride_tricks window view, then reduced along rows (RMS, batched rfft, band
+means). numpy reduces each row exactly as it reduces a 1D chunk, so the arrays
+are the ones the former frame-by-frame loops produced, and a multi-hour mix is
+analysed in seconds.
+
+Results are cached on disk as .npz files keyed by the audio content, the frame
+rate and the band layout, so re-exporting the same mix skips the analysis. The
+least recently used files are evicted beyond DEFAULT_CACHE_MAX_BYTES.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from numpy.typing import NDArray
+
+# Version du calcul : à incrémenter si les tableaux produits changent
+ANALYSIS_VERSION = 1
+
+# Bandes d'énergie (Hz) : basses, médiums, aigus (None : jusqu'à Nyquist)
+ENERGY_BANDS: dict[str, tuple[float, float | None]] = {
+    "bass_energy": (20.0, 250.0),
+    "mid_energy": (250.0, 4000.0),
+    "treble_energy": (4000.0, None),
+}
+
+# Bandes du spectre par frame (effets spectrum)
+FFT_BANDS = 32
+
+# Échantillons par bloc de frames (~16 Mo en float32)
+_BLOCK_SAMPLES = 1 << 22
+
+# Taille du cache d'analyses : ~40 Mo par mix de 90 min à 30 fps
+DEFAULT_CACHE_MAX_BYTES = 1 << 30
+
+# Fichier d'analyse (cache_key()) : seuls ceux-ci sont évincés du cache
+_CACHE_FILE = re.compile(r"[0-9a-f]{32}\.npz")
+
+
+def analyze_audio(audio: NDArray[np.floating], sr: int, total_frames: int) -> dict[str, NDArray]:
+    """Compute the normalized per-frame energies and spectrum bands.
+
+    Args:
+        audio: Audio samples.
+        sr: Sample rate.
+        total_frames: Number of video frames.
+
+    Returns:
+        energy, bass_energy, mid_energy, treble_energy (total_frames,) and
+        fft_data (total_frames, FFT_BANDS), each scaled to a maximum of 1.
+    """
+    starts, lengths = frame_bounds(len(audio), total_frames)
+    result = {"energy": _normalize(frame_rms(audio, starts, lengths))}
+
+    # Bandes par FFT du signal entier — thread-safe ; scipy.signal.filtfilt utilise
+    # BLAS, qui SIGBUS sur macOS ARM (vecLib) hors du thread principal (QThread).
+    fft = np.fft.rfft(audio)
+    freqs = np.fft.rfftfreq(len(audio), 1.0 / sr)
+    for name, (lo, hi) in ENERGY_BANDS.items():
+        mask = freqs >= lo if hi is None else (freqs >= lo) & (freqs <= hi)
+        filtered = fft.copy()
+        filtered[~mask] = 0.0
+        band_audio = np.fft.irfft(filtered, n=len(audio)).astype(np.float32)
+        del filtered
+        result[name] = _normalize(frame_rms(band_audio, starts, lengths))
+    del fft
+
+    fft_data = frame_spectrum_bands(audio, starts, lengths, FFT_BANDS)
+    max_fft = fft_data.max() if len(fft_data) else 1.0
+    if max_fft > 0:
+        fft_data = fft_data / max_fft
+    result["fft_data"] = fft_data
+    return result
+
+
+def frame_bounds(n_samples: int, total_frames: int) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """Get the first sample and the length of every frame's audio chunk."""
+    samples_per_frame = n_samples / total_frames
+    bounds = (np.arange(total_frames + 1) * samples_per_frame).astype(np.intp)
+    # Fin de chunk bornée par le signal, comme un slice
+    bounds = np.minimum(bounds, n_samples)
+    return bounds[:-1], np.diff(bounds)
+
+
+def frame_rms(
+    signal: NDArray[np.floating], starts: NDArray[np.intp], lengths: NDArray[np.intp]
+) -> NDArray[np.floating]:
+    """RMS of each frame's chunk (0 for empty chunks)."""
+    rms = np.zeros(len(starts), dtype=np.result_type(signal.dtype, np.float32))
+    for frames, chunks in _frame_blocks(signal, starts, lengths):
+        rms[frames] = np.sqrt(np.mean(chunks**2, axis=1))
+    return rms
+
+
+def frame_spectrum_bands(
+    signal: NDArray[np.floating],
+    starts: NDArray[np.intp],
+    lengths: NDArray[np.intp],
+    n_bands: int,
+) -> NDArray[np.floating]:
+    """Mean rfft magnitude of each frame's chunk over n_bands equal bin ranges.
+
+    Bins past n_bands * (n_bins // n_bands) are left out; empty chunks give
+    zeros.
+    """
+    bands = np.zeros((len(starts), n_bands), dtype=np.result_type(signal.dtype, np.float32))
+    for frames, chunks in _frame_blocks(signal, starts, lengths):
+        magnitudes = np.abs(np.fft.rfft(chunks, axis=1))
+        band_size = magnitudes.shape[1] // n_bands
+        if band_size == 0:
+            bands[frames] = np.nan
+            continue
+        # Bandes contiguës de band_size bins : moyenne par ligne (matrice de bandes en blocs)
+        grouped = magnitudes[:, : n_bands * band_size].reshape(len(frames), n_bands, band_size)
+        bands[frames] = grouped.mean(axis=2)
+    return bands
+
+
+def detect_beats(bass_energy: NDArray[np.floating], fps: int) -> list[int]:
+    """Find beats: bass peaks above 0.5, local maxima over ±3 frames.
+
+    Beats closer than a quarter second to the previous one are dropped.
+
+    Args:
+        bass_energy: Normalized bass energy per frame.
+        fps: Frames per second.
+
+    Returns:
+        Beat frame indices, in increasing order.
+    """
+    threshold = 0.5
+    window = 3
+    min_interval = fps // 4  # Minimum frames between beats
+    if len(bass_energy) == 0:
+        return []
+
+    padded = np.pad(np.asarray(bass_energy), window, constant_values=-np.inf)
+    local_max = sliding_window_view(padded, 2 * window + 1).max(axis=1)
+    candidates = np.flatnonzero((bass_energy > threshold) & (bass_energy == local_max))
+
+    # Espacement minimal : dépend du beat retenu précédent (peu de candidats)
+    beats: list[int] = []
+    last_beat = -min_interval
+    for i in candidates.tolist():
+        if i - last_beat >= min_interval:
+            beats.append(i)
+            last_beat = i
+    return beats
+
+
+def _frame_blocks(
+    signal: NDArray[np.floating], starts: NDArray[np.intp], lengths: NDArray[np.intp]
+) -> Iterator[tuple[NDArray[np.intp], NDArray[np.floating]]]:
+    """Yield (frame indices, chunks) blocks of frames sharing a chunk length."""
+    for length in np.unique(lengths):
+        if length == 0:
+            continue
+        frames = np.flatnonzero(lengths == length)
+        windows = sliding_window_view(signal, int(length))
+        block = max(1, _BLOCK_SAMPLES // int(length))
+        for first in range(0, len(frames), block):
+            selected = frames[first : first + block]
+            yield selected, windows[starts[selected]]
+
+
+def _normalize(values: NDArray[np.floating]) -> NDArray[np.floating]:
+    max_val = np.max(values) if len(values) and np.max(values) > 0 else 1.0
+    return values / max_val
+
+
+def cache_key(audio: NDArray[np.floating], sr: int, fps: int, total_frames: int) -> str:
+    """Build the cache key of an analysis: audio content, frame rate, band layout."""
+    digest = hashlib.blake2b(np.ascontiguousarray(audio).data, digest_size=16)
+    digest.update(
+        f"{audio.dtype}|{sr}|{fps}|{total_frames}|{ENERGY_BANDS}|{FFT_BANDS}|"
+        f"v{ANALYSIS_VERSION}".encode()
+    )
+    return digest.hexdigest()
+
+
+def load_cached_analysis(cache_dir: Path, key: str) -> dict[str, NDArray] | None:
+    """Load a cached analysis, or None if not cached (or unreadable)."""
+    path = cache_dir / f"{key}.npz"
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        # Date d'usage : base de l'éviction des moins récemment utilisés
+        os.utime(path)
+        return arrays
+    except Exception:
+        logging.warning("[VJing Analysis] Failed to read cache %s", path, exc_info=True)
+        return None
+
+
+def save_analysis_cache(
+    cache_dir: Path,
+    key: str,
+    arrays: dict[str, NDArray],
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+) -> None:
+    """Save an analysis to the cache (errors are logged, not raised).
+
+    The least recently used other analyses are then removed once the cache
+    holds more than max_bytes (only files named by cache_key(): the
+    directory may be shared).
+    """
+    path = cache_dir / f"{key}.npz"
+    tmp_path = cache_dir / f"{key}.tmp.npz"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        np.savez(tmp_path, **arrays)  # type: ignore[arg-type]
+        # Écriture atomique : un export concurrent ne lit jamais un fichier partiel
+        os.replace(tmp_path, path)
+        _evict(cache_dir, path, max_bytes)
+    except OSError:
+        logging.warning("[VJing Analysis] Failed to write cache %s", path, exc_info=True)
+
+
+def _evict(cache_dir: Path, kept: Path, max_bytes: int) -> None:
+    """Remove the least recently used analyses beyond max_bytes (kept excepted)."""
+    entries = []
+    for path in cache_dir.iterdir():
+        if path != kept and _CACHE_FILE.fullmatch(path.name):
+            try:
+                entries.append((path.stat(), path))
+            except OSError:
+                # Supprimé entre-temps (autre export)
+                continue
+    entries.sort(key=lambda entry: entry[0].st_mtime, reverse=True)
+    used = kept.stat().st_size
+    for stat, path in entries:
+        # Du plus récent au plus ancien : dès le dépassement, les suivants partent aussi
+        used += stat.st_size
+        if used > max_bytes:
+            logging.info("[VJing Analysis] Removing old cached analysis %s", path)
+            path.unlink(missing_ok=True)
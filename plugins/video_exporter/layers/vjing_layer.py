@@ -5,14 +5,16 @@ from __future__ import annotations
 import logging
 import math
 import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from random import Random
 from typing import TYPE_CHECKING, Any
 
 import numpy as np  # type: ignore[import-untyped]
 from PIL import Image, ImageDraw  # type: ignore[import-untyped]
 
+from plugins.video_exporter.layers import vj_kernels, vjing_analysis
 from plugins.video_exporter.layers.base import BaseVisualLayer
 
 # Try to import noise library, fallback to pseudo-noise if not available
@@ -49,7 +51,7 @@ if TYPE_CHECKING:
 
 
 def vj_effect(
-    display_name: str, category: str, pass_type: str = "generator"
+    display_name: str, category: str, pass_type: str = "generator", state: str = "none"
 ) -> Callable:  # noqa: S107
     """Decorator to register VJing effect metadata on _render_* methods.
 
@@ -57,10 +59,13 @@ def vj_effect(
         display_name: Human-readable name for UI display.
         category: UI grouping category (e.g. "Rythmiques", "GPU").
         pass_type: "generator", "post_processing", or "final_pass".
+        state: "none" (pure function of the frame), "effect" (keeps its own state
+            from one frame to the next, moved forward by VJingLayer.advance()) or
+            "frame" (reads previously composed frames).
     """
 
     def decorator(func: Callable) -> Callable:
-        func._vj_meta = (display_name, category, pass_type)  # type: ignore[attr-defined]
+        func._vj_meta = (display_name, category, pass_type, state)  # type: ignore[attr-defined]
         return func
 
     return decorator
@@ -277,6 +282,38 @@ def turbulence2d(x: float, y: float, octaves: int = 4) -> float:
     return total / max_value if max_value > 0 else 0.0
 
 
+@dataclass
+class VJingFrameState:
+    """What VJingLayer.render_state() needs to draw one frame.
+
+    Built by VJingLayer.advance(), which moves the stateful effects forward and
+    must therefore be called in frame order. Drawing from it reads no mutable
+    layer state, so several frames can be drawn by different threads at once.
+
+    Attributes:
+        ctx: Audio context of the frame (energy, bands, fft, is_beat).
+        generators: Generator effects to composite, with their transition alpha.
+        post_processor: Post-processing effect applied to the composite, if any.
+        final_pass: Final-pass effects applied last.
+        effects: Snapshot returned by ``_advance_<effect>`` for each stateful effect.
+        layers: Image of the other stateful generators, drawn by advance().
+        failed: Effects whose advance raised (skipped when drawing).
+        image: Whole frame, drawn by advance() when the post-processor reads
+            previous frames.
+        quality: Quality level the frame is drawn at (see VJingLayer.QUALITY_LEVELS).
+    """
+
+    ctx: dict[str, Any]
+    generators: list[tuple[str, float]]
+    post_processor: str | None = None
+    final_pass: list[str] = field(default_factory=list)
+    effects: dict[str, Any] = field(default_factory=dict)
+    layers: dict[str, Image.Image] = field(default_factory=dict)
+    failed: set[str] = field(default_factory=set)
+    image: Image.Image | None = None
+    quality: int = 0
+
+
 class VJingLayer(BaseVisualLayer):
     """VJing visual effects based on genre letters.
 
@@ -295,6 +332,13 @@ class VJingLayer(BaseVisualLayer):
     """
 
     z_index = 4
+    ANALYSIS_ARRAYS = ("energy", "bass_energy", "mid_energy", "treble_energy", "fft_data")
+
+    # Qualité sous budget de temps (preview) : niveau 1, les générateurs en fondu
+    # sous LOD_MIN_WEIGHT ne sont pas dessinés ; niveau 2, la passe finale
+    # (bloom...) non plus. Les effets avancent toujours (état identique).
+    QUALITY_LEVELS = 3
+    LOD_MIN_WEIGHT = 0.25
 
     # Default effect mappings (based on genre_editor codes)
     # Valid genres: D, C, P, T, H, G, I, A, W, B, F, R, L, U, O, N
@@ -340,6 +384,8 @@ class VJingLayer(BaseVisualLayer):
     AVAILABLE_EFFECTS: list[str] = []
     POST_PROCESSING_EFFECTS: set[str] = set()
     FINAL_PASS_EFFECTS: set[str] = set()
+    STATEFUL_EFFECTS: set[str] = set()
+    FRAME_STATE_EFFECTS: set[str] = set()
     EFFECT_CATALOG: dict[str, tuple[str, str]] = {}
 
     @classmethod
@@ -352,6 +398,8 @@ class VJingLayer(BaseVisualLayer):
         catalog: dict[str, tuple[str, str]] = {}
         post_processing: set[str] = set()
         final_pass: set[str] = set()
+        stateful: set[str] = set()
+        frame_state: set[str] = set()
 
         for name, method in cls.__dict__.items():
             if not name.startswith("_render_") or not callable(method):
@@ -360,18 +408,24 @@ class VJingLayer(BaseVisualLayer):
             if meta is None:
                 continue
             effect_id = name[len("_render_") :]
-            display_name, category, pass_type = meta
+            display_name, category, pass_type, state = meta
             effects.append(effect_id)
             catalog[effect_id] = (display_name, category)
             if pass_type == "post_processing":  # noqa: S105
                 post_processing.add(effect_id)
             elif pass_type == "final_pass":  # noqa: S105
                 final_pass.add(effect_id)
+            if state == "effect":
+                stateful.add(effect_id)
+            elif state == "frame":
+                frame_state.add(effect_id)
 
         cls.AVAILABLE_EFFECTS = effects
         cls.EFFECT_CATALOG = catalog
         cls.POST_PROCESSING_EFFECTS = post_processing
         cls.FINAL_PASS_EFFECTS = final_pass
+        cls.STATEFUL_EFFECTS = stateful
+        cls.FRAME_STATE_EFFECTS = frame_state
 
     # Color palettes: each palette is a list of 4-6 RGB tuples
     # Effects will use these colors for their visuals
@@ -473,6 +527,7 @@ class VJingLayer(BaseVisualLayer):
         enabled_post_processing: list[str] | None = None,
         use_gpu: bool = True,
         rng_seed: int = 42,
+        analysis_cache_dir: str | Path | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize VJing layer.
@@ -499,15 +554,19 @@ class VJingLayer(BaseVisualLayer):
             use_all_effects: If True, use all available effects regardless of genre/preset.
             use_gpu: Enable GPU-accelerated shaders when available.
             rng_seed: Seed for deterministic random number generation.
+            analysis_cache_dir: Directory caching the audio analysis between
+                exports (None: no cache).
             **kwargs: Additional parameters.
         """
+        self.analysis_cache_dir = Path(analysis_cache_dir) if analysis_cache_dir else None
         self._rng = Random(rng_seed)  # noqa: S311
         self._np_rng = np.random.default_rng(rng_seed)
+        # Intensité de l'effet en cours de dessin : propre à chaque thread
+        self._thread_state = threading.local()
         self.genre = genre
         self.effect_intensities = effect_intensities or {}
         # Use _global from effect_intensities if provided, otherwise use intensity param
         self.intensity = self.effect_intensities.pop("_global", intensity)
-        self._current_intensity = self.intensity  # Set by render() for current effect
         self._effect_phase_offset: float = 0.0  # adjusted by hot-swap to keep current effect
         self.preset = preset
         self.presets = presets or {}
@@ -559,11 +618,10 @@ class VJingLayer(BaseVisualLayer):
         self._cached_post_processors: list[str] = []
         self._cached_final_pass: list[str] = []
 
-        # Verrou sérialisant render() : feedback_buffer, particles, ripples,
-        # explosion_* et _current_intensity sont des états mutables partagés.
-        # L'export appelle render() depuis un ThreadPoolExecutor (jusqu'à 8 threads),
-        # ce qui provoquerait des data races sans ce verrou.
-        self._render_lock = threading.Lock()
+        # Verrou sérialisant advance() : seul endroit où les états des effets
+        # (particules, buffers, tirages de _rng / _np_rng) évoluent. Le dessin
+        # (render_state) se fait sans verrou, depuis plusieurs threads.
+        self._advance_lock = threading.Lock()
 
         # beats as set for O(1) lookup (beats list kept for reversed iteration in effects)
         self._beats_set: set[int] = set()
@@ -610,6 +668,15 @@ class VJingLayer(BaseVisualLayer):
 
         logging.debug(f"[VJingLayer] Initialized {len(self.lfos)} LFOs")
 
+    @property
+    def _current_intensity(self) -> float:
+        """Intensity of the effect being drawn by the calling thread."""
+        return getattr(self._thread_state, "intensity", self.intensity)
+
+    @_current_intensity.setter
+    def _current_intensity(self, value: float) -> None:
+        self._thread_state.intensity = value
+
     def _get_intensity(self, effect_name: str) -> float:
         """Get intensity for a specific effect.
 
@@ -839,69 +906,35 @@ class VJingLayer(BaseVisualLayer):
 
         return effects if effects else ["wave"]
 
+    def _analyze_audio(self) -> None:
+        """Compute per-frame band energies and FFT bands (cached on disk)."""
+        cache_dir = self.analysis_cache_dir
+        key = ""
+        arrays = None
+        if cache_dir is not None:
+            key = vjing_analysis.cache_key(self.audio, self.sr, self.fps, self.total_frames)
+            arrays = vjing_analysis.load_cached_analysis(cache_dir, key)
+        if arrays is not None:
+            logging.info("[VJingLayer] audio analysis loaded from cache (%s)", key)
+        else:
+            arrays = vjing_analysis.analyze_audio(self.audio, self.sr, self.total_frames)
+            if cache_dir is not None:
+                vjing_analysis.save_analysis_cache(cache_dir, key, arrays)
+
+        self.energy: NDArray = arrays["energy"]
+        self.bass_energy: NDArray = arrays["bass_energy"]
+        self.mid_energy: NDArray = arrays["mid_energy"]
+        self.treble_energy: NDArray = arrays["treble_energy"]
+        self.fft_data: NDArray = arrays["fft_data"]
+
     def _precompute(self) -> None:
         """Pre-compute effect-specific data."""
         logging.info("[VJingLayer] _precompute start (effects=%s)", self.active_effects)
-        samples_per_frame = len(self.audio) / self.total_frames
-
-        # Compute energy envelope for reactive effects
-        self.energy = []
-        self.bass_energy = []
-        self.mid_energy = []
-        self.treble_energy = []
-
-        # Band separation via FFT — thread-safe; scipy.signal.filtfilt uses BLAS which
-        # SIGBUS on macOS ARM (vecLib) when called from a non-main thread (QThread).
-        fft = np.fft.rfft(self.audio)
-        freqs = np.fft.rfftfreq(len(self.audio), 1.0 / self.sr)
-
-        def _fft_band(lo: float, hi: float | None) -> NDArray:
-            mask = freqs >= lo if hi is None else (freqs >= lo) & (freqs <= hi)
-            filtered = fft.copy()
-            filtered[~mask] = 0.0
-            return np.fft.irfft(filtered, n=len(self.audio)).astype(np.float32)
-
-        bass_audio = _fft_band(20.0, 250.0)
-        mid_audio = _fft_band(250.0, 4000.0)
-        treble_audio = _fft_band(4000.0, None)
         self._has_frequency_bands = True
 
-        # Compute per-frame energy
-        for frame_idx in range(self.total_frames):
-            start = int(frame_idx * samples_per_frame)
-            end = int((frame_idx + 1) * samples_per_frame)
-
-            chunk = self.audio[start:end]
-            bass_chunk = bass_audio[start:end]
-            mid_chunk = mid_audio[start:end]
-            treble_chunk = treble_audio[start:end]
-
-            self.energy.append(np.sqrt(np.mean(chunk**2)) if len(chunk) > 0 else 0.0)
-            self.bass_energy.append(np.sqrt(np.mean(bass_chunk**2)) if len(bass_chunk) > 0 else 0.0)
-            self.mid_energy.append(np.sqrt(np.mean(mid_chunk**2)) if len(mid_chunk) > 0 else 0.0)
-            self.treble_energy.append(
-                np.sqrt(np.mean(treble_chunk**2)) if len(treble_chunk) > 0 else 0.0
-            )
-
-        # Normalize
-        def normalize(arr: list) -> NDArray:
-            arr = np.array(arr)  # type: ignore[assignment]
-            max_val = np.max(arr) if np.max(arr) > 0 else 1.0
-            return arr / max_val  # type: ignore[operator]
-
-        self.energy = normalize(self.energy)
-        self.bass_energy = normalize(self.bass_energy)
-        self.mid_energy = normalize(self.mid_energy)
-        self.treble_energy = normalize(self.treble_energy)
-
-        logging.info("[VJingLayer] energy computed, running beat detection...")
         # Beat detection (simple onset detection)
         self._detect_beats()
 
-        # Compute FFT data for spectrum effects
-        logging.info("[VJingLayer] computing FFT data...")
-        self._compute_fft_data()
-
         logging.info("[VJingLayer] running effect init...")
         # Effect-specific initialization
         if "particles" in self.active_effects:
@@ -950,74 +983,46 @@ class VJingLayer(BaseVisualLayer):
 
     def _detect_beats(self) -> None:
         """Simple beat detection based on energy peaks."""
-        self.beats = []
-        threshold = 0.5
-        min_interval = self.fps // 4  # Minimum frames between beats
-
-        last_beat = -min_interval
-        for i, e in enumerate(self.bass_energy):
-            if e > threshold and i - last_beat >= min_interval:
-                # Check if it's a local maximum
-                window = 3
-                start = max(0, i - window)
-                end = min(len(self.bass_energy), i + window + 1)
-                if e == max(self.bass_energy[start:end]):
-                    self.beats.append(i)
-                    last_beat = i
+        self.beats = vjing_analysis.detect_beats(self.bass_energy, self.fps)
         self._beats_set = set(self.beats)
 
-    def _compute_fft_data(self) -> None:
-        """Pre-compute FFT data for each frame."""
-        self.fft_data = []
-        samples_per_frame = len(self.audio) / self.total_frames
-        n_bands = 32  # Number of frequency bands
-
-        for frame_idx in range(self.total_frames):
-            start = int(frame_idx * samples_per_frame)
-            end = int((frame_idx + 1) * samples_per_frame)
-            chunk = self.audio[start:end]
-
-            if len(chunk) > 0:
-                # Compute FFT
-                fft = np.abs(np.fft.rfft(chunk))
-                # Resample to n_bands
-                band_size = len(fft) // n_bands
-                bands = []
-                for i in range(n_bands):
-                    band_start = i * band_size
-                    band_end = (i + 1) * band_size
-                    bands.append(np.mean(fft[band_start:band_end]))
-                self.fft_data.append(np.array(bands))
-            else:
-                self.fft_data.append(np.zeros(n_bands))
-
-        # Normalize FFT data
-        max_fft = max(np.max(f) for f in self.fft_data) if self.fft_data else 1.0
-        if max_fft > 0:
-            self.fft_data = [f / max_fft for f in self.fft_data]
-
     def _init_particles(self) -> None:
-        """Initialize particle system."""
-        self.particles: list[dict[str, Any]] = []
+        """Initialize particle system (one array per attribute)."""
         self.max_particles = 80
+        self._particle_x = np.empty(0)
+        self._particle_y = np.empty(0)
+        self._particle_vx = np.empty(0)
+        self._particle_vy = np.empty(0)
+        self._particle_size = np.empty(0)
+        self._particle_life = np.empty(0)
+        self._particle_colors: list[tuple[int, int, int]] = []
+
+        self._spawn_particles(self.max_particles)
 
-        for _ in range(self.max_particles):
-            self._spawn_particle()
+    def _spawn_particles(self, count: int) -> None:
+        """Spawn new particles.
 
-    def _spawn_particle(self) -> None:
-        """Spawn a new particle."""
+        Args:
+            count: Number of particles to add.
+        """
         s = min(self.width, self.height) / 512
-        self.particles.append(
-            {
-                "x": self._rng.random() * self.width,
-                "y": self._rng.random() * self.height,
-                "vx": (self._rng.random() - 0.5) * 2 * s,
-                "vy": (self._rng.random() - 0.5) * 2 * s,
-                "size": (self._rng.random() * 10 + 5) * s,
-                "color": self._get_random_palette_color(),
-                "life": self._rng.random() * 100,
-            }
-        )
+        # Tirages dans l'ordre historique, particule par particule
+        spawned = []
+        for _ in range(count):
+            x = self._rng.random() * self.width
+            y = self._rng.random() * self.height
+            vx = (self._rng.random() - 0.5) * 2 * s
+            vy = (self._rng.random() - 0.5) * 2 * s
+            size = (self._rng.random() * 10 + 5) * s
+            self._particle_colors.append(self._get_random_palette_color())
+            spawned.append((x, y, vx, vy, size, self._rng.random() * 100))
+        x, y, vx, vy, size, life = np.array(spawned).T
+        self._particle_x = np.concatenate([self._particle_x, x])
+        self._particle_y = np.concatenate([self._particle_y, y])
+        self._particle_vx = np.concatenate([self._particle_vx, vx])
+        self._particle_vy = np.concatenate([self._particle_vy, vy])
+        self._particle_size = np.concatenate([self._particle_size, size])
+        self._particle_life = np.concatenate([self._particle_life, life])
 
     def _init_flow_field(self) -> None:
         """Initialize flow field (Perlin-like noise field)."""
@@ -1052,9 +1057,8 @@ class VJingLayer(BaseVisualLayer):
     def render(self, frame_idx: int, time_pos: float) -> Image.Image:
         """Render VJing effects for the current frame.
 
-        Sérialisé par ``self._render_lock`` : l'export appelle render() depuis
-        plusieurs threads, or les états mutables (feedback_buffer, particles,
-        ripples, _current_intensity, etc.) sont partagés. Voir [C22].
+        Sequential path: advance() then render_state(). The export advances the
+        frames in order on its own thread and draws them in parallel.
 
         Args:
             frame_idx: Frame index.
@@ -1063,13 +1067,55 @@ class VJingLayer(BaseVisualLayer):
         Returns:
             RGBA image with VJing effects.
         """
-        with self._render_lock:
-            return self._render_locked(frame_idx, time_pos)
+        return self.render_state(frame_idx, time_pos, self.advance(frame_idx, time_pos))
 
-    def _render_locked(self, frame_idx: int, time_pos: float) -> Image.Image:
-        """Corps de render(), exécuté sous ``self._render_lock``."""
-        img = self.create_transparent_image()
+    def advance(self, frame_idx: int, time_pos: float) -> VJingFrameState:
+        """Move the stateful effects forward to a frame and snapshot them.
+
+        Must be called once per frame, in frame order: particles, buffers and
+        the shared random generators evolve here exactly as they did when each
+        frame was rendered in turn, which keeps the output bit-identical.
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+
+        Returns:
+            State to hand to render_state().
+        """
+        with self._advance_lock:
+            state = self._plan_frame(frame_idx, time_pos)
+            steps = [effect_name for effect_name, _alpha in state.generators]
+            if state.post_processor is not None:
+                steps.append(state.post_processor)
+            steps += state.final_pass
+            for effect_name in steps:
+                if effect_name in self.STATEFUL_EFFECTS:
+                    self._advance_effect(effect_name, frame_idx, time_pos, state)
+            # Post-processing qui relit les frames précédentes (feedback, timestretch) :
+            # la frame ne peut être dessinée qu'ici, dans l'ordre
+            if state.post_processor in self.FRAME_STATE_EFFECTS:
+                state.image = self._compose(frame_idx, time_pos, state)
+            return state
+
+    def render_state(self, frame_idx: int, time_pos: float, state: Any) -> Image.Image:
+        """Draw a frame from the state returned by advance() (thread-safe).
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+            state: VJingFrameState of this frame.
+
+        Returns:
+            RGBA image with VJing effects.
+        """
+        frame_state: VJingFrameState = state
+        if frame_state.image is not None:
+            return frame_state.image
+        return self._compose(frame_idx, time_pos, frame_state)
 
+    def _plan_frame(self, frame_idx: int, time_pos: float) -> VJingFrameState:
+        """Audio context and effects drawn in a frame (called under the advance lock)."""
         # Get current energy values
         safe_idx = min(frame_idx, len(self.energy) - 1)
         bass = self.bass_energy[safe_idx]
@@ -1085,7 +1131,6 @@ class VJingLayer(BaseVisualLayer):
         # Energy is average of bands, recalculate with sensitivity
         energy_sens = min(1.0, (bass_sens + mid_sens + treble_sens) / 3)
 
-        # Local ctx dict — must not share with other threads (parallel render)
         ctx = {
             "energy": energy_sens,
             "bass": bass_sens,
@@ -1123,25 +1168,19 @@ class VJingLayer(BaseVisualLayer):
         if not generators and not post_processors and final_pass:
             generators = ["wave"]
 
-        # First: render all generator effects
+        # Generators with their crossfade alpha; nearly invisible ones are skipped
         if self.transitions_enabled and len(generators) > 1:
-            self._render_with_transitions(img, frame_idx, time_pos, ctx, generators)
+            planned = []
+            for idx, effect_name in enumerate(generators):
+                alpha = self._calculate_effect_alpha(idx, time_pos, len(generators))
+                if alpha >= 0.01:
+                    planned.append((effect_name, alpha))
         else:
-            for effect_name in generators:
-                effect_img = self.create_transparent_image()
-                self._current_intensity = self._get_intensity(effect_name)
-                effect_method = getattr(self, f"_render_{effect_name}", self._render_wave)
-                try:
-                    effect_method(effect_img, frame_idx, time_pos, ctx)
-                except Exception:
-                    logging.exception(
-                        "[VJingLayer] Effect '%s' failed (frame %d)", effect_name, frame_idx
-                    )
-                    continue
-                img.alpha_composite(effect_img)
+            planned = [(effect_name, 1.0) for effect_name in generators]
 
-        # Second: apply at most ONE post-processing effect on the composite image.
+        # At most ONE post-processing effect on the composite image.
         # The active PP cycles over time; energy below 30% of peak → no PP applied.
+        post_processor = None
         if post_processors:
             pp_cycle = self.effect_cycle_duration
             pp_count = len(post_processors)
@@ -1150,37 +1189,108 @@ class VJingLayer(BaseVisualLayer):
             slot_idx = int(time_pos / pp_cycle) % total_slots
             # Last slot = no post-processing
             if slot_idx < pp_count:
-                energy = ctx.get("energy", 0.0)
                 peak = max(self.energy) if len(self.energy) > 0 else 1.0
                 # Skip PP during quiet passages (below 30% of peak energy)
-                if peak > 0.0 and energy >= 0.3 * peak:
-                    effect_name = post_processors[slot_idx]
-                    self._current_intensity = self._get_intensity(effect_name)
-                    effect_method = getattr(self, f"_render_{effect_name}", None)
-                    if effect_method:
-                        try:
-                            effect_method(img, frame_idx, time_pos, ctx)
-                        except Exception:
-                            logging.exception(
-                                "[VJingLayer] Post-proc '%s' failed (frame %d)",
-                                effect_name,
-                                frame_idx,
-                            )
+                if peak > 0.0 and energy_sens >= 0.3 * peak:
+                    post_processor = post_processors[slot_idx]
+
+        return VJingFrameState(ctx, planned, post_processor, list(final_pass), quality=self.quality)
+
+    def _advance_effect(
+        self, effect_name: str, frame_idx: int, time_pos: float, state: VJingFrameState
+    ) -> None:
+        """Move one stateful effect forward and record its snapshot in ``state``."""
+        self._current_intensity = self._get_intensity(effect_name)
+        try:
+            advance_method = getattr(self, f"_advance_{effect_name}", None)
+            if advance_method is not None:
+                state.effects[effect_name] = advance_method(frame_idx, time_pos, state.ctx)
+            else:
+                # Générateur dont l'évolution et le dessin sont mêlés : dessiné ici
+                effect_img = self.create_transparent_image()
+                render_method = getattr(self, f"_render_{effect_name}")
+                render_method(effect_img, frame_idx, time_pos, dict(state.ctx))
+                state.layers[effect_name] = effect_img
+        except Exception:
+            logging.exception("[VJingLayer] Effect '%s' failed (frame %d)", effect_name, frame_idx)
+            state.failed.add(effect_name)
+
+    def _compose(self, frame_idx: int, time_pos: float, state: VJingFrameState) -> Image.Image:
+        """Draw the generators, post-processor and final pass of a frame."""
+        img = self.create_transparent_image()
+        # Local ctx dict — must not share with other threads (parallel render)
+        ctx = dict(state.ctx)
+
+        # First: generators, crossfaded by their transition alpha
+        min_weight = self.LOD_MIN_WEIGHT if state.quality >= 1 else 0.0
+        for effect_name, alpha in state.generators:
+            if alpha < min_weight:
+                continue
+            effect_img = state.layers.get(effect_name)
+            if effect_img is None:
+                effect_img = self.create_transparent_image()
+                method = getattr(self, f"_render_{effect_name}", self._render_wave)
+                if not self._draw_effect(
+                    "Effect", method, effect_name, effect_img, frame_idx, time_pos, ctx, state
+                ):
+                    continue
+
+            # Composite via PIL straight-alpha (correct Porter-Duff "over").
+            # Use local array — shared scratch would cause SIGBUS with parallel render workers.
+            if alpha < 0.99:
+                arr = np.array(effect_img)  # local copy; no shared state
+                # np.multiply in-place évite l'allocation temporaire intermédiaire
+                # (arr[:,:,3] * alpha crée un float64 temporaire qui peut corrompre
+                # le refcount de None sur ARM dans certains contextes C extension)
+                np.multiply(arr[:, :, 3], alpha, out=arr[:, :, 3], casting="unsafe")
+                img.alpha_composite(Image.fromarray(arr, "RGBA"))
+            else:
+                img.alpha_composite(effect_img)
+
+        # Second: post-processing on the composite image
+        if state.post_processor is not None:
+            method = getattr(self, f"_render_{state.post_processor}", None)
+            if method:
+                self._draw_effect(
+                    "Post-proc", method, state.post_processor, img, frame_idx, time_pos, ctx, state
+                )
 
         # Third: final-pass effects (bloom etc.) on the fully composited image
-        for effect_name in final_pass:
-            self._current_intensity = self._get_intensity(effect_name)
-            effect_method = getattr(self, f"_render_{effect_name}", None)
-            if effect_method:
-                try:
-                    effect_method(img, frame_idx, time_pos, ctx)
-                except Exception:
-                    logging.exception(
-                        "[VJingLayer] Final-pass '%s' failed (frame %d)", effect_name, frame_idx
-                    )
+        for effect_name in state.final_pass if state.quality < 2 else []:
+            method = getattr(self, f"_render_{effect_name}", None)
+            if method:
+                self._draw_effect(
+                    "Final-pass", method, effect_name, img, frame_idx, time_pos, ctx, state
+                )
 
         return img
 
+    def _draw_effect(
+        self,
+        stage: str,
+        method: Callable,
+        effect_name: str,
+        img: Image.Image,
+        frame_idx: int,
+        time_pos: float,
+        ctx: dict,
+        state: VJingFrameState,
+    ) -> bool:
+        """Call one ``_render_*`` method; False if it failed (logged) or its advance did."""
+        if effect_name in state.failed:
+            return False
+        self._current_intensity = self._get_intensity(effect_name)
+        # Snapshot de l'effet (None pour les effets sans état)
+        ctx["state"] = state.effects.get(effect_name)
+        try:
+            method(img, frame_idx, time_pos, ctx)
+        except Exception:
+            logging.exception(
+                "[VJingLayer] %s '%s' failed (frame %d)", stage, effect_name, frame_idx
+            )
+            return False
+        return True
+
     def _calculate_effect_alpha(
         self, effect_idx: int, time_pos: float, num_effects: int | None = None
     ) -> float:
@@ -1238,59 +1348,6 @@ class VJingLayer(BaseVisualLayer):
 
         return 0.0
 
-    def _render_with_transitions(
-        self,
-        img: Image.Image,
-        frame_idx: int,
-        time_pos: float,
-        ctx: dict,
-        effects: list[str] | None = None,
-    ) -> None:
-        """Render effects with smooth transitions between them.
-
-        Args:
-            img: Target image to render onto.
-            frame_idx: Frame index.
-            time_pos: Time position in seconds.
-            ctx: Audio context dictionary.
-            effects: List of effects to render (defaults to active_effects).
-        """
-        effects_to_render = effects if effects is not None else self.active_effects
-
-        for idx, effect_name in enumerate(effects_to_render):
-            alpha = self._calculate_effect_alpha(idx, time_pos, len(effects_to_render))
-
-            if alpha < 0.01:
-                continue  # Skip nearly invisible effects
-
-            # Create temporary image for this effect
-            effect_img = self.create_transparent_image()
-
-            # Set effect-specific intensity
-            self._current_intensity = self._get_intensity(effect_name)
-
-            # Render effect
-            effect_method = getattr(self, f"_render_{effect_name}", self._render_wave)
-            try:
-                effect_method(effect_img, frame_idx, time_pos, ctx)
-            except Exception:
-                logging.exception(
-                    "[VJingLayer] Effect '%s' failed (frame %d)", effect_name, frame_idx
-                )
-                continue
-
-            # Composite via PIL straight-alpha (correct Porter-Duff "over").
-            # Use local array — shared scratch would cause SIGBUS with parallel render workers.
-            if alpha < 0.99:
-                arr = np.array(effect_img)  # local copy; no shared state
-                # np.multiply in-place évite l'allocation temporaire intermédiaire
-                # (arr[:,:,3] * alpha crée un float64 temporaire qui peut corrompre
-                # le refcount de None sur ARM dans certains contextes C extension)
-                np.multiply(arr[:, :, 3], alpha, out=arr[:, :, 3], casting="unsafe")
-                img.alpha_composite(Image.fromarray(arr, "RGBA"))
-            else:
-                img.alpha_composite(effect_img)
-
     # ========================================================================
     # RHYTHM-SYNCHRONIZED EFFECTS
     # ========================================================================
@@ -1508,7 +1565,7 @@ class VJingLayer(BaseVisualLayer):
     # PARTICLE SYSTEMS
     # ========================================================================
 
-    @vj_effect("Particles", "Particules")
+    @vj_effect("Particles", "Particules", state="effect")
     def _render_particles(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -1518,43 +1575,42 @@ class VJingLayer(BaseVisualLayer):
         is_beat = ctx["is_beat"]
 
         # Spawn extra particles on beats
-        if is_beat and len(self.particles) < self.max_particles + 20:
-            for _ in range(5):
-                self._spawn_particle()
-
-        # Update and draw particles
-        for particle in self.particles:
-            # Update position with energy-based speed
-            speed_mult = 1 + energy * 3
-            particle["x"] += particle["vx"] * speed_mult
-            particle["y"] += particle["vy"] * speed_mult
-            particle["life"] -= 1
-
-            # Wrap around
-            if particle["x"] < 0:
-                particle["x"] = self.width
-            elif particle["x"] > self.width:
-                particle["x"] = 0
-            if particle["y"] < 0:
-                particle["y"] = self.height
-            elif particle["y"] > self.height:
-                particle["y"] = 0
-
-            # Respawn if dead
-            if particle["life"] <= 0:
-                particle["life"] = self._rng.random() * 100
-                particle["x"] = self._rng.random() * self.width
-                particle["y"] = self._rng.random() * self.height
+        if is_beat and len(self._particle_x) < self.max_particles + 20:
+            self._spawn_particles(5)
 
-            # Draw particle
-            size = max(1, int(particle["size"] * (1 + energy * 0.5) * self._current_intensity))
-            alpha = int(150 * self.intensity * (particle["life"] / 100))
-            color = (*particle["color"], alpha)
-
-            x, y = int(particle["x"]), int(particle["y"])
-            draw.ellipse([x - size, y - size, x + size, y + size], fill=color)
+        # Update position with energy-based speed
+        speed_mult = 1 + energy * 3
+        x, y, life = self._particle_x, self._particle_y, self._particle_life
+        x += self._particle_vx * speed_mult
+        y += self._particle_vy * speed_mult
+        life -= 1
+
+        # Wrap around
+        x[...] = np.where(x < 0, self.width, np.where(x > self.width, 0, x))
+        y[...] = np.where(y < 0, self.height, np.where(y > self.height, 0, y))
+
+        # Respawn dead particles (tirages dans l'ordre des particules)
+        for i in np.flatnonzero(life <= 0):
+            life[i] = self._rng.random() * 100
+            x[i] = self._rng.random() * self.width
+            y[i] = self._rng.random() * self.height
+
+        # Draw particles
+        sizes = np.maximum(
+            1, (self._particle_size * (1 + energy * 0.5) * self._current_intensity).astype(int)
+        )
+        alphas = (150 * self.intensity * (life / 100)).astype(int)
+        for px, py, size, alpha, color in zip(
+            x.astype(int).tolist(),
+            y.astype(int).tolist(),
+            sizes.tolist(),
+            alphas.tolist(),
+            self._particle_colors,
+            strict=True,
+        ):
+            draw.ellipse([px - size, py - size, px + size, py + size], fill=(*color, alpha))
 
-    @vj_effect("Flow Field", "Particules")
+    @vj_effect("Flow Field", "Particules", state="effect")
     def _render_flow_field(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -1612,7 +1668,7 @@ class VJingLayer(BaseVisualLayer):
 
             draw.line([(x, y), (x2, y2)], fill=(*base_color, alpha), width=line_w)
 
-    @vj_effect("Explosion", "Particules")
+    @vj_effect("Explosion", "Particules", state="effect")
     def _render_explosion(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -1942,7 +1998,7 @@ class VJingLayer(BaseVisualLayer):
         mask = Image.new("L", (self.width, self.height), alpha)
         img.paste(Image.composite(pixelated, img, mask), (0, 0))
 
-    @vj_effect("Feedback", "Post-process", "post_processing")
+    @vj_effect("Feedback", "Post-process", "post_processing", state="frame")
     def _render_feedback(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -2024,7 +2080,7 @@ class VJingLayer(BaseVisualLayer):
         self._timestretch_buffer: list[Image.Image] = []
         self._timestretch_accumulated_time = 0.0
 
-    @vj_effect("Timestretch", "Post-process", "post_processing")
+    @vj_effect("Timestretch", "Post-process", "post_processing", state="frame")
     def _render_timestretch(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -2125,7 +2181,7 @@ class VJingLayer(BaseVisualLayer):
     # NATURE-INSPIRED EFFECTS
     # ========================================================================
 
-    @vj_effect("Water", "Naturels")
+    @vj_effect("Water", "Naturels", state="effect")
     def _render_water(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
         """Render water ripple effect."""
         draw = ImageDraw.Draw(img)
@@ -2356,10 +2412,11 @@ class VJingLayer(BaseVisualLayer):
 
         # Color palette for fractal (fire-like gradient)
         self.fractal_palette = self._create_fractal_palette()
-
-        # Pre-allocate scratch arrays for Julia iteration loop
-        self._fractal_iters = np.zeros((self.fractal_height, self.fractal_width), dtype=np.int32)
-        self._fractal_mask = np.ones((self.fractal_height, self.fractal_width), dtype=bool)
+        # Couleur de chaque nombre d'itérations (0..max_iter)
+        self.fractal_max_iter = 50
+        self._fractal_colors = self.fractal_palette[
+            np.arange(self.fractal_max_iter + 1) * 255 // self.fractal_max_iter
+        ]
 
     def _create_fractal_palette(self) -> NDArray:
         """Create a color palette for fractal coloring based on current palette.
@@ -2429,47 +2486,22 @@ class VJingLayer(BaseVisualLayer):
         # Rotation
         rotation = time_pos * 0.2
 
-        # Create rotated and zoomed coordinate grid
-        cos_r = math.cos(rotation)
-        sin_r = math.sin(rotation)
-
-        # Apply rotation and zoom to coordinates
-        x_rot = (self.fractal_x * cos_r - self.fractal_y * sin_r) / zoom
-        y_rot = (self.fractal_x * sin_r + self.fractal_y * cos_r) / zoom
-
-        # Create complex grid
-        z = x_rot + 1j * y_rot
-        c = complex(c_real, c_imag)
-
-        # Tableaux locaux par frame : évite les conflits entre workers parallèles
-        # (self._fractal_mask partagé causait une race condition)
-        max_iter = 50
-        iterations = np.zeros((self.fractal_height, self.fractal_width), dtype=np.int32)
-        mask = np.ones((self.fractal_height, self.fractal_width), dtype=bool)
-
-        for i in range(max_iter):
-            # np.where évite l'assignation par indexation booléenne
-            # (z[mask] = z[mask]**2+c est instable quand mask est modifié entre lecture et écriture)
-            z = np.where(mask, z**2 + c, z)
-            escaped = np.abs(z) > 4
-            new_escaped = escaped & mask
-            iterations[new_escaped] = i
-            mask[new_escaped] = False
-            if not np.any(mask):
-                break
-
-        iterations[mask] = max_iter
-        normalized = (iterations * 255 // max_iter).astype(np.uint8)
-        colored = self.fractal_palette[normalized]
+        # Escape-time sur les seuls points encore bornés (buffers par thread :
+        # les frames sont dessinées en parallèle)
+        iterations = vj_kernels.julia_escape(
+            self.fractal_x,
+            self.fractal_y,
+            math.cos(rotation),
+            math.sin(rotation),
+            zoom,
+            complex(c_real, c_imag),
+            self.fractal_max_iter,
+        )
+        colored = self._fractal_colors[iterations]
 
-        alpha_value = int(200 * self._current_intensity)
         fractal_small = Image.fromarray(colored, mode="RGB")
-        fractal_full = fractal_small.resize((self.width, self.height), Image.Resampling.BILINEAR)
-
-        fractal_rgba = fractal_full.convert("RGBA")
-        r, g, b, _ = fractal_rgba.split()
-        alpha = Image.new("L", (self.width, self.height), alpha_value)
-        fractal_rgba = Image.merge("RGBA", (r, g, b, alpha))
+        fractal_rgba = fractal_small.resize((self.width, self.height), Image.Resampling.BILINEAR)
+        fractal_rgba.putalpha(int(200 * self._current_intensity))
 
         img.paste(fractal_rgba, (0, 0), fractal_rgba)
 
@@ -2477,7 +2509,7 @@ class VJingLayer(BaseVisualLayer):
     # RADAR EFFECT
     # ========================================================================
 
-    @vj_effect("Radar", "Geometric")
+    @vj_effect("Radar", "Geometric", state="effect")
     def _render_radar(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
         """Render radar sweep effect.
 
@@ -2601,9 +2633,13 @@ class VJingLayer(BaseVisualLayer):
         self.plasma_height = self.height // self.plasma_scale
         # Create coordinate grids — wider range at low resolution so we see more waves
         span = 4 * math.pi * max(1.0, 256 / min(self.width, self.height))
-        y_coords = np.linspace(0, span, self.plasma_height)
-        x_coords = np.linspace(0, span, self.plasma_width)
-        self.plasma_x, self.plasma_y = np.meshgrid(x_coords, y_coords)
+        self.plasma_xs = np.linspace(0, span, self.plasma_width)
+        self.plasma_ys = np.linspace(0, span, self.plasma_height)
+        # Distance au centre de l'onde radiale : fixe d'une frame à l'autre
+        self.plasma_radial = np.sqrt(
+            ((self.plasma_xs - 2 * math.pi) ** 2)[np.newaxis, :]
+            + ((self.plasma_ys - 2 * math.pi) ** 2)[:, np.newaxis]
+        )
 
     @vj_effect("Plasma", "GPU")
     def _render_plasma(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
@@ -2634,44 +2670,17 @@ class VJingLayer(BaseVisualLayer):
 
         # Plasma function - multiple sine waves combined
         # Each component modulated by different audio bands
-        v1 = np.sin(self.plasma_x + t + bass * math.pi)
-        v2 = np.sin(self.plasma_y + t * 0.7 + mid * math.pi)
-        v3 = np.sin((self.plasma_x + self.plasma_y + t * 0.5) * 0.5)
-        v4 = np.sin(
-            np.sqrt((self.plasma_x - 2 * math.pi) ** 2 + (self.plasma_y - 2 * math.pi) ** 2)
-            + t
-            + energy * math.pi
+        plasma = vj_kernels.plasma_field(
+            self.plasma_xs, self.plasma_ys, self.plasma_radial, t, bass, mid, energy
         )
 
-        # Combine waves
-        plasma = (v1 + v2 + v3 + v4) / 4.0
-
-        # Normalize to 0-1
-        plasma = (plasma + 1.0) / 2.0
-
-        # Create RGB from palette colors via vectorised LUT interpolation
-        colors = self.color_palette
-        n_colors = len(colors)
-        pal_arr = np.array(colors, dtype=np.float32)  # (n_colors, 3)
-
-        palette_pos = (plasma * n_colors + t) % n_colors
-        idx1 = palette_pos.astype(np.int32) % n_colors
-        idx2 = (idx1 + 1) % n_colors
-        blend = (palette_pos - np.floor(palette_pos))[..., np.newaxis]  # (..., 1)
-
-        # Direct gather + lerp — no per-color-index loop
-        rgb = (pal_arr[idx1] * (1.0 - blend) + pal_arr[idx2] * blend).astype(np.uint8)
+        # Create RGB from palette colors, rotating with time
+        rgb = vj_kernels.palette_lerp(plasma, self.color_palette, offset=t)
 
         # Create image and upscale
         plasma_small = Image.fromarray(rgb, mode="RGB")
-        plasma_full = plasma_small.resize((self.width, self.height), Image.Resampling.BILINEAR)
-
-        # Convert to RGBA with alpha
-        plasma_rgba = plasma_full.convert("RGBA")
-        r_ch, g_ch, b_ch, _ = plasma_rgba.split()
-        alpha_value = int(180 * self._current_intensity)
-        alpha = Image.new("L", (self.width, self.height), alpha_value)
-        plasma_rgba = Image.merge("RGBA", (r_ch, g_ch, b_ch, alpha))
+        plasma_rgba = plasma_small.resize((self.width, self.height), Image.Resampling.BILINEAR)
+        plasma_rgba.putalpha(int(180 * self._current_intensity))
 
         # Composite
         img.paste(plasma_rgba, (0, 0), plasma_rgba)
@@ -2779,7 +2788,7 @@ class VJingLayer(BaseVisualLayer):
         """Spawn a single star (legacy helper, unused in vectorised render)."""
         pass
 
-    @vj_effect("Starfield", "Particules")
+    @vj_effect("Starfield", "Particules", state="effect")
     def _render_starfield(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -2843,20 +2852,35 @@ class VJingLayer(BaseVisualLayer):
         # On-screen mask
         on_screen = (px_f >= 0) & (px_f < self.width) & (py_f >= 0) & (py_f < self.height)
 
-        # Draw each visible star
+        # Per-star color, size and alpha of the visible stars
+        visible = np.flatnonzero(on_screen)
+        bb = base_brightness[visible]
+        sz = sz[visible]
+        white_blend = bb * 0.5
+        # Mélange en float32 comme la couleur de palette
         pal_arr = np.array(colors, dtype=np.float32)
-        intensity = self._current_intensity
-        for i in np.where(on_screen)[0]:
-            bb = float(base_brightness[i])
-            px_i, py_i = int(px_f[i]), int(py_f[i])
-            sz_i = float(sz[i])
-            size = max(1, int(3 * s / sz_i))
-            white_blend = bb * 0.5
-            bc = pal_arr[int(scol[i]) % n_colors]
-            r = int(np.clip(bc[0] * (1 - white_blend) + 255 * white_blend * bb, 0, 255))
-            g = int(np.clip(bc[1] * (1 - white_blend) + 255 * white_blend * bb, 0, 255))
-            b = int(np.clip(bc[2] * (1 - white_blend) + 255 * white_blend * bb, 0, 255))
-            alpha = int(min(255, bb * 255) * intensity)
+        rgb = pal_arr[scol[visible] % n_colors] * (1 - white_blend).astype(np.float32)[:, None]
+        rgb += (255 * white_blend * bb).astype(np.float32)[:, None]
+        rgb = np.clip(rgb, 0, 255).astype(int)
+        alphas = (np.minimum(255, bb * 255) * self._current_intensity).astype(int)
+        sizes = np.maximum(1, (3 * s / sz).astype(int))
+        # Motion trail for fast stars
+        trails = (sz < 0.5) & (bass > 0.5)
+        trail_x = (cx + (sx[visible] / (sz + speed * 3)) * cx).astype(int)
+        trail_y = (cy + (sy[visible] / (sz + speed * 3)) * cy).astype(int)
+
+        # Draw each visible star
+        for px_i, py_i, size, (r, g, b), alpha, trail, tx, ty in zip(
+            px_f[visible].astype(int).tolist(),
+            py_f[visible].astype(int).tolist(),
+            sizes.tolist(),
+            rgb.tolist(),
+            alphas.tolist(),
+            trails.tolist(),
+            trail_x.tolist(),
+            trail_y.tolist(),
+            strict=True,
+        ):
             if size <= 1:
                 draw.point((px_i, py_i), fill=(r, g, b, alpha))
             else:
@@ -2864,12 +2888,9 @@ class VJingLayer(BaseVisualLayer):
                     [px_i - size, py_i - size, px_i + size, py_i + size],
                     fill=(r, g, b, alpha),
                 )
-            # Motion trail for fast stars
-            if sz_i < 0.5 and bass > 0.5:
-                trail_x = int(cx + (sx[i] / (sz_i + speed * 3)) * cx)
-                trail_y = int(cy + (sy[i] / (sz_i + speed * 3)) * cy)
+            if trail:
                 draw.line(
-                    [(px_i, py_i), (trail_x, trail_y)],
+                    [(px_i, py_i), (tx, ty)],
                     fill=(r, g, b, alpha // 2),
                     width=max(1, size - 1),
                 )
@@ -2878,7 +2899,7 @@ class VJingLayer(BaseVisualLayer):
     # LIGHTNING EFFECT
     # ========================================================================
 
-    @vj_effect("Lightning", "Naturels")
+    @vj_effect("Lightning", "Naturels", state="effect")
     def _render_lightning(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -3035,24 +3056,18 @@ class VJingLayer(BaseVisualLayer):
         )  # (n, 3)
         self.voronoi_points: list[dict[str, Any]] = []  # kept for API compat
 
-    @vj_effect("Voronoi", "GPU")
-    def _render_voronoi(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
-        """Render animated Voronoi diagram.
-
-        Cells colored by nearest point, points move with audio.
-        Uses GPU acceleration when available.
+    def _advance_voronoi(
+        self, frame_idx: int, time_pos: float, ctx: dict
+    ) -> Image.Image | tuple[NDArray, NDArray]:
+        """Move the Voronoi points (CPU path) or render the GPU shader.
 
-        Args:
-            img: Image to draw on.
-            frame_idx: Frame index.
-            time_pos: Time position in seconds.
-            ctx: Audio context dict.
+        Returns:
+            GPU image, or copies of the point coordinates (x, y).
         """
         # Try GPU rendering first
         gpu_img = self._render_gpu_effect("voronoi", frame_idx, time_pos, ctx)
         if gpu_img:
-            img.paste(gpu_img, (0, 0), gpu_img)
-            return
+            return gpu_img
 
         # CPU fallback
         energy = ctx["energy"]
@@ -3078,38 +3093,49 @@ class VJingLayer(BaseVisualLayer):
             self._vor_vx += (self._np_rng.random(n) - 0.5) * bass * 4 * s
             self._vor_vy += (self._np_rng.random(n) - 0.5) * bass * 4 * s
 
+        return self._vor_x.copy(), self._vor_y.copy()
+
+    @vj_effect("Voronoi", "GPU", state="effect")
+    def _render_voronoi(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
+        """Render animated Voronoi diagram.
+
+        Cells colored by nearest point, points move with audio.
+        Uses GPU acceleration when available.
+
+        Args:
+            img: Image to draw on.
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+            ctx: Audio context dict (``state`` from _advance_voronoi).
+        """
+        state = ctx["state"]
+        if isinstance(state, Image.Image):
+            img.paste(state, (0, 0), state)
+            return
+        vor_x, vor_y = state
+
         # Render at lower resolution for performance (adaptive for small viewports)
         scale = max(1, min(4, min(self.width, self.height) // 16))
         small_w = max(1, self.width // scale)
         small_h = max(1, self.height // scale)
 
-        y_coords, x_coords = np.ogrid[:small_h, :small_w]
-        x_coords = x_coords * scale
-        y_coords = y_coords * scale
-
-        # Vectorised nearest-point assignment: broadcast (n_pts, h, w)
-        pts_x = self._vor_x[:, np.newaxis, np.newaxis]
-        pts_y = self._vor_y[:, np.newaxis, np.newaxis]
-        dist_all = (x_coords - pts_x) ** 2 + (y_coords - pts_y) ** 2  # (n, h, w)
-        nearest = dist_all.argmin(axis=0).astype(np.int32)  # (h, w)
+        # Nearest seed per grid point: running minimum, one pass per seed
+        nearest = vj_kernels.nearest_seed(
+            vor_x, vor_y, np.arange(small_w) * scale, np.arange(small_h) * scale
+        )
 
         # Colour via LUT (no per-point loop)
         rgb = self._vor_colors[nearest]  # (h, w, 3)
 
-        # Edge darkening
+        # Edge darkening: cell boundaries (index change to the left or above)
         edge_x = np.abs(np.diff(nearest.astype(np.float32), axis=1, prepend=nearest[:, :1]))
         edge_y = np.abs(np.diff(nearest.astype(np.float32), axis=0, prepend=nearest[:1, :]))
         edges = np.clip((edge_x + edge_y) * 50, 0, 100).astype(np.uint8)[..., np.newaxis]
         rgb = np.clip(rgb.astype(np.int16) - edges, 0, 255).astype(np.uint8)
 
         voronoi_small = Image.fromarray(rgb, mode="RGB")
-        voronoi_full = voronoi_small.resize((self.width, self.height), Image.Resampling.NEAREST)
-
-        voronoi_rgba = voronoi_full.convert("RGBA")
-        r_ch, g_ch, b_ch, _ = voronoi_rgba.split()
-        alpha_value = int(180 * self._current_intensity)
-        alpha = Image.new("L", (self.width, self.height), alpha_value)
-        voronoi_rgba = Image.merge("RGBA", (r_ch, g_ch, b_ch, alpha))
+        voronoi_rgba = voronoi_small.resize((self.width, self.height), Image.Resampling.NEAREST)
+        voronoi_rgba.putalpha(int(180 * self._current_intensity))
 
         img.paste(voronoi_rgba, (0, 0), voronoi_rgba)
 
@@ -3132,30 +3158,21 @@ class VJingLayer(BaseVisualLayer):
         self.metaball_w = max(128, self.width // 4)
         self.metaball_h = max(128, self.height // 4)
         # Coordinates mapped to viewport space (not grid space)
-        y_coords = np.linspace(0, self.height, self.metaball_h, endpoint=False)
-        x_coords = np.linspace(0, self.width, self.metaball_w, endpoint=False)
-        self.metaball_x, self.metaball_y = np.meshgrid(x_coords, y_coords)
+        self.metaball_ys = np.linspace(0, self.height, self.metaball_h, endpoint=False)
+        self.metaball_xs = np.linspace(0, self.width, self.metaball_w, endpoint=False)
 
-    @vj_effect("Metaballs", "GPU")
-    def _render_metaballs(
-        self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
-    ) -> None:
-        """Render metaballs (blob/liquid effect).
-
-        Balls that merge smoothly when close together using field function.
-        Uses GPU acceleration when available.
+    def _advance_metaballs(
+        self, frame_idx: int, time_pos: float, ctx: dict
+    ) -> Image.Image | tuple[NDArray, NDArray]:
+        """Move the metaballs (CPU path) or render the GPU shader.
 
-        Args:
-            img: Image to draw on.
-            frame_idx: Frame index.
-            time_pos: Time position in seconds.
-            ctx: Audio context dict.
+        Returns:
+            GPU image, or copies of the ball centres (x, y).
         """
         # Try GPU rendering first
         gpu_img = self._render_gpu_effect("metaballs", frame_idx, time_pos, ctx)
         if gpu_img:
-            img.paste(gpu_img, (0, 0), gpu_img)
-            return
+            return gpu_img
 
         # CPU fallback
         energy = ctx["energy"]
@@ -3178,35 +3195,47 @@ class VJingLayer(BaseVisualLayer):
             self._mb_vx += (self._np_rng.random(n) - 0.5) * bass * 6 * s
             self._mb_vy += (self._np_rng.random(n) - 0.5) * bass * 6 * s
 
-        # Compute metaball field — vectorised over all balls simultaneously
+        return self._mb_x.copy(), self._mb_y.copy()
+
+    @vj_effect("Metaballs", "GPU", state="effect")
+    def _render_metaballs(
+        self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
+    ) -> None:
+        """Render metaballs (blob/liquid effect).
+
+        Balls that merge smoothly when close together using field function.
+        Uses GPU acceleration when available.
+
+        Args:
+            img: Image to draw on.
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+            ctx: Audio context dict (``state`` from _advance_metaballs).
+        """
+        state = ctx["state"]
+        if isinstance(state, Image.Image):
+            img.paste(state, (0, 0), state)
+            return
+        mb_x, mb_y = state
+        bass = ctx["bass"]
+
+        # Compute metaball field — one accumulation pass per ball
         radii = self._mb_radius * (1 + bass * 0.5)
-        # (n, h, w) distance squared arrays
-        dx_all = self.metaball_x[np.newaxis, :, :] - self._mb_x[:, np.newaxis, np.newaxis]
-        dy_all = self.metaball_y[np.newaxis, :, :] - self._mb_y[:, np.newaxis, np.newaxis]
-        dist_sq = dx_all**2 + dy_all**2 + 1
-        field = ((radii**2)[:, np.newaxis, np.newaxis] / dist_sq).sum(axis=0)
+        field = vj_kernels.metaball_field(mb_x, mb_y, radii, self.metaball_xs, self.metaball_ys)
 
         threshold = 1.0
         inside = field > threshold
         glow = np.clip((field - threshold * 0.5) / threshold, 0, 1)
 
-        # Use palette colors via vectorised LUT interpolation
-        colors = self.color_palette
-        n_colors = len(colors)
-        pal_arr = np.array(colors, dtype=np.float32)
-
-        palette_pos = (glow * n_colors + time_pos * 0.5) % n_colors
-        idx1 = palette_pos.astype(np.int32) % n_colors
-        idx2 = (idx1 + 1) % n_colors
-        blend = (palette_pos - np.floor(palette_pos))[..., np.newaxis]
-
-        rgb_f = pal_arr[idx1] * (1.0 - blend) + pal_arr[idx2] * blend
+        # Use palette colors, rotating with time
+        rgba = np.empty((*field.shape, 4), dtype=np.uint8)
+        rgba[..., :3] = vj_kernels.palette_lerp(glow, self.color_palette, offset=time_pos * 0.5)
 
         # Brighten inside areas
-        rgb_f[inside] = np.clip(rgb_f[inside] + 80, 0, 255)
-        rgb = rgb_f.astype(np.uint8)
-        alpha_arr = (glow * 200 * self._current_intensity).astype(np.uint8)
-        rgba = np.dstack([rgb, alpha_arr])
+        rgb = rgba[..., :3]
+        np.copyto(rgb, np.minimum(rgb, 175) + 80, where=inside[..., np.newaxis])
+        np.multiply(glow, 200 * self._current_intensity, out=glow)
+        np.copyto(rgba[..., 3], glow, casting="unsafe")
 
         metaball_img = Image.fromarray(rgba, mode="RGBA")
         # Resize from compute grid to target viewport
@@ -3253,7 +3282,7 @@ class VJingLayer(BaseVisualLayer):
             }
         )
 
-    @vj_effect("Smoke", "Naturels")
+    @vj_effect("Smoke", "Naturels", state="effect")
     def _render_smoke(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
         """Render smoke/mist effect with Perlin turbulence.
 
@@ -3377,15 +3406,11 @@ class VJingLayer(BaseVisualLayer):
         # Precompute coordinate grids (lazy, constant once w/h is set)
         if not hasattr(self, "_nebula_xs") or self._nebula_xs.shape != (sh, sw):
             self._nebula_ys, self._nebula_xs = np.mgrid[0:sh, 0:sw].astype(np.float32)
-            self._nebula_r = np.empty((sh, sw), dtype=np.float32)
-            self._nebula_g = np.empty((sh, sw), dtype=np.float32)
-            self._nebula_b = np.empty((sh, sw), dtype=np.float32)
-            self._nebula_noise = np.empty((sh, sw), dtype=np.float32)
         xs, ys = self._nebula_xs, self._nebula_ys
-        result_r, result_g, result_b = self._nebula_r, self._nebula_g, self._nebula_b
-        result_r[:] = 0.0
-        result_g[:] = 0.0
-        result_b[:] = 0.0
+        # Accumulateurs locaux : plusieurs frames sont dessinées en parallèle
+        result_r = np.zeros((sh, sw), dtype=np.float32)
+        result_g = np.zeros((sh, sw), dtype=np.float32)
+        result_b = np.zeros((sh, sw), dtype=np.float32)
 
         for scale, speed, color_idx_base, weight in layers_cfg:
             sc = scale * ds
@@ -3396,8 +3421,7 @@ class VJingLayer(BaseVisualLayer):
             c2 = np.array(colors[ci2], dtype=np.float32)
 
             # Vectorized pseudo-FBM: sum of rotated sinusoids (4 octaves)
-            noise = self._nebula_noise
-            noise[:] = 0.0
+            noise = np.zeros((sh, sw), dtype=np.float32)
             amp = 1.0
             freq = 1.0
             for octave in range(4):
@@ -3466,7 +3490,7 @@ class VJingLayer(BaseVisualLayer):
     # Hexgrid effect - Hexagonal grid with FFT-driven cell illumination
     # =========================================================================
 
-    @vj_effect("Hexgrid", "Spectraux")
+    @vj_effect("Hexgrid", "Spectraux", state="effect")
     def _render_hexgrid(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
         """Render hexagonal grid with cells lit by FFT frequency bins.
 
@@ -3557,18 +3581,16 @@ class VJingLayer(BaseVisualLayer):
     # Glitch effect - Digital corruption triggered by transients
     # =========================================================================
 
-    @vj_effect("Glitch", "Post-process", "post_processing")
-    def _render_glitch(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
-        """Render digital glitch: block displacement, RGB shift, and scanline tearing.
+    def _advance_glitch(self, frame_idx: int, time_pos: float, ctx: dict) -> dict | None:
+        """Draw the random glitch operations of a frame.
 
-        Operates as post-processing on the existing image. Stronger on beats
-        and high energy; produces random block shifts, color channel offsets,
-        and horizontal tear lines.
+        Returns:
+            Block shifts, RGB channel shift, tears and inverted block (None when
+            the glitch is too weak to show).
         """
         bass = ctx["bass"]
         energy = ctx["energy"]
         is_beat = ctx["is_beat"]
-        treble = ctx["treble"]
         intensity = self._current_intensity
         w, h = self.width, self.height
         s = min(w, h) / 512
@@ -3579,11 +3601,10 @@ class VJingLayer(BaseVisualLayer):
             glitch_strength += 0.4
         glitch_strength *= intensity
         if glitch_strength < 0.05:
-            return
-
-        data = np.array(img)
+            return None
 
         # --- 1. Block displacement: shift random horizontal slices ---
+        blocks = []
         n_blocks = self._rng.randint(2, max(3, int(6 + glitch_strength * 10)))
         for _ in range(n_blocks):
             if self._rng.random() > glitch_strength:
@@ -3593,10 +3614,10 @@ class VJingLayer(BaseVisualLayer):
             shift = self._rng.randint(-int(40 * s * glitch_strength), int(40 * s * glitch_strength))
             if shift == 0:
                 continue
-            block = data[by : by + bh].copy()
-            data[by : by + bh] = np.roll(block, shift, axis=1)
+            blocks.append((by, bh, shift))
 
         # --- 2. RGB channel offset: shift R and B horizontally ---
+        channel_shift = None
         if self._rng.random() < glitch_strength * 0.8:
             shift_r = self._rng.randint(
                 -max(1, int(8 * s * glitch_strength)), max(1, int(8 * s * glitch_strength))
@@ -3604,10 +3625,10 @@ class VJingLayer(BaseVisualLayer):
             shift_b = self._rng.randint(
                 -max(1, int(8 * s * glitch_strength)), max(1, int(8 * s * glitch_strength))
             )
-            data[:, :, 0] = np.roll(data[:, :, 0], shift_r, axis=1)
-            data[:, :, 2] = np.roll(data[:, :, 2], shift_b, axis=1)
+            channel_shift = (shift_r, shift_b)
 
-        # --- 3. Scanline tears: bright or dark horizontal lines ---
+        # --- 3. Scanline tears: palette color, or None for a blackout ---
+        tears: list[tuple[int, int, tuple[int, int, int] | None]] = []
         n_tears = self._rng.randint(0, max(1, int(4 * glitch_strength)))
         colors = self.color_palette
         for _ in range(n_tears):
@@ -3615,8 +3636,49 @@ class VJingLayer(BaseVisualLayer):
             tear_h = self._rng.randint(1, max(2, int(3 * s)))
             te = min(h, ty + tear_h)
             if self._rng.random() < 0.5:
+                tears.append((ty, te, colors[self._rng.randint(0, len(colors) - 1)]))
+            else:
+                tears.append((ty, te, None))
+
+        # --- 4. Invert random block on strong beats ---
+        invert = None
+        if is_beat and bass > 0.6 and self._rng.random() < 0.5:
+            bh = self._rng.randint(int(20 * s), int(80 * s))
+            bw = self._rng.randint(int(40 * s), int(w * 0.6))
+            by = self._rng.randint(0, max(1, h - bh))
+            bx = self._rng.randint(0, max(1, w - bw))
+            invert = (by, bh, bx, bw)
+
+        return {"blocks": blocks, "channel_shift": channel_shift, "tears": tears, "invert": invert}
+
+    @vj_effect("Glitch", "Post-process", "post_processing", state="effect")
+    def _render_glitch(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
+        """Render digital glitch: block displacement, RGB shift, and scanline tearing.
+
+        Operates as post-processing on the existing image. Stronger on beats
+        and high energy; produces random block shifts, color channel offsets,
+        and horizontal tear lines (drawn by _advance_glitch).
+        """
+        glitch = ctx["state"]
+        if glitch is None:
+            return
+        treble = ctx["treble"]
+        intensity = self._current_intensity
+
+        data = np.array(img)
+
+        for by, bh, shift in glitch["blocks"]:
+            block = data[by : by + bh].copy()
+            data[by : by + bh] = np.roll(block, shift, axis=1)
+
+        if glitch["channel_shift"] is not None:
+            shift_r, shift_b = glitch["channel_shift"]
+            data[:, :, 0] = np.roll(data[:, :, 0], shift_r, axis=1)
+            data[:, :, 2] = np.roll(data[:, :, 2], shift_b, axis=1)
+
+        for ty, te, c in glitch["tears"]:
+            if c is not None:
                 # Bright colored tear
-                c = colors[self._rng.randint(0, len(colors) - 1)]
                 alpha = int(180 * intensity * treble + 40)
                 data[ty:te, :, 0] = c[0]
                 data[ty:te, :, 1] = c[1]
@@ -3626,12 +3688,8 @@ class VJingLayer(BaseVisualLayer):
                 # Dark tear (blackout)
                 data[ty:te, :, :3] = 0
 
-        # --- 4. Invert random block on strong beats ---
-        if is_beat and bass > 0.6 and self._rng.random() < 0.5:
-            bh = self._rng.randint(int(20 * s), int(80 * s))
-            bw = self._rng.randint(int(40 * s), int(w * 0.6))
-            by = self._rng.randint(0, max(1, h - bh))
-            bx = self._rng.randint(0, max(1, w - bw))
+        if glitch["invert"] is not None:
+            by, bh, bx, bw = glitch["invert"]
             data[by : by + bh, bx : bx + bw, :3] = 255 - data[by : by + bh, bx : bx + bw, :3]
 
         result = Image.fromarray(data, "RGBA")
@@ -3641,7 +3699,61 @@ class VJingLayer(BaseVisualLayer):
     # Scanlines effect - CRT scanlines + VHS distortion, intensity on drops
     # =========================================================================
 
-    @vj_effect("Scanlines", "Post-process", "post_processing")
+    def _advance_scanlines(self, frame_idx: int, time_pos: float, ctx: dict) -> dict:
+        """Draw the random VHS jitter and tracking-bar noise of a frame.
+
+        Returns:
+            ``jitters`` (y, height, shift) slices and ``bar_noise`` (one value per
+            row of the tracking bar, None when the bar is hidden).
+        """
+        bass = ctx["bass"]
+        energy = ctx["energy"]
+        is_beat = ctx["is_beat"]
+        intensity = self._current_intensity
+        h = self.height
+        s = min(self.width, h) / 512
+
+        jitter_strength = bass * 0.3 + energy * 0.2
+        if is_beat:
+            jitter_strength += 0.5
+        jitter_strength *= intensity
+
+        jitters = []
+        if jitter_strength > 0.1:
+            # A few horizontal slices get shifted
+            n_jitter = self._rng.randint(2, max(3, int(5 + jitter_strength * 8)))
+            for _ in range(n_jitter):
+                if self._rng.random() > jitter_strength:
+                    continue
+                jh = self._rng.randint(1, max(2, int(4 * s)))
+                jy = self._rng.randint(0, h - jh)
+                shift = self._rng.randint(
+                    -max(1, int(15 * s * jitter_strength)),
+                    max(1, int(15 * s * jitter_strength)),
+                )
+                if shift != 0:
+                    jitters.append((jy, jh, shift))
+
+        bar_noise = None
+        bar_y_start, bar_y_end = self._scanlines_bar(time_pos, ctx)
+        if bar_y_start < bar_y_end:
+            bar_noise = np.array([self._rng.randint(0, 40) for _ in range(bar_y_end - bar_y_start)])
+
+        return {"jitters": jitters, "bar_noise": bar_noise}
+
+    def _scanlines_bar(self, time_pos: float, ctx: dict) -> tuple[int, int]:
+        """Rows of the VHS tracking bar (empty range when it is hidden)."""
+        # Slowly drifts through the frame, more visible on high energy
+        bar_visibility = ctx["energy"] * 0.6 + ctx["bass"] * 0.4
+        if bar_visibility <= 0.2:
+            return 0, 0
+        h = self.height
+        s = min(self.width, h) / 512
+        bar_h = max(3, int(12 * s))
+        bar_y = int((time_pos * 20 * s) % (h + bar_h * 4)) - bar_h * 2
+        return max(0, bar_y), min(h, bar_y + bar_h)
+
+    @vj_effect("Scanlines", "Post-process", "post_processing", state="effect")
     def _render_scanlines(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -3651,9 +3763,9 @@ class VJingLayer(BaseVisualLayer):
         chromatic aberration on edges, and applies VHS-style horizontal
         jitter that intensifies on drops/beats.
         """
+        scanlines = ctx["state"]
         bass = ctx["bass"]
         energy = ctx["energy"]
-        is_beat = ctx["is_beat"]
         intensity = self._current_intensity
         w, h = self.width, self.height
         s = min(w, h) / 512
@@ -3678,26 +3790,9 @@ class VJingLayer(BaseVisualLayer):
         mask_col = scanline_mask[:, np.newaxis, np.newaxis]
         data[:, :, :3] = np.clip(data[:, :, :3] * mask_col, 0, 255).astype(np.uint8)
 
-        # --- 2. VHS horizontal jitter on beats/drops ---
-        jitter_strength = bass * 0.3 + energy * 0.2
-        if is_beat:
-            jitter_strength += 0.5
-        jitter_strength *= intensity
-
-        if jitter_strength > 0.1:
-            # A few horizontal slices get shifted
-            n_jitter = self._rng.randint(2, max(3, int(5 + jitter_strength * 8)))
-            for _ in range(n_jitter):
-                if self._rng.random() > jitter_strength:
-                    continue
-                jh = self._rng.randint(1, max(2, int(4 * s)))
-                jy = self._rng.randint(0, h - jh)
-                shift = self._rng.randint(
-                    -max(1, int(15 * s * jitter_strength)),
-                    max(1, int(15 * s * jitter_strength)),
-                )
-                if shift != 0:
-                    data[jy : jy + jh] = np.roll(data[jy : jy + jh], shift, axis=1)
+        # --- 2. VHS horizontal jitter on beats/drops (drawn by _advance_scanlines) ---
+        for jy, jh, shift in scanlines["jitters"]:
+            data[jy : jy + jh] = np.roll(data[jy : jy + jh], shift, axis=1)
 
         # --- 3. Chromatic aberration: offset R and B vertically ---
         aberration = max(1, int(2 * s * (0.3 + energy * 0.7) * intensity))
@@ -3706,27 +3801,21 @@ class VJingLayer(BaseVisualLayer):
             data[:, :, 2] = np.roll(data[:, :, 2], aberration, axis=0)  # B down
 
         # --- 4. VHS tracking bar: a bright/noisy horizontal band ---
-        # Slowly drifts through the frame, more visible on high energy
-        bar_visibility = energy * 0.6 + bass * 0.4
-        if bar_visibility > 0.2:
-            bar_h = max(3, int(12 * s))
-            bar_y = int((time_pos * 20 * s) % (h + bar_h * 4)) - bar_h * 2
-            bar_y_start = max(0, bar_y)
-            bar_y_end = min(h, bar_y + bar_h)
-            if bar_y_start < bar_y_end:
-                # Brighten the bar region
-                boost = 1.3 + bar_visibility * 0.5
-                bar_region = data[bar_y_start:bar_y_end, :, :3].astype(np.float32)
-                bar_region = np.clip(bar_region * boost + 20, 0, 255)
-                data[bar_y_start:bar_y_end, :, :3] = bar_region.astype(np.uint8)
-                # Add noise to the bar
-                noise = np.array([self._rng.randint(0, 40) for _ in range(bar_y_end - bar_y_start)])
-                for c in range(3):
-                    data[bar_y_start:bar_y_end, :, c] = np.clip(
-                        data[bar_y_start:bar_y_end, :, c].astype(np.int16) + noise[:, np.newaxis],
-                        0,
-                        255,
-                    ).astype(np.uint8)
+        noise = scanlines["bar_noise"]
+        if noise is not None:
+            bar_y_start, bar_y_end = self._scanlines_bar(time_pos, ctx)
+            # Brighten the bar region
+            boost = 1.3 + (energy * 0.6 + bass * 0.4) * 0.5
+            bar_region = data[bar_y_start:bar_y_end, :, :3].astype(np.float32)
+            bar_region = np.clip(bar_region * boost + 20, 0, 255)
+            data[bar_y_start:bar_y_end, :, :3] = bar_region.astype(np.uint8)
+            # Add noise to the bar
+            for c in range(3):
+                data[bar_y_start:bar_y_end, :, c] = np.clip(
+                    data[bar_y_start:bar_y_end, :, c].astype(np.int16) + noise[:, np.newaxis],
+                    0,
+                    255,
+                ).astype(np.uint8)
 
         # --- 5. Subtle phosphor glow: tint bright scanlines toward palette color ---
         colors = self.color_palette
@@ -3754,19 +3843,17 @@ class VJingLayer(BaseVisualLayer):
         """Initialize shockwave state."""
         self.shockwaves: list[dict[str, float]] = []
 
-    @vj_effect("Shockwave", "Post-process", "post_processing")
-    def _render_shockwave(
-        self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
-    ) -> None:
-        """Render circular shockwave distortion triggered by strong kicks.
+    def _advance_shockwave(
+        self, frame_idx: int, time_pos: float, ctx: dict
+    ) -> list[tuple[float, float, float, float]]:
+        """Spawn waves on strong kicks, expand and fade the live ones.
 
-        Expanding rings that displace pixels radially outward, creating
-        a ripple/lens distortion effect. Multiple waves can overlap.
+        Returns:
+            (cx, cy, radius, strength × life) of each wave to draw.
         """
         bass = ctx["bass"]
         energy = ctx["energy"]
         is_beat = ctx["is_beat"]
-        intensity = self._current_intensity
         w, h = self.width, self.height
         s = min(w, h) / 512
 
@@ -3786,9 +3873,33 @@ class VJingLayer(BaseVisualLayer):
                 }
             )
 
-        # Remove dead waves early
-        if not self.shockwaves:
+        waves = []
+        new_waves = []
+        for wave in self.shockwaves:
+            wave["radius"] += wave["speed"]
+            wave["life"] -= wave["decay"]
+            if wave["life"] <= 0:
+                continue
+            waves.append((wave["cx"], wave["cy"], wave["radius"], wave["strength"] * wave["life"]))
+            new_waves.append(wave)
+
+        self.shockwaves = new_waves
+        return waves
+
+    @vj_effect("Shockwave", "Post-process", "post_processing", state="effect")
+    def _render_shockwave(
+        self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
+    ) -> None:
+        """Render circular shockwave distortion triggered by strong kicks.
+
+        Expanding rings that displace pixels radially outward, creating
+        a ripple/lens distortion effect. Multiple waves can overlap.
+        """
+        waves = ctx["state"]
+        if not waves:
             return
+        intensity = self._current_intensity
+        s = min(self.width, self.height) / 512
 
         data = np.array(img)
         h_arr, w_arr = data.shape[:2]
@@ -3798,16 +3909,8 @@ class VJingLayer(BaseVisualLayer):
 
         result = data.copy()
 
-        new_waves = []
-        for wave in self.shockwaves:
-            wave["radius"] += wave["speed"]
-            wave["life"] -= wave["decay"]
-            if wave["life"] <= 0:
-                continue
-
-            cx, cy = wave["cx"], wave["cy"]
-            radius = wave["radius"]
-            strength = wave["strength"] * wave["life"] * intensity
+        for cx, cy, radius, wave_strength in waves:
+            strength = wave_strength * intensity
 
             # Distance from each pixel to wave center
             dx = xs - cx
@@ -3843,7 +3946,7 @@ class VJingLayer(BaseVisualLayer):
             edge_dist = np.abs(dist - radius)
             edge_mask = np.clip(1.0 - edge_dist / edge_width, 0.0, 1.0)
             edge_tint = edge_mask * strength * 60
-            color = self._get_palette_color(int(wave["cx"] + wave["cy"]))
+            color = self._get_palette_color(int(cx + cy))
             for c in range(3):
                 result[:, :, c] = np.clip(
                     result[:, :, c].astype(np.float32) + edge_tint * (color[c] / 255.0),
@@ -3851,10 +3954,6 @@ class VJingLayer(BaseVisualLayer):
                     255,
                 ).astype(np.uint8)
 
-            new_waves.append(wave)
-
-        self.shockwaves = new_waves
-
         out = Image.fromarray(result, "RGBA")
         img.paste(out, (0, 0))
 
@@ -4071,7 +4170,7 @@ class VJingLayer(BaseVisualLayer):
             }
         )
 
-    @vj_effect("Circuit", "Geometric")
+    @vj_effect("Circuit", "Geometric", state="effect")
     def _render_circuit(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
         """Render animated circuit board with light signals traveling along traces.
 
@@ -4210,7 +4309,7 @@ class VJingLayer(BaseVisualLayer):
                 }
             )
 
-    @vj_effect("Constellation", "Particules")
+    @vj_effect("Constellation", "Particules", state="effect")
     def _render_constellation(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -4332,7 +4431,7 @@ class VJingLayer(BaseVisualLayer):
         # Keep legacy list for backward compat (shallow wrapper)
         self.swarm_boids: list[dict[str, float]] = []  # unused in render
 
-    @vj_effect("Swarm", "Particules")
+    @vj_effect("Swarm", "Particules", state="effect")
     def _render_swarm(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
         """Render boid flocking swarm.
 
@@ -4474,7 +4573,7 @@ class VJingLayer(BaseVisualLayer):
             }
         )
 
-    @vj_effect("Bokeh", "Particules")
+    @vj_effect("Bokeh", "Particules", state="effect")
     def _render_bokeh(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
         """Render luminous out-of-focus bokeh circles.
 
@@ -4573,7 +4672,7 @@ class VJingLayer(BaseVisualLayer):
         # Active wave ripples triggered by beats: (start_time, cx, cy)
         self.grid_ripples: list[tuple[float, float, float]] = []
 
-    @vj_effect("Grid", "Geometric")
+    @vj_effect("Grid", "Geometric", state="effect")
     def _render_grid(self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
         """Render dynamic grid deformed by beat-triggered sine waves."""
         draw = ImageDraw.Draw(img)
@@ -4755,7 +4854,14 @@ class VJingLayer(BaseVisualLayer):
         result_img = Image.fromarray(data.astype(np.uint8), "RGBA")
         img.paste(result_img, (0, 0))
 
-    @vj_effect("Attractor", "Particules")
+    def _advance_attractor(self, frame_idx: int, time_pos: float, ctx: dict) -> float:
+        """Beat kick of the attractor phase (decays over the following frames)."""
+        if ctx["is_beat"]:
+            self._attractor_kick = getattr(self, "_attractor_kick", 0.0) + 0.04
+        self._attractor_kick = getattr(self, "_attractor_kick", 0.0) * 0.85
+        return self._attractor_kick
+
+    @vj_effect("Attractor", "Particules", state="effect")
     def _render_attractor(
         self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
     ) -> None:
@@ -4772,7 +4878,6 @@ class VJingLayer(BaseVisualLayer):
         """
         energy = ctx["energy"]
         bass = ctx["bass"]
-        is_beat = ctx["is_beat"]
 
         w, h = self.width, self.height
 
@@ -4781,10 +4886,7 @@ class VJingLayer(BaseVisualLayer):
 
         # Time: audio energy speeds up animation; beat adds a transient phase kick
         t_anim = time_pos * (1.0 + energy * 0.06)
-        if is_beat:
-            self._attractor_kick = getattr(self, "_attractor_kick", 0.0) + 0.04
-        self._attractor_kick = getattr(self, "_attractor_kick", 0.0) * 0.85
-        t_anim += self._attractor_kick
+        t_anim += ctx["state"]
 
         # Starting point evolves slowly with time (attractor basin reached after ~10 iters)
         X = 0.5 * math.sin(time_pos * 0.11)
@@ -4904,17 +5006,11 @@ class VJingLayer(BaseVisualLayer):
         self._emission_lut: np.ndarray | None = None
         self._emission_lut_key: str = ""
 
-    @vj_effect("Emission", "Particules")
-    def _render_emission(
-        self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
-    ) -> None:
-        """Emission point — transcribed from dwitter.net d/33748 by rodrigo.siqueira.
+    def _advance_emission(self, frame_idx: int, time_pos: float, ctx: dict) -> NDArray:
+        """Decay the accumulation buffer and add this frame's particles.
 
-        5 000 particles radiate from centre in polar coordinates (angle=i rad,
-        radius=9·s·scale). s = (i/9 + t·7) % 138 controls both radius and visual size.
-        A persistent RGB accumulation buffer with exponential decay reproduces the
-        original's trail effect (canvas never cleared after the first frame).
-        Colours cycle through the active palette mapped to sin(t + i²).
+        Returns:
+            The buffer as uint8 RGB (h, w, 3).
         """
         energy = ctx["energy"]
         w, h = self.width, self.height
@@ -4961,7 +5057,22 @@ class VJingLayer(BaseVisualLayer):
         np.maximum.at(buf[:, :, 1], (py[pos], px[pos]), colors[:, 1])
         np.maximum.at(buf[:, :, 2], (py[pos], px[pos]), colors[:, 2])
 
-        rgb = np.clip(buf, 0, 255).astype(np.uint8)
+        rgb: NDArray = np.clip(buf, 0, 255).astype(np.uint8)
+        return rgb
+
+    @vj_effect("Emission", "Particules", state="effect")
+    def _render_emission(
+        self, img: Image.Image, frame_idx: int, time_pos: float, ctx: dict
+    ) -> None:
+        """Emission point — transcribed from dwitter.net d/33748 by rodrigo.siqueira.
+
+        5 000 particles radiate from centre in polar coordinates (angle=i rad,
+        radius=9·s·scale). s = (i/9 + t·7) % 138 controls both radius and visual size.
+        A persistent RGB accumulation buffer with exponential decay reproduces the
+        original's trail effect (canvas never cleared after the first frame).
+        Colours cycle through the active palette mapped to sin(t + i²).
+        """
+        rgb = ctx["state"]
         alpha = np.minimum(np.max(rgb, axis=2), min(255, int(220 * self._current_intensity)))
         result = Image.fromarray(np.dstack([rgb, alpha]), "RGBA")
         img.paste(result, (0, 0), result)
@@ -18,6 +18,7 @@ class WaveformLayer(BaseVisualLayer):
     """Animated waveform visualization with 3-band coloring and cursor."""
 
     z_index = 2
+    ANALYSIS_ARRAYS = ("bass_envelope", "mid_envelope", "treble_envelope")
 
     # Default colors (similar to waveform_visualizer plugin)
     DEFAULT_BASS_COLOR = (0, 102, 255, 255)  # Blue
@@ -108,9 +109,11 @@ class WaveformLayer(BaseVisualLayer):
         return np.fft.irfft(fft, n=len(audio)).astype(np.float32)
 
     def _precompute(self) -> None:
-        """Pre-compute waveform data for all frames."""
+        """Draw the band envelopes (computed by _analyze_audio)."""
         self._use_filtering = True
 
+    def _analyze_audio(self) -> None:
+        """Compute the per-band envelopes drawn by the waveform."""
         # Band separation via FFT (thread-safe; avoids scipy BLAS SIGBUS on macOS ARM)
         self.bass_audio = self._fft_bandpass(self.audio, self.sr, FREQ_BASS_LOW, FREQ_BASS_HIGH)
         self.mid_audio = self._fft_bandpass(self.audio, self.sr, FREQ_BASS_HIGH, FREQ_MID_HIGH)
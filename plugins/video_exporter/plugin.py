@@ -151,6 +151,7 @@ class VideoExporterPlugin(SettingsSyncMixin):
         SyncedSetting("milkdrop_preset_path", str),
         SyncedSetting("milkdrop_preset_duration", float),
         SyncedSetting("milkdrop_hard_cut_on_beat", bool),
+        SyncedSetting("export_segment_cache_max_gb", float),
     ]
 
     def _on_settings_changed(self) -> None:
@@ -307,4 +308,11 @@ class VideoExporterPlugin(SettingsSyncMixin):
                 "type": "bool",
                 "default": self.context.config.video_exporter.milkdrop_hard_cut_on_beat,
             },
+            "export_segment_cache_max_gb": {
+                "label": "Export Segment Cache Size (GB)",
+                "type": "float",
+                "default": self.context.config.video_exporter.export_segment_cache_max_gb,
+                "min": 0.0,
+                "max": 1000.0,
+            },
         }
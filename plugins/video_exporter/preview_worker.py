@@ -0,0 +1,94 @@
+"""Worker thread streaming preview frames to the export dialog."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QThread, Signal
+
+if TYPE_CHECKING:
+    from plugins.video_exporter.renderers.preview_renderer import PreviewRenderer
+
+
+class PreviewPlaybackWorker(QThread):
+    """Render preview frames in real time, off the GUI thread.
+
+    Frames follow the wall clock from the start frame: when rendering falls
+    behind, frames are dropped rather than delayed, so the picture stays in
+    sync with the audio player. A frame is only rendered once the dialog
+    has shown the previous one (frame_shown()).
+    """
+
+    # Signals
+    frame_ready = Signal(int, object)  # Frame index, RGB frame (numpy copy)
+    looped = Signal()  # Playback restarted from the first frame
+    too_slow = Signal()  # Behind even at the largest frame step
+    error = Signal(str)  # Error message
+
+    def __init__(self, preview: PreviewRenderer, start_frame: int) -> None:
+        """Initialize playback worker.
+
+        Args:
+            preview: Preview renderer, only used by this thread while it runs.
+            start_frame: First frame to play.
+        """
+        super().__init__()
+        self.preview = preview
+        self.start_frame = start_frame
+        self._stopped = threading.Event()
+        self._shown = threading.Event()
+        self._shown.set()
+
+    def run(self) -> None:
+        """Play frames until stop()."""
+        try:
+            self._play()
+        except Exception as e:
+            logging.exception("[Preview Playback] Rendering failed")
+            self.error.emit(str(e))
+
+    def stop(self) -> None:
+        """Ask playback to stop (then wait() for the thread)."""
+        self._stopped.set()
+        self._shown.set()
+
+    def frame_shown(self) -> None:
+        """Tell the worker the last frame is on screen."""
+        self._shown.set()
+
+    def _play(self) -> None:
+        fps = self.preview.renderer.fps
+        total_frames = self.preview.total_frames
+        first = self.start_frame
+        clock = time.perf_counter()
+        last_sent = first - 1
+        slow_reported = False
+
+        while not self._stopped.is_set():
+            frame_idx = first + int((time.perf_counter() - clock) * fps)
+            if frame_idx >= total_frames:
+                first, clock, last_sent = 0, time.perf_counter(), -1
+                self.looped.emit()
+                continue
+            if frame_idx <= last_sent:
+                # En avance : attente de l'heure de la frame suivante
+                next_time = clock + (last_sent + 1 - first) / fps
+                time.sleep(max(0.0, next_time - time.perf_counter()))
+                continue
+            # Une frame à la fois : le GUI ne doit pas accumuler de retard
+            if not self._shown.wait(timeout=0.25):
+                continue
+            if self._stopped.is_set():
+                break
+
+            frame = self.preview.render(frame_idx).copy()
+            self._shown.clear()
+            self.frame_ready.emit(frame_idx, frame)
+            last_sent = frame_idx
+
+            if not slow_reported and self.preview.needs_lower_resolution:
+                slow_reported = True
+                self.too_slow.emit()
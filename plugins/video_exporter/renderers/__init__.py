@@ -1,6 +1,8 @@
 """Rendering components for video export."""
 
+from plugins.video_exporter.renderers.compositor import Compositor, LayerPixels
 from plugins.video_exporter.renderers.ffmpeg_encoder import FFmpegEncoder
 from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+from plugins.video_exporter.renderers.render_farm import RenderFarm
 
-__all__ = ["FFmpegEncoder", "FrameRenderer"]
+__all__ = ["Compositor", "FFmpegEncoder", "FrameRenderer", "LayerPixels", "RenderFarm"]
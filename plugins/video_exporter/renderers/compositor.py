@@ -0,0 +1,137 @@
+"""Compositor for the export frame, on numpy buffers.
+
+Layers are blended into an RGB uint8 frame (the buffer handed to the
+encoder) with premultiplied alpha: the color of a layer pixel is weighted by
+its alpha in 16-bit integers (``rgb * a``, 0..65025), blended with the frame,
+then divided by 255 with PIL's rounding. The "normal" mode therefore gives
+the same pixels as ``Image.alpha_composite`` over an opaque frame.
+
+Only the area a layer drew (LayerPixels.x / y and the array size) is
+visited, and transparent pixels are skipped. The per-pixel loop is compiled
+with numba (already required by librosa): the same arithmetic written as
+numpy ufuncs makes ~10 passes over uint16 temporaries and is 2-3x slower
+than PIL; compiled, it runs without the GIL so export threads blend in
+parallel.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numba import njit
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+BLEND_MODES = ("normal", "add", "screen", "multiply")
+
+
+@dataclass
+class LayerPixels:
+    """What a layer drew for one frame: a region of the frame and its alpha."""
+
+    # (h, w, 4) RGBA, alpha non prémultiplié, ou (h, w, 3) RGB opaque
+    pixels: NDArray[np.uint8]
+    x: int = 0
+    y: int = 0
+    # Multiplie l'alpha de cette frame (fondu, opacité de la couche)
+    opacity: float = 1.0
+
+
+class Compositor:
+    """Blend layer pixels into RGB frame buffers (thread-safe)."""
+
+    def __init__(self, width: int, height: int) -> None:
+        """Initialize compositor.
+
+        Args:
+            width: Frame width in pixels.
+            height: Frame height in pixels.
+        """
+        self.width = width
+        self.height = height
+
+    def new_frame(self) -> NDArray[np.uint8]:
+        """Allocate a black frame."""
+        return np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+    def composite(
+        self,
+        frame: NDArray[np.uint8],
+        layer: LayerPixels,
+        blend_mode: str = "normal",
+        opacity: float = 1.0,
+    ) -> None:
+        """Blend a layer into a frame, in place.
+
+        Args:
+            frame: RGB frame, (height, width, 3) uint8.
+            layer: Pixels drawn by the layer (clipped to the frame).
+            blend_mode: One of BLEND_MODES.
+            opacity: Layer opacity (multiplies layer.opacity).
+
+        Raises:
+            ValueError: If the blend mode is unknown.
+        """
+        if blend_mode not in BLEND_MODES:
+            raise ValueError(f"Unknown blend mode: {blend_mode}")
+        # Alpha 8 bits de l'opacité (troncature, comme l'ancien masque PIL)
+        alpha_scale = int(255 * max(0.0, min(1.0, opacity * layer.opacity)))
+        if alpha_scale == 0:
+            return
+
+        pixels = layer.pixels
+        x0, y0 = max(layer.x, 0), max(layer.y, 0)
+        x1 = min(layer.x + pixels.shape[1], self.width)
+        y1 = min(layer.y + pixels.shape[0], self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        pixels = pixels[y0 - layer.y : y1 - layer.y, x0 - layer.x : x1 - layer.x]
+        target = frame[y0:y1, x0:x1]
+
+        if pixels.shape[2] == 3 and alpha_scale == 255 and blend_mode == "normal":
+            target[...] = pixels
+            return
+        _blend(target, pixels, alpha_scale, BLEND_MODES.index(blend_mode))
+
+
+@njit(cache=True, nogil=True)
+def _blend(
+    target: NDArray[np.uint8], pixels: NDArray[np.uint8], alpha_scale: int, mode: int
+) -> None:
+    """Blend straight-alpha pixels into target (modes indexed as BLEND_MODES)."""
+    has_alpha = pixels.shape[2] == 4
+    scale = np.uint16(alpha_scale)
+    full = np.uint16(255)
+    half = np.uint16(128)
+    eight = np.uint16(8)
+    for y in range(target.shape[0]):
+        for x in range(target.shape[1]):
+            a = np.uint16(pixels[y, x, 3]) if has_alpha else full
+            if scale != full:
+                a = (a * scale + np.uint16(127)) // full
+            if a == 0:
+                continue
+            inv = full - a
+            for c in range(3):
+                f = np.uint16(target[y, x, c])
+                # Couleur prémultipliée, échelle 255 × 255
+                v = np.uint16(pixels[y, x, c]) * a
+                if mode == 0:  # normal : c·a + f·(255 − a)
+                    v = v + f * inv
+                else:
+                    v = v + half
+                    v = (v + (v >> eight)) >> eight
+                    if mode == 1:  # add
+                        target[y, x, c] = min(v + f, full)
+                        continue
+                    if mode == 2:  # screen : f + c·a·(255 − f)
+                        v = v * (full - f)
+                        v = v + half
+                        target[y, x, c] = f + ((v + (v >> eight)) >> eight)
+                        continue
+                    v = f * (v + inv)  # multiply : f·(c·a + 255 − a)
+                v = v + half
+                target[y, x, c] = (v + (v >> eight)) >> eight
@@ -1,17 +1,56 @@
-"""FFmpeg encoder wrapper for video export."""
+"""FFmpeg encoder wrapper for video export.
+
+Frames reach FFmpeg's stdin through a writer thread: write_frame() queues the
+frame and returns, and the thread writes the array's own buffer (no bytes
+copy). The queue is bounded, so rendering waits when FFmpeg falls behind and
+the two stages overlap otherwise. stats() tells which side did the waiting.
+
+For segmented exports, an encoder without audio_path writes one video-only
+segment of the export timeline (timeline_start..timeline_end), and
+mux_segments() joins the segments with the concat demuxer (no re-encoding)
+while adding the audio.
+"""
 
 from __future__ import annotations
 
 import logging
+import queue
 import shutil
 import subprocess
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:
-    import numpy as np
     from numpy.typing import NDArray
 
+# Frames en attente d'écriture : ~1/4 s à 30 fps, 25 Mo en 1080p
+DEFAULT_QUEUE_FRAMES = 8
+
+# Tampon du pipe stdin (Linux) : 1 Mo, le maximum sans privilèges, au lieu de 64 Ko
+PIPE_SIZE = 1 << 20
+
+
+@dataclass
+class EncoderStats:
+    """Where time went between rendering and FFmpeg."""
+
+    frames: int = 0
+    # Temps passé dans stdin.write : FFmpeg ne lit pas assez vite
+    write_s: float = 0.0
+    # Écritures plus longues qu'une frame (pipe plein)
+    stalled_writes: int = 0
+    # Temps bloqué dans write_frame, file pleine (le rendu attend l'encodeur)
+    backpressure_s: float = 0.0
+    # Temps du writer à attendre une frame (l'encodeur attend le rendu)
+    starved_s: float = 0.0
+    max_queued: int = 0
+
 
 class FFmpegEncoder:
     """Wrapper for FFmpeg subprocess to encode video frames."""
@@ -22,11 +61,13 @@ class FFmpegEncoder:
         width: int,
         height: int,
         fps: int,
-        audio_path: Path,
+        audio_path: Path | None,
         audio_start: float,
         audio_duration: float,
         fade_duration: float = 1.0,
         *,
+        timeline_start: float = 0.0,
+        timeline_end: float | None = None,
         video_codec: str = "libx264",
         preset: str = "medium",
         crf: int = 23,
@@ -36,6 +77,7 @@ class FFmpegEncoder:
         min_video_bitrate: str = "3500k",
         max_video_bitrate: str = "5000k",
         bufsize: str = "7000k",
+        queue_frames: int = DEFAULT_QUEUE_FRAMES,
     ) -> None:
         """Initialize FFmpeg encoder.
 
@@ -44,10 +86,12 @@ class FFmpegEncoder:
             width: Video width in pixels.
             height: Video height in pixels.
             fps: Frames per second.
-            audio_path: Path to the audio file.
+            audio_path: Path to the audio file (None: video-only segment).
             audio_start: Start time in the audio file (seconds).
-            audio_duration: Duration of audio to include (seconds).
+            audio_duration: Duration of audio to include (seconds), i.e. of the export.
             fade_duration: Duration of fade in/out in seconds (0 to disable).
+            timeline_start: Export time of the first frame (segments).
+            timeline_end: Export time after the last frame (default: audio_duration).
             video_codec: FFmpeg video codec (default: libx264).
             preset: FFmpeg encoding preset (default: medium).
             crf: FFmpeg constant rate factor (default: 23).
@@ -57,6 +101,8 @@ class FFmpegEncoder:
             min_video_bitrate: Débit vidéo minimum pour le constrained CRF (default: 3500k).
             max_video_bitrate: Débit vidéo maximum pour le constrained CRF (default: 5000k).
             bufsize: Taille du buffer VBV pour le constrained CRF (default: 7000k).
+            queue_frames: Frames queued for the writer thread before
+                write_frame() blocks.
 
         Raises:
             RuntimeError: If FFmpeg is not found.
@@ -69,6 +115,8 @@ class FFmpegEncoder:
         self.audio_start = audio_start
         self.audio_duration = audio_duration
         self.fade_duration = fade_duration
+        self.timeline_start = timeline_start
+        self.timeline_end = audio_duration if timeline_end is None else timeline_end
         self.video_codec = video_codec
         self.preset = preset
         self.crf = crf
@@ -79,9 +127,21 @@ class FFmpegEncoder:
         self.min_video_bitrate = min_video_bitrate
         self.max_video_bitrate = max_video_bitrate
         self.bufsize = bufsize
+        self.queue_frames = max(1, queue_frames)
         self.process: subprocess.Popen | None = None
         self._frame_count = 0
 
+        # (frame, callback) à écrire ; None arrête le writer
+        self._queue: queue.Queue[tuple[NDArray[np.uint8], Callable[[], None] | None] | None] = (
+            queue.Queue(maxsize=self.queue_frames)
+        )
+        self._writer: threading.Thread | None = None
+        self._write_error: Exception | None = None
+        self._stats = EncoderStats()
+        # Tampons de frame_buffer() (référencés ici pour que leur id reste unique)
+        self._buffers: dict[int, NDArray[np.uint8]] = {}
+        self._free_buffers: list[NDArray[np.uint8]] = []
+
         # Vérification de la disponibilité de FFmpeg
         ffmpeg_path = shutil.which("ffmpeg")
         if not ffmpeg_path:
@@ -110,30 +170,26 @@ class FFmpegEncoder:
             str(self.fps),
             "-i",
             "-",  # stdin
-            # Audio input
-            "-ss",
-            str(self.audio_start),
-            "-t",
-            str(self.audio_duration),
-            "-i",
-            str(self.audio_path),
         ]
+        if self.audio_path is not None:
+            # Audio input
+            cmd.extend(
+                [
+                    "-ss",
+                    str(self.audio_start),
+                    "-t",
+                    str(self.audio_duration),
+                    "-i",
+                    str(self.audio_path),
+                ]
+            )
 
         # Add fade filters if enabled
-        if self.fade_duration > 0:
-            fade_out_start = max(0, self.audio_duration - self.fade_duration)
-            # Video fade: fade in at start, fade out at end
-            video_filter = (
-                f"fade=t=in:st=0:d={self.fade_duration},"
-                f"fade=t=out:st={fade_out_start}:d={self.fade_duration}"
-            )
-            # Audio fade: fade in at start, fade out at end
-            audio_filter = (
-                f"afade=t=in:st=0:d={self.fade_duration},"
-                f"afade=t=out:st={fade_out_start}:d={self.fade_duration}"
-            )
+        video_filter = self._video_fade_filter()
+        if video_filter:
             cmd.extend(["-vf", video_filter])
-            cmd.extend(["-af", audio_filter])
+        if self.audio_path is not None and self.fade_duration > 0:
+            cmd.extend(["-af", _audio_fade_filter(self.fade_duration, self.audio_duration)])
 
         # Paramètres de sortie : constrained CRF pour garantir le débit minimum Instagram Reels
         cmd.extend(
@@ -153,16 +209,21 @@ class FFmpegEncoder:
                 self.bufsize,
                 "-pix_fmt",
                 self.pixel_format,
-                "-c:a",
-                self.audio_codec,
-                "-b:a",
-                self.audio_bitrate,
-                "-shortest",  # Fin quand le flux le plus court se termine
-                "-movflags",
-                "+faststart",  # MOOV atom en tête : requis pour streaming web / Instagram boost
-                str(self.output_path),
             ]
         )
+        if self.audio_path is not None:
+            cmd.extend(
+                [
+                    "-c:a",
+                    self.audio_codec,
+                    "-b:a",
+                    self.audio_bitrate,
+                    "-shortest",  # Fin quand le flux le plus court se termine
+                    "-movflags",
+                    "+faststart",  # MOOV atom en tête : requis pour streaming web / Instagram boost
+                ]
+            )
+        cmd.append(str(self.output_path))
 
         logging.info(f"[FFmpeg] Starting encoder: {' '.join(cmd)}")
 
@@ -172,23 +233,64 @@ class FFmpegEncoder:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
+        assert self.process.stdin is not None
+        _enlarge_pipe(self.process.stdin)
+        self._writer = threading.Thread(target=self._write_loop, name="ffmpeg-writer", daemon=True)
+        self._writer.start()
+
+    def _video_fade_filter(self) -> str:
+        """Video fades of the export falling in this encoder's part of the timeline.
+
+        Times are relative to timeline_start: a segment must hold the whole
+        fade it overlaps (the filters take no negative start).
+        """
+        if self.fade_duration <= 0:
+            return ""
+        fade_out_start = max(0, self.audio_duration - self.fade_duration)
+        filters = []
+        if self.timeline_start < self.fade_duration:
+            # Video fade: fade in at start
+            filters.append(f"fade=t=in:st=0:d={self.fade_duration}")
+        if self.timeline_end > fade_out_start:
+            # Video fade: fade out at end
+            start = max(0.0, fade_out_start - self.timeline_start)
+            filters.append(f"fade=t=out:st={start}:d={self.fade_duration}")
+        return ",".join(filters)
+
+    def frame_buffer(self) -> NDArray[np.uint8]:
+        """Get a frame buffer to render into.
+
+        Buffers passed to write_frame() come back to the encoder once written,
+        so rendering in steady state allocates no frames.
+        """
+        try:
+            return self._free_buffers.pop()
+        except IndexError:
+            buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            self._buffers[id(buffer)] = buffer
+            return buffer
+
+    def write_frame(
+        self, frame: NDArray[np.uint8], on_written: Callable[[], None] | None = None
+    ) -> None:
+        """Queue a frame for the FFmpeg process.
 
-    def write_frame(self, frame: NDArray[np.uint8]) -> None:
-        """Write a frame to the FFmpeg process.
+        The writer thread writes the frame from its own memory, so it must not
+        be modified until then (frame_buffer() buffers are handled by the
+        encoder; other callers can wait for on_written).
 
         Args:
             frame: RGB frame as numpy array (height, width, 3).
+            on_written: Called from the writer thread once the frame has been
+                written (or dropped after a failure or cancel()).
 
         Raises:
-            RuntimeError: If encoder is not started or write fails.
+            RuntimeError: If encoder is not started or FFmpeg failed.
+            ValueError: If the frame shape doesn't match the video size.
         """
-        if self.process is None or self.process.stdin is None:
+        if self.process is None or self._writer is None:
             raise RuntimeError("Encoder not started")
-
-        # Check if process is still running
-        if self.process.poll() is not None:
-            _, stderr = self.process.communicate()
-            raise RuntimeError(f"FFmpeg process terminated: {stderr.decode()}")
+        self._raise_if_failed()
 
         # Ensure frame is in correct format
         if frame.shape != (self.height, self.width, 3):
@@ -197,23 +299,94 @@ class FFmpegEncoder:
                 f"expected ({self.height}, {self.width}, 3)"
             )
 
-        # Write frame data
+        start = time.perf_counter()
+        self._queue.put((frame, on_written))
+        self._stats.backpressure_s += time.perf_counter() - start
+        self._stats.max_queued = max(self._stats.max_queued, self._queue.qsize())
+
+    def drain(self) -> None:
+        """Wait until every queued frame has been written.
+
+        Raises:
+            RuntimeError: If FFmpeg failed.
+        """
+        self._queue.join()
+        if self.process is not None:
+            self._raise_if_failed()
+
+    def stats(self) -> EncoderStats:
+        """Get writer statistics (pipe stalls, backpressure) so far."""
+        return replace(self._stats, frames=self._frame_count)
+
+    def _write_loop(self) -> None:
+        """Writer thread: write queued frames to FFmpeg's stdin, in order."""
+        assert self.process is not None and self.process.stdin is not None
+        stdin = self.process.stdin
+        stats = self._stats
+        frame_period = 1.0 / self.fps
+        while True:
+            if self._queue.empty() and self._write_error is None:
+                # Plus rien à écrire : FFmpeg reçoit la fin de la frame en tampon
+                try:
+                    stdin.flush()
+                except (OSError, ValueError) as e:
+                    self._write_error = e
+            start = time.perf_counter()
+            item = self._queue.get()
+            stats.starved_s += time.perf_counter() - start
+            try:
+                if item is None:
+                    return
+                frame, on_written = item
+                if self._write_error is None:
+                    start = time.perf_counter()
+                    try:
+                        # Le buffer du tableau tel quel, sans copie en bytes
+                        stdin.write(frame.data if frame.flags.c_contiguous else frame.tobytes())
+                    except (OSError, ValueError) as e:
+                        # Les frames suivantes sont abandonnées, write_frame() lève
+                        self._write_error = e
+                    else:
+                        elapsed = time.perf_counter() - start
+                        stats.write_s += elapsed
+                        stats.stalled_writes += elapsed > frame_period
+                        self._frame_count += 1
+                self._frame_done(frame, on_written)
+            finally:
+                self._queue.task_done()
+
+    def _frame_done(self, frame: NDArray[np.uint8], on_written: Callable[[], None] | None) -> None:
+        if on_written is not None:
+            on_written()
+        if id(frame) in self._buffers:
+            self._free_buffers.append(frame)
+
+    def _stop_writer(self, timeout: float | None = None) -> None:
+        """Let the writer write the queued frames, then stop it."""
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join(timeout)
+        if not self._writer.is_alive():
+            self._writer = None
+
+    def _raise_if_failed(self) -> None:
+        assert self.process is not None
+        if self._write_error is not None:
+            raise RuntimeError(f"FFmpeg pipe broken: {self._ffmpeg_error()}") from self._write_error
+        if self.process.poll() is not None:
+            raise RuntimeError(f"FFmpeg process terminated: {self._ffmpeg_error()}")
+
+    def _ffmpeg_error(self) -> str:
+        """Get FFmpeg's error output once the process has exited."""
+        assert self.process is not None
         try:
-            self.process.stdin.write(frame.tobytes())
-            self._frame_count += 1
-            # Flush every 30 frames to prevent buffer issues
-            if self._frame_count % 30 == 0:
-                self.process.stdin.flush()
-        except BrokenPipeError as e:
-            # Get FFmpeg error output
-            _, stderr = self.process.communicate()
-            raise RuntimeError(f"FFmpeg pipe broken: {stderr.decode()}") from e
-        except ValueError as e:
-            # Handle "flush of closed file" error
-            if self.process.poll() is not None:
-                _, stderr = self.process.communicate()
-                raise RuntimeError(f"FFmpeg process terminated: {stderr.decode()}") from e
-            raise
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        stderr = self.process.stderr.read() if self.process.stderr else b""
+        return stderr.decode(errors="replace")
 
     def finish(self) -> Path:
         """Finish encoding and close the process.
@@ -227,6 +400,12 @@ class FFmpegEncoder:
         if self.process is None:
             raise RuntimeError("Encoder not started")
 
+        # Les frames encore en file sont écrites avant la fermeture de stdin
+        self._stop_writer()
+        self._log_stats()
+        if self._write_error is not None:
+            raise RuntimeError(f"FFmpeg pipe broken: {self._ffmpeg_error()}") from self._write_error
+
         # Check if process already terminated
         poll_result = self.process.poll()
         if poll_result is not None:
@@ -274,6 +453,13 @@ class FFmpegEncoder:
     def cancel(self) -> None:
         """Cancel encoding and terminate FFmpeg process."""
         if self.process:
+            # Frames en file abandonnées ; le writer s'arrête après son écriture en cours
+            self._discard_queued()
+            self._stop_writer(timeout=1.0)
+            if self._writer is not None:
+                # FFmpeg ne lit plus : son arrêt fait échouer l'écriture bloquée
+                self.process.terminate()
+                self._stop_writer()
             # Fermer stdin avant terminate() : un FFmpeg bloqué en lecture sur stdin
             # ne réagit pas toujours à SIGTERM sur certains OS tant que le pipe est ouvert.
             if self.process.stdin:
@@ -286,7 +472,139 @@ class FFmpegEncoder:
             self.process.wait()
             logging.info("[FFmpeg] Encoding cancelled")
 
+    def _discard_queued(self) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                self._frame_done(*item)
+            self._queue.task_done()
+
+    def _log_stats(self) -> None:
+        stats = self.stats()
+        logging.info(
+            "[FFmpeg] Writer: %d frames, %.1f s writing (%d stalled writes), "
+            "render blocked %.1f s on a full queue (max %d queued), writer idle %.1f s",
+            stats.frames,
+            stats.write_s,
+            stats.stalled_writes,
+            stats.backpressure_s,
+            stats.max_queued,
+            stats.starved_s,
+        )
+
     @property
     def frame_count(self) -> int:
         """Get the number of frames written."""
         return self._frame_count
+
+
+def mux_segments(
+    segments: list[Path],
+    output_path: Path,
+    audio_path: Path,
+    audio_start: float,
+    audio_duration: float,
+    fade_duration: float = 1.0,
+    *,
+    audio_codec: str = "aac",
+    audio_bitrate: str = "192k",
+) -> Path:
+    """Join video-only segments and add the audio, without re-encoding the video.
+
+    Args:
+        segments: Segment files, in timeline order (same codec and settings).
+        output_path: Path for the output video file.
+        audio_path: Path to the audio file.
+        audio_start: Start time in the audio file (seconds).
+        audio_duration: Duration of audio to include (seconds).
+        fade_duration: Duration of the audio fade in/out in seconds (0 to disable).
+        audio_codec: FFmpeg audio codec.
+        audio_bitrate: FFmpeg audio bitrate.
+
+    Returns:
+        Path to the output video file.
+
+    Raises:
+        RuntimeError: If FFmpeg is not found or failed.
+    """
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
+        raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Liste du demuxer concat : un fichier par ligne
+    list_path = output_path.with_name(f".{output_path.name}.segments.txt")
+    list_path.write_text("".join(_concat_entry(path) for path in segments), encoding="utf-8")
+    cmd: list[str] = [
+        ffmpeg_path,
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(list_path),
+        "-ss",
+        str(audio_start),
+        "-t",
+        str(audio_duration),
+        "-i",
+        str(audio_path),
+        "-map",
+        "0:v:0",
+        "-map",
+        "1:a:0",
+        "-c:v",
+        "copy",
+    ]
+    if fade_duration > 0:
+        cmd.extend(["-af", _audio_fade_filter(fade_duration, audio_duration)])
+    cmd.extend(
+        [
+            "-c:a",
+            audio_codec,
+            "-b:a",
+            audio_bitrate,
+            "-shortest",
+            "-movflags",
+            "+faststart",
+            str(output_path),
+        ]
+    )
+    logging.info(f"[FFmpeg] Joining {len(segments)} segments: {' '.join(cmd)}")
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=600)  # noqa: S603
+    finally:
+        list_path.unlink(missing_ok=True)
+    if result.returncode != 0:
+        error_msg = result.stderr.decode(errors="replace") if result.stderr else "No error output"
+        raise RuntimeError(f"FFmpeg concat failed (code {result.returncode}): {error_msg}")
+    logging.info(f"[FFmpeg] Joined {len(segments)} segments -> {output_path}")
+    return output_path
+
+
+def _concat_entry(path: Path) -> str:
+    # Apostrophe dans un nom entre apostrophes : ' -> '\''
+    escaped = str(path.resolve()).replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+
+def _audio_fade_filter(fade_duration: float, duration: float) -> str:
+    """Audio fade in at start, fade out at end."""
+    fade_out_start = max(0, duration - fade_duration)
+    return (
+        f"afade=t=in:st=0:d={fade_duration}," f"afade=t=out:st={fade_out_start}:d={fade_duration}"
+    )
+
+
+def _enlarge_pipe(pipe: IO[bytes]) -> None:
+    """Grow a pipe's kernel buffer where supported (Linux): fewer wake-ups per frame."""
+    try:
+        import fcntl
+
+        fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+    except (ImportError, AttributeError, OSError) as e:
+        logging.debug("[FFmpeg] pipe size unchanged: %s", e)
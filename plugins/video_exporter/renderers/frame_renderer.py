@@ -2,17 +2,32 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import threading
+import time
+from collections.abc import Hashable
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
-from PIL import Image
+
+from plugins.video_exporter.renderers.compositor import Compositor, LayerPixels
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
     from plugins.video_exporter.layers.base import BaseVisualLayer
 
+# Frames entre deux changements de qualité (budget de temps par frame)
+_QUALITY_INTERVAL = 5
+
+# Lissage du coût des frames (moyenne exponentielle)
+_COST_SMOOTHING = 0.3
+
+# Fraction du budget sous laquelle une couche dégradée remonte en qualité
+_QUALITY_RECOVERY = 0.5
+
 
 class FrameRenderer:
     """Compositor for rendering frames from multiple visual layers."""
@@ -42,6 +57,9 @@ class FrameRenderer:
         enabled_post_processing: list[str] | None = None,
         intro_video_path: str = "",
         rng_seed: int = 42,
+        layer_analysis: dict[str, dict[str, NDArray]] | None = None,
+        vjing_analysis_cache_dir: str = "",
+        frame_time_budget: float | None = None,
     ) -> None:
         """Initialize frame renderer.
 
@@ -68,6 +86,13 @@ class FrameRenderer:
             use_all_effects: Use all available VJing effects regardless of genre/preset.
             intro_video_path: Path to intro video to overlay on top (plays once).
             rng_seed: Seed for deterministic VJing effect randomization.
+            layer_analysis: Audio analysis of each layer class, as returned by
+                analysis_arrays() on a renderer built with the same settings.
+            vjing_analysis_cache_dir: Directory caching the VJing audio analysis
+                (empty = no cache).
+            frame_time_budget: Seconds a frame may take to render; above it, the
+                costliest layers lower their quality (preview only, None keeps
+                the export quality).
         """
         self.width = width
         self.height = height
@@ -91,9 +116,25 @@ class FrameRenderer:
         self.enabled_post_processing = enabled_post_processing or []
         self.intro_video_path = intro_video_path
         self.rng_seed = rng_seed
+        self.layer_analysis = layer_analysis or {}
+        self.vjing_analysis_cache_dir = vjing_analysis_cache_dir
+
+        self.compositor = Compositor(width, height)
+        # Coût par couche : nom -> [frames, rendu (s), composition (s)]
+        self._timings: dict[str, list[float]] = {}
+        self._timings_lock = threading.Lock()
+        # Couches statiques : position -> (content_key, pixels de la dernière frame)
+        self._reused: dict[int, tuple[Hashable, LayerPixels | None]] = {}
+        self._reused_lock = threading.Lock()
+        # Budget de temps : coût lissé des frames, frames depuis le dernier ajustement
+        self.frame_time_budget = frame_time_budget
+        self._frame_cost: float | None = None
+        self._frames_since_quality = 0
 
         # Initialize enabled layers
         self.layers: list[BaseVisualLayer] = []
+        # Réglages propres à chaque couche (id -> kwargs), pour layer_fingerprints()
+        self._layer_settings: dict[int, dict[str, Any]] = {}
         self._init_layers(layers_config)
 
         logging.info(f"[Frame Renderer] Initialized with {len(self.layers)} layers")
@@ -121,7 +162,7 @@ class FrameRenderer:
             layers_config: Dictionary of layer_name -> enabled.
         """
         # Common kwargs for all layers
-        common_kwargs = {
+        common_kwargs: dict[str, Any] = {
             "width": self.width,
             "height": self.height,
             "fps": self.fps,
@@ -129,17 +170,20 @@ class FrameRenderer:
             "sr": self.sr,
             "duration": self.duration,
         }
+        layer: BaseVisualLayer
+        settings: dict[str, Any]
 
         # Import layers lazily
         if layers_config.get("video_background", False) and self.video_clips_folder:
             try:
                 from plugins.video_exporter.layers.video_layer import VideoBackgroundLayer
 
-                layer = VideoBackgroundLayer(
-                    **common_kwargs,
-                    video_folder=self.video_clips_folder,
-                )
-                self.layers.append(layer)
+                settings = {
+                    "video_folder": self.video_clips_folder,
+                    "rng_seed": self.rng_seed,
+                }
+                layer = VideoBackgroundLayer(**common_kwargs, **settings)
+                self._add_layer(layer, settings)
                 logging.info("[Frame Renderer] Video background layer enabled")
             except Exception as e:
                 logging.warning(f"[Frame Renderer] Failed to init video layer: {e}")
@@ -149,15 +193,17 @@ class FrameRenderer:
             try:
                 from plugins.video_exporter.layers.waveform_layer import WaveformLayer
 
+                settings = {
+                    "waveform_height_ratio": self.waveform_config.get("height_ratio", 0.3),
+                    "bass_color": self.waveform_config.get("bass_color"),
+                    "mid_color": self.waveform_config.get("mid_color"),
+                    "treble_color": self.waveform_config.get("treble_color"),
+                    "cursor_color": self.waveform_config.get("cursor_color"),
+                }
                 layer = WaveformLayer(
-                    **common_kwargs,
-                    waveform_height_ratio=self.waveform_config.get("height_ratio", 0.3),
-                    bass_color=self.waveform_config.get("bass_color"),
-                    mid_color=self.waveform_config.get("mid_color"),
-                    treble_color=self.waveform_config.get("treble_color"),
-                    cursor_color=self.waveform_config.get("cursor_color"),
+                    **common_kwargs, analysis=self.layer_analysis.get("WaveformLayer"), **settings
                 )
-                self.layers.append(layer)
+                self._add_layer(layer, settings)
                 logging.info("[Frame Renderer] Waveform layer enabled")
             except Exception as e:
                 logging.warning(f"[Frame Renderer] Failed to init waveform layer: {e}")
@@ -167,8 +213,10 @@ class FrameRenderer:
             try:
                 from plugins.video_exporter.layers.dynamics_layer import DynamicsLayer
 
-                layer = DynamicsLayer(**common_kwargs)
-                self.layers.append(layer)
+                layer = DynamicsLayer(
+                    **common_kwargs, analysis=self.layer_analysis.get("DynamicsLayer")
+                )
+                self._add_layer(layer, {})
                 logging.info("[Frame Renderer] Dynamics layer enabled")
             except Exception as e:
                 logging.warning(f"[Frame Renderer] Failed to init dynamics layer: {e}")
@@ -184,23 +232,28 @@ class FrameRenderer:
                     f"[Frame Renderer] VJing: genre='{genre}', "
                     f"preset='{self.vjing_preset}', mappings={self.vjing_mappings}"
                 )
+                settings = {
+                    "genre": genre,
+                    "effect_mappings": self.vjing_mappings,
+                    "preset": self.vjing_preset,
+                    "presets": self.vjing_presets,
+                    "use_gpu": self.use_gpu,
+                    "effect_intensities": self.effect_intensities,
+                    "color_palette": self.color_palette,
+                    "audio_sensitivity": self.audio_sensitivity,
+                    "transitions_enabled": self.transitions_enabled,
+                    "simultaneous_effects": self.simultaneous_effects,
+                    "use_all_effects": self.use_all_effects,
+                    "enabled_post_processing": self.enabled_post_processing,
+                    "rng_seed": self.rng_seed,
+                }
                 layer = VJingLayer(
                     **common_kwargs,
-                    genre=genre,
-                    effect_mappings=self.vjing_mappings,
-                    preset=self.vjing_preset,
-                    presets=self.vjing_presets,
-                    use_gpu=self.use_gpu,
-                    effect_intensities=self.effect_intensities,
-                    color_palette=self.color_palette,
-                    audio_sensitivity=self.audio_sensitivity,
-                    transitions_enabled=self.transitions_enabled,
-                    simultaneous_effects=self.simultaneous_effects,
-                    use_all_effects=self.use_all_effects,
-                    enabled_post_processing=self.enabled_post_processing,
-                    rng_seed=self.rng_seed,
+                    analysis=self.layer_analysis.get("VJingLayer"),
+                    analysis_cache_dir=self.vjing_analysis_cache_dir or None,
+                    **settings,
                 )
-                self.layers.append(layer)
+                self._add_layer(layer, settings)
                 logging.info("[Frame Renderer] VJing layer enabled")
             except Exception as e:
                 logging.warning(f"[Frame Renderer] Failed to init vjing layer: {e}")
@@ -209,12 +262,12 @@ class FrameRenderer:
             try:
                 from plugins.video_exporter.layers.text_layer import TextLayer
 
-                layer = TextLayer(
-                    **common_kwargs,
-                    artist=self._get_metadata("artist", "Unknown"),
-                    title=self._get_metadata("title", "Unknown"),
-                )
-                self.layers.append(layer)
+                settings = {
+                    "artist": self._get_metadata("artist", "Unknown"),
+                    "title": self._get_metadata("title", "Unknown"),
+                }
+                layer = TextLayer(**common_kwargs, **settings)
+                self._add_layer(layer, settings)
                 logging.info("[Frame Renderer] Text layer enabled")
             except Exception as e:
                 logging.warning(f"[Frame Renderer] Failed to init text layer: {e}")
@@ -227,14 +280,14 @@ class FrameRenderer:
                     MilkDropLayer,
                 )
 
-                layer = MilkDropLayer(
-                    **common_kwargs,
-                    preset_path=layers_config.get("milkdrop_preset_path", ""),
-                    preset_duration=layers_config.get("milkdrop_preset_duration", 8.0),
-                    hard_cut_on_beat=layers_config.get("milkdrop_hard_cut_on_beat", True),
-                    rng_seed=self.rng_seed,
-                )
-                self.layers.append(layer)
+                settings = {
+                    "preset_path": layers_config.get("milkdrop_preset_path", ""),
+                    "preset_duration": layers_config.get("milkdrop_preset_duration", 8.0),
+                    "hard_cut_on_beat": layers_config.get("milkdrop_hard_cut_on_beat", True),
+                    "rng_seed": self.rng_seed,
+                }
+                layer = MilkDropLayer(**common_kwargs, **settings)
+                self._add_layer(layer, settings)
                 logging.info("[Frame Renderer] MilkDrop layer enabled")
             except Exception:
                 # Désactivation du layer (comme les autres) : on logue la trace
@@ -251,11 +304,9 @@ class FrameRenderer:
             try:
                 from plugins.video_exporter.layers.intro_overlay_layer import IntroOverlayLayer
 
-                layer = IntroOverlayLayer(
-                    **common_kwargs,
-                    video_path=self.intro_video_path,
-                )
-                self.layers.append(layer)
+                settings = {"video_path": self.intro_video_path}
+                layer = IntroOverlayLayer(**common_kwargs, **settings)
+                self._add_layer(layer, settings)
                 logging.info("[Frame Renderer] Intro overlay layer enabled")
             except Exception:
                 # Désactivation du layer : trace complète loguée, export poursuivi
@@ -269,6 +320,45 @@ class FrameRenderer:
         # Sort by z-index
         self.layers.sort(key=lambda layer: layer.z_index)
 
+    def _add_layer(self, layer: BaseVisualLayer, settings: dict[str, Any]) -> None:
+        """Add a layer built with the given settings (besides the common arguments)."""
+        self.layers.append(layer)
+        self._layer_settings[id(layer)] = settings
+
+    def layer_fingerprints(self) -> list[tuple[tuple[int, int], str]]:
+        """Describe what shapes each layer's pixels, for the export segment cache.
+
+        Returns:
+            Per layer, in z order: (active frame range, fingerprint of its class,
+            z position, settings and source files (size, modification time)).
+        """
+        fingerprints = []
+        for position, layer in enumerate(self.layers):
+            settings = self._layer_settings.get(id(layer), {})
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{type(layer).__name__}|{position}|".encode())
+            digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+            for path in layer.source_files():
+                try:
+                    stat = path.stat()
+                    digest.update(f"|{path}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+                except OSError:
+                    digest.update(f"|{path}|missing".encode())
+            fingerprints.append((layer.active_frames(), digest.hexdigest()))
+        return fingerprints
+
+    def analysis_arrays(self) -> dict[str, dict[str, NDArray]]:
+        """Get the audio analysis of the layers (see BaseVisualLayer.ANALYSIS_ARRAYS).
+
+        Returns:
+            Layer class name -> arrays, for the ``layer_analysis`` argument.
+        """
+        return {
+            type(layer).__name__: layer.analysis_arrays()
+            for layer in self.layers
+            if layer.ANALYSIS_ARRAYS
+        }
+
     def prerender_gpu(self) -> int:
         """Pre-render GPU effects for all layers that support it.
 
@@ -293,26 +383,162 @@ class FrameRenderer:
         for layer in self.layers:
             layer.warmup_gpu_frames()
 
-    def render_frame(self, frame_idx: int, time_pos: float) -> NDArray[np.uint8]:
+    def advance(self, frame_idx: int, time_pos: float) -> list[Any]:
+        """Advance every layer to a frame (call once per frame, in frame order).
+
+        Args:
+            frame_idx: Frame index.
+            time_pos: Time position in seconds.
+
+        Returns:
+            One snapshot per layer, for render_frame().
+        """
+        return [layer.advance(frame_idx, time_pos) for layer in self.layers]
+
+    def render_frame(
+        self,
+        frame_idx: int,
+        time_pos: float,
+        states: list[Any] | None = None,
+        out: NDArray[np.uint8] | None = None,
+    ) -> NDArray[np.uint8]:
         """Render a single frame by compositing all layers.
 
         Args:
             frame_idx: Frame index.
             time_pos: Time position in seconds.
+            states: Snapshots returned by advance() for this frame; None advances
+                the layers first (sequential rendering).
+            out: RGB buffer (height, width, 3) to render into, e.g. the
+                encoder's frame slot; None allocates one.
 
         Returns:
-            RGB frame as numpy array (height, width, 3).
+            RGB frame as numpy array (height, width, 3): ``out`` if given.
         """
+        if states is None:
+            states = self.advance(frame_idx, time_pos)
+
         # Start with black background
-        composite = Image.new("RGBA", (self.width, self.height), (0, 0, 0, 255))
+        if out is None:
+            out = self.compositor.new_frame()
+        else:
+            out.fill(0)
 
         # Render and composite each layer
-        for layer in self.layers:
-            layer_image = layer.render(frame_idx, time_pos)
-            if layer_image.mode != "RGBA":
-                layer_image = layer_image.convert("RGBA")
-            composite = Image.alpha_composite(composite, layer_image)
-
-        # Convert to RGB numpy array
-        rgb = composite.convert("RGB")
-        return np.array(rgb, dtype=np.uint8)
+        costs = []
+        for position, (layer, state) in enumerate(zip(self.layers, states, strict=True)):
+            start = time.perf_counter()
+            if not layer.is_visible(frame_idx, time_pos):
+                # Couche transparente sur cette frame : ni rendu ni composition
+                self._record_timing(layer, 0.0, 0.0)
+                costs.append(0.0)
+                continue
+            pixels = self._layer_pixels(position, layer, frame_idx, time_pos, state)
+            rendered = time.perf_counter()
+            if pixels is not None:
+                self.compositor.composite(out, pixels, layer.blend_mode, layer.opacity)
+            end = time.perf_counter()
+            self._record_timing(layer, rendered - start, end - rendered)
+            costs.append(end - start)
+
+        if self.frame_time_budget is not None:
+            self._schedule_quality(costs)
+        return out
+
+    def _layer_pixels(
+        self, position: int, layer: BaseVisualLayer, frame_idx: int, time_pos: float, state: Any
+    ) -> LayerPixels | None:
+        """Render a layer, or reuse its last pixels if its content key did not change."""
+        key = layer.content_key(frame_idx, time_pos)
+        if key is None:
+            return layer.render_pixels(frame_idx, time_pos, state)
+        with self._reused_lock:
+            reused = self._reused.get(position)
+        if reused is not None and reused[0] == key:
+            return reused[1]
+        pixels = layer.render_pixels(frame_idx, time_pos, state)
+        with self._reused_lock:
+            self._reused[position] = (key, pixels)
+        return pixels
+
+    def _schedule_quality(self, costs: list[float]) -> None:
+        """Lower or restore layer quality to keep frames within frame_time_budget.
+
+        Every _QUALITY_INTERVAL frames, a smoothed frame cost above the budget
+        lowers the costliest layer that can still go down one level; below
+        _QUALITY_RECOVERY of the budget, the cheapest lowered layer goes back up.
+        """
+        assert self.frame_time_budget is not None
+        with self._timings_lock:
+            cost = sum(costs)
+            if self._frame_cost is None:
+                self._frame_cost = cost
+            else:
+                self._frame_cost += _COST_SMOOTHING * (cost - self._frame_cost)
+            self._frames_since_quality += 1
+            if self._frames_since_quality < _QUALITY_INTERVAL:
+                return
+
+            layers = list(zip(self.layers, costs, strict=True))
+            if self._frame_cost > self.frame_time_budget:
+                candidates = [
+                    (c, layer) for layer, c in layers if layer.quality < layer.QUALITY_LEVELS - 1
+                ]
+                if not candidates:
+                    return
+                _, layer = max(candidates, key=lambda item: item[0])
+                layer.set_quality(layer.quality + 1)
+            elif self._frame_cost < self.frame_time_budget * _QUALITY_RECOVERY:
+                candidates = [(c, layer) for layer, c in layers if layer.quality > 0]
+                if not candidates:
+                    return
+                _, layer = min(candidates, key=lambda item: item[0])
+                layer.set_quality(layer.quality - 1)
+            else:
+                return
+            logging.debug(
+                "[Frame Renderer] %s quality level %d (frame cost %.1f ms, budget %.1f ms)",
+                type(layer).__name__,
+                layer.quality,
+                self._frame_cost * 1000,
+                self.frame_time_budget * 1000,
+            )
+            # Mesures repartant de zéro au nouveau niveau
+            self._frame_cost = None
+            self._frames_since_quality = 0
+
+    def can_lower_quality(self) -> bool:
+        """Whether a layer can still lower its quality (see frame_time_budget)."""
+        return any(layer.quality < layer.QUALITY_LEVELS - 1 for layer in self.layers)
+
+    def layer_qualities(self) -> dict[str, int]:
+        """Get the current quality level of each layer (0 = export quality).
+
+        Returns:
+            Layer class name -> quality level.
+        """
+        return {type(layer).__name__: layer.quality for layer in self.layers}
+
+    def _record_timing(self, layer: BaseVisualLayer, render: float, composite: float) -> None:
+        with self._timings_lock:
+            timing = self._timings.setdefault(type(layer).__name__, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += render
+            timing[2] += composite
+
+    def reset_layer_timings(self) -> None:
+        """Forget the layer costs measured so far (e.g. warm-up frames)."""
+        with self._timings_lock:
+            self._timings.clear()
+
+    def layer_timings(self) -> dict[str, tuple[float, float]]:
+        """Get the average cost of each layer since the renderer was created.
+
+        Returns:
+            Layer class name -> (render, composite) seconds per frame.
+        """
+        with self._timings_lock:
+            return {
+                name: (render / frames, composite / frames)
+                for name, (frames, render, composite) in self._timings.items()
+            }
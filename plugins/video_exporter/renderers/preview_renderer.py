@@ -0,0 +1,226 @@
+"""Fast preview of an export: reduced resolution, keyframes and interpolation.
+
+The preview renderer wraps a FrameRenderer built at a fraction of the export
+resolution (preview_size(); the viewer upscales the frames). Only keyframes,
+every frame_step frames, are rendered: the frames in between are blended
+from the two surrounding keyframes. Layers still advance on every frame in
+playback, so stateful effects (beats, effect cycling) follow the export.
+
+In adaptive mode frame_step follows the measured keyframe cost to keep
+playback real time. When even MAX_FRAME_STEP cannot keep up, the renderer's
+frame-time budget first lowers the quality of the costliest layers, then
+needs_lower_resolution tells the viewer to rebuild the renderer at a lower
+scale. The
+per-layer costs measured by the FrameRenderer project the full export time
+(project_export_time()).
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+
+# Keyframes au plus espacées de MAX_FRAME_STEP frames (au-delà, le fondu
+# entre keyframes efface le mouvement)
+MAX_FRAME_STEP = 8
+
+# Échelle interne minimale (fraction de la résolution d'export)
+MIN_PREVIEW_SCALE = 0.125
+
+# Marge sur le coût d'une keyframe : composition des frames intermédiaires,
+# affichage
+_COST_HEADROOM = 1.25
+
+# Lissage du coût mesuré (moyenne exponentielle)
+_COST_SMOOTHING = 0.3
+
+# Keyframes de chauffe exclues des coûts par couche (projection)
+_WARMUP_KEYFRAMES = 2
+
+
+def preview_size(width: int, height: int, scale: float) -> tuple[int, int]:
+    """Get the internal resolution of a preview (multiples of 4, at least 16x16).
+
+    Args:
+        width: Export width in pixels.
+        height: Export height in pixels.
+        scale: Fraction of the export resolution.
+
+    Returns:
+        (width, height) of the preview frames.
+    """
+    return max(16, int(width * scale) // 4 * 4), max(16, int(height * scale) // 4 * 4)
+
+
+def project_export_time(
+    layer_timings: dict[str, tuple[float, float]],
+    preview_size: tuple[int, int],
+    export_size: tuple[int, int],
+    total_frames: int,
+    workers: int = 1,
+) -> dict[str, float]:
+    """Project the rendering time of each layer over the full export.
+
+    Layer costs measured at preview resolution are scaled by the pixel count
+    of the export (layers draw and blend per pixel) and spread over the
+    export workers. Per-frame costs that do not depend on the size are
+    scaled too, so small previews tend to overestimate. Encoding is not
+    included.
+
+    Args:
+        layer_timings: FrameRenderer.layer_timings() of the preview renderer.
+        preview_size: (width, height) the costs were measured at.
+        export_size: (width, height) of the export.
+        total_frames: Frames in the export.
+        workers: Frames rendered in parallel by the export.
+
+    Returns:
+        Layer class name -> projected seconds.
+    """
+    pixel_ratio = (export_size[0] * export_size[1]) / (preview_size[0] * preview_size[1])
+    return {
+        name: (render + composite) * pixel_ratio * total_frames / max(1, workers)
+        for name, (render, composite) in layer_timings.items()
+    }
+
+
+class PreviewRenderer:
+    """Render preview frames from keyframes, blending the frames in between.
+
+    Not thread-safe: one thread renders at a time (the playback thread, or
+    the dialog when paused).
+    """
+
+    def __init__(
+        self,
+        renderer: FrameRenderer,
+        total_frames: int,
+        frame_step: int = 1,
+        max_frame_step: int = MAX_FRAME_STEP,
+        adaptive: bool = True,
+    ) -> None:
+        """Initialize preview renderer.
+
+        Args:
+            renderer: Frame renderer at preview resolution.
+            total_frames: Frames in the previewed export.
+            frame_step: Frames from one keyframe to the next (1 renders
+                every frame).
+            max_frame_step: Upper bound of frame_step in adaptive mode.
+            adaptive: Adjust frame_step to the measured keyframe cost.
+        """
+        self.renderer = renderer
+        self.total_frames = total_frames
+        self.max_frame_step = max(1, min(max_frame_step, MAX_FRAME_STEP))
+        self.frame_step = max(1, min(frame_step, self.max_frame_step))
+        self.adaptive = adaptive
+        # Keyframes encadrant la frame courante : (index, pixels)
+        self._previous: tuple[int, NDArray[np.uint8]] | None = None
+        self._next: tuple[int, NDArray[np.uint8]] | None = None
+        self._last_advanced = -1
+        self._keyframe_cost: float | None = None
+        self._keyframes_rendered = 0
+        self._out = renderer.compositor.new_frame()
+        if adaptive:
+            # Keyframe prête avant la fin des max_frame_step frames qu'elle couvre
+            renderer.frame_time_budget = self.max_frame_step / renderer.fps / _COST_HEADROOM
+
+    def render(self, frame_idx: int) -> NDArray[np.uint8]:
+        """Render a preview frame.
+
+        Frames requested in increasing order (playback) advance the layers
+        through every frame; a seek renders the target frame directly.
+
+        Args:
+            frame_idx: Frame index.
+
+        Returns:
+            RGB frame (height, width, 3), valid until the next call.
+        """
+        frame_idx = max(0, min(frame_idx, self.total_frames - 1))
+        if not self._covers(frame_idx):
+            if (
+                self._next is not None
+                and self._next[0] < frame_idx <= self._next[0] + self.frame_step
+            ):
+                # Lecture : la keyframe suivante devient la précédente
+                self._previous = self._next
+            else:
+                self._previous = (frame_idx, self._render_keyframe(frame_idx))
+            start = self._previous[0]
+            end = min(start + self.frame_step, self.total_frames - 1)
+            self._next = self._previous if end == start else (end, self._render_keyframe(end))
+
+        assert self._previous is not None and self._next is not None
+        (start, first), (end, last) = self._previous, self._next
+        if frame_idx == start or end == start:
+            np.copyto(self._out, first)
+        elif frame_idx == end:
+            np.copyto(self._out, last)
+        else:
+            span = end - start
+            weight = frame_idx - start
+            # Interpolation linéaire en entiers 16 bits, arrondie
+            blended = first.astype(np.uint16) * (span - weight)
+            blended += last.astype(np.uint16) * weight
+            blended += span // 2
+            np.floor_divide(blended, span, out=blended)
+            np.copyto(self._out, blended, casting="unsafe")
+        return self._out
+
+    @property
+    def keyframe_cost(self) -> float:
+        """Get the smoothed cost of a keyframe in seconds (0 before the first one)."""
+        return self._keyframe_cost or 0.0
+
+    @property
+    def needs_lower_resolution(self) -> bool:
+        """Whether playback falls behind even at max_frame_step."""
+        return (
+            self.adaptive
+            and self._keyframes_rendered >= 3
+            and self.frame_step == self.max_frame_step
+            and self.keyframe_cost * _COST_HEADROOM > self.max_frame_step / self.renderer.fps
+            and not self.renderer.can_lower_quality()
+        )
+
+    def _covers(self, frame_idx: int) -> bool:
+        return (
+            self._previous is not None
+            and self._next is not None
+            and self._previous[0] <= frame_idx <= self._next[0]
+        )
+
+    def _render_keyframe(self, frame_idx: int) -> NDArray[np.uint8]:
+        start = time.perf_counter()
+        fps = self.renderer.fps
+        if self._last_advanced < frame_idx <= self._last_advanced + MAX_FRAME_STEP:
+            # Frames interpolées : les couches avancent quand même (état des effets)
+            for skipped in range(self._last_advanced + 1, frame_idx):
+                self.renderer.advance(skipped, skipped / fps)
+        states = self.renderer.advance(frame_idx, frame_idx / fps)
+        self._last_advanced = frame_idx
+        pixels = self.renderer.render_frame(frame_idx, frame_idx / fps, states)
+
+        cost = time.perf_counter() - start
+        if self._keyframe_cost is None:
+            self._keyframe_cost = cost
+        else:
+            self._keyframe_cost += _COST_SMOOTHING * (cost - self._keyframe_cost)
+        self._keyframes_rendered += 1
+        if self._keyframes_rendered == _WARMUP_KEYFRAMES:
+            # Premières keyframes : compilation numba, caches des couches
+            self.renderer.reset_layer_timings()
+        if self.adaptive:
+            # Une keyframe doit être prête avant la fin des frames qu'elle couvre
+            step = math.ceil(self._keyframe_cost * fps * _COST_HEADROOM)
+            self.frame_step = max(1, min(step, self.max_frame_step))
+        return pixels
@@ -0,0 +1,348 @@
+"""Multiprocess frame rendering for video export.
+
+The layers draw with PIL and numpy code that holds the GIL most of the time,
+so the export thread pool scales poorly. RenderFarm renders frames in worker
+processes instead:
+
+- each worker rebuilds the FrameRenderer from its (picklable) keyword
+  arguments; the audio and the layers' audio analysis
+  (BaseVisualLayer.ANALYSIS_ARRAYS) are read from shared memory instead of
+  being reloaded and recomputed;
+- frames are handed out as contiguous chunks, in order. Before drawing a
+  chunk, a worker advances its layers over the frames rendered by the other
+  workers (advance() only moves effect state forward), so every frame is the
+  one sequential rendering would give;
+- each worker owns a few slots of a shared-memory frame ring: it writes a
+  frame straight into a free slot and posts its index; the export worker reads the
+  frame from the slot, writes it to the encoder and gives the slot back.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import queue
+import traceback
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from multiprocessing.context import SpawnProcess
+    from multiprocessing.queues import Queue
+
+    from numpy.typing import NDArray
+
+# Frames par tâche : assez pour amortir les échanges, assez peu pour que
+# l'encodeur reçoive les frames de façon régulière
+DEFAULT_CHUNK_FRAMES = 4
+
+_ALIGN = 64
+
+# (clé, dtype, shape, offset) de chaque tableau d'un SharedArrays
+ArrayLayout = tuple[tuple[str, str, tuple[int, ...], int], ...]
+
+
+class SharedArrays:
+    """Read-only numpy arrays packed into one shared memory block."""
+
+    def __init__(self, shm: SharedMemory, layout: ArrayLayout) -> None:
+        """Wrap a block (use create() or attach()).
+
+        Args:
+            shm: Shared memory block holding the arrays.
+            layout: Position of each array in the block.
+        """
+        self._shm = shm
+        self.layout = layout
+        self._arrays: dict[str, NDArray] = {}
+        for key, dtype, shape, offset in layout:
+            array: NDArray = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            array.flags.writeable = False
+            self._arrays[key] = array
+
+    @classmethod
+    def create(cls, arrays: dict[str, NDArray]) -> SharedArrays:
+        """Copy arrays into a new shared memory block."""
+        layout = []
+        size = 0
+        for key, array in arrays.items():
+            layout.append((key, array.dtype.str, array.shape, size))
+            size += -(-array.nbytes // _ALIGN) * _ALIGN
+        shm = SharedMemory(create=True, size=max(size, 1))
+        for (_key, dtype, shape, offset), array in zip(layout, arrays.values(), strict=True):
+            np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)[...] = array
+        return cls(shm, tuple(layout))
+
+    @classmethod
+    def attach(cls, name: str, layout: ArrayLayout) -> SharedArrays:
+        """Open a block created by another process."""
+        return cls(SharedMemory(name=name), layout)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __getitem__(self, key: str) -> NDArray:
+        return self._arrays[key]
+
+    def close(self) -> None:
+        """Release this process's mapping (views must no longer be used)."""
+        self._arrays.clear()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Free the block (creator only, once every process has closed it)."""
+        self._shm.unlink()
+
+
+class RenderFarm:
+    """Render export frames in worker processes through a shared-memory ring."""
+
+    def __init__(
+        self,
+        renderer_kwargs: dict[str, Any],
+        audio: NDArray[np.floating],
+        layer_analysis: dict[str, dict[str, NDArray]],
+        total_frames: int,
+        num_workers: int,
+        chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+        slots_per_worker: int | None = None,
+        frame_ranges: list[tuple[int, int]] | None = None,
+    ) -> None:
+        """Initialize render farm (workers start with start() or ``with``).
+
+        Args:
+            renderer_kwargs: FrameRenderer arguments except audio and
+                layer_analysis; must be picklable.
+            audio: Audio samples.
+            layer_analysis: FrameRenderer.analysis_arrays() of a renderer built
+                with the same arguments.
+            total_frames: Number of frames in the export.
+            num_workers: Number of worker processes.
+            chunk_frames: Frames per task.
+            slots_per_worker: Ring slots owned by each worker (default: two
+                chunks, so a worker can start a chunk before the previous one
+                is written).
+            frame_ranges: (first, end) frame ranges to render, in order
+                (default: every frame); the layers advance over the others.
+        """
+        self.renderer_kwargs = {
+            **renderer_kwargs,
+            # sqlite3.Row ne se sérialise pas
+            "track_metadata": dict(renderer_kwargs.get("track_metadata") or {}),
+        }
+        self.width: int = renderer_kwargs["width"]
+        self.height: int = renderer_kwargs["height"]
+        self.audio = audio
+        self.layer_analysis = layer_analysis
+        self.total_frames = total_frames
+        self.num_workers = max(1, num_workers)
+        self.chunk_frames = max(1, chunk_frames)
+        self.slots_per_worker = slots_per_worker or 2 * self.chunk_frames
+        self.frame_ranges = frame_ranges if frame_ranges is not None else [(0, total_frames)]
+
+        self._data: SharedArrays | None = None
+        self._ring_shm: SharedMemory | None = None
+        self._ring: NDArray[np.uint8] | None = None
+        self._processes: list[SpawnProcess] = []
+        self._tasks: Queue | None = None
+        self._free_slots: list[Queue] = []
+        self._results: Queue | None = None
+        self._slot_of: dict[int, int] = {}
+
+    def __enter__(self) -> RenderFarm:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Share the audio and analysis, then start the workers."""
+        arrays = {"audio": np.asarray(self.audio)}
+        for layer_name, layer_arrays in self.layer_analysis.items():
+            for attr, array in layer_arrays.items():
+                arrays[f"{layer_name}.{attr}"] = array
+        self._data = SharedArrays.create(arrays)
+
+        ring_shape = (
+            self.num_workers * self.slots_per_worker,
+            self.height,
+            self.width,
+            3,
+        )
+        self._ring_shm = SharedMemory(create=True, size=int(np.prod(ring_shape)))
+        self._ring = np.ndarray(ring_shape, dtype=np.uint8, buffer=self._ring_shm.buf)
+
+        # spawn : pas de fork d'un processus Qt / OpenGL
+        ctx = mp.get_context("spawn")
+        self._tasks = tasks = ctx.Queue()
+        for first, end in self.frame_ranges:
+            for start in range(first, end, self.chunk_frames):
+                tasks.put((start, min(start + self.chunk_frames, end)))
+        self._results = ctx.Queue()
+        for worker_id in range(self.num_workers):
+            free_slots = ctx.Queue()
+            first_slot = worker_id * self.slots_per_worker
+            for slot in range(first_slot, first_slot + self.slots_per_worker):
+                free_slots.put(slot)
+            self._free_slots.append(free_slots)
+            tasks.put(None)
+            process = ctx.Process(
+                target=_render_worker,
+                args=(
+                    worker_id,
+                    self.renderer_kwargs,
+                    self._data.name,
+                    self._data.layout,
+                    self._ring_shm.name,
+                    ring_shape,
+                    tasks,
+                    free_slots,
+                    self._results,
+                ),
+                name=f"render-farm-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        logging.info(
+            "[Render Farm] %d workers, %d frames in chunks of %d, %d ring slots (%.0f MB)",
+            self.num_workers,
+            sum(end - first for first, end in self.frame_ranges),
+            self.chunk_frames,
+            ring_shape[0],
+            self._ring.nbytes / 1e6,
+        )
+
+    def poll(self, timeout: float) -> list[int]:
+        """Wait for rendered frames.
+
+        Args:
+            timeout: Maximum wait for the first frame, in seconds.
+
+        Returns:
+            Indexes of the frames now readable with frame() (possibly none).
+
+        Raises:
+            RuntimeError: If a worker failed or died.
+        """
+        if self._results is None:
+            raise RuntimeError("Render farm not started")
+        ready: list[int] = []
+        try:
+            message = self._results.get(timeout=timeout)
+            while True:
+                ready.append(self._receive(message))
+                message = self._results.get_nowait()
+        except queue.Empty:
+            pass
+        if not ready:
+            for process in self._processes:
+                if process.exitcode not in (None, 0):
+                    raise RuntimeError(f"{process.name} died (exit code {process.exitcode})")
+        return ready
+
+    def _receive(self, message: tuple[int, Any]) -> int:
+        frame_idx, payload = message
+        if frame_idx < 0:
+            raise RuntimeError(f"Render worker failed:\n{payload}")
+        self._slot_of[frame_idx] = payload
+        return frame_idx
+
+    def frame(self, frame_idx: int) -> NDArray[np.uint8]:
+        """Get a rendered frame (a view into its slot, valid until release())."""
+        assert self._ring is not None
+        return self._ring[self._slot_of[frame_idx]]
+
+    def release(self, frame_idx: int) -> None:
+        """Give a frame's slot back to the worker that rendered it."""
+        slot = self._slot_of.pop(frame_idx)
+        self._free_slots[slot // self.slots_per_worker].put(slot)
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            process.join(timeout=5)
+        queues = [self._tasks, self._results, *self._free_slots]
+        for q in queues:
+            if q is not None:
+                # Les workers arrêtés ne videront plus ces files
+                q.cancel_join_thread()
+                q.close()
+        self._processes.clear()
+        self._free_slots.clear()
+        self._tasks = self._results = None
+        self._slot_of.clear()
+        if self._data is not None:
+            self._data.close()
+            self._data.unlink()
+            self._data = None
+        if self._ring_shm is not None:
+            self._ring = None
+            self._ring_shm.close()
+            self._ring_shm.unlink()
+            self._ring_shm = None
+
+
+def _render_worker(
+    worker_id: int,
+    renderer_kwargs: dict[str, Any],
+    data_name: str,
+    data_layout: ArrayLayout,
+    ring_name: str,
+    ring_shape: tuple[int, ...],
+    tasks: Queue,
+    free_slots: Queue,
+    results: Queue,
+) -> None:
+    """Worker process entry point (errors are posted to ``results``)."""
+    data = SharedArrays.attach(data_name, data_layout)
+    ring_shm = SharedMemory(name=ring_name)
+    try:
+        ring: NDArray[np.uint8] = np.ndarray(ring_shape, dtype=np.uint8, buffer=ring_shm.buf)
+        _render_chunks(renderer_kwargs, data, ring, tasks, free_slots, results)
+        del ring
+    except Exception:
+        results.put((-1 - worker_id, traceback.format_exc()))
+    finally:
+        # Les vues sur la mémoire partagée ont disparu avec _render_chunks
+        data.close()
+        ring_shm.close()
+
+
+def _render_chunks(
+    renderer_kwargs: dict[str, Any],
+    data: SharedArrays,
+    ring: NDArray[np.uint8],
+    tasks: Queue,
+    free_slots: Queue,
+    results: Queue,
+) -> None:
+    """Render the chunks taken from ``tasks`` into this worker's ring slots."""
+    from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+
+    layer_analysis: dict[str, dict[str, NDArray]] = {}
+    for key, *_ in data.layout:
+        if "." in key:
+            layer_name, attr = key.split(".", 1)
+            layer_analysis.setdefault(layer_name, {})[attr] = data[key]
+    renderer = FrameRenderer(audio=data["audio"], layer_analysis=layer_analysis, **renderer_kwargs)
+    fps = renderer.fps
+
+    next_frame = 0
+    while (chunk := tasks.get()) is not None:
+        start, end = chunk
+        # Frames des autres workers : l'état des couches avance sans dessin
+        for frame_idx in range(next_frame, start):
+            renderer.advance(frame_idx, frame_idx / fps)
+        for frame_idx in range(start, end):
+            slot = free_slots.get()
+            renderer.render_frame(frame_idx, frame_idx / fps, out=ring[slot])
+            results.put((frame_idx, slot))
+        next_frame = end
@@ -0,0 +1,387 @@
+"""Encoded segment cache for resumable video exports.
+
+An export is cut into fixed-length segments (plan_segments()), each encoded
+to its own video-only file by a SegmentWriter, then joined with the audio by
+ffmpeg_encoder.mux_segments(). Segment files are named after a key built
+from:
+
+- the export fingerprint: audio content, video format, encoder settings,
+  fade duration (export_fingerprint());
+- the segment's frame range;
+- the fingerprint of every layer that can draw on that range
+  (FrameRenderer.layer_fingerprints()).
+
+A segment is only written under its final name once fully encoded, so a
+cancelled or crashed export resumes from its last complete segment, and a
+settings change re-renders only the segments whose key changed (e.g. the
+intro video only keys the segments it plays on). Skipped segments still
+advance the layers (see RenderFarm): frames after them are unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from numpy.typing import NDArray
+
+    from plugins.video_exporter.renderers.ffmpeg_encoder import FFmpegEncoder
+
+# Durée d'un segment : ~1/540 d'un export de 90 min à refaire après un arrêt
+DEFAULT_SEGMENT_SECONDS = 10.0
+
+# Taille du cache (video_exporter.export_segment_cache_max_gb) : ~3 exports de
+# 90 min à 5000 kbps, les moins récemment utilisés sont évincés au-delà
+DEFAULT_CACHE_MAX_GB = 10.0
+
+# Répertoire d'un export (export_name()) : seuls ceux-ci sont évincés du cache
+_EXPORT_NAME = re.compile(r"[0-9a-f]{32}")
+
+# Version du découpage et des clés : à incrémenter si un segment change de contenu
+SEGMENT_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Frame range of the export encoded to its own file."""
+
+    index: int
+    # Première frame, frame après la dernière
+    start: int
+    end: int
+    key: str
+    path: Path
+
+    @property
+    def frames(self) -> int:
+        return self.end - self.start
+
+    @property
+    def partial_path(self) -> Path:
+        """File the segment is encoded to, renamed to path once complete."""
+        return self.path.with_name(f"{self.path.stem}.partial{self.path.suffix}")
+
+
+def plan_segments(
+    total_frames: int, fps: int, segment_seconds: float, fade_duration: float = 0.0
+) -> list[tuple[int, int]]:
+    """Cut the export into fixed-length frame ranges.
+
+    Each fade of the export falls within one segment (the first and the last
+    ones hold at least a fade), so segments can be encoded separately.
+
+    Args:
+        total_frames: Frames in the export.
+        fps: Frames per second.
+        segment_seconds: Segment duration.
+        fade_duration: Export fade in/out duration in seconds.
+
+    Returns:
+        (first frame, frame after the last one) of each segment.
+    """
+    fade_frames = math.ceil(fade_duration * fps)
+    length = max(1, round(segment_seconds * fps), fade_frames)
+    starts = list(range(0, total_frames, length))
+    # Dernier segment trop court pour le fondu de sortie : fusionné au précédent
+    if len(starts) > 1 and total_frames - starts[-1] < fade_frames:
+        starts.pop()
+    return [(start, end) for start, end in zip(starts, [*starts[1:], total_frames], strict=True)]
+
+
+def export_fingerprint(audio: NDArray[np.floating], settings: dict[str, Any]) -> str:
+    """Fingerprint what shapes every frame of an export.
+
+    Args:
+        audio: Audio samples of the export.
+        settings: Video format, encoder settings and fades (JSON-serializable).
+
+    Returns:
+        Hex digest.
+    """
+    digest = hashlib.blake2b(np.ascontiguousarray(audio).data, digest_size=16)
+    digest.update(f"{audio.dtype}|v{SEGMENT_FORMAT_VERSION}|".encode())
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def export_name(source: Path, loop_start: float, loop_end: float, width: int, height: int) -> str:
+    """Name the cache directory of an export: same track, loop and size."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{source.resolve()}|{loop_start}|{loop_end}|{width}x{height}".encode())
+    return digest.hexdigest()
+
+
+class SegmentCache:
+    """Segment files of one export, in their own directory."""
+
+    def __init__(self, root: Path, export_name: str, suffix: str = ".mp4") -> None:
+        """Initialize cache.
+
+        Args:
+            root: Cache directory shared by the exports.
+            export_name: This export's directory (export_name()), reused
+                across re-exports.
+            suffix: Segment file extension (container of the output).
+        """
+        self.root = root
+        self.directory = root / export_name
+        self.suffix = suffix
+
+    def plan(
+        self,
+        ranges: list[tuple[int, int]],
+        export_key: str,
+        layer_fingerprints: list[tuple[tuple[int, int], str]],
+    ) -> list[Segment]:
+        """Key the segments of an export.
+
+        Args:
+            ranges: Segment frame ranges from plan_segments().
+            export_key: export_fingerprint() of the export.
+            layer_fingerprints: (active frame range, fingerprint) of each layer.
+
+        Returns:
+            Segments in timeline order.
+        """
+        segments = []
+        for index, (start, end) in enumerate(ranges):
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{export_key}|{start}|{end}".encode())
+            for (first, last), fingerprint in layer_fingerprints:
+                # Couche sans pixel sur ce segment : ses réglages ne le changent pas
+                if first < end and start < last:
+                    digest.update(f"|{fingerprint}".encode())
+            key = digest.hexdigest()
+            segments.append(
+                Segment(index, start, end, key, self.directory / f"{index:05d}-{key}{self.suffix}")
+            )
+        return segments
+
+    def prepare(self, segments: list[Segment], max_gb: float = DEFAULT_CACHE_MAX_GB) -> None:
+        """Create the export directory and drop what the plan no longer uses.
+
+        Removes this export's stale and partial segment files, then the least
+        recently used other exports once the cache holds more than max_gb
+        (only directories named by export_name(): the root may be shared).
+        This export is always kept, whatever its size.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        planned = {segment.path.name for segment in segments}
+        for path in self.directory.iterdir():
+            if path.name not in planned:
+                path.unlink(missing_ok=True)
+        # Date d'usage de l'export : base de l'éviction des plus anciens
+        os.utime(self.directory)
+
+        others = sorted(
+            (
+                path
+                for path in self.root.iterdir()
+                if path.is_dir()
+                and _EXPORT_NAME.fullmatch(path.name)
+                and path.name != self.directory.name
+            ),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        max_bytes = max_gb * 1024**3
+        used = _directory_size(self.directory)
+        for path in others:
+            # Du plus récent au plus ancien : dès le dépassement, les suivants partent aussi
+            used += _directory_size(path)
+            if used > max_bytes:
+                logging.info(f"[Segment Cache] Removing old export segments {path}")
+                shutil.rmtree(path, ignore_errors=True)
+
+
+class SegmentWriter:
+    """Encode the missing segments of an export, one FFmpeg process each.
+
+    Offers the encoder methods the export loops use (frame_buffer(),
+    write_frame(), drain(), cancel(), frame_count): frames are written in
+    order and cover exactly the given segments. A full segment is finalized
+    in the background while the next one is being encoded.
+    """
+
+    def __init__(
+        self,
+        segments: list[Segment],
+        width: int,
+        height: int,
+        make_encoder: Callable[[Segment], FFmpegEncoder],
+    ) -> None:
+        """Initialize writer.
+
+        Args:
+            segments: Segments to encode, in timeline order.
+            width: Video width in pixels.
+            height: Video height in pixels.
+            make_encoder: Builds the (not started) video-only encoder of a
+                segment, writing to its partial_path.
+        """
+        self.segments = segments
+        self.width = width
+        self.height = height
+        self.make_encoder = make_encoder
+        self._next_segment = 0
+        self._current: FFmpegEncoder | None = None
+        self._current_segment: Segment | None = None
+        self._written_in_segment = 0
+        self._frame_count = 0
+        self._finisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-finish")
+        self._finishing: list[Future[None]] = []
+        self._free_buffers: list[NDArray[np.uint8]] = []
+        self._buffers: set[int] = set()
+
+    def frame_buffer(self) -> NDArray[np.uint8]:
+        """Get a frame buffer to render into (recycled once written)."""
+        try:
+            return self._free_buffers.pop()
+        except IndexError:
+            buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            self._buffers.add(id(buffer))
+            return buffer
+
+    def write_frame(
+        self, frame: NDArray[np.uint8], on_written: Callable[[], None] | None = None
+    ) -> None:
+        """Queue the next frame of the current segment (see FFmpegEncoder.write_frame).
+
+        Raises:
+            RuntimeError: If every segment is complete or FFmpeg failed.
+        """
+        self._raise_if_failed()
+        encoder = self._encoder()
+        if id(frame) in self._buffers:
+            on_written = self._recycle(frame, on_written)
+        encoder.write_frame(frame, on_written=on_written)
+        self._frame_count += 1
+        self._written_in_segment += 1
+        assert self._current_segment is not None
+        if self._written_in_segment == self._current_segment.frames:
+            self._finish_current()
+
+    def drain(self) -> None:
+        """Wait until every written segment is complete.
+
+        Raises:
+            RuntimeError: If FFmpeg failed.
+        """
+        if self._current is not None:
+            self._current.drain()
+        for future in self._finishing:
+            future.result()
+        self._raise_if_failed()
+
+    def finish(self) -> list[Path]:
+        """Wait for the last segments and stop the writer.
+
+        Returns:
+            Paths of the encoded segments.
+
+        Raises:
+            RuntimeError: If a segment is incomplete or FFmpeg failed.
+        """
+        try:
+            self.drain()
+            if self._current is not None or self._next_segment < len(self.segments):
+                raise RuntimeError(
+                    f"Export stopped after {self._frame_count} frames, " f"segments incomplete"
+                )
+        finally:
+            self._finisher.shutdown()
+        return [segment.path for segment in self.segments]
+
+    def cancel(self) -> None:
+        """Stop the segment being encoded; complete segments are kept."""
+        if self._current is not None and self._current_segment is not None:
+            self._current.cancel()
+            self._current_segment.partial_path.unlink(missing_ok=True)
+            self._current = self._current_segment = None
+        # Segments complets en cours de finalisation : conservés pour la reprise
+        self._finisher.shutdown(wait=True)
+        for future in self._finishing:
+            if future.exception() is not None:
+                logging.warning(f"[Segment Cache] Segment not kept: {future.exception()}")
+
+    @property
+    def frame_count(self) -> int:
+        """Get the number of frames written."""
+        return self._frame_count
+
+    def _encoder(self) -> FFmpegEncoder:
+        """Get the current segment's encoder, starting the next segment if needed."""
+        if self._current is None:
+            if self._next_segment >= len(self.segments):
+                raise RuntimeError("Every segment has been written")
+            segment = self.segments[self._next_segment]
+            self._next_segment += 1
+            encoder = self.make_encoder(segment)
+            encoder.start()
+            self._current, self._current_segment = encoder, segment
+            self._written_in_segment = 0
+        return self._current
+
+    def _finish_current(self) -> None:
+        assert self._current is not None and self._current_segment is not None
+        encoder, segment = self._current, self._current_segment
+        self._current = self._current_segment = None
+        self._finishing.append(self._finisher.submit(_finish_segment, encoder, segment))
+
+    def _recycle(
+        self, frame: NDArray[np.uint8], on_written: Callable[[], None] | None
+    ) -> Callable[[], None]:
+        def written() -> None:
+            if on_written is not None:
+                on_written()
+            self._free_buffers.append(frame)
+
+        return written
+
+    def _raise_if_failed(self) -> None:
+        for future in self._finishing:
+            if future.done() and future.exception() is not None:
+                future.result()
+
+
+def _directory_size(directory: Path) -> int:
+    """Total size in bytes of the files of a segment directory."""
+    size = 0
+    for path in directory.iterdir():
+        try:
+            size += path.stat().st_size
+        except OSError:
+            # Fichier supprimé entre-temps (autre export)
+            continue
+    return size
+
+
+def _finish_segment(encoder: FFmpegEncoder, segment: Segment) -> None:
+    """Finalize a segment's encoder, then give the file its final name."""
+    start = time.perf_counter()
+    encoder.finish()
+    # Nom définitif seulement une fois complet : une reprise ne lit jamais un
+    # segment tronqué
+    os.replace(segment.partial_path, segment.path)
+    logging.info(
+        "[Segment Cache] Segment %d (frames %d-%d) complete, finalized in %.2f s",
+        segment.index,
+        segment.start,
+        segment.end - 1,
+        time.perf_counter() - start,
+    )
@@ -8,18 +8,22 @@ from typing import TYPE_CHECKING, Any
 import numpy as np
 import pyqtgraph as pg
 from PySide6.QtCore import QThread, Signal
-from PySide6.QtWidgets import QVBoxLayout, QWidget
+from PySide6.QtWidgets import QGraphicsItem, QVBoxLayout, QWidget
 
 from jukebox.core.constants import (
     AUDIO_HOP_LENGTH,
     AUDIO_SAMPLE_RATE_LOW,
-    FREQ_BASS_HIGH,
-    FREQ_MID_HIGH,
     VLC_SEEK_DELAY_MS,
     WORKER_WAIT_TIMEOUT_MS,
 )
 from jukebox.core.event_bus import Events
 from jukebox.core.settings_sync_mixin import SettingsSyncMixin, SyncedSetting
+from jukebox.utils.waveform_serializer import (
+    BANDS,
+    WaveformPyramid,
+    read_waveform_pyramid,
+    serialize_waveform,
+)
 
 if TYPE_CHECKING:
     from jukebox.core.protocols import PluginContextProtocol, UIBuilderProtocol
@@ -43,6 +47,7 @@ class WaveformVisualizerPlugin(SettingsSyncMixin):
         self.current_track_id: int | None = None  # Currently displayed track
         self._current_track_filepath: str | None = None  # Filepath of displayed track
         self._single_worker: QThread | None = None  # For single waveform regeneration
+        self._migration_worker: WaveformCacheMigrationWorker | None = None
 
     def initialize(self, context: PluginContextProtocol) -> None:
         """Initialize plugin."""
@@ -64,6 +69,14 @@ class WaveformVisualizerPlugin(SettingsSyncMixin):
         from PySide6.QtCore import QTimer
 
         QTimer.singleShot(1000, self._start_batch_waveform)
+        QTimer.singleShot(1000, self._start_cache_migration)
+
+    def _start_cache_migration(self) -> None:
+        """Convert legacy npz rows of waveform_cache to the pyramid format in background."""
+        if self._migration_worker is not None:
+            return
+        self._migration_worker = WaveformCacheMigrationWorker(self.context.database.db_path)
+        self._migration_worker.start()
 
     def _on_tracks_added(self) -> None:
         """Auto-generate missing waveforms when tracks are added."""
@@ -158,11 +171,9 @@ class WaveformVisualizerPlugin(SettingsSyncMixin):
         cached_data = self.context.database.waveforms.get(track_id)
 
         if cached_data:
-            from jukebox.utils.waveform_serializer import deserialize_waveform
-
             try:
-                waveform = deserialize_waveform(cached_data)
-                self.waveform_widget.display_waveform(waveform)
+                # Niveaux de la pyramide lus directement, sans décoder la pleine résolution
+                self.waveform_widget.display_waveform(read_waveform_pyramid(cached_data))
             except Exception as e:
                 logging.warning("[WaveformVisualizer] Cache corrompu, effacement : %s", e)
                 self.context.database.waveforms.delete(track_id)
@@ -272,13 +283,14 @@ class WaveformVisualizerPlugin(SettingsSyncMixin):
             on_complete=self._on_batch_waveform_complete,
             on_error=self._on_batch_waveform_error,
             no_work_message="All waveforms generated",
+            max_concurrency=self.context.config.batch_processing.waveform_workers,
         )
 
     def _on_waveform_progress(self, track_id: int, partial_waveform: dict[str, Any]) -> None:
-        """Handle progressive waveform updates during generation."""
+        """Handle progressive waveform updates (new frames only) during generation."""
         # Only display if this is the currently displayed track
         if track_id == self.current_track_id and self.waveform_widget:
-            self.waveform_widget.display_waveform(partial_waveform)
+            self.waveform_widget.apply_waveform_delta(partial_waveform)
 
     def _on_batch_waveform_complete(self, item: tuple[int, str], result: dict[str, Any]) -> None:
         """Handle single waveform completion in batch."""
@@ -288,8 +300,6 @@ class WaveformVisualizerPlugin(SettingsSyncMixin):
         try:
             import os
 
-            from jukebox.utils.waveform_serializer import serialize_waveform
-
             # Cache waveform
             waveform_bytes = serialize_waveform(result["waveform_data"])
             self.context.database.waveforms.save(track_id, waveform_bytes)
@@ -308,7 +318,7 @@ class WaveformVisualizerPlugin(SettingsSyncMixin):
 
             # If this is the currently displayed track, show the waveform
             if track_id == self.current_track_id and self.waveform_widget:
-                self.waveform_widget.display_waveform(result["waveform_data"])
+                self.waveform_widget.display_waveform(read_waveform_pyramid(waveform_bytes))
                 logging.debug("[Waveform] Displayed waveform for current track %s", track_id)
 
             # Emit event to notify waveform complete
@@ -347,6 +357,11 @@ class WaveformVisualizerPlugin(SettingsSyncMixin):
 
     def shutdown(self) -> None:
         """Cleanup on application exit."""
+        if self._migration_worker is not None:
+            self._migration_worker.requestInterruption()
+            self._migration_worker.wait(WORKER_WAIT_TIMEOUT_MS)
+            self._migration_worker = None
+
         # Stop single worker if running
         if self._single_worker is not None and self._single_worker.isRunning():
             self._single_worker.requestInterruption()
@@ -411,22 +426,58 @@ class WaveformVisualizerPlugin(SettingsSyncMixin):
         }
 
 
+def _reduce_columns(frames: np.ndarray, factor: int) -> np.ndarray:
+    """Max of each group of ``factor`` frames of a (3, frames) array (last group padded)."""
+    remainder = frames.shape[1] % factor
+    if remainder:
+        # Enveloppes positives : compléter par des zéros ne change pas le max
+        frames = np.pad(frames, ((0, 0), (0, factor - remainder)))
+    columns: np.ndarray = frames.reshape(3, -1, factor).max(axis=2)
+    return columns
+
+
 class WaveformWidget(QWidget):
-    """Interactive waveform widget with playback cursor."""
+    """Interactive waveform widget with playback cursor.
+
+    The three filled curves are created once and fed from the stored waveform
+    pyramid (WaveformPyramid): only the visible columns of the coarsest level
+    that still has a column per pixel are read, then stacked. During
+    progressive generation the received frames are reduced to that level as
+    they arrive. The curves are cached as pixmaps, so moving the playback
+    cursor does not repaint them.
+    """
 
     position_clicked = Signal(float)  # 0.0-1.0
 
     def __init__(self, waveform_config: Any = None) -> None:
         """Initialize widget."""
         super().__init__()
-        self.waveform_data: np.ndarray | None = None
         self.expected_length: int = (
             0  # Expected total length (for stable cursor during progressive display)
         )
         self.cursor_line: Any = None
         self.waveform_config = waveform_config
+        self._pyramid: WaveformPyramid | None = None
+        # Trames brutes (bass, mid, treble) reçues pendant la génération progressive,
+        # leur max par bande et les colonnes du niveau affiché : (niveau, (3, colonnes))
+        self._partial: np.ndarray | None = None
+        self._partial_max = np.zeros((3, 1), dtype=np.float32)
+        self._partial_level: tuple[int, np.ndarray] | None = None
+        # Plage visible en trames (None = toute la waveform)
+        self._view: tuple[float, float] | None = None
+        self._rendered: tuple[int, int, int] | None = None  # (level, first, last column)
         self._init_ui(waveform_config)
 
+    @property
+    def waveform_data(self) -> np.ndarray | None:
+        """Normalized full-resolution bass envelope (None without waveform)."""
+        if self._pyramid is not None:
+            return self._pyramid.peaks(0)["bass"]
+        if self._partial is not None:
+            bass: np.ndarray = self._normalized(self._partial)[0]
+            return bass
+        return None
+
     def _init_ui(self, waveform_config: Any = None) -> None:
         """Initialize UI."""
         layout = QVBoxLayout()
@@ -459,82 +510,194 @@ class WaveformWidget(QWidget):
         # Store config for rendering
         self.waveform_config = waveform_config
 
+        # Get colors from config
+        bass_color = waveform_config.bass_color if waveform_config else "#0066FF"
+        mid_color = waveform_config.mid_color if waveform_config else "#00FF00"
+        treble_color = waveform_config.treble_color if waveform_config else "#FFFFFF"
+
+        # Treble on top (white) drawn first as background, bass drawn last
+        self._curves = []
+        for color in (treble_color, mid_color, bass_color):
+            curve = pg.PlotDataItem(pen=None, fillLevel=0, brush=pg.mkBrush(color + "FF"))
+            # Rendu en pixmap : déplacer le curseur ne redessine pas les remplissages
+            curve.curve.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+            self._curves.append(curve)
+
         # Create cursor line immediately at position 0
         cursor_color = waveform_config.cursor_color if waveform_config else "#FFFFFF"
         self.cursor_line = pg.InfiniteLine(pos=0, angle=90, pen=pg.mkPen(cursor_color, width=2))
-        self.plot_widget.addItem(self.cursor_line)
+        self._add_items()
 
         # Set initial viewport range with no padding
         self.plot_widget.setXRange(0, 100, padding=0)  # type: ignore[call-arg]
         self.plot_widget.setYRange(0, 1, padding=0)  # type: ignore[call-arg]
 
-    def display_waveform(self, waveform: Any) -> None:
-        """Display waveform data with 3 colors stacked (Engine DJ style)."""
-        # waveform is a dict with bass, mid, treble arrays
-        if isinstance(waveform, dict):
-            bass = waveform.get("bass", np.array([]))
-            mid = waveform.get("mid", np.array([]))
-            treble = waveform.get("treble", np.array([]))
-            self.waveform_data = bass  # Use bass for length reference
-        else:
-            # Fallback: single waveform
-            self.waveform_data = waveform
-            bass = mid = treble = waveform / 3
+    def _add_items(self) -> None:
+        for curve in self._curves:
+            self.plot_widget.addItem(curve)
+        self.plot_widget.addItem(self.cursor_line)
 
-        self.plot_widget.clear()
+    def display_waveform(self, waveform: Any) -> None:
+        """Display waveform data with 3 colors stacked (Engine DJ style).
 
-        # Stack 3 bands vertically (Engine DJ style) - cumulative stacking
-        if len(bass) > 0 and len(mid) > 0 and len(treble) > 0:
-            # Update expected length (for stable cursor positioning)
-            # This is the full length, even for partial waveforms (padded with zeros)
-            self.expected_length = len(bass)
+        Args:
+            waveform: WaveformPyramid or serialized waveform as stored in the
+                database; a dict of bass/mid/treble arrays (or a single array)
+                is converted to the same pyramid
 
-            x = np.arange(len(bass))
+        Other plot items (cue maker highlight region...) are kept.
+        """
+        if isinstance(waveform, bytes):
+            waveform = read_waveform_pyramid(waveform)
+        elif not isinstance(waveform, WaveformPyramid):
+            if not isinstance(waveform, dict):
+                # Fallback: single waveform
+                waveform = dict.fromkeys(BANDS, np.asarray(waveform) / 3)
+            if all(np.size(waveform.get(band, ())) > 0 for band in BANDS):
+                waveform = read_waveform_pyramid(serialize_waveform(waveform))
+            else:
+                waveform = None
+
+        self._partial = None
+        self._partial_level = None
+        self._pyramid = waveform if waveform is not None and waveform.length > 0 else None
+        # Longueur complète, pour un curseur stable
+        self.expected_length = self._pyramid.length if self._pyramid is not None else 0
+        if self._pyramid is not None:
+            # Niveau le plus grossier : chaque colonne majore les trames qu'elle couvre
+            coarsest = self._pyramid.num_levels - 1
+            self._set_y_range(self._columns(coarsest, 0, self._pyramid.level_length(coarsest)))
+        self._rendered = None
+        self._render()
+
+    def set_view_range(self, start: float | None = None, end: float | None = None) -> None:
+        """Show frames ``start..end`` (zoom/scroll); no argument shows the whole waveform."""
+        if start is None or end is None or end <= start:
+            self._view = None
+        else:
+            self._view = (max(float(start), 0.0), float(end))
+        self._render()
+
+    def _set_y_range(self, columns: np.ndarray) -> None:
+        # Garde : max nul → setYRange(0, 0) crashe pyqtgraph
+        max_total = float(columns.sum(axis=0).max(initial=0.0))
+        if max_total <= 0.0:
+            max_total = 1.0
+        self.plot_widget.setYRange(0, max_total * 1.05, padding=0)  # type: ignore[call-arg]
+
+    def _normalized(self, frames: np.ndarray) -> np.ndarray:
+        """Partial frames or columns divided by each band's maximum so far."""
+        normalized = np.zeros(frames.shape, dtype=np.float32)
+        np.divide(frames, self._partial_max, out=normalized, where=self._partial_max > 0)
+        return normalized
+
+    def _columns(self, level: int, first: int, last: int) -> np.ndarray:
+        """Per-band maxima of columns ``first:last`` of a level, shape (3, columns)."""
+        if self._pyramid is not None:
+            peaks = self._pyramid.peaks(level, first, last)
+            columns = np.zeros((3, last - first), dtype=np.float32)
+            for i, band in enumerate(BANDS):
+                if len(peaks[band]):
+                    columns[i] = peaks[band]
+            return columns
+        assert self._partial is not None
+        if self._partial_level is None or self._partial_level[0] != level:
+            self._partial_level = (level, _reduce_columns(self._partial, 1 << level))
+        return self._normalized(self._partial_level[1][:, first:last])
+
+    def _num_levels(self) -> int:
+        if self._pyramid is not None:
+            return self._pyramid.num_levels
+        return max(self.expected_length.bit_length(), 1)
+
+    def _render(self) -> None:
+        """Feed the curves with the visible columns of the matching pyramid level."""
+        if self.expected_length <= 0:
+            for curve in self._curves:
+                curve.setData([], [])
+            self._rendered = None
+            return
 
-            # Get colors from config
-            bass_color = self.waveform_config.bass_color if self.waveform_config else "#0066FF"
-            mid_color = self.waveform_config.mid_color if self.waveform_config else "#00FF00"
-            treble_color = self.waveform_config.treble_color if self.waveform_config else "#FFFFFF"
+        start, end = self._view or (0.0, float(self.expected_length))
+        self.plot_widget.setXRange(start, end, padding=0)  # type: ignore[call-arg]
+        pixels = max(int(self.plot_widget.plotItem.vb.width()), 1)  # type: ignore[attr-defined]
+        # Niveau le plus grossier ayant encore au moins une colonne par pixel
+        level = int(np.clip(np.floor(np.log2(max((end - start) / pixels, 1.0))), 0, None))
+        level = min(level, self._num_levels() - 1)
+        factor = 1 << level
+        first = max(int(start // factor) - 1, 0)
+        last = min(int(np.ceil(end / factor)) + 1, -(-self.expected_length // factor))
+        if (level, first, last) == self._rendered:
+            return
+        self._rendered = (level, first, last)
 
-            # Treble on top (white) - draw first as background
-            treble_total = bass + mid + treble
-            self.plot_widget.plot(
-                x, treble_total, pen=None, fillLevel=0, brush=pg.mkBrush(treble_color + "FF")
-            )
+        # Courbes cumulées : bass, bass+mid, bass+mid+treble
+        stacked = np.cumsum(self._columns(level, first, last), axis=0)
+        # Colonne i du niveau : trames i*factor .. (i+1)*factor - 1, tracée en son centre
+        x = np.arange(first, last, dtype=np.float64) * factor + (factor - 1) / 2
+        for curve, values in zip(self._curves, stacked[::-1], strict=True):
+            curve.setData(x, values)
 
-            # Mid in middle (green) - covers bass+mid
-            mid_total = bass + mid
-            self.plot_widget.plot(
-                x, mid_total, pen=None, fillLevel=0, brush=pg.mkBrush(mid_color + "FF")
-            )
+    def resizeEvent(self, event: Any) -> None:  # noqa: N802 - Qt override
+        """Pick the pyramid level for the new width."""
+        super().resizeEvent(event)
+        self._rendered = None
+        self._render()
 
-            # Bass at bottom (blue) - drawn last, on top visually
-            self.plot_widget.plot(
-                x, bass, pen=None, fillLevel=0, brush=pg.mkBrush(bass_color + "FF")
-            )
+    def apply_waveform_delta(self, delta: dict[str, Any]) -> None:
+        """Add frames from CompleteWaveformWorker.progress_update and redraw.
 
-            # Set range to fit data exactly
-            self.plot_widget.setXRange(0, len(bass), padding=0)  # type: ignore[call-arg]
-            # Garde : array vide → ValueError ; max nul → setYRange(0, 0) crashe pyqtgraph
-            max_total = float(np.max(treble_total)) if len(treble_total) > 0 else 0.0
-            if max_total <= 0.0:
-                max_total = 1.0
-            self.plot_widget.setYRange(0, max_total * 1.05, padding=0)  # type: ignore[call-arg]
+        Only the columns of the displayed level covering the new frames are
+        updated; the normalization by each band's maximum is applied when drawing.
 
-        # Re-add cursor line after clear (cleared removes it)
-        if self.cursor_line:
-            self.plot_widget.addItem(self.cursor_line)
-            # Don't reset position - keep current position stable
+        Args:
+            delta: start, length (expected total frames) and the raw bass/mid/treble
+                peaks of frames start..start + n; start == 0 begins a new waveform
+        """
+        start = int(delta["start"])
+        bands = np.stack([delta["bass"], delta["mid"], delta["treble"]]).astype(np.float32)
+        end = start + bands.shape[1]
+        length = max(int(delta["length"]), end)
+        if start == 0 or self._partial is None:
+            self._partial = np.zeros((3, length), dtype=np.float32)
+            self._partial_max = np.zeros((3, 1), dtype=np.float32)
+            self._partial_level = None
+            self._pyramid = None
+        elif self._partial.shape[1] < length:
+            # Estimation de durée de l'en-tête trop courte
+            grown = np.zeros((3, length), dtype=np.float32)
+            grown[:, : self._partial.shape[1]] = self._partial
+            self._partial = grown
+            self._partial_level = None
+        self._partial[:, start:end] = bands
+        if bands.shape[1]:
+            np.maximum(self._partial_max, bands.max(axis=1, keepdims=True), out=self._partial_max)
+
+        if self._partial_level is not None:
+            level, columns = self._partial_level
+            factor = 1 << level
+            first, last = start // factor, -(-end // factor)
+            columns[:, first:last] = _reduce_columns(
+                self._partial[:, first * factor : last * factor], factor
+            )
+        self.expected_length = length
+        self._rendered = None
+        self._render()
+        if self._partial_level is not None:
+            self._set_y_range(self._normalized(self._partial_level[1]))
 
     def clear_waveform(self) -> None:
-        """Clear waveform display."""
+        """Clear waveform display (and every other plot item)."""
         self.plot_widget.clear()
-        self.waveform_data = None
+        self._pyramid = None
+        self._partial = None
+        self._partial_level = None
         self.expected_length = 0
-        # Re-add cursor line after clear
-        if self.cursor_line:
-            self.plot_widget.addItem(self.cursor_line)
-            self.cursor_line.setPos(0)
+        self._view = None
+        # Re-add curves and cursor line after clear
+        self._add_items()
+        self.cursor_line.setPos(0)
+        self._render()
 
     def set_position(self, position: float) -> None:
         """Set playback position (0.0-1.0)."""
@@ -551,12 +714,9 @@ class WaveformWidget(QWidget):
 
     def _on_click(self, event: Any) -> None:
         """Handle click on waveform."""
-        if self.waveform_data is None:
-            return
-
         # Garde contre une waveform vide pour éviter une division par zéro
-        waveform_length = len(self.waveform_data)
-        if waveform_length == 0:
+        waveform_length = self.expected_length
+        if waveform_length <= 0:
             return
 
         # Get click position
@@ -607,155 +767,35 @@ class CompleteWaveformWorker(QThread):
                 self.error.emit(f"File not found: {filename}")
                 return
 
-            import librosa
-            from scipy import signal
-
-            # Get audio duration
-            duration = librosa.get_duration(path=self.filepath)
-
-            if duration < 0.1:
-                self.error.emit(f"Track too short or empty: {duration}s")
-                return
+            from jukebox.utils.audio_cache import stream_audio
+            from jukebox.utils.waveform_stream import BandWaveformBuilder
 
             # Parameters
             sr = AUDIO_SAMPLE_RATE_LOW
             hop = AUDIO_HOP_LENGTH
 
-            # Pre-calculate filter coefficients
-            sos_bass = signal.butter(4, FREQ_BASS_HIGH, "lp", fs=sr, output="sos")
-            sos_mid = signal.butter(
-                4, [FREQ_BASS_HIGH, FREQ_MID_HIGH], "bandpass", fs=sr, output="sos"
-            )
-            sos_treble = signal.butter(4, FREQ_MID_HIGH, "hp", fs=sr, output="sos")
-
-            # Pre-allocate arrays
-            total_samples = int(duration * sr)
-            expected_length = max((total_samples // hop) + 1, 1)
-
-            full_bass = np.zeros(expected_length)
-            full_mid = np.zeros(expected_length)
-            full_treble = np.zeros(expected_length)
-
-            write_index = 0
-            offset = 0.0
-
-            # Process all chunks
-            while offset < duration and not self.isInterruptionRequested():
-                actual_chunk_duration = min(self.chunk_duration, duration - offset)
-
-                # Load chunk
-                y, _ = librosa.load(
-                    self.filepath, sr=sr, mono=True, offset=offset, duration=actual_chunk_duration
-                )
-
-                if len(y) == 0:
-                    break
-
-                # Separate frequency bands
-                bass = signal.sosfilt(sos_bass, y)
-                mid = signal.sosfilt(sos_mid, y)
-                treble = signal.sosfilt(sos_treble, y)
-
-                # Downsample
-                bass_chunk = np.abs(bass[::hop])
-                mid_chunk = np.abs(mid[::hop])
-                treble_chunk = np.abs(treble[::hop])
-
-                # Write to arrays
-                chunk_len = len(bass_chunk)
-                end_index = min(write_index + chunk_len, expected_length)
-                actual_len = end_index - write_index
-
-                full_bass[write_index:end_index] = bass_chunk[:actual_len]
-                full_mid[write_index:end_index] = mid_chunk[:actual_len]
-                full_treble[write_index:end_index] = treble_chunk[:actual_len]
-
-                write_index = end_index
-                offset += self.chunk_duration
-
-                # Emit progressive update after each chunk
-                if write_index > 0:
-                    # Create partial normalized waveforms for display
-                    bass_partial = full_bass[:write_index]
-                    mid_partial = full_mid[:write_index]
-                    treble_partial = full_treble[:write_index]
-
-                    # Normalize
-                    bass_norm = (
-                        bass_partial / np.max(bass_partial)
-                        if np.max(bass_partial) > 0
-                        else bass_partial
-                    )
-                    mid_norm = (
-                        mid_partial / np.max(mid_partial)
-                        if np.max(mid_partial) > 0
-                        else mid_partial
-                    )
-                    treble_norm = (
-                        treble_partial / np.max(treble_partial)
-                        if np.max(treble_partial) > 0
-                        else treble_partial
-                    )
-
-                    # Pad to expected length for stable display
-                    bass_display = np.zeros(expected_length)
-                    mid_display = np.zeros(expected_length)
-                    treble_display = np.zeros(expected_length)
-
-                    bass_display[:write_index] = bass_norm
-                    mid_display[:write_index] = mid_norm
-                    treble_display[:write_index] = treble_norm
-
-                    partial_waveform = {
-                        "bass": bass_display,
-                        "mid": mid_display,
-                        "treble": treble_display,
-                    }
-
-                    # Emit progress update
-                    self.progress_update.emit(self.track_id, partial_waveform)
-
-            # Trim to actual length
-            full_bass = full_bass[:write_index]
-            full_mid = full_mid[:write_index]
-            full_treble = full_treble[:write_index]
-
-            if write_index == 0:
-                self.error.emit("No waveform data generated")
+            # Un seul décodage, bloc par bloc (tableau du cache s'il y est déjà)
+            total_samples, blocks = stream_audio(self.filepath, sr, self.chunk_duration)
+            expected_length = max(-(-total_samples // hop), 1)
+            builder = BandWaveformBuilder(sr, hop)
+
+            for block in blocks:
+                if self.isInterruptionRequested():
+                    return
+                delta = builder.feed(block)
+                if delta is not None:
+                    # Seules les nouvelles trames (brutes) : le widget les normalise
+                    self.progress_update.emit(self.track_id, delta.as_dict(expected_length))
+            delta = builder.finish()
+            if delta is not None:
+                self.progress_update.emit(self.track_id, delta.as_dict(expected_length))
+
+            duration = builder.samples / sr
+            if duration < 0.1:
+                self.error.emit(f"Track too short or empty: {duration}s")
                 return
 
-            # Calculate analysis metrics
-            bass_energy = float(np.mean(full_bass))
-            mid_energy = float(np.mean(full_mid))
-            treble_energy = float(np.mean(full_treble))
-            energy = bass_energy + mid_energy + treble_energy
-            dynamic_range = float(
-                20 * np.log10(np.max(full_bass + full_mid + full_treble) + 1e-10)
-                - 20 * np.log10(np.mean(full_bass + full_mid + full_treble) + 1e-10)
-            )
-
-            # Normalize
-            bass_wave = full_bass / np.max(full_bass) if np.max(full_bass) > 0 else full_bass
-            mid_wave = full_mid / np.max(full_mid) if np.max(full_mid) > 0 else full_mid
-            treble_wave = (
-                full_treble / np.max(full_treble) if np.max(full_treble) > 0 else full_treble
-            )
-
-            # Emit result
-            result = {
-                "waveform_data": {
-                    "bass": bass_wave,
-                    "mid": mid_wave,
-                    "treble": treble_wave,
-                },
-                "duration": duration,
-                "energy": energy,
-                "bass_energy": bass_energy,
-                "mid_energy": mid_energy,
-                "treble_energy": treble_energy,
-                "dynamic_range": dynamic_range,
-            }
-
+            result = builder.result()
             self.complete.emit(result)
 
         except Exception as e:
@@ -766,3 +806,72 @@ class CompleteWaveformWorker(QThread):
             # exc_info=True journalise déjà la stack trace complète
             logging.error("[WaveformWorker] %s", error_msg, exc_info=True)
             self.error.emit(error_msg)
+
+
+class WaveformCacheMigrationWorker(QThread):
+    """Rewrite legacy npz waveform_cache rows in the pyramid format.
+
+    Runs on its own SQLite connection, one small transaction per batch so the
+    UI thread is never blocked for long. A row rewritten meanwhile (waveform
+    regenerated) is left untouched thanks to the guarded UPDATE.
+    """
+
+    finished_migration = Signal(int)  # number of rows converted
+
+    BATCH_SIZE = 200
+
+    def __init__(self, db_path: Any, parent: Any = None) -> None:
+        super().__init__(parent)
+        self._db_path = db_path
+        self.converted = 0
+        self.setObjectName("WaveformCacheMigration")
+
+    def run(self) -> None:
+        """Convert every legacy row, batch by batch."""
+        import sqlite3
+        from pathlib import Path
+
+        from jukebox.utils.waveform_serializer import upgrade_waveform
+
+        try:
+            # mode=rw : ne jamais créer de base vide si le fichier n'existe pas
+            uri = Path(self._db_path).resolve().as_uri() + "?mode=rw"
+            conn = sqlite3.connect(uri, uri=True)
+        except (TypeError, sqlite3.Error) as e:
+            logging.error("[WaveformMigration] Connexion impossible : %s", e)
+            return
+        last_id = -1
+        try:
+            while not self.isInterruptionRequested():
+                rows = conn.execute(
+                    "SELECT track_id, waveform_data FROM waveform_cache "
+                    "WHERE track_id > ? AND substr(waveform_data, 1, 4) = ? "
+                    "ORDER BY track_id LIMIT ?",
+                    (last_id, b"PK\x03\x04", self.BATCH_SIZE),
+                ).fetchall()
+                if not rows:
+                    break
+                updates = []
+                for track_id, data in rows:
+                    try:
+                        upgraded = upgrade_waveform(data)
+                    except ValueError as e:
+                        logging.warning("[WaveformMigration] Track %s ignoré : %s", track_id, e)
+                        continue
+                    if upgraded is not None:
+                        updates.append((upgraded, track_id, data))
+                with conn:
+                    cursor = conn.executemany(
+                        "UPDATE waveform_cache SET waveform_data = ? "
+                        "WHERE track_id = ? AND waveform_data = ?",
+                        updates,
+                    )
+                self.converted += max(cursor.rowcount, 0)
+                last_id = rows[-1][0]
+        except sqlite3.Error as e:
+            logging.error("[WaveformMigration] Erreur : %s", e, exc_info=True)
+        finally:
+            conn.close()
+        if self.converted:
+            logging.info("[WaveformMigration] %d waveforms converted", self.converted)
+        self.finished_migration.emit(self.converted)
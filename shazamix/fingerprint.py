@@ -8,11 +8,22 @@ This implementation uses:
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 
 import numpy as np
 
+AudioLoader = Callable[[str, int], tuple[np.ndarray, int]]
+"""Decode a file to mono float32 at a sample rate: (path, sr) -> (samples, sr)."""
+
+
+def librosa_load(audio_path: str, sr: int) -> tuple[np.ndarray, int]:
+    """Default AudioLoader: decode with librosa."""
+    import librosa
+
+    y, _ = librosa.load(audio_path, sr=sr, mono=True)
+    return y, sr
+
 
 @dataclass(frozen=True, slots=True)
 class Fingerprint:
@@ -67,6 +78,7 @@ class Fingerprinter:
         ),  # (time, freq) neighborhood - larger = fewer peaks
         target_zone: tuple[int, int, int, int] = (2, 30, -8, 8),  # (t_min, t_max, f_min, f_max)
         fan_out: int = 3,  # Max targets per anchor - reduced for more selective fingerprints
+        load_audio: AudioLoader | None = None,
     ):
         """Initialize fingerprinter.
 
@@ -79,8 +91,11 @@ class Fingerprinter:
             target_zone: Zone to search for target peaks relative to anchor
                         (t_min, t_max, f_min, f_max) in frames/bins
             fan_out: Maximum number of target peaks per anchor
+            load_audio: Decoder used for audio files (librosa if None); an
+                application can pass a caching decoder shared with other workers
         """
         self.sample_rate = sample_rate
+        self.load_audio: AudioLoader = load_audio or librosa_load
         self.hop_length = hop_length
         self.n_bins = n_bins
         self.bins_per_octave = bins_per_octave
@@ -100,10 +115,7 @@ class Fingerprinter:
         Returns:
             List of fingerprints
         """
-        import librosa
-
-        # Load audio
-        y, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
+        y, sr = self.load_audio(audio_path, self.sample_rate)
 
         if len(y) == 0:
             return []
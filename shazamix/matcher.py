@@ -498,7 +498,7 @@ class Matcher:
                 continue
 
             try:
-                y_ref, _ = librosa.load(filepath, sr=sr, mono=True)
+                y_ref, _ = self.fingerprinter.load_audio(filepath, sr)
                 if len(y_ref) == 0:
                     continue
 
@@ -740,7 +740,7 @@ class Matcher:
                 continue
 
             try:
-                y_ref, _ = librosa.load(filepath, sr=sr, mono=True)
+                y_ref, _ = self.fingerprinter.load_audio(filepath, sr)
                 if len(y_ref) == 0:
                     continue
 
@@ -0,0 +1,243 @@
+"""Tests for the concurrent batch processor."""
+
+import sys
+import threading
+import time
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from PySide6.QtCore import QThread, Signal
+
+from jukebox.core.batch_processor import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    BatchProcessor,
+    BatchQueue,
+    _format_duration,
+)
+
+
+def square_item(item: tuple[int, str]) -> int:
+    """Top-level (picklable) process function."""
+    if item[0] < 0:
+        raise ValueError(f"Skipping {item[1]}: negative id")
+    return item[0] * item[0]
+
+
+class FakeWorker(QThread):
+    """Worker sleeping a little, tracking how many run at the same time."""
+
+    complete = Signal(object)
+    error = Signal(str)
+
+    running = 0
+    max_running = 0
+    _lock = threading.Lock()
+
+    def __init__(self, item: tuple[int, str], delay: float = 0.05) -> None:
+        super().__init__()
+        self.item = item
+        self.delay = delay
+
+    def run(self) -> None:
+        with FakeWorker._lock:
+            FakeWorker.running += 1
+            FakeWorker.max_running = max(FakeWorker.max_running, FakeWorker.running)
+        time.sleep(self.delay)
+        with FakeWorker._lock:
+            FakeWorker.running -= 1
+        if self.item[1] == "bad":
+            self.error.emit("Error: bad item")
+        else:
+            self.complete.emit(self.item[0])
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_worker() -> None:
+    FakeWorker.running = 0
+    FakeWorker.max_running = 0
+
+
+def _processor(**kwargs: Any) -> BatchProcessor:
+    kwargs.setdefault("worker_factory", FakeWorker)
+    return BatchProcessor(name="Test", context=Mock(), key_fn=lambda item: item[0], **kwargs)
+
+
+class TestBatchQueue:
+    """Tests for BatchQueue."""
+
+    def test_fifo_within_priority(self) -> None:
+        queue = BatchQueue()
+        for item in ("a", "b", "c"):
+            queue.push(item)
+
+        assert [queue.pop() for _ in range(3)] == ["a", "b", "c"]
+        assert queue.pop() is None
+
+    def test_priorities_and_front(self) -> None:
+        queue = BatchQueue()
+        queue.push("low", PRIORITY_LOW)
+        queue.push("a")
+        queue.push("b")
+        queue.push("urgent", PRIORITY_HIGH)
+        queue.push("b", front=True)  # already queued → moved before "a"
+
+        assert len(queue) == 4
+        assert [queue.pop() for _ in range(4)] == ["urgent", "b", "a", "low"]
+
+    def test_reprioritize_and_cancel(self) -> None:
+        queue = BatchQueue(key_fn=lambda item: item[0])
+        queue.push((1, "a"))
+        queue.push((2, "b"))
+        queue.push((3, "c"))
+
+        assert queue.reprioritize(3, PRIORITY_HIGH)
+        assert queue.cancel(1)
+        assert not queue.cancel(1)
+        assert 1 not in queue
+
+        assert [queue.pop() for _ in range(2)] == [(3, "c"), (2, "b")]
+        assert len(queue) == 0
+
+
+class TestBatchProcessor:
+    """Tests for BatchProcessor (thread backend)."""
+
+    def test_runs_items_concurrently(self, qtbot: Any) -> None:
+        processor = _processor(max_concurrency=3)
+        results: list[Any] = []
+        processor.item_complete.connect(lambda item, result: results.append(result))
+
+        with qtbot.waitSignal(processor.finished, timeout=5000) as blocker:
+            processor.start([(i, f"track{i}") for i in range(9)])
+
+        assert blocker.args == [9]
+        assert sorted(results) == list(range(9))
+        assert 1 < FakeWorker.max_running <= 3
+        assert not processor.is_running
+
+    def test_sequential_by_default(self, qtbot: Any) -> None:
+        processor = _processor()
+
+        with qtbot.waitSignal(processor.finished, timeout=5000):
+            processor.start([(i, "t") for i in range(3)])
+
+        assert FakeWorker.max_running == 1
+
+    def test_errors_counted_and_reported(self, qtbot: Any) -> None:
+        processor = _processor(max_concurrency=2)
+        errors: list[Any] = []
+        processor.item_error.connect(lambda item, message: errors.append(item))
+
+        with qtbot.waitSignal(processor.finished, timeout=5000) as blocker:
+            processor.start([(1, "ok"), (2, "bad"), (3, "ok")])
+
+        assert blocker.args == [2]
+        assert errors == [(2, "bad")]
+
+    def test_failing_submits_do_not_recurse(self, qtbot: Any) -> None:
+        def broken_factory(item: tuple[int, str]) -> FakeWorker:
+            raise RuntimeError("pool broken")
+
+        processor = _processor(worker_factory=broken_factory, max_concurrency=4)
+        errors: list[Any] = []
+        processor.item_error.connect(lambda item, message: errors.append(item))
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(200)
+        try:
+            with qtbot.waitSignal(processor.finished, timeout=5000) as blocker:
+                processor.start([(i, "x") for i in range(1000)])
+        finally:
+            sys.setrecursionlimit(limit)
+
+        assert blocker.args == [0]
+        assert len(errors) == 1000
+        assert not processor.active
+
+    def test_priority_item_processed_next(self, qtbot: Any) -> None:
+        processor = _processor()
+        order: list[int] = []
+        processor.item_complete.connect(lambda item, result: order.append(item[0]))
+
+        with qtbot.waitSignal(processor.finished, timeout=5000):
+            processor.start([(i, "t") for i in range(4)])
+            assert processor.add_priority_item((3, "t"))  # queued → moved to front
+            assert processor.add_priority_item((9, "t"))  # new item
+
+        assert order == [0, 9, 3, 1, 2]
+        assert processor.total_items == 0  # reset after finish
+
+    def test_priority_item_in_flight_is_skipped(self, qtbot: Any) -> None:
+        processor = _processor()
+        skipped: list[Any] = []
+        processor.item_skipped.connect(skipped.append)
+
+        with qtbot.waitSignal(processor.finished, timeout=5000):
+            processor.start([(1, "t"), (2, "t")])
+            assert not processor.add_priority_item((1, "t"))
+
+        assert skipped == [(1, "t")]
+
+    def test_cancel_queued_item(self, qtbot: Any) -> None:
+        processor = _processor()
+        done: list[int] = []
+        processor.item_complete.connect(lambda item, result: done.append(item[0]))
+
+        with qtbot.waitSignal(processor.finished, timeout=5000):
+            processor.start([(1, "t"), (2, "t"), (3, "t")])
+            assert processor.cancel(2)
+            assert processor.pending_count == 1
+
+        assert done == [1, 3]
+
+    def test_stop_clears_queue(self, qtbot: Any) -> None:
+        processor = _processor()
+        finished = Mock()
+        processor.finished.connect(finished)
+
+        processor.start([(i, "t") for i in range(5)])
+        processor.stop()
+        qtbot.wait(200)
+
+        assert not processor.is_running
+        assert processor.pending_count == 0
+        finished.assert_not_called()
+
+    def test_status_reports_throughput_and_eta(self, qtbot: Any) -> None:
+        processor = _processor(max_concurrency=2)
+
+        with qtbot.waitSignal(processor.finished, timeout=5000):
+            processor.start([(i, "t") for i in range(4)])
+
+        messages = [call.kwargs["message"] for call in processor.context.emit.call_args_list]
+        assert any("/s, ETA" in message for message in messages)
+        assert messages[-1] == "Test: Complete (4/4)"
+
+    def test_requires_a_backend(self) -> None:
+        with pytest.raises(ValueError):
+            BatchProcessor(name="Test", worker_factory=None, context=Mock())
+
+
+class TestProcessBackend:
+    """Tests for the process-pool backend."""
+
+    def test_results_delivered_on_qt_thread(self, qtbot: Any) -> None:
+        processor = _processor(worker_factory=None, process_function=square_item, max_concurrency=2)
+        results: dict[int, int] = {}
+        errors: list[str] = []
+        processor.item_complete.connect(lambda item, result: results.update({item[0]: result}))
+        processor.item_error.connect(lambda item, message: errors.append(message))
+
+        with qtbot.waitSignal(processor.finished, timeout=60000) as blocker:
+            processor.start([(2, "a"), (3, "b"), (-1, "c.mp3")])
+
+        assert blocker.args == [2]
+        assert results == {2: 4, 3: 9}
+        assert errors == ["Skipping c.mp3: negative id"]
+
+
+def test_format_duration() -> None:
+    assert _format_duration(42.4) == "42s"
+    assert _format_duration(192) == "3m 12s"
+    assert _format_duration(3900) == "1h 05m"
@@ -12,6 +12,7 @@ from jukebox.core.repositories import (
     TrackRepository,
     WaveformRepository,
 )
+from jukebox.core.settings_cache import SettingsCache
 
 
 @pytest.fixture
@@ -230,8 +231,7 @@ class TestDatabase:
         assert db.conn is not None
 
         # Create old schema without mode column
-        db.conn.execute(
-            """
+        db.conn.execute("""
             CREATE TABLE tracks (
                 id INTEGER PRIMARY KEY,
                 filepath TEXT UNIQUE NOT NULL,
@@ -239,8 +239,7 @@ class TestDatabase:
                 title TEXT,
                 date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-        """
-        )
+        """)
         db.conn.execute(
             "INSERT INTO tracks (filepath, filename, title) VALUES (?, ?, ?)",
             (str(tmp_path / "old.mp3"), "old.mp3", "Old Song"),
@@ -281,9 +280,10 @@ class TestDatabaseAdditional:
         """Test that db.analysis returns an AnalysisRepository instance."""
         assert isinstance(db.analysis, AnalysisRepository)
 
-    def test_settings_property_returns_plugin_settings_repository(self, db: Database) -> None:
-        """Test that db.settings returns a PluginSettingsRepository instance."""
-        assert isinstance(db.settings, PluginSettingsRepository)
+    def test_settings_property_returns_settings_cache(self, db: Database) -> None:
+        """Test that db.settings returns a SettingsCache over PluginSettingsRepository."""
+        assert isinstance(db.settings, SettingsCache)
+        assert isinstance(db.settings._repository, PluginSettingsRepository)
 
     # ------------------------------------------------------------------
     # Transaction context manager
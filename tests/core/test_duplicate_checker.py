@@ -21,8 +21,7 @@ def make_db(tmp_path: Path, jukebox_tracks: list[dict[str, Any]]) -> Path:
     """
     db_path = tmp_path / "test.db"
     conn = sqlite3.connect(str(db_path))
-    conn.execute(
-        """
+    conn.execute("""
         CREATE TABLE tracks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             filepath TEXT,
@@ -30,8 +29,7 @@ def make_db(tmp_path: Path, jukebox_tracks: list[dict[str, Any]]) -> Path:
             title TEXT,
             mode TEXT DEFAULT 'jukebox'
         )
-        """
-    )
+        """)
     for t in jukebox_tracks:
         conn.execute(
             "INSERT INTO tracks (filepath, artist, title, mode) VALUES (?, ?, ?, ?)",
@@ -152,28 +150,6 @@ class TestMakeDisplay:
         )
 
 
-class TestTokenize:
-    """Tests for DuplicateChecker._tokenize."""
-
-    def test_returns_words_of_min_length(self) -> None:
-        checker = DuplicateChecker.__new__(DuplicateChecker)
-        result = checker._tokenize("get lucky daft")
-        assert result == {"get", "lucky", "daft"}
-
-    def test_filters_short_words(self) -> None:
-        checker = DuplicateChecker.__new__(DuplicateChecker)
-        result = checker._tokenize("a bb ccc dddd")
-        # MIN_TOKEN_LENGTH = 3 → "a" and "bb" filtered out
-        assert "a" not in result
-        assert "bb" not in result
-        assert "ccc" in result
-        assert "dddd" in result
-
-    def test_empty_string(self) -> None:
-        checker = DuplicateChecker.__new__(DuplicateChecker)
-        assert checker._tokenize("") == set()
-
-
 # ---------------------------------------------------------------------------
 # Pass 1 — Exact (artist, title) match
 # ---------------------------------------------------------------------------
@@ -454,6 +430,124 @@ class TestIndexManagement:
         assert result.status == DuplicateStatus.GREEN
 
 
+def _set_mode(db_path: Path, filepath: str, mode: str) -> None:
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("UPDATE tracks SET mode = ? WHERE filepath = ?", (mode, filepath))
+    conn.commit()
+    conn.close()
+
+
+class TestIncrementalIndex:
+    """Tests for add/remove/update hooks and queued notifications."""
+
+    LUCKY = {"artist": "Daft Punk", "title": "Get Lucky", "filename": ""}
+
+    def test_add_and_remove_track(self, tmp_path: Path) -> None:
+        checker = make_checker(tmp_path, [])
+        checker.rebuild_index()
+
+        checker.add_track("/music/Daft Punk - Get Lucky.mp3", "Daft Punk", "Get Lucky")
+        assert checker.check(self.LUCKY).status == DuplicateStatus.RED
+        fuzzy = {"artist": "", "title": "", "filename": "daft_punk-get_lucky (edit).mp3"}
+        assert checker.check(fuzzy).status == DuplicateStatus.ORANGE
+
+        assert checker.remove_track("/music/Daft Punk - Get Lucky.mp3")
+        assert not checker.remove_track("/music/Daft Punk - Get Lucky.mp3")
+        assert checker.check(self.LUCKY).status == DuplicateStatus.GREEN
+        assert checker.check(fuzzy).status == DuplicateStatus.GREEN
+        assert checker._exact_index == {}
+        assert checker._title_index == {}
+
+    def test_add_track_replaces_previous_entry(self, tmp_path: Path) -> None:
+        checker = make_checker(tmp_path, [])
+        checker.rebuild_index()
+
+        checker.add_track("/music/a.mp3", "Daft Punk", "Get Lucky")
+        checker.add_track("/music/a.mp3", "Daft Punk", "One More Time")
+
+        assert checker.check(self.LUCKY).status == DuplicateStatus.GREEN
+        assert len(checker._exact_index) == 1
+
+    def test_duplicate_metadata_survives_partial_removal(self, tmp_path: Path) -> None:
+        checker = make_checker(
+            tmp_path,
+            [
+                {"filepath": "/music/a.mp3", "artist": "Daft Punk", "title": "Get Lucky"},
+                {"filepath": "/music/b.mp3", "artist": "Daft Punk", "title": "Get Lucky"},
+            ],
+        )
+        assert checker.check(self.LUCKY).match_info == "Daft Punk - Get Lucky\n/music/b.mp3"
+
+        checker.remove_track("/music/b.mp3")
+
+        assert checker.check(self.LUCKY).match_info == "Daft Punk - Get Lucky\n/music/a.mp3"
+
+    def test_update_track_follows_database(self, tmp_path: Path) -> None:
+        db_path = make_db(
+            tmp_path,
+            [{"filepath": "/music/a.mp3", "artist": "Daft Punk", "title": "Get Lucky"}],
+        )
+        checker = DuplicateChecker(db_path)
+        assert checker.check(self.LUCKY).status == DuplicateStatus.RED
+
+        _set_mode(db_path, "/music/a.mp3", "curating")
+        assert checker.update_track("/music/a.mp3")
+        assert checker.check(self.LUCKY).status == DuplicateStatus.GREEN
+
+        _set_mode(db_path, "/music/a.mp3", "jukebox")
+        assert checker.update_track("/music/a.mp3")
+        assert checker.check(self.LUCKY).status == DuplicateStatus.RED
+
+    def test_notifications_applied_on_next_check(self, tmp_path: Path) -> None:
+        db_path = make_db(
+            tmp_path,
+            [{"filepath": "/music/a.mp3", "artist": "Daft Punk", "title": "Get Lucky"}],
+        )
+        checker = DuplicateChecker(db_path)
+        checker.rebuild_index()
+
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("UPDATE tracks SET title = 'Lose Yourself' WHERE filepath = '/music/a.mp3'")
+        conn.commit()
+        conn.close()
+        checker.notify_track_changed(Path("/music/a.mp3"))
+
+        # Non-bloquant : rien n'est appliqué avant le prochain check() autorisé à lire la DB
+        assert checker.check(self.LUCKY, build_if_needed=False).status == DuplicateStatus.RED
+        assert checker.check(self.LUCKY).status == DuplicateStatus.GREEN
+
+        checker.notify_track_removed("/music/a.mp3")
+        lose = {"artist": "Daft Punk", "title": "Lose Yourself", "filename": ""}
+        assert checker.check(lose).status == DuplicateStatus.GREEN
+
+    def test_sync_index_diffs_database(self, tmp_path: Path) -> None:
+        db_path = make_db(
+            tmp_path,
+            [
+                {"filepath": "/music/a.mp3", "artist": "Daft Punk", "title": "Get Lucky"},
+                {"filepath": "/music/b.mp3", "artist": "Mozart", "title": "Requiem"},
+            ],
+        )
+        checker = DuplicateChecker(db_path)
+        checker.rebuild_index()
+
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("DELETE FROM tracks WHERE filepath = '/music/a.mp3'")
+        conn.execute(
+            "INSERT INTO tracks (filepath, artist, title, mode) VALUES (?, ?, ?, ?)",
+            ("/music/c.mp3", "New Artist", "New Song", "jukebox"),
+        )
+        conn.commit()
+        conn.close()
+        checker.notify_library_changed()
+
+        new = {"artist": "New Artist", "title": "New Song", "filename": ""}
+        assert checker.check(new).status == DuplicateStatus.RED
+        assert checker.check(self.LUCKY).status == DuplicateStatus.GREEN
+        assert set(checker._tracks) == {"/music/b.mp3", "/music/c.mp3"}
+        assert len(checker._fuzzy_index) == 2
+
+
 # ---------------------------------------------------------------------------
 # recheck_tracks
 # ---------------------------------------------------------------------------
@@ -1,8 +1,15 @@
 """Tests for plugin manager."""
 
+import sys
+import types
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
 
 from jukebox.core.plugin_manager import PluginContext, PluginManager
+from jukebox.core.plugin_manifest import MenuContribution, load_manifests
 
 
 class TestPluginManager:
@@ -41,3 +48,157 @@ class TestPluginManager:
         assert context.player == "player"
         assert context.config == "config"
         assert context.event_bus == "bus"
+
+
+class _LazyPlugin:
+    """Plugin of the fake ``plugins.lazy_fake`` module."""
+
+    name = "lazy_fake"
+    version = "1.0"
+    description = "Deferred test plugin"
+    modes = ["special"]
+
+    def __init__(self) -> None:
+        self.events: list[int] = []
+        self.opened = 0
+        self.active_in: list[str] = []
+
+    def initialize(self, context: Any) -> None:
+        context.subscribe("lazy_event", self._on_event)
+
+    def register_ui(self, ui_builder: Any) -> None:
+        menu = ui_builder.get_or_create_menu("&Tools")
+        ui_builder.add_menu_action(menu, "Open Fake...", self._open)
+
+    def _on_event(self, value: int) -> None:
+        self.events.append(value)
+
+    def _open(self) -> None:
+        self.opened += 1
+
+    def activate(self, mode: str) -> None:
+        self.active_in.append(mode)
+
+    def deactivate(self, mode: str) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class _EagerPlugin(_LazyPlugin):
+    name = "eager_fake"
+    modes = ["jukebox", "special"]
+
+    def register_ui(self, ui_builder: Any) -> None:
+        menu = ui_builder.get_or_create_menu("&Tools")
+        ui_builder.add_menu_action(menu, "Eager Action", self._open)
+
+
+class TestLazyLoading:
+    """Manifest-driven deferred plugins (plugins.lazy)."""
+
+    MANIFEST = """
+lazy_fake:
+  menu:
+    - {menu: "&Tools", text: "Open Fake..."}
+  modes: [special]
+  events: [lazy_event]
+"""
+
+    @pytest.fixture
+    def manager(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, qapp) -> PluginManager:  # type: ignore
+        from PySide6.QtWidgets import QMainWindow
+
+        from jukebox.core.event_bus import EventBus
+        from jukebox.ui.ui_builder import UIBuilder
+
+        plugins_dir = tmp_path / "plugins"
+        plugins_dir.mkdir()
+        (plugins_dir / "eager_fake.py").write_text("# fake")
+        (plugins_dir / "lazy_fake.py").write_text("# fake")
+        (plugins_dir / "manifest.yaml").write_text(self.MANIFEST)
+        for module_name, cls in (("eager_fake", _EagerPlugin), ("lazy_fake", _LazyPlugin)):
+            module = types.ModuleType(f"plugins.{module_name}")
+            module.Plugin = cls  # type: ignore[attr-defined]
+            monkeypatch.setitem(sys.modules, f"plugins.{module_name}", module)
+
+        config = SimpleNamespace(plugins=SimpleNamespace(enabled=None, lazy=True))
+        app = SimpleNamespace(database=None, player=None, config=config, event_bus=EventBus())
+        manager = PluginManager(plugins_dir, PluginContext(app))
+        manager.load_all_plugins(mode="jukebox")
+        self.window = QMainWindow()
+        manager.register_all_ui(UIBuilder(self.window))
+        return manager
+
+    @staticmethod
+    def _tools_actions(manager: PluginManager) -> list[str]:
+        return [
+            action.text() for action in manager.ui_builder.get_or_create_menu("&Tools").actions()
+        ]
+
+    def test_deferred_until_menu_action(self, manager: PluginManager) -> None:
+        assert "lazy_fake" not in manager.plugins
+        assert list(manager.deferred) == ["lazy_fake"]
+        before = self._tools_actions(manager)
+        assert sorted(before) == ["Eager Action", "Open Fake..."]
+
+        menu = manager.ui_builder.get_or_create_menu("&Tools")
+        index = before.index("Open Fake...")
+        menu.actions()[index].trigger()
+
+        plugin = manager.plugins["lazy_fake"]
+        assert plugin.opened == 1
+        assert not manager.deferred
+        # L'action du plugin remplace le substitut, à la même place
+        assert self._tools_actions(manager) == before
+        assert manager.timings["lazy_fake"].trigger == "menu Open Fake..."
+        menu.actions()[index].trigger()
+        assert plugin.opened == 2
+
+    def test_event_is_delivered_once_loaded(self, manager: PluginManager) -> None:
+        bus = manager.context.event_bus
+        assert bus is not None
+        before = self._tools_actions(manager)
+
+        bus.emit("lazy_event", value=1)
+        bus.emit("lazy_event", value=2)
+
+        assert manager.plugins["lazy_fake"].events == [1, 2]
+        assert self._tools_actions(manager) == before
+
+    def test_mode_trigger_loads_and_activates(self, manager: PluginManager) -> None:
+        manager.switch_mode("special")
+
+        assert manager.plugins["lazy_fake"].active_in == ["special"]
+        assert manager.timings["lazy_fake"].trigger == "mode special"
+
+    def test_timing_report(self, manager: PluginManager) -> None:
+        report = manager.timing_report()
+
+        assert "eager_fake" in report
+        assert "deferred: menu Tools > Open Fake..., mode special, event lazy_event" in report
+        manager.load_deferred()
+        assert "deferred" not in manager.timing_report()
+
+    def test_everything_loaded_when_not_lazy(self, manager: PluginManager) -> None:
+        manager.context.config.plugins.lazy = False  # type: ignore[attr-defined]
+        eager = PluginManager(manager.plugins_dir, manager.context)
+
+        assert eager.load_all_plugins(mode="jukebox") == 2
+        assert not eager.deferred
+
+
+def test_load_manifests(tmp_path: Path) -> None:
+    assert load_manifests(tmp_path) == {}
+    (tmp_path / "manifest.yaml").write_text(
+        "a:\n  menu:\n    - {menu: '&X', text: 'Go', shortcut: 'Ctrl+G'}\nb:\n"
+    )
+
+    manifests = load_manifests(tmp_path)
+
+    assert manifests["a"].menu[0] == MenuContribution("&X", "Go", "Ctrl+G")
+    assert manifests["a"].has_triggers
+    assert not manifests["b"].has_triggers
+    (tmp_path / "manifest.yaml").write_text("a: [unclosed")
+    assert load_manifests(tmp_path) == {}
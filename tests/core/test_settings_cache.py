@@ -0,0 +1,128 @@
+"""Tests for the in-memory plugin settings cache."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from jukebox.core.database import Database
+from jukebox.core.event_bus import EventBus, Events
+from jukebox.core.plugin_manager import PluginContext
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Iterator[Database]:
+    database = Database(tmp_path / "test.db")
+    database.connect()
+    database.initialize_schema()
+    yield database
+    database.close()
+
+
+class _CountingConnection:
+    """Connection proxy counting the statements run on plugin_settings."""
+
+    def __init__(self, conn: Any) -> None:
+        self._conn = conn
+        self.queries = 0
+
+    def execute(self, sql: str, *args: Any) -> Any:
+        if "plugin_settings" in sql:
+            self.queries += 1
+        return self._conn.execute(sql, *args)
+
+    def executemany(self, sql: str, *args: Any) -> Any:
+        self.queries += 1
+        return self._conn.executemany(sql, *args)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
+def test_reads_hit_the_database_once_per_plugin(db: Database) -> None:
+    db.settings.save("player", "volume", "75")
+    db.settings.save("player", "muted", "false")
+    db.settings.invalidate()
+    counting = _CountingConnection(db.conn)
+    db.conn = counting  # type: ignore[assignment]
+
+    for _ in range(100):
+        assert db.settings.get("player", "volume") == "75"
+        assert db.settings.get("player", "unknown") is None
+
+    assert counting.queries == 1
+    assert db.settings.get_all("player") == {"volume": "75", "muted": "false"}
+
+
+def test_batched_writes_land_in_one_flush(db: Database) -> None:
+    scheduled: list[int] = []
+    db.settings.schedule_flush = lambda: scheduled.append(1)
+    counting = _CountingConnection(db.conn)
+    db.conn = counting  # type: ignore[assignment]
+
+    for i in range(10):
+        db.settings.save("player", f"key{i}", str(i))
+
+    assert len(scheduled) == 10
+    assert db.settings.pending == 10
+    assert db.settings.get("player", "key3") == "3"  # visible avant l'écriture
+    assert db.settings.flush()
+    assert db.settings.pending == 0
+    assert counting.queries == 2  # get_all initial + un seul executemany
+
+    db.settings.invalidate()
+    assert db.settings.get_all("player") == {f"key{i}": str(i) for i in range(10)}
+
+
+def test_close_writes_pending_settings(tmp_path: Path) -> None:
+    database = Database(tmp_path / "test.db")
+    database.connect()
+    database.initialize_schema()
+    database.settings.schedule_flush = lambda: None
+    database.settings.save("player", "volume", "30")
+    database.close()
+
+    reopened = Database(tmp_path / "test.db")
+    reopened.connect()
+    assert reopened.settings.get("player", "volume") == "30"
+    reopened.close()
+
+
+class TestPluginContext:
+    """Typed accessors and change notifications."""
+
+    @pytest.fixture
+    def context(self, db: Database) -> PluginContext:
+        class App:
+            database = db
+            player = None
+            config = None
+            event_bus = EventBus()
+
+        db.settings.on_change = lambda plugin, key, value: App.event_bus.emit(
+            Events.PLUGIN_SETTING_CHANGED, plugin_name=plugin, key=key, value=value
+        )
+        return PluginContext(App())
+
+    def test_typed_roundtrip(self, context: PluginContext) -> None:
+        context.set_setting("nav", "auto_play", True)
+        context.set_setting("nav", "seek", 2.5)
+
+        assert context.get_setting("nav", "auto_play", bool, False) is True
+        assert context.get_setting("nav", "seek", float, 0.0) == 2.5
+        assert context.get_setting("nav", "missing", int, 7) == 7
+
+    def test_change_events(self, context: PluginContext) -> None:
+        changes: list[tuple[str, str, str]] = []
+        assert context.event_bus is not None
+        context.event_bus.subscribe(
+            Events.PLUGIN_SETTING_CHANGED,
+            lambda plugin_name, key, value: changes.append((plugin_name, key, value)),
+        )
+
+        context.set_setting("nav", "random", False)
+        context.set_setting("nav", "random", False)  # inchangé : pas d'événement
+        context.set_setting("nav", "random", True)
+
+        assert changes == [("nav", "random", "false"), ("nav", "random", "true")]
@@ -3,11 +3,21 @@
 import time
 from pathlib import Path
 
+import numpy as np
 import pytest
+from PySide6.QtCore import Qt
 
 from jukebox.core.audio_player import AudioPlayer
 from jukebox.core.config import AudioConfig, JukeboxConfig, LoggingConfig, UIConfig, load_config
+from jukebox.core.database import Database
+from jukebox.ui.components.track_list import TrackList
 from jukebox.ui.main_window import MainWindow
+from jukebox.utils.waveform_serializer import (
+    _serialize_npz,
+    deserialize_waveform,
+    read_waveform_pyramid,
+    serialize_waveform,
+)
 
 
 @pytest.mark.benchmark
@@ -67,3 +77,873 @@ class TestPerformance:
 
         assert window.track_list.count() == 100
         assert duration < 0.5  # Should add 100 tracks in < 500ms
+
+
+@pytest.mark.benchmark
+class TestWaveformFormat:
+    """Size and decode time of the waveform pyramid vs the legacy npz blobs."""
+
+    # Mix de 2 h à ~5,4 colonnes/s (11025 Hz, hop 2048)
+    LENGTH = 2 * 3600 * 11025 // 2048
+
+    @pytest.fixture
+    def waveform(self):  # type: ignore
+        rng = np.random.default_rng(0)
+        return {band: rng.random(self.LENGTH) for band in ("bass", "mid", "treble")}
+
+    def test_pyramid_smaller_than_npz(self, waveform):  # type: ignore
+        """The pyramid (all levels included) takes a fraction of the npz size."""
+        pyramid = serialize_waveform(waveform)
+        legacy = _serialize_npz(waveform)
+
+        assert len(pyramid) < len(legacy) / 2.5
+
+    def test_overview_decode_time(self, waveform):  # type: ignore
+        """Reading a screen-width overview does not decode the whole waveform."""
+        pyramid_data = serialize_waveform(waveform)
+        legacy_data = _serialize_npz(waveform)
+
+        start = time.perf_counter()
+        for _ in range(20):
+            pyramid = read_waveform_pyramid(pyramid_data)
+            pyramid.peaks(pyramid.level_for(1920))
+        pyramid_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(20):
+            deserialize_waveform(legacy_data)
+        legacy_duration = time.perf_counter() - start
+
+        assert pyramid_duration < legacy_duration / 5
+
+
+@pytest.mark.benchmark
+class TestTrackListLoad:
+    """Startup load of an 80k-track library into the track list."""
+
+    LIBRARY_SIZE = 80_000
+
+    @pytest.fixture
+    def library(self, tmp_path):  # type: ignore
+        database = Database(tmp_path / "library.db")
+        database.connect()
+        database.initialize_schema()
+        rng = np.random.default_rng(0)
+        # Waveforms courtes : garde la base de test petite (~20 Mo)
+        blob = serialize_waveform({band: rng.random(64) for band in ("bass", "mid", "treble")})
+        with database.transaction():
+            database.conn.executemany(
+                "INSERT INTO tracks (filepath, filename, artist, title, mode) "
+                "VALUES (?, ?, ?, ?, 'jukebox')",
+                [
+                    (
+                        f"/music/{i % 100}/track{i}.mp3",
+                        f"track{i}.mp3",
+                        f"Artist {i % 500}",
+                        f"T{i}",
+                    )
+                    for i in range(self.LIBRARY_SIZE)
+                ],
+            )
+            database.conn.execute(
+                "INSERT INTO waveform_cache (track_id, waveform_data) SELECT id, ? FROM tracks",
+                (blob,),
+            )
+        yield database
+        database.close()
+
+    def test_time_to_first_paint_and_fully_populated(self, qtbot, library):  # type: ignore
+        """Rows paint after the first chunk; waveforms arrive decoded from the worker."""
+        track_list = TrackList(database=library)
+        qtbot.addWidget(track_list)
+        track_list.resize(900, 700)
+        track_list.show()
+        qtbot.waitExposed(track_list)
+
+        start = time.perf_counter()
+        with qtbot.waitSignal(track_list.tracks_loaded, timeout=120_000):
+            track_list.load_tracks_batch(library.get_all_tracks(mode="jukebox"))
+            track_list.viewport().repaint()
+            first_paint = time.perf_counter() - start
+        fully_populated = time.perf_counter() - start
+
+        tracks = track_list.track_model.tracks
+        assert len(tracks) == self.LIBRARY_SIZE
+        assert tracks[-1]["waveform_data"] is not None
+        print(f"\nfirst paint {first_paint:.2f}s, fully populated {fully_populated:.2f}s")
+        assert first_paint < 3.0
+        assert fully_populated < 60.0
+
+
+@pytest.mark.benchmark
+class TestTrackSort:
+    """Column sorts of an 80k-row track list."""
+
+    def test_sort_80k_rows(self, qtbot):  # type: ignore
+        rng = np.random.default_rng(0)
+        ratings = rng.integers(0, 6, 80_000)
+        track_list = TrackList(mode="jukebox")
+        qtbot.addWidget(track_list)
+        model = track_list.track_model
+        model.load_tracks_batch(
+            [
+                {
+                    "filepath": f"/music/{i % 300}/track{i}.mp3",
+                    "artist": f"Artist {rng.integers(3000)}",
+                    "title": f"Title {i}",
+                    "genre": f"H-D-*{ratings[i]}" if ratings[i] else "H",
+                    "duration_seconds": float(rng.random() * 600),
+                    "date_added": f"2026-01-{i % 28 + 1:02d}",
+                }
+                for i in range(80_000)
+            ]
+        )
+        qtbot.waitUntil(lambda: not model.is_loading, timeout=30_000)
+        # Vérifications de fichiers en arrière-plan terminées : pas de contention du GIL
+        qtbot.waitUntil(lambda: model._file_worker is not None, timeout=5_000)
+        qtbot.waitUntil(lambda: model._file_worker.isFinished(), timeout=60_000)
+        columns = model.cell_renderer.columns
+
+        timings = {}
+        for name in ("rating", "duration", "artist", "title"):
+            for order in (Qt.SortOrder.AscendingOrder, Qt.SortOrder.DescendingOrder):
+                start = time.perf_counter()
+                model.sort(columns.index(name), order)
+                timings[name, order.name] = time.perf_counter() - start
+
+        print("\n" + ", ".join(f"{n} {o[:4]} {t * 1000:.0f} ms" for (n, o), t in timings.items()))
+        titles = [t["title"].casefold() for t in model.tracks]
+        assert titles == sorted(titles, reverse=True)  # dernier tri : title DESC
+        assert max(timings.values()) < 1.0
+
+
+@pytest.mark.benchmark
+class TestDirectoryTree:
+    """Directory navigator tree for an 80k-track library (deep folders)."""
+
+    def test_build_and_incremental_updates(self, qapp):  # type: ignore
+        from plugins.directory_navigator import DirectoryTreeWidget, PathTrie
+
+        rng = np.random.default_rng(0)
+        dirs = rng.integers(0, [40, 30, 8], size=(80_000, 3))
+        filepaths = [f"/mnt/music/{a}/{b}/{c}/t{i}.mp3" for i, (a, b, c) in enumerate(dirs)]
+        widget = DirectoryTreeWidget()
+
+        start = time.perf_counter()
+        trie = PathTrie.from_filepaths(filepaths)
+        widget.show_trie(trie, [])
+        build = time.perf_counter() - start
+
+        widget.tree_view.expand(widget._ensure_item("/mnt/music/1/2").index())  # type: ignore[union-attr]
+        start = time.perf_counter()
+        widget.apply_changes(trie.add(100_000, "/mnt/music/1/2/9/new.mp3"))
+        widget.apply_changes(trie.remove(100_000))
+        update = time.perf_counter() - start
+
+        start = time.perf_counter()
+        subtree = trie.filepaths("/mnt/music/1")
+        filtering = time.perf_counter() - start
+
+        print(
+            f"\nbuild {build * 1000:.0f} ms, add+remove {update * 1000:.1f} ms, "
+            f"filter {filtering * 1000:.1f} ms"
+        )
+        assert len(subtree) == int((dirs[:, 0] == 1).sum())
+        assert build < 3.0
+        assert update < 0.05
+
+
+@pytest.mark.benchmark
+class TestWaveformGeneration:
+    """Streaming CompleteWaveformWorker on a 10-minute track."""
+
+    def test_close_to_single_decode_pass(self, qapp, tmp_path):  # type: ignore
+        import soundfile as sf
+        import soxr
+        from scipy import signal  # noqa: F401 - import hors chronométrage
+
+        from plugins.waveform_visualizer import CompleteWaveformWorker
+
+        path = tmp_path / "mix.flac"
+        rng = np.random.default_rng(0)
+        sf.write(path, (rng.standard_normal((44100 * 600, 2)) * 0.1).astype(np.float32), 44100)
+
+        start = time.perf_counter()
+        with sf.SoundFile(path) as f:
+            soxr.resample(f.read(dtype="float32") @ np.full(2, 0.5, np.float32), 44100, 11025)
+        decode = time.perf_counter() - start
+
+        worker = CompleteWaveformWorker(track_id=1, filepath=str(path), chunk_duration=10.0)
+        results: list[dict] = []
+        deltas: list[dict] = []
+        worker.complete.connect(results.append)
+        worker.progress_update.connect(lambda _track_id, delta: deltas.append(delta))
+        start = time.perf_counter()
+        worker.run()  # synchrone : mesure le calcul seul
+        generation = time.perf_counter() - start
+
+        print(
+            f"\ndecode pass {decode:.2f} s, waveform {generation:.2f} s, "
+            f"{len(deltas)} deltas of ~{len(deltas[1]['bass'])} frames"
+        )
+        assert len(results) == 1
+        assert generation < 3 * decode + 0.5
+
+
+@pytest.mark.benchmark
+class TestWaveformDisplay:
+    """WaveformWidget on a 2-hour mix: cursor moves and zoom/scroll repaints."""
+
+    @pytest.mark.parametrize("minutes", [120, 10, 1])
+    def test_repaint_cost(self, qtbot, minutes):  # type: ignore
+        from plugins.waveform_visualizer import WaveformWidget
+
+        frames = 2 * 3600 * 11025 // 2048  # trames d'un mix de 2 h (hop 2048 à 11025 Hz)
+        rng = np.random.default_rng(0)
+        widget = WaveformWidget()
+        qtbot.addWidget(widget)
+        widget.resize(1600, 120)
+        widget.show()
+        widget.display_waveform({band: rng.random(frames) for band in ("bass", "mid", "treble")})
+        span = frames * minutes / 120
+        viewport = widget.plot_widget.viewport()
+        widget.set_view_range(0, span)
+        viewport.repaint()
+
+        curves = [curve.getData()[1] for curve in widget._curves]
+        start = time.perf_counter()
+        for i in range(20):
+            widget.set_position(i / 20 * minutes / 120)
+            viewport.repaint()
+        playhead = (time.perf_counter() - start) / 20
+        # Le curseur ne renvoie aucune donnée aux courbes
+        assert all(c.getData()[1] is y for c, y in zip(widget._curves, curves, strict=True))
+
+        pixels = widget.plot_widget.plotItem.vb.width()
+        columns = []
+        start = time.perf_counter()
+        for i in range(20):
+            first = (frames - span) * i / 20
+            widget.set_view_range(first, first + span)
+            viewport.repaint()
+            columns.append(len(widget._curves[0].getData()[0]))
+        scroll = (time.perf_counter() - start) / 20
+
+        print(
+            f"\n{minutes} min view: playhead {playhead * 1000:.2f} ms, scroll {scroll * 1000:.2f} ms"
+        )
+        # Coût borné par la largeur du widget, pas par la durée du mix
+        assert all(min(pixels, span) <= n <= 2 * pixels + 4 for n in columns)
+
+
+@pytest.mark.benchmark
+class TestRenderFarm:
+    """Video export frames: sequential rendering vs RenderFarm worker processes."""
+
+    @pytest.mark.parametrize("size", [(320, 180), (640, 360)], ids=["180p", "360p"])
+    def test_worker_scaling(self, size):  # type: ignore
+        import hashlib
+        import os
+
+        from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+        from plugins.video_exporter.renderers.render_farm import RenderFarm
+
+        sr, fps, duration = 22050, 15, 2.0
+        total = int(duration * fps)
+        t = np.arange(int(sr * duration)) / sr
+        noise = np.random.default_rng(0).standard_normal(len(t)) * 0.1
+        audio = (np.sin(2 * np.pi * 60 * t) * 0.5 + noise).astype(np.float32)
+        kwargs = {
+            "width": size[0],
+            "height": size[1],
+            "fps": fps,
+            "sr": sr,
+            "duration": duration,
+            "layers_config": {"waveform": True, "dynamics": True, "vjing": True, "text": True},
+            "track_metadata": {"artist": "Artist", "title": "Title"},
+            "use_gpu": False,
+            "use_all_effects": True,
+            "simultaneous_effects": 3,
+        }
+
+        renderer = FrameRenderer(audio=audio, **kwargs)
+        digest = hashlib.md5()  # noqa: S324 - empreinte, pas de sécurité
+        start = time.perf_counter()
+        for i in range(total):
+            digest.update(renderer.render_frame(i, i / fps).tobytes())
+        sequential = time.perf_counter() - start
+        report = [f"\n{size[0]}x{size[1]}, {os.cpu_count()} CPU: sequential {sequential:.2f} s"]
+
+        analysis = renderer.analysis_arrays()
+        for workers in (1, 2, 4):
+            farm_digest = hashlib.md5()  # noqa: S324
+            frames: dict[int, bytes] = {}
+            written = 0
+            start = time.perf_counter()
+            with RenderFarm(kwargs, audio, analysis, total, workers) as farm:
+                while written < total:
+                    for frame_idx in farm.poll(timeout=1.0):
+                        frames[frame_idx] = farm.frame(frame_idx).tobytes()
+                        farm.release(frame_idx)
+                    while written in frames:
+                        farm_digest.update(frames.pop(written))
+                        written += 1
+            elapsed = time.perf_counter() - start
+            report.append(f"{workers} process(es) {elapsed:.2f} s ({sequential / elapsed:.1f}x)")
+            assert farm_digest.hexdigest() == digest.hexdigest()
+            # Démarrage des processus (spawn + imports) compris
+            assert elapsed < 2 * sequential * max(1, workers / (os.cpu_count() or 1)) + 10
+        print(", ".join(report))
+
+
+@pytest.mark.benchmark
+class TestCompositor:
+    """1080p frame compositing per layer: PIL alpha_composite vs Compositor."""
+
+    def test_per_layer_cost_1080p(self):  # type: ignore
+        from PIL import Image
+
+        from plugins.video_exporter.layers.video_layer import VideoBackgroundLayer
+        from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+
+        width, height, fps, sr, duration = 1920, 1080, 60, 22050, 1.0
+        t = np.arange(int(sr * duration)) / sr
+        audio = (np.sin(2 * np.pi * 60 * t) * 0.5).astype(np.float32)
+        renderer = FrameRenderer(
+            width=width,
+            height=height,
+            fps=fps,
+            audio=audio,
+            sr=sr,
+            duration=duration,
+            layers_config={"waveform": True, "dynamics": True, "vjing": True, "text": True},
+            track_metadata={"artist": "Artist", "title": "Title"},
+            use_gpu=False,
+        )
+        video = VideoBackgroundLayer(width, height, fps, audio, sr, duration, opacity=1.0)
+        video.still_frames = [
+            np.random.default_rng(0).integers(0, 256, (height, width, 3), np.uint8)
+        ]
+        layers = [video, *renderer.layers]
+
+        frame_idx = 20
+        states = [
+            video.advance(frame_idx, frame_idx / fps),
+            *renderer.advance(frame_idx, frame_idx / fps),
+        ]
+        images = [
+            layer.render_state(frame_idx, frame_idx / fps, state).convert("RGBA")
+            for layer, state in zip(layers, states, strict=True)
+        ]
+        runs = 5
+
+        # Frame noire puis conversion en tableau RGB (PIL) / remise à zéro du buffer
+        start = time.perf_counter()
+        for _ in range(runs):
+            composite = Image.new("RGBA", (width, height), (0, 0, 0, 255))
+            np.array(composite.convert("RGB"), dtype=np.uint8)
+        pil_frame = (time.perf_counter() - start) / runs
+        frame = renderer.compositor.new_frame()
+        start = time.perf_counter()
+        for _ in range(runs):
+            frame.fill(0)
+        numpy_frame = (time.perf_counter() - start) / runs
+        report = [
+            f"\n1080p frame setup: PIL {pil_frame * 1000:.2f} ms, numpy {numpy_frame * 1000:.2f} ms"
+        ]
+        pil_total, numpy_total = pil_frame, numpy_frame
+
+        for layer, state, image in zip(layers, states, images, strict=True):
+            layer.render_state = lambda *_args, image=image: image  # type: ignore[method-assign]
+            # Le texte se dessine lui-même dans sa zone (render_pixels), à t = frame
+            pixels = layer.render_pixels(frame_idx, frame_idx / fps, state)
+            assert pixels is not None
+            renderer.compositor.composite(frame, pixels)  # compilation numba hors mesure
+
+            start = time.perf_counter()
+            for _ in range(runs):
+                Image.alpha_composite(composite, image)
+            pil = (time.perf_counter() - start) / runs
+            start = time.perf_counter()
+            for _ in range(runs):
+                pixels = layer.render_pixels(frame_idx, frame_idx / fps, state)
+                if pixels is not None:
+                    renderer.compositor.composite(frame, pixels, layer.blend_mode, layer.opacity)
+            compositor = (time.perf_counter() - start) / runs
+            pil_total += pil
+            numpy_total += compositor
+            report.append(
+                f"{type(layer).__name__}: PIL {pil * 1000:.2f} ms, numpy {compositor * 1000:.2f} ms"
+            )
+
+        report.append(
+            f"total: PIL {pil_total * 1000:.1f} ms, numpy {numpy_total * 1000:.1f} ms "
+            f"(1080p60 budget 16.7 ms)"
+        )
+        print("\n".join(report))
+        assert numpy_total < pil_total
+
+
+@pytest.mark.benchmark
+class TestFFmpegWriter:
+    """Render/encode overlap: writes on the render thread vs FFmpegEncoder writer thread."""
+
+    def test_render_encode_overlap(self, monkeypatch, tmp_path):  # type: ignore
+        import subprocess
+        import sys
+
+        from plugins.video_exporter.renderers import ffmpeg_encoder
+
+        width, height, fps, total = 1280, 720, 30, 64
+        frame_bytes = width * height * 3
+
+        # Coûts irréguliers, 12 ms en moyenne de chaque côté : pics de rendu
+        # (transitions VJing) et d'encodage (images clés) décalés
+        def render_s(i: int) -> float:
+            return 0.040 if i % 8 == 0 else 0.008
+
+        # Faux FFmpeg : lit chaque frame puis "l'encode"
+        consumer = [
+            sys.executable,
+            "-c",
+            "import sys, time\n"
+            "i = 0\n"
+            "while sys.stdin.buffer.read(int(sys.argv[1])):\n"
+            "    time.sleep(0.040 if i % 8 == 4 else 0.008)\n"
+            "    i += 1",
+            str(frame_bytes),
+        ]
+        frame = np.random.default_rng(0).integers(0, 256, (height, width, 3), np.uint8)
+
+        # Avant : écriture bloquante sur le thread de rendu
+        process = subprocess.Popen(consumer, stdin=subprocess.PIPE)  # noqa: S603
+        assert process.stdin is not None
+        start = time.perf_counter()
+        for i in range(total):
+            time.sleep(render_s(i))  # rendu (numba / PIL relâchent le GIL)
+            process.stdin.write(frame.data)
+        process.stdin.close()
+        process.wait()
+        inline = time.perf_counter() - start
+
+        popen = subprocess.Popen
+        monkeypatch.setattr(ffmpeg_encoder.shutil, "which", lambda _name: sys.executable)
+        monkeypatch.setattr(
+            ffmpeg_encoder.subprocess,
+            "Popen",
+            lambda _cmd, **kwargs: popen(consumer, **kwargs),  # noqa: S603
+        )
+        encoder = ffmpeg_encoder.FFmpegEncoder(
+            tmp_path / "out.mp4", width, height, fps, tmp_path / "a.wav", 0.0, 2.0
+        )
+        encoder.start()
+        start = time.perf_counter()
+        for i in range(total):
+            buffer = encoder.frame_buffer()
+            time.sleep(render_s(i))
+            buffer[...] = frame
+            encoder.write_frame(buffer)
+        encoder.finish()
+        threaded = time.perf_counter() - start
+        stats = encoder.stats()
+
+        print(
+            f"\n{total} frames 720p (render and encode 12 ms on average): "
+            f"inline {inline:.2f} s, writer thread {threaded:.2f} s; "
+            f"writes {stats.write_s:.2f} s, backpressure {stats.backpressure_s:.2f} s, "
+            f"stalled writes {stats.stalled_writes}, writer idle {stats.starved_s:.2f} s"
+        )
+        assert stats.frames == total
+        # Recouvrement : le rendu n'a attendu qu'une partie du temps passé à écrire
+        assert stats.backpressure_s < stats.write_s
+
+
+@pytest.mark.benchmark
+class TestVideoStream:
+    """Video background: memory and decode rate of the streaming decoder."""
+
+    def test_memory_independent_of_duration(self, tmp_path):  # type: ignore
+        import os
+
+        cv2 = pytest.importorskip("cv2")
+        if not Path("/proc/self/statm").exists():
+            pytest.skip("RSS sampled from /proc")
+        page = os.sysconf("SC_PAGE_SIZE")
+
+        def rss() -> int:
+            return int(Path("/proc/self/statm").read_text().split()[1]) * page
+
+        from plugins.video_exporter.layers.video_stream import VideoFrameStream, plan_clips
+
+        width, height, fps = 1280, 720, 30
+        clip = tmp_path / "clip.avi"
+        writer = cv2.VideoWriter(str(clip), cv2.VideoWriter_fourcc(*"MJPG"), fps, (960, 540))
+        rng = np.random.default_rng(0)
+        for _ in range(45):
+            writer.write(rng.integers(0, 256, (540, 960, 3), np.uint8))
+        writer.release()
+        frame_bytes = width * height * 3
+
+        report = ["\n720p video background, 1.5 s clip looped (RSS growth):"]
+        baseline = rss()
+        for seconds in (5, 20):
+            total = seconds * fps
+            stream = VideoFrameStream(plan_clips([clip], total), width, height, total)
+            peak = 0
+            start = time.perf_counter()
+            for frame_idx in range(total):
+                stream.frame(frame_idx)
+                peak = max(peak, rss() - baseline)
+            elapsed = time.perf_counter() - start
+            stream.close()
+            report.append(
+                f"{seconds:>3} s: {total / elapsed:.0f} frames/s, peak {peak / 1e6:.0f} MB "
+                f"(preloading: {total * frame_bytes / 1e6:.0f} MB)"
+            )
+            # Read-ahead + frames en cours de décodage, quelle que soit la durée
+            assert peak < (stream.read_ahead + 8) * frame_bytes
+        print("\n".join(report))
+
+
+@pytest.mark.benchmark
+class TestVJingAnalysis:
+    """VJing audio analysis: frame loops vs vectorized, and the cache hit."""
+
+    def test_vectorized_analysis(self, tmp_path):  # type: ignore
+        from plugins.video_exporter.layers import vjing_analysis
+
+        sr, fps, seconds = 22050, 30, 600
+        audio = (np.random.default_rng(0).standard_normal(sr * seconds) * 0.1).astype(np.float32)
+        total_frames = seconds * fps
+
+        # Boucles frame par frame de l'ancienne implémentation (RMS + spectre)
+        start = time.perf_counter()
+        spf = len(audio) / total_frames
+        for frame_idx in range(total_frames):
+            chunk = audio[int(frame_idx * spf) : int((frame_idx + 1) * spf)]
+            np.sqrt(np.mean(chunk**2))
+            fft = np.abs(np.fft.rfft(chunk))
+            band_size = len(fft) // vjing_analysis.FFT_BANDS
+            [
+                np.mean(fft[i * band_size : (i + 1) * band_size])
+                for i in range(vjing_analysis.FFT_BANDS)
+            ]
+        loop_time = time.perf_counter() - start
+
+        starts, lengths = vjing_analysis.frame_bounds(len(audio), total_frames)
+        start = time.perf_counter()
+        vjing_analysis.frame_rms(audio, starts, lengths)
+        vjing_analysis.frame_spectrum_bands(audio, starts, lengths, vjing_analysis.FFT_BANDS)
+        vector_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        arrays = vjing_analysis.analyze_audio(audio, sr, total_frames)
+        full_time = time.perf_counter() - start
+        key = vjing_analysis.cache_key(audio, sr, fps, total_frames)
+        vjing_analysis.save_analysis_cache(tmp_path, key, arrays)
+        start = time.perf_counter()
+        key = vjing_analysis.cache_key(audio, sr, fps, total_frames)
+        assert vjing_analysis.load_cached_analysis(tmp_path, key) is not None
+        cached_time = time.perf_counter() - start
+
+        print(
+            f"\n10 min mix, {total_frames} frames at {fps} fps:"
+            f"\n  per-frame RMS + spectrum: loops {loop_time:.2f} s, "
+            f"vectorized {vector_time:.2f} s ({loop_time / vector_time:.1f}x)"
+            f"\n  full analysis (band FFTs included): {full_time:.2f} s, "
+            f"cache hit {cached_time * 1000:.0f} ms"
+        )
+        assert vector_time < loop_time
+        assert cached_time < full_time
+
+
+@pytest.mark.benchmark
+class TestSegmentResume:
+    """Resumable export: re-render after an interruption at 80%."""
+
+    def test_resume_renders_only_missing_segments(self):  # type: ignore
+        from plugins.video_exporter.export_worker import VideoExportWorker
+        from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+        from plugins.video_exporter.renderers.segment_cache import plan_segments
+
+        width, height, fps, sr, duration = 320, 180, 30, 22050, 20.0
+        t = np.arange(int(sr * duration)) / sr
+        audio = (np.sin(2 * np.pi * 60 * t) * (0.5 + 0.5 * np.sign(np.sin(4 * np.pi * t)))).astype(
+            np.float32
+        )
+
+        def renderer() -> FrameRenderer:
+            return FrameRenderer(
+                width=width,
+                height=height,
+                fps=fps,
+                audio=audio,
+                sr=sr,
+                duration=duration,
+                layers_config={"waveform": True, "vjing": True, "text": True},
+                track_metadata={"artist": "Artist", "title": "Title"},
+                use_gpu=False,
+            )
+
+        class Sink:
+            def frame_buffer(self) -> np.ndarray:
+                return np.empty((height, width, 3), np.uint8)
+
+            def write_frame(self, frame, on_written=None):  # type: ignore
+                pass
+
+        worker = VideoExportWorker({"layers": {}}, None)  # type: ignore[arg-type]
+        total_frames = int(duration * fps)
+        segments = plan_segments(total_frames, fps, 2.0, fade_duration=1.0)
+
+        start = time.perf_counter()
+        worker._render_parallel(renderer(), Sink(), range(total_frames), fps)
+        full_time = time.perf_counter() - start
+
+        # Arrêt à 80 % : les segments complets sont repris, les couches avancent sans dessin
+        missing = segments[int(len(segments) * 0.8) :]
+        frames = [idx for first, end in missing for idx in range(first, end)]
+        start = time.perf_counter()
+        worker._render_parallel(renderer(), Sink(), frames, fps)
+        resume_time = time.perf_counter() - start
+
+        print(
+            f"\n{duration:.0f} s export, {len(segments)} segments of 2 s, "
+            f"{len(missing)} left after an interruption at 80%:"
+            f"\n  full render {full_time:.2f} s, resume {resume_time:.2f} s "
+            f"({resume_time / full_time:.0%})"
+        )
+        assert resume_time < full_time * 0.5
+
+
+@pytest.mark.benchmark
+class TestPreviewRender:
+    """Fast preview vs rendering the test clip at export resolution."""
+
+    def test_preview_playback_cost(self):  # type: ignore
+        from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+        from plugins.video_exporter.renderers.preview_renderer import (
+            PreviewRenderer,
+            preview_size,
+            project_export_time,
+        )
+
+        export_size, fps, sr, duration = (1280, 720), 30, 22050, 4.0
+        t = np.arange(int(sr * duration)) / sr
+        audio = (np.sin(2 * np.pi * 60 * t) * (0.5 + 0.5 * np.sign(np.sin(4 * np.pi * t)))).astype(
+            np.float32
+        )
+        total_frames = int(duration * fps)
+
+        def renderer(size: tuple[int, int]) -> FrameRenderer:
+            return FrameRenderer(
+                width=size[0],
+                height=size[1],
+                fps=fps,
+                audio=audio,
+                sr=sr,
+                duration=duration,
+                layers_config={"waveform": True, "vjing": True, "text": True},
+                track_metadata={"artist": "Artist", "title": "Title"},
+                use_gpu=False,
+            )
+
+        full = renderer(export_size)
+        start = time.perf_counter()
+        for idx in range(total_frames):
+            full.render_frame(idx, idx / fps)
+        full_time = time.perf_counter() - start
+
+        size = preview_size(*export_size, 0.25)
+        preview = PreviewRenderer(renderer(size), total_frames, frame_step=4, adaptive=False)
+        start = time.perf_counter()
+        for idx in range(total_frames):
+            preview.render(idx)
+        preview_time = time.perf_counter() - start
+
+        projected = sum(
+            project_export_time(
+                preview.renderer.layer_timings(), size, export_size, total_frames
+            ).values()
+        )
+        print(
+            f"\n{duration:.0f} s clip, {total_frames} frames:"
+            f"\n  export resolution {export_size[0]}x{export_size[1]}: {full_time:.2f} s "
+            f"({total_frames / full_time:.0f} fps)"
+            f"\n  preview {size[0]}x{size[1]}, keyframe every 4 frames: {preview_time:.2f} s "
+            f"({total_frames / preview_time:.0f} fps, {full_time / preview_time:.1f}x)"
+            f"\n  projected export rendering from preview layer costs: {projected:.2f} s"
+        )
+        assert preview_time < full_time
+
+
+@pytest.mark.benchmark
+class TestVJEffects:
+    """Cost of every registered VJing effect, checked against a stored baseline.
+
+    Each effect is drawn alone on a transparent frame (advance then render),
+    best of 2 frames after a warm-up one. Costs are stored in units of a
+    reference workload measured in the same run (numpy blend + PIL composite
+    of one frame), so the baseline does not depend on the machine. An effect
+    fails when it costs more than 3x its baseline + a quarter of the reference
+    (a real regression is a change of algorithm). Set VJ_EFFECT_BASELINE_UPDATE=1 to
+    rewrite the baseline after an intended change.
+    """
+
+    BASELINE = Path(__file__).parent / "vj_effect_baseline.json"
+    SIZES = ((1280, 720), (1920, 1080))
+
+    @staticmethod
+    def _reference_cost(width: int, height: int) -> float:
+        """Best of 5 of a fixed frame workload, in ms."""
+        from PIL import Image
+
+        rng = np.random.default_rng(0)
+        pixels = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+        base = Image.new("RGBA", (width, height), (0, 0, 0, 255))
+        times = []
+        for _ in range(5):
+            start = time.perf_counter()
+            blended = (pixels.astype(np.float32) * 0.5 + 64.0).astype(np.uint8)
+            Image.alpha_composite(base, Image.fromarray(blended, "RGBA"))
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000
+
+    @staticmethod
+    def _effect_costs(width: int, height: int) -> dict[str, float]:
+        from plugins.video_exporter.layers.vjing_layer import VJingLayer
+
+        fps, sr, duration = 30, 22050, 2.0
+        t = np.arange(int(sr * duration)) / sr
+        audio = (np.sin(2 * np.pi * 60 * t) * (0.5 + 0.5 * np.sign(np.sin(4 * np.pi * t)))).astype(
+            np.float32
+        )
+        layer = VJingLayer(
+            width, height, fps, audio, sr, duration, use_all_effects=True, use_gpu=False
+        )
+        costs = {}
+        for name in layer.AVAILABLE_EFFECTS:
+            render = getattr(layer, f"_render_{name}")
+            advance = getattr(layer, f"_advance_{name}", None)
+            times = []
+            for idx in range(3):
+                ctx = {
+                    "energy": 0.7,
+                    "bass": 0.8,
+                    "mid": 0.5,
+                    "treble": 0.4,
+                    "fft": np.linspace(0, 1, 32),
+                    "is_beat": idx % 2 == 0,
+                }
+                img = layer.create_transparent_image()
+                layer._current_intensity = 1.0
+                start = time.perf_counter()
+                ctx["state"] = advance(idx, idx / fps, dict(ctx)) if advance else None
+                render(img, idx, idx / fps, ctx)
+                times.append(time.perf_counter() - start)
+            costs[name] = min(times[1:]) * 1000
+        return costs
+
+    def test_effect_costs(self):  # type: ignore
+        import json
+        import os
+
+        measured = {f"{w}x{h}": self._effect_costs(w, h) for w, h in self.SIZES}
+        references = {f"{w}x{h}": self._reference_cost(w, h) for w, h in self.SIZES}
+        if os.environ.get("VJ_EFFECT_BASELINE_UPDATE"):
+            relative = {
+                size: {name: round(cost / references[size], 2) for name, cost in costs.items()}
+                for size, costs in measured.items()
+            }
+            self.BASELINE.write_text(json.dumps(relative, indent=2, sort_keys=True) + "\n")
+        baseline = json.loads(self.BASELINE.read_text())
+
+        regressions = []
+        for size, costs in measured.items():
+            unit = references[size]
+            print(
+                f"\n{size}: {sum(costs.values()):.0f} ms for {len(costs)} effects "
+                f"(reference {unit:.1f} ms)"
+            )
+            for name, cost in sorted(costs.items(), key=lambda item: -item[1])[:12]:
+                expected = baseline[size].get(name, 0) * unit
+                print(f"  {name:<16} {cost:7.1f} ms (baseline {expected:.1f})")
+            for name, cost in costs.items():
+                reference = baseline[size].get(name)
+                if reference is not None and cost > (reference * 3 + 0.25) * unit:
+                    regressions.append(
+                        f"{name} at {size}: {cost / unit:.2f} vs {reference:.2f} references"
+                    )
+        assert set(measured["1280x720"]) <= set(baseline["1280x720"]), "effects missing a baseline"
+        assert not regressions, regressions
+
+
+@pytest.mark.benchmark
+class TestLayerCulling:
+    """Text layer drawn in its region and reused between fades; VJing quality levels."""
+
+    def test_culling_and_quality_levels(self):  # type: ignore
+        from plugins.video_exporter.layers.base import BaseVisualLayer
+        from plugins.video_exporter.layers.text_layer import TextLayer
+        from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+
+        width, height, fps, sr, duration = 1920, 1080, 30, 22050, 4.0
+        t = np.arange(int(sr * duration)) / sr
+        audio = (np.sin(2 * np.pi * 60 * t) * (0.5 + 0.5 * np.sign(np.sin(4 * np.pi * t)))).astype(
+            np.float32
+        )
+        total_frames = int(duration * fps)
+
+        renderer = FrameRenderer(
+            width, height, fps, audio, sr, duration, {"text": True}, {"artist": "Artist"}
+        )
+        text = renderer.layers[0]
+        assert isinstance(text, TextLayer)
+        out = renderer.compositor.new_frame()
+        # Avant : image pleine frame, recherche de la zone dessinée, à chaque frame
+        start = time.perf_counter()
+        for idx in range(total_frames):
+            out.fill(0)
+            pixels = BaseVisualLayer.render_pixels(text, idx, idx / fps, None)
+            if pixels is not None:
+                renderer.compositor.composite(out, pixels)
+        full_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for idx in range(total_frames):
+            renderer.render_frame(idx, idx / fps, out=out)
+        culled_time = time.perf_counter() - start
+
+        vjing = FrameRenderer(
+            1280,
+            720,
+            fps,
+            audio,
+            sr,
+            duration,
+            {"vjing": True},
+            {},
+            use_gpu=False,
+            use_all_effects=True,
+        )
+        frames = range(0, total_frames, 10)
+        level_times = []
+        for level in range(vjing.layers[0].QUALITY_LEVELS):
+            vjing.layers[0].set_quality(level)
+            start = time.perf_counter()
+            for idx in frames:
+                vjing.render_frame(idx, idx / fps)
+            level_times.append((time.perf_counter() - start) / len(frames))
+
+        print(
+            f"\nText layer, {total_frames} frames at {width}x{height}:"
+            f"\n  full-frame draw + bbox scan: {full_time * 1000 / total_frames:.2f} ms/frame"
+            f"\n  region draw, reused between fades, composited: "
+            f"{culled_time * 1000 / total_frames:.2f} ms/frame ({full_time / culled_time:.0f}x)"
+            "\nVJing layer (all effects) at 1280x720, per frame:"
+            + "".join(
+                f"\n  quality level {level}: {cost * 1000:.0f} ms"
+                for level, cost in enumerate(level_times)
+            )
+        )
+        assert culled_time < full_time
+        assert level_times[-1] < level_times[0]
@@ -0,0 +1,53 @@
+"""Tests for the streaming CompleteWaveformWorker and progressive display."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from plugins.waveform_visualizer import CompleteWaveformWorker, WaveformWidget
+
+
+@pytest.fixture
+def wav_file(tmp_path: Path) -> Path:
+    import soundfile as sf
+
+    rng = np.random.default_rng(0)
+    path = tmp_path / "track.wav"
+    sf.write(path, rng.uniform(-0.5, 0.5, 22050 * 5).astype(np.float32), 22050)
+    return path
+
+
+def test_worker_streams_deltas(qtbot, wav_file: Path) -> None:  # type: ignore
+    worker = CompleteWaveformWorker(track_id=7, filepath=str(wav_file), chunk_duration=1.0)
+    deltas: list[dict] = []
+    worker.progress_update.connect(lambda track_id, delta: deltas.append(delta))
+
+    with qtbot.waitSignal(worker.complete, timeout=20_000) as blocker:
+        worker.start()
+    worker.wait()
+    result = blocker.args[0]
+
+    bass = result["waveform_data"]["bass"]
+    assert len(deltas) >= 5
+    assert deltas[0]["start"] == 0
+    for previous, delta in zip(deltas, deltas[1:], strict=False):
+        assert delta["start"] == previous["start"] + len(previous["bass"])
+    assert sum(len(d["bass"]) for d in deltas) == len(bass) == deltas[0]["length"]
+    assert result["duration"] == pytest.approx(5.0, abs=1e-3)
+
+    # Le widget reconstruit la waveform finale à partir des deltas
+    widget = WaveformWidget()
+    qtbot.addWidget(widget)
+    for delta in deltas:
+        widget.apply_waveform_delta(delta)
+    np.testing.assert_allclose(widget.waveform_data, bass, atol=1e-6)  # type: ignore[arg-type]
+    assert widget.expected_length == len(bass)
+
+
+def test_worker_missing_file(qtbot, tmp_path: Path) -> None:  # type: ignore
+    worker = CompleteWaveformWorker(track_id=1, filepath=str(tmp_path / "x.wav"), chunk_duration=1)
+
+    with qtbot.waitSignal(worker.error, timeout=5_000):
+        worker.start()
+    worker.wait()
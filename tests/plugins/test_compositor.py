@@ -0,0 +1,102 @@
+"""Compositor: premultiplied-alpha blending of layer pixels into the RGB frame."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from plugins.video_exporter.layers.base import BaseVisualLayer
+from plugins.video_exporter.renderers.compositor import Compositor, LayerPixels
+
+W, H = 48, 32
+
+
+def _random(shape: tuple[int, ...], seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, shape, dtype=np.uint8)
+
+
+def _pil_over(frame: np.ndarray, rgba: np.ndarray, x: int = 0, y: int = 0) -> np.ndarray:
+    base = Image.fromarray(frame).convert("RGBA")
+    layer = Image.new("RGBA", base.size, (0, 0, 0, 0))
+    layer.paste(Image.fromarray(rgba, "RGBA"), (x, y))
+    return np.asarray(Image.alpha_composite(base, layer).convert("RGB"))
+
+
+def test_normal_blend_matches_pil_alpha_composite() -> None:
+    frame = _random((H, W, 3), 0)
+    rgba = _random((H, W, 4), 1)
+    rgba[0, :, 3] = 0
+    rgba[1, :, 3] = 255
+    expected = _pil_over(frame, rgba)
+
+    Compositor(W, H).composite(frame, LayerPixels(rgba))
+    assert np.array_equal(frame, expected)
+
+
+def test_layer_region_is_clipped_to_frame() -> None:
+    frame = _random((H, W, 3), 2)
+    rgba = _random((20, 30, 4), 3)
+    # Débord en bas à droite : seule la partie visible est composée
+    expected = _pil_over(frame, rgba, 30, 20)
+
+    Compositor(W, H).composite(frame, LayerPixels(rgba, x=30, y=20))
+    assert np.array_equal(frame, expected)
+
+
+def test_opaque_rgb_layer_with_opacity() -> None:
+    frame = _random((H, W, 3), 4)
+    rgb = _random((H, W, 3), 5)
+    rgba = np.dstack([rgb, np.full((H, W), int(255 * 0.3), np.uint8)])
+    expected = _pil_over(frame, rgba)
+
+    compositor = Compositor(W, H)
+    compositor.composite(frame, LayerPixels(rgb, opacity=0.6), opacity=0.5)
+    assert np.array_equal(frame, expected)
+
+    compositor.composite(frame, LayerPixels(rgb))
+    assert np.array_equal(frame, rgb)
+
+
+@pytest.mark.parametrize(
+    ("mode", "reference"),
+    [
+        ("add", lambda f, c, a: np.minimum(f + c * a, 1.0)),
+        ("screen", lambda f, c, a: f + c * a * (1 - f)),
+        ("multiply", lambda f, c, a: f * (c * a + 1 - a)),
+    ],
+)
+def test_blend_modes(mode: str, reference: object) -> None:
+    frame = _random((H, W, 3), 6)
+    rgba = _random((H, W, 4), 7)
+    f = frame / 255.0
+    c = rgba[..., :3] / 255.0
+    a = rgba[..., 3:] / 255.0
+    expected = reference(f, c, a) * 255  # type: ignore[operator]
+
+    Compositor(W, H).composite(frame, LayerPixels(rgba), blend_mode=mode)
+    assert np.abs(frame - expected).max() <= 1.0
+
+
+def test_unknown_blend_mode() -> None:
+    with pytest.raises(ValueError, match="overlay"):
+        Compositor(W, H).composite(
+            np.zeros((H, W, 3), np.uint8), LayerPixels(_random((H, W, 4), 8)), "overlay"
+        )
+
+
+class _ImageLayer(BaseVisualLayer):
+    def __init__(self, image: Image.Image) -> None:
+        self.image = image
+        super().__init__(W, H, 10, np.zeros(100, np.float32), 1000, 1.0)
+
+    def render(self, frame_idx: int, time_pos: float) -> Image.Image:
+        return self.image
+
+
+def test_pil_layers_are_cropped_to_drawn_area() -> None:
+    image = Image.new("RGBA", (W, H), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 200), (10, 5, 20, 8))
+    pixels = _ImageLayer(image).render_pixels(0, 0.0, None)
+
+    assert pixels is not None
+    assert (pixels.x, pixels.y, pixels.pixels.shape) == (10, 5, (3, 10, 4))
+    assert _ImageLayer(Image.new("RGBA", (W, H))).render_pixels(0, 0.0, None) is None
@@ -54,6 +54,9 @@ class _FakeWaveformWidget(QWidget):
     def display_waveform(self, data: object) -> None:
         pass
 
+    def apply_waveform_delta(self, delta: object) -> None:
+        pass
+
 
 @pytest.fixture(autouse=True)
 def _no_waveform(monkeypatch):  # type: ignore
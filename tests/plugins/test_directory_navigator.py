@@ -12,6 +12,7 @@ from plugins.directory_navigator import (
     ROLE_PATH,
     DirectoryNavigatorPlugin,
     DirectoryTreeWidget,
+    PathTrie,
 )
 
 # ============================================================================
@@ -134,57 +135,151 @@ def test_build_tree_common_prefix(qapp) -> None:  # type: ignore
     assert dir_node.rowCount() > 0
 
 
-def test_build_directory_nodes_single_dir(qapp) -> None:  # type: ignore
-    """Test _build_directory_nodes with a single directory."""
-    widget = DirectoryTreeWidget()
-    from PySide6.QtGui import QStandardItem
+def test_trie_single_dir_is_shown_itself(qapp) -> None:  # type: ignore
+    """A lone directory is the top-level node."""
+    trie = PathTrie.from_filepaths([f"/music/song{i}.mp3" for i in range(5)])
 
-    parent_item = QStandardItem()
-    dir_counts = {"/music": 5}
+    (top,) = trie.display_roots()
 
-    widget._build_directory_nodes(parent_item, dir_counts)
+    assert top.path == "/music"
+    assert top.label == "music (5)"
 
-    assert parent_item.rowCount() == 1
-    item = parent_item.child(0)
-    assert "music" in item.text()
-    assert "(5)" in item.text()
-    assert item.data(ROLE_PATH) == "/music"
 
+def test_trie_counts_include_descendants(qapp) -> None:  # type: ignore
+    """Counts include descendant tracks; a common ancestor holding tracks stays visible."""
+    trie = PathTrie.from_filepaths(
+        ["/music/a.mp3", "/music/b.mp3", "/music/rock/c.mp3", "/music/rock/d.mp3"]
+    )
 
-def test_build_directory_nodes_nested(qapp) -> None:  # type: ignore
-    """Test _build_directory_nodes with nested directories."""
-    widget = DirectoryTreeWidget()
-    from PySide6.QtGui import QStandardItem
+    (music,) = trie.display_roots()
 
-    parent_item = QStandardItem()
-    dir_counts = {
-        "/music/rock": 3,
-        "/music/jazz": 2,
-        "/music/jazz/classic": 1,
-    }
+    assert music.label == "music (4)"
+    assert [child.label for child in music.sorted_children()] == ["rock (2)"]
 
-    widget._build_directory_nodes(parent_item, dir_counts)
 
-    # Should create hierarchical structure
-    assert parent_item.rowCount() > 0
+def test_trie_skips_common_prefix(qapp) -> None:  # type: ignore
+    trie = PathTrie.from_filepaths(
+        [
+            "/home/user/music/rock/1.mp3",
+            "/home/user/music/jazz/2.mp3",
+            "/home/user/music/jazz/x/3.mp3",
+        ]
+    )
 
+    assert [node.label for node in trie.display_roots()] == ["jazz (2)", "rock (1)"]
+    assert trie.node("/home/user/music/jazz/x").count == 1  # type: ignore[union-attr]
+
+
+class TestPathTrieUpdates:
+    """Incremental add / remove / move keep counts and ranges exact."""
+
+    def test_remove_prunes_empty_directories(self) -> None:
+        trie = PathTrie()
+        trie.add(1, "/music/rock/old/a.mp3")
+        trie.add(2, "/music/rock/b.mp3")
+
+        touched = trie.remove(1)
+
+        assert [node.path for node in touched] == ["/music/rock/old", "/music/rock", "/music", "/"]
+        assert trie.node("/music/rock/old") is None
+        assert trie.node("/music/rock").count == 1  # type: ignore[union-attr]
+        assert len(trie) == 1
+        assert trie.remove(1) == []
 
-def test_build_directory_nodes_count_accumulation(qapp) -> None:  # type: ignore
-    """Test that directory counts include descendant tracks."""
-    widget = DirectoryTreeWidget()
-    from PySide6.QtGui import QStandardItem
+    def test_move_known_id(self) -> None:
+        trie = PathTrie()
+        trie.add(1, "/music/rock/a.mp3")
+        trie.add(2, "/music/rock/b.mp3")
+
+        trie.add(1, "/music/jazz/a.mp3")
+
+        assert trie.node("/music/rock").count == 1  # type: ignore[union-attr]
+        assert trie.node("/music/jazz").count == 1  # type: ignore[union-attr]
+        assert trie.filepaths("/music") == ["/music/jazz/a.mp3", "/music/rock/b.mp3"]
+        assert trie.add(1, "/music/jazz/a.mp3") == []
+
+    def test_filepaths_match_prefix_filter(self) -> None:
+        filepaths = [
+            f"/lib/{a}/{b}/t{i}.mp3" for i, (a, b) in enumerate((i % 7, i % 5) for i in range(200))
+        ]
+        trie = PathTrie.from_filepaths(filepaths)
+        trie.remove_path(filepaths[3])
+        trie.add(500, "/lib/3/new/n.mp3")
+        expected = set(filepaths) - {filepaths[3]} | {"/lib/3/new/n.mp3"}
+
+        for path in ("/lib", "/lib/3", "/lib/3/2", "/lib/3/new"):
+            result = trie.filepaths(path)
+            assert sorted(result) == sorted(fp for fp in expected if fp.startswith(path + "/"))
+        assert trie.filepaths("/lib/6/0") == [fp for fp in filepaths if fp.startswith("/lib/6/0/")]
+        assert trie.filepaths("/nowhere") == []
+
+    def test_find_depth_first_by_name(self) -> None:
+        trie = PathTrie.from_filepaths(
+            ["/m/b/NORMALIZED/1.mp3", "/m/a/x/2.mp3", "/m/a/normalized_old/3.mp3"]
+        )
+
+        assert trie.find("normalized").path == "/m/a/normalized_old"  # type: ignore[union-attr]
+        assert trie.find("missing") is None
+
+
+class TestLazyTree:
+    """Directory items are created on expand and patched in place."""
+
+    @staticmethod
+    def _labels(item) -> list[str]:  # type: ignore[no-untyped-def]
+        return [item.child(i).text() for i in range(item.rowCount())]
+
+    def test_children_created_on_expand(self, qapp) -> None:  # type: ignore
+        widget = DirectoryTreeWidget()
+        widget.build_tree(["/m/a/x/1.mp3", "/m/a/y/2.mp3", "/m/b/3.mp3"], [])
+        dir_node = widget.model.invisibleRootItem().child(0)
+        a_item = dir_node.child(0)
+
+        assert self._labels(dir_node) == ["a (2)", "b (1)"]
+        assert a_item.child(0).data(ROLE_NODE_TYPE) == "placeholder"
+        assert "/m/a/x" not in widget._items
+
+        widget.tree_view.expand(a_item.index())
+
+        assert self._labels(a_item) == ["x (1)", "y (1)"]
+        assert a_item.child(0).data(ROLE_PATH) == "/m/a/x"
+
+    def test_apply_changes_patches_items(self, qapp) -> None:  # type: ignore
+        widget = DirectoryTreeWidget()
+        widget.build_tree(["/m/a/x/1.mp3", "/m/b/2.mp3"], [])
+        dir_node = widget.model.invisibleRootItem().child(0)
+        a_item = dir_node.child(0)
+        widget.tree_view.expand(a_item.index())
+
+        widget.apply_changes(widget.trie.add(10, "/m/a/w/3.mp3"))
+        assert self._labels(a_item) == ["w (1)", "x (1)"]
+        assert a_item.text() == "a (2)"
+        assert dir_node.child(0) is a_item  # pas de reconstruction
 
-    parent_item = QStandardItem()
-    dir_counts = {
-        "/music": 2,  # 2 direct tracks
-        "/music/rock": 3,  # 3 tracks in rock
-    }
+        widget.apply_changes(widget.trie.remove_path("/m/a/x/1.mp3"))
+        assert self._labels(a_item) == ["w (1)"]
+        assert "/m/a/x" not in widget._items
 
-    widget._build_directory_nodes(parent_item, dir_counts)
+        # b/ gagne un sous-dossier : le nœud replié reçoit un placeholder
+        widget.apply_changes(widget.trie.add(11, "/m/b/sub/4.mp3"))
+        b_item = dir_node.child(1)
+        assert b_item.text() == "b (2)"
+        assert b_item.child(0).data(ROLE_NODE_TYPE) == "placeholder"
 
-    # Parent "/music" should show total count (2 direct + 3 in rock = 5)
-    # Implementation detail: verify the count includes descendants
-    assert parent_item.rowCount() > 0
+    def test_expanded_and_selected_restored(self, qapp) -> None:  # type: ignore
+        widget = DirectoryTreeWidget()
+        filepaths = ["/m/a/x/deep/1.mp3", "/m/b/2.mp3"]
+        widget.build_tree(filepaths, [])
+        widget.tree_view.expand(widget._ensure_item("/m/a").index())  # type: ignore[union-attr]
+        widget.tree_view.expand(widget._ensure_item("/m/a/x").index())  # type: ignore[union-attr]
+        widget.tree_view.setCurrentIndex(widget._ensure_item("/m/a/x/deep").index())  # type: ignore[union-attr]
+
+        widget.build_tree(filepaths + ["/m/c/3.mp3"], [])
+
+        assert widget.tree_view.isExpanded(widget._items["/m/a/x"].index())
+        assert widget.model.itemFromIndex(widget.tree_view.currentIndex()).data(ROLE_PATH) == (
+            "/m/a/x/deep"
+        )
 
 
 def test_tree_view_expand_directories_by_default(qapp) -> None:  # type: ignore
@@ -254,10 +349,10 @@ def test_initialize_subscribes_to_events(plugin, mock_context) -> None:  # type:
     from jukebox.core.event_bus import Events
 
     assert mock_context.subscribe.call_count == 4
-    mock_context.subscribe.assert_any_call(Events.TRACKS_ADDED, plugin._rebuild_tree)
-    mock_context.subscribe.assert_any_call(Events.TRACK_DELETED, plugin._on_track_changed)
+    mock_context.subscribe.assert_any_call(Events.TRACKS_ADDED, plugin._on_tracks_added)
+    mock_context.subscribe.assert_any_call(Events.TRACK_DELETED, plugin._on_track_deleted)
     mock_context.subscribe.assert_any_call(Events.TRACK_METADATA_UPDATED, plugin._on_track_changed)
-    mock_context.subscribe.assert_any_call(Events.PLAYLIST_CHANGED, plugin._rebuild_tree)
+    mock_context.subscribe.assert_any_call(Events.PLAYLIST_CHANGED, plugin._refresh_playlists)
 
 
 def test_register_ui_creates_widget(qapp, plugin, mock_context, mock_ui_builder) -> None:  # type: ignore
@@ -349,15 +444,65 @@ def test_deactivate_hides_dock(qapp, plugin, mock_context, mock_ui_builder) -> N
         mock_dock.setVisible.assert_called_with(False)
 
 
-def test_on_track_changed_rebuilds_tree(qapp, plugin, mock_context, mock_ui_builder) -> None:  # type: ignore
-    """Test that _on_track_changed calls _rebuild_tree."""
+def _mode(context, value: str = "jukebox") -> None:  # type: ignore[no-untyped-def]
+    context.app.mode_manager.get_mode.return_value.value = value
+
+
+def test_track_events_update_trie_incrementally(qapp, plugin, mock_context, mock_ui_builder) -> None:  # type: ignore
+    """Track events patch the trie instead of rebuilding the tree."""
+    _mode(mock_context)
     plugin.initialize(mock_context)
+    mock_conn = mock_context.database.conn
+    mock_conn.execute.return_value.fetchall.side_effect = [
+        [{"id": 1, "filepath": "/music/rock/a.mp3"}, {"id": 2, "filepath": "/music/jazz/b.mp3"}],
+        [],
+    ]
     plugin.register_ui(mock_ui_builder)
 
     with patch.object(plugin, "_rebuild_tree") as mock_rebuild:
-        mock_rebuild.reset_mock()
+        mock_conn.execute.return_value.fetchall.side_effect = [
+            [{"id": 3, "filepath": "/music/rock/c.mp3"}]
+        ]
+        plugin._on_tracks_added()
+        assert mock_conn.execute.call_args[0][1] == ("jukebox", 2)
+        assert plugin.trie.node("/music/rock").count == 2
+
+        plugin._on_track_deleted(filepath=Path("/music/jazz/b.mp3"))
+        assert plugin.trie.node("/music/jazz") is None
+
+        # Déplacement : même id, nouveau chemin
+        mock_conn.execute.return_value.fetchone.return_value = {
+            "id": 3,
+            "filepath": "/music/jazz/c.mp3",
+            "mode": "jukebox",
+        }
+        plugin._on_track_changed(filepath=Path("/music/jazz/c.mp3"))
+        assert plugin.trie.filepaths("/music") == ["/music/jazz/c.mp3", "/music/rock/a.mp3"]
+
+        # Passage dans un autre mode : retiré
+        mock_conn.execute.return_value.fetchone.return_value = {
+            "id": 1,
+            "filepath": "/music/rock/a.mp3",
+            "mode": "curating",
+        }
+        plugin._on_track_changed(filepath=Path("/music/rock/a.mp3"))
+        assert len(plugin.trie) == 1
+
+        mock_rebuild.assert_not_called()
+
+    dir_node = plugin.widget.model.invisibleRootItem().child(0)
+    assert [dir_node.child(i).text() for i in range(dir_node.rowCount())] == ["jazz (1)"]
+
+
+def test_mode_change_triggers_rebuild(qapp, plugin, mock_context, mock_ui_builder) -> None:  # type: ignore
+    """An event received after a mode switch rebuilds the trie for the new mode."""
+    _mode(mock_context)
+    plugin.initialize(mock_context)
+    plugin.register_ui(mock_ui_builder)
+    _mode(mock_context, "cue_maker")
 
-        plugin._on_track_changed()
+    with patch.object(plugin, "_rebuild_tree") as mock_rebuild:
+        plugin._on_track_deleted(filepath=Path("/music/a.mp3"))
         mock_rebuild.assert_called_once()
 
 
@@ -372,8 +517,8 @@ def test_rebuild_tree_queries_database(qapp, plugin, mock_context, mock_ui_build
 
     # Mock track query
     track_rows = [
-        {"filepath": "/music/song1.mp3"},
-        {"filepath": "/music/song2.mp3"},
+        {"id": 1, "filepath": "/music/song1.mp3"},
+        {"id": 2, "filepath": "/music/song2.mp3"},
     ]
     mock_conn.execute.return_value.fetchall.side_effect = [track_rows, []]
 
@@ -391,36 +536,33 @@ def test_rebuild_tree_with_playlists(qapp, plugin, mock_context, mock_ui_builder
     mock_conn = Mock()
     mock_context.database.conn = mock_conn
 
-    track_rows = [{"filepath": "/music/song1.mp3"}]
+    track_rows = [{"id": 1, "filepath": "/music/song1.mp3"}]
     playlist_rows = [
         {"id": 1, "name": "Favorites", "track_count": 5},
     ]
 
     mock_conn.execute.return_value.fetchall.side_effect = [track_rows, playlist_rows]
 
-    with patch.object(plugin.widget, "build_tree") as mock_build:
+    with patch.object(plugin.widget, "show_trie") as mock_show:
         plugin._rebuild_tree()
 
-        # Verify build_tree was called with both tracks and playlists
-        mock_build.assert_called_once()
-        call_args = mock_build.call_args[0]
-        assert len(call_args[0]) == 1  # filepaths
+        # Verify show_trie was called with both tracks and playlists
+        mock_show.assert_called_once()
+        call_args = mock_show.call_args[0]
+        assert len(call_args[0]) == 1  # tracks
         assert len(call_args[1]) == 1  # playlists
 
 
 def test_on_item_clicked_directory(qapp, plugin, mock_context, mock_ui_builder) -> None:  # type: ignore
-    """Test clicking directory node filters tracks recursively."""
+    """Test clicking directory node filters tracks recursively, from the trie."""
     plugin.initialize(mock_context)
     plugin.register_ui(mock_ui_builder)
+    plugin.trie = PathTrie.from_filepaths(
+        ["/music/rock/song1.mp3", "/music/rock/live/song2.mp3", "/music/rockabilly/song3.mp3"]
+    )
 
-    # Setup mock database
     mock_conn = Mock()
     mock_context.database.conn = mock_conn
-    track_rows = [
-        {"filepath": "/music/rock/song1.mp3"},
-        {"filepath": "/music/rock/song2.mp3"},
-    ]
-    mock_conn.execute.return_value.fetchall.return_value = track_rows
 
     # Create mock index for directory node
     mock_item = Mock()
@@ -432,17 +574,18 @@ def test_on_item_clicked_directory(qapp, plugin, mock_context, mock_ui_builder)
         mock_index = Mock(spec=QModelIndex)
         plugin._on_item_clicked(mock_index)
 
-    # Verify database query used LIKE for recursive filtering
-    mock_conn.execute.assert_called()
-    call_args = mock_conn.execute.call_args
-    assert "LIKE" in call_args[0][0]
-    assert call_args[0][1] == ("/music/rock/%",)
+    # No database query: the subtree is a range of the trie order
+    mock_conn.execute.assert_not_called()
 
     # Verify LOAD_TRACK_LIST was emitted
     from jukebox.core.event_bus import Events
 
     mock_context.emit.assert_called_once()
     assert mock_context.emit.call_args[0][0] == Events.LOAD_TRACK_LIST
+    assert mock_context.emit.call_args[1]["filepaths"] == [
+        Path("/music/rock/song1.mp3"),
+        Path("/music/rock/live/song2.mp3"),
+    ]
 
 
 def test_on_item_clicked_playlist(qapp, plugin, mock_context, mock_ui_builder) -> None:  # type: ignore
@@ -543,10 +686,7 @@ def test_filepaths_converted_to_path_objects(qapp, plugin, mock_context, mock_ui
     plugin.initialize(mock_context)
     plugin.register_ui(mock_ui_builder)
 
-    mock_conn = Mock()
-    mock_context.database.conn = mock_conn
-    track_rows = [{"filepath": "/music/song1.mp3"}]
-    mock_conn.execute.return_value.fetchall.return_value = track_rows
+    plugin.trie = PathTrie.from_filepaths(["/music/song1.mp3"])
 
     # Click a "directory" node
     mock_item = Mock()
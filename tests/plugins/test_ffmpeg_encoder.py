@@ -0,0 +1,228 @@
+"""FFmpegEncoder writer thread: queued frames, buffer reuse, backpressure, failures.
+
+FFmpeg is replaced by a fake process whose stdin records what it receives.
+"""
+
+import io
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from plugins.video_exporter.renderers import ffmpeg_encoder
+from plugins.video_exporter.renderers.ffmpeg_encoder import FFmpegEncoder, mux_segments
+
+W, H, FPS = 16, 8, 30
+
+
+class _FakeStdin:
+    def __init__(self, process: "_FakeProcess") -> None:
+        self.process = process
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data: memoryview) -> int:
+        if not self.process.gate.wait(timeout=5) or self.process.returncode is not None:
+            raise BrokenPipeError("ffmpeg exited")
+        if self.process.fail_writes:
+            self.process.returncode = 1
+            raise BrokenPipeError("ffmpeg exited")
+        self.data += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def fileno(self) -> int:
+        raise io.UnsupportedOperation("fileno")
+
+
+class _FakeProcess:
+    instances: list["_FakeProcess"] = []
+
+    def __init__(self, cmd: list[str], **kwargs: object) -> None:
+        self.cmd = cmd
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail_writes = False
+        self.returncode: int | None = None
+        self.stdin: _FakeStdin | None = _FakeStdin(self)
+        # L'encodeur remet stdin à None en fin d'encodage
+        self.stdin_data = self.stdin.data
+        self.stderr = io.BytesIO(b"Invalid data found when processing input")
+        _FakeProcess.instances.append(self)
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+    def communicate(self, timeout: float | None = None) -> tuple[bytes, bytes]:
+        if self.returncode is None:
+            self.returncode = 0
+        return b"", b""
+
+    def wait(self, timeout: float | None = None) -> int:
+        self.communicate()
+        assert self.returncode is not None
+        return self.returncode
+
+    def terminate(self) -> None:
+        if self.returncode is None:
+            self.returncode = -15
+        self.gate.set()
+
+    kill = terminate
+
+
+@pytest.fixture
+def encoder(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> FFmpegEncoder:
+    monkeypatch.setattr(ffmpeg_encoder.shutil, "which", lambda _name: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(ffmpeg_encoder.subprocess, "Popen", _FakeProcess)
+    _FakeProcess.instances.clear()
+    return FFmpegEncoder(
+        tmp_path / "out.mp4", W, H, FPS, tmp_path / "a.wav", 0.0, 1.0, queue_frames=2
+    )
+
+
+def _process() -> _FakeProcess:
+    return _FakeProcess.instances[-1]
+
+
+def _frames(count: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (H, W, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def test_frames_are_written_in_order_and_buffers_reused(encoder: FFmpegEncoder) -> None:
+    encoder.start()
+    frames = _frames(6)
+    written: list[int] = []
+    used_buffers = set()
+    for i, frame in enumerate(frames):
+        buffer = encoder.frame_buffer()
+        used_buffers.add(id(buffer))
+        buffer[...] = frame
+        encoder.write_frame(buffer, on_written=lambda i=i: written.append(i))
+    # Vue non contiguë : écrite via une copie
+    encoder.write_frame(np.asfortranarray(frames[0]))
+    encoder.finish()
+
+    assert bytes(_process().stdin_data) == b"".join(f.tobytes() for f in [*frames, frames[0]])
+    assert written == list(range(6))
+    # File de 2 frames : quelques tampons suffisent
+    assert len(used_buffers) <= 4
+    assert encoder.frame_count == encoder.stats().frames == 7
+
+
+def test_full_queue_blocks_the_renderer(encoder: FFmpegEncoder) -> None:
+    encoder.start()
+    process = _process()
+    process.gate.clear()
+    frames = _frames(4)
+    # Une frame en cours d'écriture, deux en file : la quatrième attend
+    for frame in frames[:3]:
+        encoder.write_frame(frame)
+    blocked = threading.Thread(target=encoder.write_frame, args=(frames[3],))
+    blocked.start()
+    time.sleep(0.1)
+    assert blocked.is_alive()
+
+    process.gate.set()
+    blocked.join(timeout=5)
+    encoder.drain()
+    stats = encoder.stats()
+    assert stats.frames == 4
+    assert stats.backpressure_s > 0.05
+    assert stats.stalled_writes >= 1
+    assert stats.max_queued == 2
+
+
+def test_ffmpeg_failure_is_raised(encoder: FFmpegEncoder) -> None:
+    encoder.start()
+    _process().fail_writes = True
+    released: list[int] = []
+    encoder.write_frame(_frames(1)[0], on_written=lambda: released.append(0))
+    with pytest.raises(RuntimeError, match="Invalid data found"):
+        encoder.drain()
+    with pytest.raises(RuntimeError, match="FFmpeg"):
+        encoder.write_frame(_frames(1)[0])
+    assert released == [0]
+
+
+def test_cancel_stops_a_blocked_writer(encoder: FFmpegEncoder) -> None:
+    encoder.start()
+    process = _process()
+    process.gate.clear()
+    released: list[int] = []
+    for i, frame in enumerate(_frames(3)):
+        encoder.write_frame(frame, on_written=lambda i=i: released.append(i))
+
+    encoder.cancel()
+    assert sorted(released) == [0, 1, 2]
+    assert process.returncode is not None
+    assert process.stdin_data == b""
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "fades"),
+    [
+        (0.0, 10.0, ["fade=t=in:st=0:d=1.0"]),
+        (10.0, 20.0, []),
+        (20.0, 30.0, ["fade=t=out:st=9.0:d=1.0"]),
+    ],
+    ids=["first", "middle", "last"],
+)
+def test_segment_encoder_is_video_only_with_its_fades(
+    encoder: FFmpegEncoder, tmp_path: Path, start: float, end: float, fades: list[str]
+) -> None:
+    segment = FFmpegEncoder(
+        tmp_path / "seg.mp4",
+        W,
+        H,
+        FPS,
+        None,
+        0.0,
+        30.0,
+        timeline_start=start,
+        timeline_end=end,
+    )
+    segment.start()
+    cmd = _process().cmd
+    segment.cancel()
+
+    assert cmd.count("-i") == 1
+    assert "-c:a" not in cmd and "-af" not in cmd
+    assert (cmd[cmd.index("-vf") + 1].split(",") if "-vf" in cmd else []) == fades
+    assert cmd[-1] == str(tmp_path / "seg.mp4")
+
+
+def test_segments_are_joined_without_reencoding(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(ffmpeg_encoder.shutil, "which", lambda _name: "/usr/bin/ffmpeg")
+    calls: list[tuple[list[str], str]] = []
+
+    def run(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess:
+        concat_list = Path(cmd[cmd.index("concat") + 4])
+        calls.append((cmd, concat_list.read_text()))
+        return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+    monkeypatch.setattr(ffmpeg_encoder.subprocess, "run", run)
+    segments = [tmp_path / "00000-a.mp4", tmp_path / "it's.mp4"]
+    output = mux_segments(segments, tmp_path / "out.mp4", tmp_path / "a.wav", 5.0, 30.0)
+
+    cmd, concat_list = calls[0]
+    assert output == tmp_path / "out.mp4"
+    assert cmd[cmd.index("-c:v") + 1] == "copy"
+    assert cmd[cmd.index("-ss") + 1] == "5.0"
+    assert concat_list.splitlines() == [
+        f"file '{segments[0]}'",
+        f"file '{tmp_path}/it'\\''s.mp4'",
+    ]
+    # Liste temporaire supprimée
+    assert not list(tmp_path.glob(".*segments.txt"))
@@ -0,0 +1,132 @@
+"""Render-time layer culling, static layer reuse and the quality scheduler."""
+
+import time
+
+import numpy as np
+from PIL import Image
+
+from plugins.video_exporter.layers.base import BaseVisualLayer
+from plugins.video_exporter.layers.text_layer import TextLayer
+from plugins.video_exporter.layers.vjing_layer import VJingLayer
+from plugins.video_exporter.renderers.compositor import Compositor, LayerPixels
+from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+
+W, H, FPS, SR = 64, 48, 10, 8000
+
+
+class _CountingLayer(BaseVisualLayer):
+    """Red square; counts its renders, costs cost * (QUALITY_LEVELS - quality)."""
+
+    QUALITY_LEVELS = 3
+
+    def __init__(self, frames: tuple[int, int] = (0, 30), cost: float = 0.0) -> None:
+        self.frames = frames
+        self.cost = cost
+        self.rendered: list[int] = []
+        super().__init__(W, H, FPS, np.zeros(100, np.float32), 1000, 3.0)
+
+    def render(self, frame_idx: int, time_pos: float) -> Image.Image:
+        time.sleep(self.cost * (self.QUALITY_LEVELS - self.quality))
+        self.rendered.append(frame_idx)
+        image = self.create_transparent_image()
+        image.paste((255, 0, 0, 200), (10, 5, 20, 8))
+        return image
+
+    def active_frames(self) -> tuple[int, int]:
+        return self.frames
+
+
+class _StaticLayer(_CountingLayer):
+    def content_key(self, frame_idx: int, time_pos: float) -> str:
+        return "square"
+
+
+def _renderer(*layers: BaseVisualLayer) -> FrameRenderer:
+    renderer = FrameRenderer(W, H, FPS, np.zeros(3 * SR, np.float32), SR, 3.0, {}, {})
+    renderer.layers.extend(layers)
+    return renderer
+
+
+def test_invisible_layers_are_skipped() -> None:
+    layer = _CountingLayer(frames=(0, 5))
+    renderer = _renderer(layer)
+    frames = [renderer.render_frame(i, i / FPS).copy() for i in range(10)]
+
+    assert layer.rendered == [0, 1, 2, 3, 4]
+    assert frames[4][6, 12].tolist() == [200, 0, 0]
+    assert not frames[5].any()
+
+
+def test_static_layers_reuse_their_pixels() -> None:
+    layer = _StaticLayer()
+    renderer = _renderer(layer)
+    frames = [renderer.render_frame(i, i / FPS).copy() for i in range(5)]
+
+    assert layer.rendered == [0]
+    assert all(np.array_equal(frame, frames[0]) for frame in frames)
+    assert frames[0][6, 12].tolist() == [200, 0, 0]
+
+
+def test_text_layer_draws_only_its_region() -> None:
+    layer = TextLayer(320, 240, FPS, np.zeros(100, np.float32), SR, 3.0, artist="A", title="T")
+    compositor = Compositor(320, 240)
+    keys = set()
+    for frame_idx in range(30):
+        time_pos = frame_idx / FPS
+        image = layer.render(frame_idx, time_pos)
+        box = image.getbbox()
+        expected, frame = compositor.new_frame(), compositor.new_frame()
+        if box is not None:
+            compositor.composite(expected, LayerPixels(np.asarray(image.crop(box)), *box[:2]))
+        pixels = layer.render_pixels(frame_idx, time_pos, None)
+        if pixels is not None:
+            compositor.composite(frame, pixels)
+        assert np.array_equal(frame, expected), frame_idx
+
+        region = layer.dirty_region(frame_idx, time_pos)
+        assert box is None or (region[0] <= box[0] and region[2] >= box[2])
+        assert layer.is_visible(frame_idx, time_pos) == (box is not None), frame_idx
+        keys.add(layer.content_key(frame_idx, time_pos))
+
+    # Texte fixe entre les fondus (1 s d'entrée, 1 s de sortie) : une seule clé
+    steady = {layer.content_key(i, i / FPS) for i in range(11, 20)}
+    assert len(steady) == 1
+    assert len(keys) > 10
+
+
+def test_quality_drops_under_budget_and_recovers() -> None:
+    layer = _CountingLayer(cost=0.004)
+    renderer = _renderer(layer, _CountingLayer())
+    renderer.frame_time_budget = 0.006
+    for i in range(30):
+        renderer.render_frame(i, i / FPS)
+    # 12 ms au niveau 0, 8 ms au niveau 1 : la couche coûteuse descend au niveau 2
+    assert layer.quality == 2
+    assert renderer.layers[1].quality == 0
+    assert renderer.can_lower_quality()
+
+    renderer.frame_time_budget = 1.0
+    for i in range(30):
+        renderer.render_frame(i, i / FPS)
+    assert layer.quality == 0
+
+
+def test_vjing_lower_quality_skips_final_pass() -> None:
+    t = np.arange(3 * SR) / SR
+    audio = np.sin(2 * np.pi * 60 * t).astype(np.float32)
+    layer = VJingLayer(W, H, FPS, audio, SR, 3.0, use_all_effects=True, use_gpu=False)
+    calls: list[int] = []
+
+    def bloom(img: Image.Image, frame_idx: int, time_pos: float, ctx: dict) -> None:
+        calls.append(frame_idx)
+
+    layer._render_bloom = bloom  # type: ignore[method-assign]
+
+    layer.render_state(0, 0.0, layer.advance(0, 0.0))
+    layer.set_quality(5)
+    assert layer.quality == VJingLayer.QUALITY_LEVELS - 1
+    state = layer.advance(1, 0.1)
+    layer.render_state(1, 0.1, state)
+
+    assert "bloom" in state.final_pass
+    assert calls == [0]
@@ -0,0 +1,149 @@
+"""Fast preview: keyframe interpolation, adaptive frame step, export time projection.
+
+The fake renderer draws frame N as a flat gray of N * 10 and records the
+frames its layers advance through.
+"""
+
+import time
+
+import numpy as np
+import pytest
+from PySide6.QtCore import Qt
+
+from plugins.video_exporter.preview_worker import PreviewPlaybackWorker
+from plugins.video_exporter.renderers.compositor import Compositor
+from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+from plugins.video_exporter.renderers.preview_renderer import (
+    MAX_FRAME_STEP,
+    PreviewRenderer,
+    preview_size,
+    project_export_time,
+)
+
+W, H, FPS, SR = 32, 24, 10, 8000
+
+
+class _FakeRenderer:
+    def __init__(self, cost: float = 0.0) -> None:
+        self.fps = FPS
+        self.width, self.height = W, H
+        self.compositor = Compositor(W, H)
+        self.cost = cost
+        self.advanced: list[int] = []
+        self.rendered: list[int] = []
+
+    def advance(self, frame_idx: int, time_pos: float) -> list[int]:
+        self.advanced.append(frame_idx)
+        return [frame_idx]
+
+    def render_frame(self, frame_idx: int, time_pos: float, states: list[int]) -> np.ndarray:
+        assert states == [frame_idx]
+        time.sleep(self.cost)
+        self.rendered.append(frame_idx)
+        return np.full((H, W, 3), frame_idx * 10 % 256, np.uint8)
+
+    def reset_layer_timings(self) -> None:
+        pass
+
+    def can_lower_quality(self) -> bool:
+        return False
+
+
+def test_frames_between_keyframes_are_interpolated() -> None:
+    renderer = _FakeRenderer()
+    preview = PreviewRenderer(renderer, 20, frame_step=4, adaptive=False)  # type: ignore[arg-type]
+    values = [int(preview.render(i)[0, 0, 0]) for i in range(20)]
+
+    assert values == [i * 10 for i in range(20)]
+    assert renderer.rendered == [0, 4, 8, 12, 16, 19]
+    # Les couches avancent sur chaque frame, dans l'ordre
+    assert renderer.advanced == list(range(20))
+
+
+def test_interpolation_rounds_between_keyframes() -> None:
+    renderer = _FakeRenderer()
+    preview = PreviewRenderer(renderer, 20, frame_step=3, adaptive=False)  # type: ignore[arg-type]
+    # Keyframes 0 et 3 (0 et 30) : 10 et 20 exactement
+    assert [int(preview.render(i)[0, 0, 0]) for i in range(4)] == [0, 10, 20, 30]
+
+
+def test_seek_renders_the_target_frame() -> None:
+    renderer = _FakeRenderer()
+    preview = PreviewRenderer(renderer, 100, frame_step=4, adaptive=False)  # type: ignore[arg-type]
+    preview.render(0)
+    assert int(preview.render(50)[0, 0, 0]) == 500 % 256
+    assert renderer.rendered == [0, 4, 50, 54]
+    # Retour en arrière dans les keyframes courantes : pas de nouveau rendu
+    preview.render(52)
+    preview.render(51)
+    assert renderer.rendered == [0, 4, 50, 54]
+
+
+def test_keyframes_match_the_export_render() -> None:
+    t = np.arange(3 * SR) / SR
+    audio = (np.sin(2 * np.pi * 60 * t) * (0.5 + 0.5 * np.sign(np.sin(4 * np.pi * t)))).astype(
+        np.float32
+    )
+
+    def renderer() -> FrameRenderer:
+        return FrameRenderer(
+            W, H, FPS, audio, SR, 3.0, {"vjing": True}, {}, use_gpu=False, use_all_effects=True
+        )
+
+    export = renderer()
+    frames = [export.render_frame(i, i / FPS).copy() for i in range(30)]
+    preview = PreviewRenderer(renderer(), 30, frame_step=3, adaptive=False)
+    for i in range(0, 30, 3):
+        assert np.array_equal(preview.render(i), frames[i]), i
+
+
+def test_frame_step_follows_keyframe_cost() -> None:
+    # 25 ms par keyframe à 10 fps : une keyframe toutes les frames suffit
+    preview = PreviewRenderer(_FakeRenderer(cost=0.025), 100)  # type: ignore[arg-type]
+    for i in range(10):
+        preview.render(i)
+    assert preview.frame_step == 1
+    assert not preview.needs_lower_resolution
+
+    # 250 ms : au moins 3 frames par keyframe, borné par max_frame_step
+    slow = PreviewRenderer(_FakeRenderer(cost=0.25), 100, max_frame_step=2)  # type: ignore[arg-type]
+    for i in range(10):
+        slow.render(i)
+    assert slow.frame_step == 2
+    assert slow.needs_lower_resolution
+
+
+def test_export_time_is_projected_from_layer_costs() -> None:
+    timings = {"VJingLayer": (0.004, 0.001), "TextLayer": (0.0005, 0.0005)}
+    projected = project_export_time(timings, (480, 270), (1920, 1080), 1000, workers=4)
+    # 16 fois plus de pixels, 1000 frames sur 4 workers
+    assert projected == pytest.approx({"VJingLayer": 20.0, "TextLayer": 4.0})
+    assert preview_size(1920, 1080, 0.5) == (960, 540)
+    assert preview_size(1080, 1920, 0.125) == (132, 240)
+    assert MAX_FRAME_STEP >= 4
+
+
+def test_playback_worker_streams_frames_and_loops(qapp) -> None:  # type: ignore[no-untyped-def]
+    preview = PreviewRenderer(_FakeRenderer(), 5, adaptive=False)  # type: ignore[arg-type]
+    worker = PreviewPlaybackWorker(preview, start_frame=2)
+    shown: list[int] = []
+    loops: list[bool] = []
+
+    def on_frame(frame_idx: int, frame: np.ndarray) -> None:
+        assert int(frame[0, 0, 0]) == frame_idx * 10
+        shown.append(frame_idx)
+        worker.frame_shown()
+
+    worker.frame_ready.connect(on_frame, Qt.ConnectionType.DirectConnection)
+    worker.looped.connect(lambda: loops.append(True), Qt.ConnectionType.DirectConnection)
+    worker.start()
+    time.sleep(0.8)
+    worker.stop()
+    assert worker.wait(2000)
+
+    # 10 fps : frames 2, 3, 4 (une frame en retard peut être sautée) puis retour à 0
+    assert loops
+    first_pass = shown[: shown.index(0)]
+    assert first_pass[0] == 2
+    assert first_pass == sorted(set(first_pass))
+    assert first_pass[-1] <= 4
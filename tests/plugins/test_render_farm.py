@@ -0,0 +1,97 @@
+"""RenderFarm: export frames rendered in worker processes.
+
+Workers rebuild the FrameRenderer from its arguments and the shared audio
+analysis; the frames must be the ones sequential rendering gives.
+"""
+
+import numpy as np
+import pytest
+
+from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+from plugins.video_exporter.renderers.render_farm import RenderFarm, SharedArrays
+
+SR = 22050
+FPS = 15
+DURATION = 2.0
+TOTAL = int(DURATION * FPS)
+
+RENDERER_KWARGS = {
+    "width": 64,
+    "height": 48,
+    "fps": FPS,
+    "sr": SR,
+    "duration": DURATION,
+    "layers_config": {"waveform": True, "dynamics": True, "vjing": True, "text": True},
+    "track_metadata": {"artist": "Artist", "title": "Title", "genre": "T"},
+    "use_gpu": False,
+    "use_all_effects": True,
+    "simultaneous_effects": 3,
+    "enabled_post_processing": ["feedback", "glitch", "shockwave", "scanlines", "timestretch"],
+}
+
+
+def _audio() -> np.ndarray:
+    t = np.arange(int(SR * DURATION)) / SR
+    gate = 0.5 + 0.5 * np.sign(np.sin(2 * np.pi * 2 * t))
+    noise = np.random.default_rng(1).standard_normal(len(t)) * 0.1
+    return (np.sin(2 * np.pi * 60 * t) * gate * 0.5 + noise).astype(np.float32)
+
+
+def _collect(farm: RenderFarm) -> list[bytes]:
+    frames: dict[int, bytes] = {}
+    while len(frames) < farm.total_frames:
+        for frame_idx in farm.poll(timeout=1.0):
+            frames[frame_idx] = farm.frame(frame_idx).tobytes()
+            farm.release(frame_idx)
+    return [frames[i] for i in range(farm.total_frames)]
+
+
+def test_farm_frames_match_sequential() -> None:
+    audio = _audio()
+    sequential = FrameRenderer(audio=audio, **RENDERER_KWARGS)
+    expected = [sequential.render_frame(i, i / FPS).tobytes() for i in range(TOTAL)]
+
+    analysis = FrameRenderer(audio=audio, **RENDERER_KWARGS).analysis_arrays()
+    assert set(analysis) == {"WaveformLayer", "DynamicsLayer", "VJingLayer"}
+    # Peu de slots : les workers attendent que l'encodeur libère les leurs
+    farm = RenderFarm(
+        RENDERER_KWARGS, audio, analysis, TOTAL, 2, chunk_frames=3, slots_per_worker=2
+    )
+    with farm:
+        assert _collect(farm) == expected
+
+
+def test_layers_built_from_analysis_skip_audio_analysis(monkeypatch: pytest.MonkeyPatch) -> None:
+    from plugins.video_exporter.layers.vjing_layer import VJingLayer
+
+    audio = _audio()
+    analysis = FrameRenderer(audio=audio, **RENDERER_KWARGS).analysis_arrays()
+
+    def fail(self: VJingLayer) -> None:
+        raise AssertionError("audio analysed again")
+
+    monkeypatch.setattr(VJingLayer, "_analyze_audio", fail)
+    renderer = FrameRenderer(audio=audio, layer_analysis=analysis, **RENDERER_KWARGS)
+    assert [type(layer).__name__ for layer in renderer.layers].count("VJingLayer") == 1
+
+
+def test_worker_error_is_raised() -> None:
+    farm = RenderFarm({**RENDERER_KWARGS, "unknown_option": 1}, _audio(), {}, TOTAL, 1)
+    with farm, pytest.raises(RuntimeError, match="unknown_option"):
+        _collect(farm)
+
+
+def test_shared_arrays_round_trip() -> None:
+    arrays = {"a": np.arange(10, dtype=np.float32), "b": np.ones((3, 32))}
+    shared = SharedArrays.create(arrays)
+    try:
+        attached = SharedArrays.attach(shared.name, shared.layout)
+        for key, array in arrays.items():
+            assert np.array_equal(attached[key], array)
+            assert attached[key].dtype == array.dtype
+        with pytest.raises(ValueError):
+            attached["a"][0] = 1.0
+        attached.close()
+    finally:
+        shared.close()
+        shared.unlink()
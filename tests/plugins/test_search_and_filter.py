@@ -1,17 +1,62 @@
 """Tests for search and filter plugin."""
 
+from typing import Any
 from unittest.mock import Mock, patch
 
-from PySide6.QtCore import QModelIndex
+import numpy as np
+import pytest
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, Qt
 
 from plugins.search_and_filter import (
     GenreFilterButton,
     GenreFilterProxyModel,
     GenreFilterState,
     SearchAndFilterPlugin,
+    TrackFilterIndex,
+    compile_genre_expr,
 )
 
 
+class TracksModel(QAbstractListModel):
+    """Minimal source model exposing ``tracks`` like TrackListModel."""
+
+    def __init__(self, tracks: list[dict[str, Any]]) -> None:
+        super().__init__()
+        self.tracks = tracks
+
+    def rowCount(  # noqa: N802
+        self, parent: QModelIndex | QPersistentModelIndex | None = None
+    ) -> int:
+        return len(self.tracks)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = 0) -> Any:
+        return self.tracks[index.row()].get("title")
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        self.layoutAboutToBeChanged.emit()
+        self.tracks.sort(key=lambda t: t["title"], reverse=order == Qt.SortOrder.DescendingOrder)
+        self.layoutChanged.emit()
+
+    def append(self, track: dict[str, Any]) -> None:
+        row = len(self.tracks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.tracks.append(track)
+        self.endInsertRows()
+
+    def remove(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.tracks.pop(row)
+        self.endRemoveRows()
+
+    def set_genre(self, row: int, genre: str) -> None:
+        self.tracks[row]["genre"] = genre
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 0))
+
+
+def _visible_titles(proxy: GenreFilterProxyModel) -> list[str]:
+    return sorted(proxy.index(row, 0).data() for row in range(proxy.rowCount()))
+
+
 class TestGenreFilterState:
     """Test GenreFilterState enum."""
 
@@ -438,3 +483,118 @@ class TestSearchAndFilterPlugin:
         # Verify filter updated
         assert plugin.proxy._on_genres == {"H"}
         assert plugin.proxy._off_genres == set()
+
+
+class TestGenreExpr:
+    """compile_genre_expr: per-track call and vectorized mask agree."""
+
+    @pytest.mark.parametrize(
+        "expr", ["D", "not H", "D and not W", "(D or H) and not P", "not (W or T) or D"]
+    )
+    def test_mask_matches_call(self, expr: str) -> None:
+        genres = ["D", "H-W", "D-P-*3", "", "*5", "T-D", "W-H-D-P", "Z"]
+        index = TrackFilterIndex()
+        index.rebuild([{"genre": genre} for genre in genres])
+        fn = compile_genre_expr(expr, {"D", "H", "W", "P", "T"})
+
+        expected = [
+            fn({c for c in genre.split("-") if c and not c.startswith("*")}) for genre in genres
+        ]
+
+        assert fn.mask(index).tolist() == expected
+
+    def test_unknown_code_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            compile_genre_expr("D and X", {"D"})
+
+
+class TestFilterIndexMaintenance:
+    """The proxy keeps its index in sync with source model changes."""
+
+    def _tracks(self) -> list[dict[str, Any]]:
+        return [
+            {"artist": "Daft Punk", "title": "Get Lucky", "filename": "a.mp3", "genre": "H-*4"},
+            {"artist": "Moby", "title": "Porcelain", "filename": "b.mp3", "genre": "D"},
+            {"artist": "Daft Punk", "title": "Around", "filename": "c.mp3", "genre": "D-H"},
+            {"artist": "Air", "title": "Lucky Star", "filename": "d.mp3", "genre": "W"},
+        ]
+
+    def test_search_words_and_narrowing(self, qapp) -> None:  # type: ignore
+        proxy = GenreFilterProxyModel()
+        proxy.setSourceModel(TracksModel(self._tracks()))
+
+        proxy.set_search_text("Luc")
+        assert _visible_titles(proxy) == ["Get Lucky", "Lucky Star"]
+        proxy.set_search_text("lucky daft")  # typing on: narrowed from previous mask
+        assert _visible_titles(proxy) == ["Get Lucky"]
+        proxy.set_search_text("punk")
+        assert _visible_titles(proxy) == ["Around", "Get Lucky"]
+
+    def test_rows_inserted_removed_and_changed(self, qapp) -> None:  # type: ignore
+        model = TracksModel(self._tracks())
+        proxy = GenreFilterProxyModel()
+        proxy.setSourceModel(model)
+        proxy.set_genre_filter({"D"}, set())
+        assert _visible_titles(proxy) == ["Around", "Porcelain"]
+
+        model.append({"artist": "X", "title": "New", "filename": "e.mp3", "genre": "D-T"})
+        assert _visible_titles(proxy) == ["Around", "New", "Porcelain"]
+
+        model.remove(1)  # Porcelain
+        assert _visible_titles(proxy) == ["Around", "New"]
+
+        model.set_genre(0, "D")  # Get Lucky
+        assert _visible_titles(proxy) == ["Around", "Get Lucky", "New"]
+        assert len(proxy._index) == len(model.tracks)
+
+    def test_sort_permutes_index(self, qapp) -> None:  # type: ignore
+        model = TracksModel(self._tracks())
+        proxy = GenreFilterProxyModel()
+        proxy.setSourceModel(model)
+        proxy.set_genre_expr(compile_genre_expr("H and not W", {"H", "W"}))
+        accept = proxy._accept_mask(model.tracks)
+
+        proxy.sort(0)
+
+        assert not proxy._index_stale  # permuted, not rebuilt
+        assert proxy._accept is not None and proxy._accept is not accept
+        assert _visible_titles(proxy) == ["Around", "Get Lucky"]
+        assert [t["title"] for t in model.tracks][:2] == ["Around", "Get Lucky"]
+        assert proxy._accept.tolist() == [True, True, False, False]
+
+    def test_model_reset_rebuilds_index(self, qapp) -> None:  # type: ignore
+        model = TracksModel(self._tracks())
+        proxy = GenreFilterProxyModel()
+        proxy.setSourceModel(model)
+        proxy.set_genre_filter({"W"}, set())
+        assert _visible_titles(proxy) == ["Lucky Star"]
+
+        model.beginResetModel()
+        model.tracks = [{"artist": "", "title": "Only", "filename": "", "genre": "W"}]
+        model.endResetModel()
+
+        assert _visible_titles(proxy) == ["Only"]
+
+    def test_min_rating(self, qapp) -> None:  # type: ignore
+        model = TracksModel(self._tracks())
+        proxy = GenreFilterProxyModel()
+        proxy.setSourceModel(model)
+
+        proxy.set_min_rating(3)
+        assert _visible_titles(proxy) == ["Get Lucky"]
+
+        model.set_genre(1, "D-*5")  # Porcelain
+        assert _visible_titles(proxy) == ["Get Lucky", "Porcelain"]
+        proxy.set_min_rating(0)
+        assert len(_visible_titles(proxy)) == 4
+
+    def test_longer_texts_are_not_truncated(self) -> None:
+        index = TrackFilterIndex()
+        index.rebuild([{"title": "a"}])
+        long_title = "a very long title with a needle at the end"
+
+        index.insert_rows([{"title": long_title}, {"title": "a"}], 0, 0)
+        index.update_rows([{"title": long_title}, {"title": long_title + " 2"}], 1, 1)
+
+        assert index.search(["needle"], np.arange(2)).tolist() == [True, True]
+        assert index.search(["end 2"], np.arange(2)).tolist() == [False, True]
@@ -0,0 +1,211 @@
+"""Resumable exports: segment plan and keys, segment writer, skipped segments.
+
+FFmpeg is replaced by a fake encoder that writes the raw frames it receives.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from plugins.video_exporter.export_worker import VideoExportWorker
+from plugins.video_exporter.renderers.frame_renderer import FrameRenderer
+from plugins.video_exporter.renderers.segment_cache import (
+    Segment,
+    SegmentCache,
+    SegmentWriter,
+    export_fingerprint,
+    export_name,
+    plan_segments,
+)
+
+W, H, FPS, SR = 32, 24, 10, 8000
+
+
+class _FakeEncoder:
+    def __init__(self, segment: Segment) -> None:
+        self.segment = segment
+        self.width, self.height = W, H
+        self.data = bytearray()
+        self.cancelled = False
+
+    def start(self) -> None:
+        self.segment.partial_path.write_bytes(b"")
+
+    def write_frame(self, frame: np.ndarray, on_written=None) -> None:  # type: ignore[no-untyped-def]
+        self.data += frame.tobytes()
+        if on_written is not None:
+            on_written()
+
+    def drain(self) -> None:
+        pass
+
+    def finish(self) -> Path:
+        self.segment.partial_path.write_bytes(bytes(self.data))
+        return self.segment.partial_path
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+def _frames(count: int, first: int = 0) -> list[np.ndarray]:
+    return [np.full((H, W, 3), (first + i) % 256, np.uint8) for i in range(count)]
+
+
+def _segments(tmp_path: Path, ranges: list[tuple[int, int]]) -> list[Segment]:
+    cache = SegmentCache(tmp_path, export_name(tmp_path / "a.flac", 0.0, 6.0, W, H))
+    segments = cache.plan(ranges, "export", [((0, 60), "layer")])
+    cache.prepare(segments)
+    return segments
+
+
+def test_segments_hold_the_fades() -> None:
+    assert plan_segments(60, FPS, 2.0) == [(0, 20), (20, 40), (40, 60)]
+    # Reste de 5 frames, plus court que le fondu de 1 s : fusionné
+    assert plan_segments(65, FPS, 2.0, fade_duration=1.0) == [(0, 20), (20, 40), (40, 65)]
+    # Segments d'au moins un fondu
+    assert plan_segments(40, FPS, 0.5, fade_duration=1.5) == [(0, 15), (15, 40)]
+    assert plan_segments(5, FPS, 2.0, fade_duration=1.0) == [(0, 5)]
+
+
+def test_layer_change_only_rekeys_the_segments_it_draws_on(tmp_path: Path) -> None:
+    cache = SegmentCache(tmp_path, "0" * 32)
+    ranges = plan_segments(60, FPS, 2.0)
+    layers = [((0, 60), "vjing"), ((0, 25), "intro-v1")]
+    before = cache.plan(ranges, "export", layers)
+    after = cache.plan(ranges, "export", [((0, 60), "vjing"), ((0, 25), "intro-v2")])
+    assert [a.key == b.key for a, b in zip(before, after, strict=True)] == [False, False, True]
+
+    # Réglage global (audio, encodeur) : tout change
+    audio = np.zeros(SR, np.float32)
+    other = cache.plan(ranges, export_fingerprint(audio, {"crf": 18}), layers)
+    assert not {s.key for s in other} & {s.key for s in before}
+    assert export_fingerprint(audio, {"crf": 18}) != export_fingerprint(audio, {"crf": 23})
+
+
+def test_prepare_drops_stale_segments_and_old_exports(tmp_path: Path) -> None:
+    unrelated = tmp_path / "my-videos"
+    unrelated.mkdir()
+    (unrelated / "big.mp4").write_bytes(bytes(4096))
+    old_exports = []
+    for i in range(3):
+        path = tmp_path / f"{i:032x}"
+        path.mkdir()
+        (path / "00000-key.mp4").write_bytes(bytes(1000))
+        # Du plus ancien au plus récent
+        os.utime(path, (1000 + i, 1000 + i))
+        old_exports.append(path)
+
+    cache = SegmentCache(tmp_path, export_name(tmp_path / "a.flac", 0.0, 6.0, W, H))
+    cache.directory.mkdir()
+    (cache.directory / "00000-stale.mp4").write_bytes(b"x")
+    segments = cache.plan(plan_segments(60, FPS, 2.0), "export", [])
+    segments[0].path.write_bytes(bytes(1000))
+    cache.prepare(segments, max_gb=2500 / 1024**3)
+
+    assert [p.name for p in cache.directory.iterdir()] == [segments[0].path.name]
+    # 1000 octets pour l'export courant, le plus récent des autres tient encore
+    assert [path.exists() for path in old_exports] == [False, False, True]
+    # Le cache peut partager son répertoire : seuls les exports y sont évincés
+    assert unrelated.exists()
+
+
+def test_prepare_keeps_the_current_export_over_the_cap(tmp_path: Path) -> None:
+    other = tmp_path / f"{1:032x}"
+    other.mkdir()
+    (other / "00000-key.mp4").write_bytes(b"x")
+    cache = SegmentCache(tmp_path, export_name(tmp_path / "a.flac", 0.0, 6.0, W, H))
+    segments = cache.plan(plan_segments(60, FPS, 2.0), "export", [])
+    cache.directory.mkdir()
+    segments[0].path.write_bytes(bytes(100))
+
+    cache.prepare(segments, max_gb=0.0)
+
+    assert segments[0].path.exists()
+    assert not other.exists()
+
+
+def test_cancelled_export_resumes_from_complete_segments(tmp_path: Path) -> None:
+    segments = _segments(tmp_path, plan_segments(60, FPS, 2.0))
+    writer = SegmentWriter(segments, W, H, _FakeEncoder)  # type: ignore[arg-type]
+    frames = _frames(60)
+    for frame in frames[:30]:
+        buffer = writer.frame_buffer()
+        buffer[...] = frame
+        writer.write_frame(buffer)
+    writer.cancel()
+
+    assert segments[0].path.read_bytes() == b"".join(f.tobytes() for f in frames[:20])
+    assert not segments[1].path.exists()
+    assert not segments[1].partial_path.exists()
+
+    # Reprise : seuls les segments manquants sont rendus
+    missing = [s for s in _segments(tmp_path, plan_segments(60, FPS, 2.0)) if not s.path.exists()]
+    assert missing == segments[1:]
+    writer = SegmentWriter(missing, W, H, _FakeEncoder)  # type: ignore[arg-type]
+    for frame in frames[20:]:
+        writer.write_frame(frame)
+    paths = writer.finish()
+    assert b"".join(s.path.read_bytes() for s in segments) == b"".join(f.tobytes() for f in frames)
+    assert paths == [s.path for s in missing]
+    assert writer.frame_count == 40
+
+
+def test_missing_frames_fail_the_export(tmp_path: Path) -> None:
+    segments = _segments(tmp_path, plan_segments(60, FPS, 2.0))
+    writer = SegmentWriter(segments, W, H, _FakeEncoder)  # type: ignore[arg-type]
+    for frame in _frames(25):
+        writer.write_frame(frame)
+    with pytest.raises(RuntimeError, match="segments incomplete"):
+        writer.finish()
+
+
+def _renderer(**metadata: str) -> FrameRenderer:
+    t = np.arange(6 * SR) / SR
+    audio = (np.sin(2 * np.pi * 60 * t) * (0.5 + 0.5 * np.sign(np.sin(4 * np.pi * t)))).astype(
+        np.float32
+    )
+    return FrameRenderer(
+        W,
+        H,
+        FPS,
+        audio,
+        SR,
+        6.0,
+        {"vjing": True, "text": True},
+        metadata or {"artist": "A", "title": "T"},
+        use_gpu=False,
+        use_all_effects=True,
+    )
+
+
+class _RecordingEncoder:
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+
+    def frame_buffer(self) -> np.ndarray:
+        return np.empty((H, W, 3), np.uint8)
+
+    def write_frame(self, frame: np.ndarray, on_written=None) -> None:  # type: ignore[no-untyped-def]
+        self.frames.append(frame.tobytes())
+
+
+def test_skipped_segments_leave_later_frames_unchanged() -> None:
+    worker = VideoExportWorker({"layers": {}}, None)  # type: ignore[arg-type]
+    worker._num_workers = 2
+
+    full = _RecordingEncoder()
+    worker._render_parallel(_renderer(), full, range(60), FPS)
+    resumed = _RecordingEncoder()
+    frames = [*range(20, 40), *range(50, 60)]
+    worker._render_parallel(_renderer(), resumed, frames, FPS)
+
+    assert resumed.frames == [full.frames[i] for i in frames]
+
+
+def test_text_change_rekeys_text_layer_only() -> None:
+    before = _renderer(artist="A", title="T").layer_fingerprints()
+    after = _renderer(artist="A", title="Other").layer_fingerprints()
+    assert [range_ for range_, _ in before] == [(0, 60), (0, 60)]
+    assert [a == b for a, b in zip(before, after, strict=True)] == [True, False]
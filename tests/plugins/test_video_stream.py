@@ -0,0 +1,123 @@
+"""VideoFrameStream: clip timeline decoded ahead of the video background layer."""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from plugins.video_exporter.layers.video_layer import VideoBackgroundLayer  # noqa: E402
+from plugins.video_exporter.layers.video_stream import (  # noqa: E402
+    VideoFrameStream,
+    plan_clips,
+)
+
+W, H = 32, 24
+
+
+def _write_clip(path: Path, frames: int, level: int) -> Path:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (40, 30))
+    for i in range(frames):
+        image = np.full((30, 40, 3), (level + 7 * i) % 256, np.uint8)
+        image[:, :20, 0] = 255 - level
+        writer.write(image)
+    writer.release()
+    return path
+
+
+def _decoded(path: Path) -> list[np.ndarray]:
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ok, bgr = cap.read()
+        if not ok:
+            break
+        frames.append(cv2.cvtColor(cv2.resize(bgr, (W, H)), cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames
+
+
+@pytest.fixture
+def clips(tmp_path: Path) -> list[Path]:
+    return [_write_clip(tmp_path / "a.avi", 12, 10), _write_clip(tmp_path / "b.avi", 7, 150)]
+
+
+def test_clips_are_planned_end_to_end(clips: list[Path]) -> None:
+    spans = plan_clips(clips, 30)
+    assert [(s.path.name, s.start, s.length) for s in spans] == [
+        ("a.avi", 0, 12),
+        ("b.avi", 12, 7),
+        ("a.avi", 19, 11),
+    ]
+    # Trois passages au plus sur la liste, puis le plan boucle
+    assert sum(s.length for s in plan_clips(clips[1:], 100)) == 21
+
+
+def test_stream_matches_sequential_decoding(clips: list[Path]) -> None:
+    a, b = (_decoded(path) for path in clips)
+    timeline = [*a, *b, *a[:11]]
+    stream = VideoFrameStream(plan_clips(clips, 30), W, H, 30, read_ahead=4)
+
+    for frame_idx, expected in enumerate(timeline):
+        frame = stream.frame(frame_idx)
+        assert frame is not None
+        assert np.array_equal(frame, expected), frame_idx
+    assert stream.frame(30) is None
+    stream.close()
+
+
+def test_skipping_looping_and_restarting(clips: list[Path]) -> None:
+    a = _decoded(clips[0])
+    # Un seul clip, 3 passages prévus (36 frames) pour 50 : l'export reboucle
+    stream = VideoFrameStream(plan_clips(clips[:1], 50), W, H, 50, read_ahead=3)
+
+    # Frames sautées (chunks d'un autre worker de la ferme de rendu)
+    for frame_idx in [0, 1, 5, 11, 12, 40, 49]:
+        assert np.array_equal(stream.frame(frame_idx), a[frame_idx % 12]), frame_idx
+    # Retour en arrière : reprise au milieu du clip
+    assert np.array_equal(stream.frame(8), a[8])
+    assert np.array_equal(stream.frame(9), a[9])
+    stream.close()
+
+
+def test_read_ahead_is_bounded(clips: list[Path]) -> None:
+    stream = VideoFrameStream(plan_clips(clips, 30), W, H, 30, read_ahead=3)
+    stream.frame(0)
+    for _ in range(100):
+        if stream._queue is not None and stream._queue.full():
+            break
+        time.sleep(0.01)
+    assert stream._queue is not None and stream._queue.qsize() == 3
+    stream.close()
+    assert stream._thread is None
+
+
+def test_layer_streams_frames_with_clip_fades(clips: list[Path]) -> None:
+    layer = VideoBackgroundLayer(
+        W,
+        H,
+        10,
+        np.zeros(100, np.float32),
+        1000,
+        2.0,
+        video_folder=str(clips[0].parent),
+        opacity=0.5,
+        fade_duration=0.2,
+    )
+    assert layer.stream is not None
+    expected = {path.name: _decoded(path) for path in clips}
+    first = layer.stream.spans[0]
+
+    states = [layer.advance(i, i / 10) for i in range(3)]
+    for i, state in enumerate(states):
+        assert np.array_equal(state, expected[first.path.name][i])
+    # Fondu d'entrée du premier clip sur 2 frames
+    pixels = [layer.render_pixels(i, i / 10, state) for i, state in enumerate(states)]
+    assert [p.opacity for p in pixels if p is not None] == [0.0, 0.5, 1.0]
+
+    image = layer.render_state(2, 0.2, states[2])
+    assert image.mode == "RGBA"
+    assert np.array_equal(np.asarray(image)[..., 3], np.full((H, W), 127, np.uint8))
+    layer.stream.close()
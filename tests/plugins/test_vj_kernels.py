@@ -0,0 +1,152 @@
+"""Vectorized VJing kernels against the straightforward numpy versions they replace."""
+
+import math
+import threading
+
+import numpy as np
+import pytest
+
+from plugins.video_exporter.layers import vj_kernels
+from plugins.video_exporter.layers.vjing_layer import VJingLayer
+
+SR, FPS = 8000, 10
+PALETTE = [(255, 0, 0), (0, 200, 40), (10, 20, 250), (240, 240, 240)]
+
+
+def _layer(width: int = 64, height: int = 48) -> VJingLayer:
+    t = np.arange(2 * SR) / SR
+    audio = np.sin(2 * np.pi * 60 * t).astype(np.float32)
+    return VJingLayer(width, height, FPS, audio, SR, 2.0, use_all_effects=True, use_gpu=False)
+
+
+def test_julia_escape_matches_full_grid_iteration() -> None:
+    x, y = np.meshgrid(np.linspace(-2.0, 2.0, 70), np.linspace(-1.5, 1.5, 50))
+    rotation, zoom, c, max_iter = 0.4, 1.3, complex(-0.7, 0.27), 50
+
+    z = ((x * math.cos(rotation) - y * math.sin(rotation)) / zoom) + 1j * (
+        (x * math.sin(rotation) + y * math.cos(rotation)) / zoom
+    )
+    expected = np.zeros(x.shape, dtype=np.int32)
+    mask = np.ones(x.shape, dtype=bool)
+    for i in range(max_iter):
+        z = np.where(mask, z**2 + c, z)
+        escaped = (np.abs(z) > 4) & mask
+        expected[escaped] = i
+        mask[escaped] = False
+    expected[mask] = max_iter
+
+    result = vj_kernels.julia_escape(
+        x, y, math.cos(rotation), math.sin(rotation), zoom, c, max_iter
+    )
+    assert np.array_equal(result, expected)
+    assert 0 < (result == max_iter).sum() < result.size
+
+
+def test_nearest_seed_matches_argmin() -> None:
+    rng = np.random.default_rng(1)
+    seeds_x, seeds_y = rng.random(20) * 64, rng.random(20) * 48
+    # Deux graines confondues : l'indice le plus bas l'emporte, comme argmin
+    seeds_x[7], seeds_y[7] = seeds_x[3], seeds_y[3]
+    xs, ys = np.arange(32) * 2, np.arange(24) * 2
+
+    dist = (xs[np.newaxis, np.newaxis, :] - seeds_x[:, np.newaxis, np.newaxis]) ** 2 + (
+        ys[np.newaxis, :, np.newaxis] - seeds_y[:, np.newaxis, np.newaxis]
+    ) ** 2
+    assert np.array_equal(vj_kernels.nearest_seed(seeds_x, seeds_y, xs, ys), dist.argmin(axis=0))
+
+
+def test_metaball_and_plasma_fields_match_full_grids() -> None:
+    rng = np.random.default_rng(2)
+    xs, ys = np.linspace(0, 64, 40, endpoint=False), np.linspace(0, 48, 30, endpoint=False)
+    gx, gy = np.meshgrid(xs, ys)
+    balls_x, balls_y, radii = rng.random(6) * 64, rng.random(6) * 48, rng.random(6) * 10 + 5
+
+    dist_sq = (gx - balls_x[:, None, None]) ** 2 + (gy - balls_y[:, None, None]) ** 2 + 1
+    expected = ((radii**2)[:, None, None] / dist_sq).sum(axis=0)
+    field = vj_kernels.metaball_field(balls_x, balls_y, radii, xs, ys)
+    assert np.allclose(field, expected, rtol=1e-12)
+
+    t, bass, mid, energy = 1.7, 0.8, 0.3, 0.6
+    span = np.linspace(0, 4 * np.pi, 40), np.linspace(0, 4 * np.pi, 30)
+    px, py = np.meshgrid(*span)
+    radial = np.sqrt((px - 2 * np.pi) ** 2 + (py - 2 * np.pi) ** 2)
+    waves = (
+        np.sin(px + t + bass * np.pi)
+        + np.sin(py + t * 0.7 + mid * np.pi)
+        + np.sin((px + py + t * 0.5) * 0.5)
+        + np.sin(radial + t + energy * np.pi)
+    )
+    plasma = vj_kernels.plasma_field(*span, radial, t, bass, mid, energy)
+    assert np.allclose(plasma, (waves / 4.0 + 1.0) / 2.0, atol=1e-9)
+
+
+def test_palette_lerp_wraps_around_the_palette() -> None:
+    values = np.linspace(0, 1, 101).reshape(1, -1)
+    offset = 2.5
+    n_colors = len(PALETTE)
+    colors = np.array(PALETTE, dtype=np.float64)
+    position = (values * n_colors + offset) % n_colors
+    first = position.astype(int) % n_colors
+    blend = (position - np.floor(position))[..., None]
+    expected = colors[first] * (1 - blend) + colors[(first + 1) % n_colors] * blend
+
+    rgb = vj_kernels.palette_lerp(values, PALETTE, offset=offset)
+    assert rgb.dtype == np.uint8
+    assert np.abs(rgb.astype(int) - expected.astype(int)).max() <= 1
+    # Entre la dernière couleur et la première
+    assert tuple(vj_kernels.palette_lerp(np.array([[0.875]]), PALETTE)[0, 0]) == (247, 120, 120)
+
+
+def test_scratch_buffers_are_per_thread() -> None:
+    main = vj_kernels.scratch("test", (4,))
+    assert vj_kernels.scratch("test", (4,)) is main
+    assert vj_kernels.scratch("test", (5,)) is not main
+
+    other: list[np.ndarray] = []
+    thread = threading.Thread(target=lambda: other.append(vj_kernels.scratch("test", (4,))))
+    thread.start()
+    thread.join()
+    assert other[0] is not main
+
+
+def test_particles_wrap_and_respawn() -> None:
+    layer = _layer()
+    layer._init_particles()
+    count = layer.max_particles
+    layer._particle_x[:3] = [-1.0, 65.0, 10.0]
+    layer._particle_vx[:3] = 0.0
+    layer._particle_life[:3] = [50.0, 50.0, 0.5]
+    ctx = {"energy": 0.0, "is_beat": True}
+    layer._current_intensity = 1.0
+    layer._render_particles(layer.create_transparent_image(), 0, 0.0, ctx)
+
+    # Bord gauche -> bord droit, bord droit -> bord gauche
+    assert layer._particle_x[0] == layer.width
+    assert layer._particle_x[1] == 0
+    # Particule morte : nouvelle vie, nouvelle position
+    assert 0 <= layer._particle_life[2] <= 100
+    assert layer._particle_x[2] != 10.0
+    # Beat : 5 particules de plus, tous les attributs alignés
+    assert len(layer._particle_colors) == len(layer._particle_size) == count + 5
+
+
+@pytest.mark.parametrize("effect", ["particles", "starfield", "voronoi", "metaballs"])
+def test_effects_are_deterministic(effect: str) -> None:
+    def frames() -> list[bytes]:
+        layer = _layer()
+        render = getattr(layer, f"_render_{effect}")
+        advance = getattr(layer, f"_advance_{effect}", None)
+        out = []
+        for idx in range(6):
+            ctx = {"energy": 0.6, "bass": 0.7, "mid": 0.4, "treble": 0.2, "is_beat": idx == 2}
+            ctx["fft"] = np.linspace(0, 1, 32)
+            layer._current_intensity = 1.0
+            ctx["state"] = advance(idx, idx / FPS, dict(ctx)) if advance else None
+            img = layer.create_transparent_image()
+            render(img, idx, idx / FPS, ctx)
+            out.append(img.tobytes())
+        return out
+
+    first = frames()
+    assert first == frames()
+    assert len(set(first)) > 1
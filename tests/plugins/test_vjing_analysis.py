@@ -0,0 +1,157 @@
+"""VJing audio analysis: vectorized arrays, beats and the on-disk cache.
+
+The reference functions below are the frame-by-frame loops the VJing layer
+used before vectorization; the vectorized analysis must give the same arrays.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from plugins.video_exporter.layers import vjing_analysis
+from plugins.video_exporter.layers.vjing_layer import VJingLayer
+
+SR = 22050
+
+
+def _audio(duration: float) -> np.ndarray:
+    t = np.arange(int(SR * duration)) / SR
+    gate = 0.5 + 0.5 * np.sign(np.sin(2 * np.pi * 2 * t))
+    noise = np.random.default_rng(3).standard_normal(len(t)) * 0.1
+    return (np.sin(2 * np.pi * 60 * t) * gate * 0.5 + noise).astype(np.float32)
+
+
+def _reference_energies(audio: np.ndarray, sr: int, total_frames: int) -> dict[str, np.ndarray]:
+    samples_per_frame = len(audio) / total_frames
+    fft = np.fft.rfft(audio)
+    freqs = np.fft.rfftfreq(len(audio), 1.0 / sr)
+
+    def _fft_band(lo: float, hi: float | None) -> np.ndarray:
+        mask = freqs >= lo if hi is None else (freqs >= lo) & (freqs <= hi)
+        filtered = fft.copy()
+        filtered[~mask] = 0.0
+        return np.fft.irfft(filtered, n=len(audio)).astype(np.float32)
+
+    signals = {
+        "energy": audio,
+        "bass_energy": _fft_band(20.0, 250.0),
+        "mid_energy": _fft_band(250.0, 4000.0),
+        "treble_energy": _fft_band(4000.0, None),
+    }
+    result = {}
+    for name, signal in signals.items():
+        values = []
+        for frame_idx in range(total_frames):
+            start = int(frame_idx * samples_per_frame)
+            end = int((frame_idx + 1) * samples_per_frame)
+            chunk = signal[start:end]
+            values.append(np.sqrt(np.mean(chunk**2)) if len(chunk) > 0 else 0.0)
+        arr = np.array(values)
+        result[name] = arr / (np.max(arr) if np.max(arr) > 0 else 1.0)
+    return result
+
+
+def _reference_fft_data(audio: np.ndarray, total_frames: int) -> np.ndarray:
+    fft_data = []
+    samples_per_frame = len(audio) / total_frames
+    n_bands = 32
+    for frame_idx in range(total_frames):
+        start = int(frame_idx * samples_per_frame)
+        end = int((frame_idx + 1) * samples_per_frame)
+        chunk = audio[start:end]
+        fft = np.abs(np.fft.rfft(chunk))
+        band_size = len(fft) // n_bands
+        fft_data.append(
+            np.array([np.mean(fft[i * band_size : (i + 1) * band_size]) for i in range(n_bands)])
+        )
+    max_fft = max(np.max(f) for f in fft_data)
+    return np.array([f / max_fft for f in fft_data])
+
+
+def _reference_beats(bass_energy: np.ndarray, fps: int) -> list[int]:
+    beats = []
+    min_interval = fps // 4
+    last_beat = -min_interval
+    for i, e in enumerate(bass_energy):
+        if e > 0.5 and i - last_beat >= min_interval:
+            start = max(0, i - 3)
+            end = min(len(bass_energy), i + 4)
+            if e == max(bass_energy[start:end]):
+                beats.append(i)
+                last_beat = i
+    return beats
+
+
+@pytest.mark.parametrize("fps", [24, 30, 60])
+def test_vectorized_analysis_matches_frame_loops(fps: int) -> None:
+    audio = _audio(3.0)
+    # 22050 / 24 : frames de longueurs inégales (918 et 919 échantillons)
+    total_frames = int(3.0 * fps)
+    arrays = vjing_analysis.analyze_audio(audio, SR, total_frames)
+
+    for name, expected in _reference_energies(audio, SR, total_frames).items():
+        assert arrays[name].shape == (total_frames,)
+        assert np.array_equal(arrays[name], expected), name
+    assert np.array_equal(arrays["fft_data"], _reference_fft_data(audio, total_frames))
+
+
+def test_beats_match_frame_loop() -> None:
+    rng = np.random.default_rng(5)
+    for fps in (24, 30):
+        bass = rng.random(500) ** 3
+        # Plateaux : deux frames voisines au même maximum local
+        bass[100:102] = 0.9
+        bass[300:303] = 1.0
+        assert vjing_analysis.detect_beats(bass, fps) == _reference_beats(bass, fps)
+    assert vjing_analysis.detect_beats(np.zeros(0), 30) == []
+
+
+def test_analysis_is_cached_on_disk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    audio = _audio(1.0)
+    first = VJingLayer(32, 24, 20, audio, SR, 1.0, use_gpu=False, analysis_cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    def _no_analysis(*args: object) -> None:
+        raise AssertionError("analysis should come from the cache")
+
+    monkeypatch.setattr(vjing_analysis, "analyze_audio", _no_analysis)
+    cached = VJingLayer(32, 24, 20, audio, SR, 1.0, use_gpu=False, analysis_cache_dir=tmp_path)
+    for name, values in first.analysis_arrays().items():
+        assert np.array_equal(cached.analysis_arrays()[name], values), name
+    assert cached.beats == first.beats
+
+    # Autre cadence : autre clé, l'analyse est refaite
+    with pytest.raises(AssertionError, match="from the cache"):
+        VJingLayer(32, 24, 25, audio, SR, 1.0, use_gpu=False, analysis_cache_dir=tmp_path)
+
+
+def test_unreadable_cache_is_recomputed(tmp_path: Path) -> None:
+    audio = _audio(1.0)
+    key = vjing_analysis.cache_key(audio, SR, 20, 20)
+    (tmp_path / f"{key}.npz").write_bytes(b"not a npz file")
+    assert vjing_analysis.load_cached_analysis(tmp_path, key) is None
+
+    layer = VJingLayer(32, 24, 20, audio, SR, 1.0, use_gpu=False, analysis_cache_dir=tmp_path)
+    assert vjing_analysis.load_cached_analysis(tmp_path, key) is not None
+    assert len(layer.energy) == 20
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    unrelated = tmp_path / "notes.npz"
+    unrelated.write_bytes(bytes(10_000))
+    arrays = {"energy": np.zeros(100)}
+    keys = [f"{i:032x}" for i in range(3)]
+    for i, key in enumerate(keys):
+        vjing_analysis.save_analysis_cache(tmp_path, key, arrays)
+        os.utime(tmp_path / f"{key}.npz", (1000 + i, 1000 + i))
+    size = (tmp_path / f"{keys[0]}.npz").stat().st_size
+
+    # Lecture : keys[0] devient le plus récemment utilisé
+    assert vjing_analysis.load_cached_analysis(tmp_path, keys[0]) is not None
+    vjing_analysis.save_analysis_cache(tmp_path, "f" * 32, arrays, max_bytes=int(size * 2.5))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [f"{keys[0]}.npz", f"{'f' * 32}.npz", "notes.npz"]
+    )
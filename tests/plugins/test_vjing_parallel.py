@@ -0,0 +1,84 @@
+"""VJingLayer: frames drawn in parallel from advance() snapshots.
+
+advance() runs in frame order and is the only place where effect state
+evolves; render_state() must then give the same pixels whatever the thread
+and the order in which frames are drawn.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from plugins.video_exporter.layers.vjing_layer import VJingLayer
+
+SR = 22050
+FPS = 20
+DURATION = 2.0
+
+
+def _audio() -> np.ndarray:
+    """Kick-like bass bursts over noise: beats, energy swings, every PP slot."""
+    t = np.arange(int(SR * DURATION)) / SR
+    gate = 0.5 + 0.5 * np.sign(np.sin(2 * np.pi * 2 * t))
+    noise = np.random.default_rng(1).standard_normal(len(t)) * 0.1
+    return (np.sin(2 * np.pi * 60 * t) * gate * 0.5 + noise).astype(np.float32)
+
+
+def _layer(**kwargs: object) -> VJingLayer:
+    return VJingLayer(
+        64,
+        48,
+        FPS,
+        _audio(),
+        SR,
+        DURATION,
+        use_all_effects=True,
+        use_gpu=False,
+        effect_cycle_duration=0.3,
+        enabled_post_processing=sorted(VJingLayer.POST_PROCESSING_EFFECTS),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"transitions_enabled": False},
+        {"transitions_enabled": True, "simultaneous_effects": 3, "transition_duration": 0.2},
+    ],
+    ids=["all_generators", "transitions"],
+)
+def test_parallel_frames_match_sequential(kwargs: dict) -> None:
+    total = int(DURATION * FPS)
+    sequential = _layer(**kwargs)
+    expected = [sequential.render(i, i / FPS).tobytes() for i in range(total)]
+
+    parallel = _layer(**kwargs)
+    states = [parallel.advance(i, i / FPS) for i in range(total)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # Ordre inverse : aucune frame ne doit dépendre de celles dessinées avant elle
+        futures = {
+            i: executor.submit(parallel.render_state, i, i / FPS, states[i])
+            for i in reversed(range(total))
+        }
+        frames = [futures[i].result().tobytes() for i in range(total)]
+
+    assert frames == expected
+
+
+def test_whole_frame_drawn_in_advance_only_for_frame_state_effects() -> None:
+    layer = _layer(transitions_enabled=False)
+    post_processors = set()
+    for i in range(int(DURATION * FPS)):
+        state = layer.advance(i, i / FPS)
+        post_processors.add(state.post_processor)
+        assert (state.image is not None) == (state.post_processor in {"feedback", "timestretch"})
+    assert {"feedback", "timestretch", "shockwave"} <= post_processors
+
+
+def test_stateful_post_processors_have_advance_methods() -> None:
+    # Un post-processing ne peut pas être dessiné sur une image vierge dans advance()
+    assert {"feedback", "timestretch"} == VJingLayer.FRAME_STATE_EFFECTS
+    for effect in VJingLayer.STATEFUL_EFFECTS & VJingLayer.POST_PROCESSING_EFFECTS:
+        assert hasattr(VJingLayer, f"_advance_{effect}"), effect
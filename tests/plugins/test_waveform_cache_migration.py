@@ -0,0 +1,62 @@
+"""Tests for the background waveform_cache migration to the pyramid format."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from jukebox.core.database import Database
+from jukebox.utils.waveform_serializer import (
+    _serialize_npz,
+    deserialize_waveform,
+    is_legacy_waveform,
+    serialize_waveform,
+)
+from plugins.waveform_visualizer import WaveformCacheMigrationWorker
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Iterator[Database]:
+    database = Database(tmp_path / "test.db")
+    database.connect()
+    database.initialize_schema()
+    yield database
+    database.close()
+
+
+def _add_track(db: Database, name: str) -> int:
+    return db.tracks.add({"filepath": f"/music/{name}.mp3", "filename": f"{name}.mp3"})
+
+
+def test_legacy_rows_are_converted(db: Database, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(WaveformCacheMigrationWorker, "BATCH_SIZE", 2)
+    waveform = {band: np.linspace(0.0, 1.0, 300) for band in ("bass", "mid", "treble")}
+    legacy_ids = [_add_track(db, f"legacy{i}") for i in range(5)]
+    for track_id in legacy_ids:
+        db.waveforms.save(track_id, _serialize_npz(waveform))
+    current_id = _add_track(db, "current")
+    current = serialize_waveform(waveform)
+    db.waveforms.save(current_id, current)
+    broken_id = _add_track(db, "broken")
+    db.waveforms.save(broken_id, b"PK\x03\x04 truncated")
+
+    worker = WaveformCacheMigrationWorker(db.db_path)
+    worker.run()  # synchrone
+
+    assert worker.converted == 5
+    for track_id in legacy_ids:
+        data = db.waveforms.get(track_id)
+        assert data is not None
+        assert not is_legacy_waveform(data)
+        np.testing.assert_allclose(deserialize_waveform(data)["mid"], waveform["mid"], atol=1 / 255)
+    assert db.waveforms.get(current_id) == current
+    assert db.waveforms.get(broken_id) == b"PK\x03\x04 truncated"  # laissé tel quel
+
+
+def test_missing_database_is_not_created(tmp_path: Path) -> None:
+    worker = WaveformCacheMigrationWorker(tmp_path / "missing.db")
+    worker.run()
+
+    assert worker.converted == 0
+    assert not (tmp_path / "missing.db").exists()
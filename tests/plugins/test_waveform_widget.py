@@ -0,0 +1,107 @@
+"""Tests for the WaveformWidget pyramid reads and visible-range rendering."""
+
+import numpy as np
+import pytest
+
+from jukebox.utils.waveform_serializer import read_waveform_pyramid, serialize_waveform
+from plugins.waveform_visualizer import WaveformWidget
+
+
+def _waveform(frames: int) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(0)
+    return {band: rng.random(frames).astype(np.float32) for band in ("bass", "mid", "treble")}
+
+
+@pytest.fixture
+def widget(qtbot) -> WaveformWidget:  # type: ignore
+    widget = WaveformWidget()
+    qtbot.addWidget(widget)
+    widget.resize(1000, 120)
+    widget.show()
+    return widget
+
+
+def test_draws_about_one_column_per_pixel(widget: WaveformWidget) -> None:
+    widget.display_waveform(_waveform(40_000))
+
+    x, _ = widget._curves[0].getData()
+    width = widget.plot_widget.plotItem.vb.width()
+    assert width <= len(x) <= 2 * width + 4
+    assert x[0] < 64 and x[-1] > 40_000 - 64
+
+
+def test_view_range_draws_visible_frames_only(widget: WaveformWidget) -> None:
+    waveform = _waveform(40_000)
+    widget.display_waveform(waveform)
+
+    widget.set_view_range(10_000, 10_500)
+
+    x, y = widget._curves[2].getData()  # bass, niveau le plus fin
+    assert x[0] <= 10_000 and x[-1] >= 10_499
+    assert len(x) < 520
+    np.testing.assert_allclose(y, waveform["bass"][x.astype(int)], atol=1 / 255)
+
+    widget.set_view_range()
+    assert len(widget._curves[0].getData()[0]) < 2100
+
+
+def test_reads_the_stored_pyramid_level(widget: WaveformWidget) -> None:
+    pyramid = read_waveform_pyramid(serialize_waveform(_waveform(40_000)))
+
+    widget.display_waveform(pyramid)
+
+    x, y = widget._curves[2].getData()
+    factor = int(x[1] - x[0])
+    level = factor.bit_length() - 1
+    first = int(x[0]) // factor
+    assert 0 < level < pyramid.num_levels
+    assert np.array_equal(y, pyramid.peaks(level, first, first + len(x))["bass"])
+    # Courbe du dessus : somme des trois bandes de la même colonne
+    total = sum(pyramid.peaks(level, first, first + len(x)).values())
+    np.testing.assert_allclose(widget._curves[0].getData()[1], total, rtol=1e-6)
+
+
+def test_deltas_update_the_displayed_level(widget: WaveformWidget) -> None:
+    waveform = {band: values / values.max() for band, values in _waveform(40_000).items()}
+    bands = [waveform[band] * 2 for band in ("bass", "mid", "treble")]
+    for start in range(0, 40_000, 7_000):
+        delta = {"start": start, "length": 40_000}
+        delta.update(
+            zip(("bass", "mid", "treble"), [b[start : start + 7_000] for b in bands], strict=True)
+        )
+        widget.apply_waveform_delta(delta)
+    partial_x, partial_y = widget._curves[0].getData()
+
+    widget.display_waveform(waveform)
+
+    x, y = widget._curves[0].getData()
+    assert np.array_equal(partial_x, x)
+    # Normalisation par bande identique ; la pyramide stockée est quantifiée sur 8 bits
+    np.testing.assert_allclose(partial_y, y, atol=3 / 255)
+
+
+def test_cursor_does_not_touch_curves(widget: WaveformWidget) -> None:
+    widget.display_waveform(_waveform(40_000))
+    data = [curve.getData()[1] for curve in widget._curves]
+
+    widget.set_position(0.5)
+
+    assert widget.cursor_line.value() == 20_000
+    assert all(
+        curve.getData()[1] is before for curve, before in zip(widget._curves, data, strict=True)
+    )
+
+
+def test_display_keeps_other_plot_items(widget: WaveformWidget) -> None:
+    import pyqtgraph as pg
+
+    region = pg.LinearRegionItem(values=(10, 20))
+    widget.plot_widget.addItem(region)
+
+    widget.display_waveform(_waveform(1000))
+    assert region in widget.plot_widget.plotItem.items
+
+    widget.clear_waveform()
+    assert region not in widget.plot_widget.plotItem.items
+    assert widget.cursor_line in widget.plot_widget.plotItem.items
+    assert len(widget._curves[0].getData()[0] or []) == 0
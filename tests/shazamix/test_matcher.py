@@ -37,11 +37,13 @@ def _sine_audio(duration_sec: float = 1.0, sr: int = 22050) -> np.ndarray:
 
 def _make_matcher() -> Matcher:  # noqa: F821
     """Return a Matcher with mocked DB and fingerprinter."""
+    from shazamix.fingerprint import librosa_load
     from shazamix.matcher import Matcher
 
     db = MagicMock()
     fp = MagicMock()
     fp.sample_rate = 22050
+    fp.load_audio = librosa_load
     return Matcher(db, fp)
 
 
@@ -440,3 +442,39 @@ class TestMatchSegmentByMfcc:
         # librosa.load must have been called with the mix path (no preloaded_audio)
         called_paths = [call.args[0] for call in mock_load.call_args_list]
         assert "real_mix.mp3" in called_paths
+
+    def test_references_use_the_fingerprinter_loader(self) -> None:
+        """Reference tracks are decoded by the loader injected in the Fingerprinter."""
+        m = self._matcher()
+        sr = 22050
+        y = _sine_audio(5.0)
+        m.db.get_all_audio_features.side_effect = lambda key: (
+            {1: m.compute_mfcc_summary(y, sr)}
+            if key == "mfcc_summary"
+            else {1: m.compute_chroma_summary(y, sr)}
+        )
+        m.db.get_track_info.return_value = {"artist": "A", "title": "T", "filepath": "/ref.mp3"}
+        loads: list[tuple[str, int]] = []
+
+        def load_audio(path: str, sample_rate: int) -> tuple[np.ndarray, int]:
+            loads.append((path, sample_rate))
+            return y, sample_rate
+
+        m.fingerprinter.load_audio = load_audio
+        with patch("librosa.load", side_effect=AssertionError("librosa.load")):
+            result = m.match_segment_by_mfcc("mix.mp3", 0, 5000, preloaded_audio=y)
+
+        assert loads == [("/ref.mp3", sr)]
+        assert result is not None
+
+
+def test_shazamix_does_not_import_the_app() -> None:
+    """shazamix stays a standalone package: the app injects its decoder."""
+    import subprocess
+    import sys
+
+    code = "import sys, shazamix.matcher; print(any(m.startswith('jukebox') for m in sys.modules))"
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
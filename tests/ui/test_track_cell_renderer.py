@@ -5,14 +5,30 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+import pytest
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
 
 from jukebox.ui.components.track_cell_renderer import (
+    MINI_WAVEFORM_BYTES,
+    MINI_WAVEFORM_HEIGHT,
+    MINI_WAVEFORM_WIDTH,
     ArtistStyler,
     DuplicateStatusStyler,
     FilenameStyler,
+    PixmapCache,
     TitleStyler,
+    WaveformStyler,
+    decode_mini_waveform,
+    next_waveform_version,
+    render_mini_waveform,
+)
+from jukebox.utils.waveform_serializer import (
+    _serialize_npz,
+    deserialize_waveform,
+    read_waveform_pyramid,
+    serialize_waveform,
 )
 
 # ---------------------------------------------------------------------------
@@ -217,3 +233,120 @@ class TestTitleStylerMissingFile:
         styler = TitleStyler()
         track = make_track(file_missing=False)
         assert styler.foreground(None, track) is None
+
+
+# ---------------------------------------------------------------------------
+# Mini waveform rendering
+# ---------------------------------------------------------------------------
+
+
+def _reference_render(
+    waveform: dict[str, np.ndarray], width: int = 200, height: int = 16
+) -> QImage:
+    """Former renderer: one fillRect per column and band."""
+    pixmap = QPixmap(width, height)
+    pixmap.fill(Qt.GlobalColor.black)
+    painter = QPainter(pixmap)
+    bass, mid, treble = waveform["bass"], waveform["mid"], waveform["treble"]
+    step = max(1, len(bass) // width)
+    b, m, t = bass[::step][:width], mid[::step][:width], treble[::step][:width]
+    for x in range(min(len(b), width)):
+        for band_h, color in (
+            (int((b[x] + m[x] + t[x]) * height), "#FFFFFF"),
+            (int((b[x] + m[x]) * height), "#00FF00"),
+            (int(b[x] * height), "#0066FF"),
+        ):
+            if band_h > 0:
+                painter.fillRect(x, height - band_h, 1, band_h, QColor(color))
+    painter.end()
+    return pixmap.toImage().convertToFormat(QImage.Format.Format_RGB32)
+
+
+class TestRenderMiniWaveform:
+    """render_mini_waveform draws the whole image with numpy."""
+
+    @pytest.mark.parametrize("length", [50, 200, 1937, 38759])
+    def test_identical_to_per_column_painting(self, qapp: Any, length: int) -> None:
+        rng = np.random.default_rng(length)
+        waveform = {band: rng.random(length) * 0.6 for band in ("bass", "mid", "treble")}
+
+        image = render_mini_waveform(waveform)
+
+        assert image is not None
+        assert image == _reference_render(waveform)
+
+    def test_empty_band_returns_none(self) -> None:
+        waveform = {"bass": np.ones(10), "mid": np.array([]), "treble": np.ones(10)}
+        assert render_mini_waveform(waveform) is None
+
+
+class TestDecodeMiniWaveform:
+    """decode_mini_waveform reads the mini waveform columns from a coarse pyramid level."""
+
+    @pytest.mark.parametrize("serialize", [serialize_waveform, _serialize_npz])
+    @pytest.mark.parametrize("length", [50, 1937])
+    def test_columns_are_peaks_of_the_full_waveform(self, serialize: Any, length: int) -> None:
+        rng = np.random.default_rng(length)
+        data = serialize({band: rng.random(length) for band in ("bass", "mid", "treble")})
+        full = deserialize_waveform(serialize_waveform(deserialize_waveform(data)))
+
+        decoded = decode_mini_waveform(data, MINI_WAVEFORM_WIDTH)
+
+        # Niveau choisi : 2**level colonnes pleine résolution par colonne du niveau
+        pyramid = read_waveform_pyramid(data)
+        level = pyramid.level_for(MINI_WAVEFORM_WIDTH)
+        level_length, span = pyramid.level_length(level), 2**level
+        columns = min(level_length, MINI_WAVEFORM_WIDTH)
+        bounds = [j * level_length // columns for j in range(columns + 1)]
+        for band in ("bass", "mid", "treble"):
+            expected = [
+                full[band][bounds[j] * span : bounds[j + 1] * span].max() for j in range(columns)
+            ]
+            np.testing.assert_array_equal(decoded[band], expected)
+
+    def test_short_peak_stays_visible(self, qapp: Any) -> None:
+        waveform = {band: np.full(5000, 0.1) for band in ("bass", "mid", "treble")}
+        waveform["bass"][2601] = 0.9  # entre deux échantillons d'un simple pas de 25
+
+        decoded = decode_mini_waveform(serialize_waveform(waveform), MINI_WAVEFORM_WIDTH)
+
+        assert len(decoded["bass"]) == MINI_WAVEFORM_WIDTH
+        assert int(np.argmax(decoded["bass"])) == 2601 * MINI_WAVEFORM_WIDTH // 5000
+        assert render_mini_waveform(decoded) != render_mini_waveform(
+            {band: values[::25] for band, values in waveform.items()}
+        )
+
+
+class TestPixmapCache:
+    """PixmapCache is bounded in bytes and evicts least recently used first."""
+
+    def test_evicts_by_bytes(self, qapp: Any) -> None:
+        cache = PixmapCache(max_bytes=3 * MINI_WAVEFORM_BYTES)
+        for key in "abc":
+            cache.put(key, QPixmap(MINI_WAVEFORM_WIDTH, MINI_WAVEFORM_HEIGHT))
+        assert cache.get("a") is not None  # "a" devient le plus récent
+
+        cache.put("d", QPixmap(MINI_WAVEFORM_WIDTH, MINI_WAVEFORM_HEIGHT))
+
+        assert "b" not in cache
+        assert {"a", "c", "d"} == {key for key in "abcd" if key in cache}
+        assert cache.nbytes == 3 * MINI_WAVEFORM_BYTES
+
+        cache.put("big", QPixmap(MINI_WAVEFORM_WIDTH, 2 * MINI_WAVEFORM_HEIGHT))
+        assert len(cache) == 2
+        assert cache.nbytes <= cache.max_bytes
+
+    def test_new_waveform_version_is_rendered_again(self, qapp: Any) -> None:
+        styler = WaveformStyler()
+        waveform = {band: np.full(300, 0.2) for band in ("bass", "mid", "treble")}
+        track = make_track(
+            _db_id=7, waveform_data=waveform, waveform_version=next_waveform_version()
+        )
+
+        first = styler.decoration(None, track)
+        assert styler.decoration(None, track) is first
+        assert WaveformStyler.is_cached(track)
+
+        track["waveform_version"] = next_waveform_version()
+        assert not WaveformStyler.is_cached(track)
+        assert styler.decoration(None, track) is not first
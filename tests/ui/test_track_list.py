@@ -1,10 +1,23 @@
 """Tests for track list widget."""
 
+from collections.abc import Iterator
 from pathlib import Path
+from unittest.mock import MagicMock
 
-from PySide6.QtCore import QSortFilterProxyModel
+import numpy as np
+import pytest
+from PySide6.QtCore import QPersistentModelIndex, QSortFilterProxyModel, Qt
 
-from jukebox.ui.components.track_list import TrackList
+from jukebox.core.database import Database
+from jukebox.ui.components import track_list as track_list_module
+from jukebox.ui.components.track_cell_renderer import (
+    WaveformStyler,
+    next_waveform_version,
+    render_mini_waveform,
+)
+from jukebox.ui.components.track_list import ROW_HEIGHT, TrackList
+from jukebox.utils.file_checker import UNKNOWN, FileCheckService
+from jukebox.utils.waveform_serializer import read_waveform_pyramid, serialize_waveform
 
 
 class TestTrackList:
@@ -176,3 +189,205 @@ class TestTrackList:
         track_list.set_proxy_model(proxy)
 
         assert track_list.count() == 2
+
+
+class TestDuplicateIndexHooks:
+    """Library changes reach the duplicate index incrementally."""
+
+    def test_deletion_removes_one_entry_without_full_sync(self, qapp):  # type: ignore
+        track_list = TrackList()
+        paths = [Path(f"/tmp/track{i}.mp3") for i in range(3)]
+        track_list.add_tracks(paths)
+        model = track_list.track_model
+        checker = MagicMock()
+        model._duplicate_checker = checker
+
+        model._on_track_deleted(paths[1])
+
+        checker.notify_track_removed.assert_called_once_with(paths[1])
+        checker.notify_library_changed.assert_not_called()
+        assert len(model.tracks) == 2
+
+
+class TestMiniWaveformPrefetch:
+    """Mini waveforms of rows about to scroll into view are pre-rendered."""
+
+    def test_rows_ahead_are_prerendered(self, qtbot):  # type: ignore
+        track_list = TrackList()
+        qtbot.addWidget(track_list)
+        track_list.resize(600, 10 * ROW_HEIGHT)
+        waveform = {band: np.linspace(0.0, 0.3, 500) for band in ("bass", "mid", "treble")}
+        track_list.load_tracks_batch(
+            [{"id": i, "filepath": f"/tmp/track{i}.mp3"} for i in range(200)]
+        )
+        for track in track_list.track_model.tracks:
+            track["waveform_data"] = waveform
+            track["waveform_version"] = next_waveform_version()
+        track_list.show()
+        qtbot.waitExposed(track_list)
+
+        track_list.verticalScrollBar().setValue(50)
+        qtbot.waitUntil(
+            lambda: WaveformStyler.is_cached(track_list.track_model.tracks[70]), timeout=5000
+        )
+
+        tracks = track_list.track_model.tracks
+        first = track_list.rowAt(0)
+        assert all(WaveformStyler.is_cached(tracks[row]) for row in range(first, first + 20))
+        assert not WaveformStyler.is_cached(tracks[199])
+
+
+class TestStreamingLoad:
+    """load_tracks_batch inserts rows in chunks and loads waveforms off the UI thread."""
+
+    @pytest.fixture
+    def db(self, tmp_path: Path) -> Iterator[Database]:
+        database = Database(tmp_path / "test.db")
+        database.connect()
+        database.initialize_schema()
+        yield database
+        database.close()
+
+    def test_rows_inserted_in_chunks(self, qtbot, monkeypatch):  # type: ignore
+        monkeypatch.setattr(track_list_module, "ROW_INSERT_CHUNK", 10)
+        track_list = TrackList()
+        inserted: list[int] = []
+        track_list.track_model.rowsInserted.connect(
+            lambda parent, first, last: inserted.append(last - first + 1)
+        )
+        tracks = [{"filepath": f"/tmp/track{i}.mp3"} for i in range(35)]
+
+        with qtbot.waitSignal(track_list.tracks_loaded, timeout=5000):
+            track_list.load_tracks_batch(tracks)
+            assert track_list.count() == 10  # premier chunk synchrone
+            assert track_list.track_model.is_loading
+            track_list.select_track_by_filepath(Path("/tmp/track30.mp3"))
+
+        assert inserted == [10, 10, 15]  # chunks grandissants
+        assert track_list.count() == 35
+        qtbot.waitUntil(lambda: track_list.get_selected_track() == Path("/tmp/track30.mp3"))
+
+    def test_waveform_before_its_row_is_kept(self, qtbot, monkeypatch):  # type: ignore
+        monkeypatch.setattr(track_list_module, "ROW_INSERT_CHUNK", 10)
+        track_list = TrackList()
+        waveform = {band: np.full(200, 0.5, dtype=np.float32) for band in ("bass", "mid", "treble")}
+
+        with qtbot.waitSignal(track_list.tracks_loaded, timeout=5000):
+            track_list.load_tracks_batch([{"filepath": f"/tmp/track{i}.mp3"} for i in range(30)])
+            track_list.track_model.apply_waveform_batch(
+                {Path("/tmp/track25.mp3"): (waveform, True)}
+            )
+
+        track = track_list.track_model.tracks[25]
+        assert track["waveform_data"] is waveform
+        assert track["has_stats"]
+        assert track["waveform_version"] > 0
+
+    def test_waveforms_decoded_in_worker(self, qtbot, db):  # type: ignore
+        rng = np.random.default_rng(0)
+        waveforms = {}
+        for i in range(5):
+            track_id = db.tracks.add({"filepath": f"/music/t{i}.mp3", "filename": f"t{i}.mp3"})
+            waveforms[track_id] = {band: rng.random(1000) for band in ("bass", "mid", "treble")}
+            db.waveforms.save(track_id, serialize_waveform(waveforms[track_id]))
+        db.analysis.save(track_id, {"tempo": 120.0})
+
+        track_list = TrackList(database=db)
+        with qtbot.waitSignal(track_list.tracks_loaded, timeout=5000):
+            track_list.load_tracks_batch(db.tracks.get_all())
+
+        for track in track_list.track_model.tracks:
+            pyramid = read_waveform_pyramid(db.waveforms.get(track["_db_id"]))
+            assert len(track["waveform_data"]["mid"]) == 200
+            assert render_mini_waveform(track["waveform_data"]) == render_mini_waveform(
+                pyramid.envelope(200)
+            )
+            assert track["has_stats"] == (track["_db_id"] == track_id)
+
+
+class TestFileChecks:
+    """File existence is checked in background and streamed back to the rows."""
+
+    def test_missing_files_flagged(self, qtbot, tmp_path, monkeypatch):  # type: ignore
+        service = FileCheckService(mount_points=[])
+        monkeypatch.setattr(track_list_module, "get_file_check_service", lambda: service)
+        present = tmp_path / "present.mp3"
+        present.write_bytes(b"x")
+        missing = tmp_path / "missing.mp3"
+        track_list = TrackList()
+        model = track_list.track_model
+
+        track_list.add_tracks([present, missing])
+
+        qtbot.waitUntil(lambda: model.tracks[1]["file_missing"], timeout=5000)
+        assert model.tracks[0]["file_missing"] is False
+        assert service.cached(str(missing)) is not None
+
+    def test_unknown_status_keeps_previous_state(self, qtbot, monkeypatch):  # type: ignore
+        probed: list[str] = []
+
+        def probe(filepath: str):  # type: ignore
+            probed.append(filepath)
+            return UNKNOWN
+
+        service = FileCheckService(probe=probe, mount_points=[])
+        monkeypatch.setattr(track_list_module, "get_file_check_service", lambda: service)
+        track_list = TrackList()
+
+        track_list.add_track(Path("/mnt/offline/a.mp3"))
+
+        qtbot.waitUntil(lambda: probed == ["/mnt/offline/a.mp3"], timeout=5000)
+        qtbot.waitUntil(lambda: track_list.track_model._file_worker.isFinished(), timeout=5000)
+        qtbot.wait(20)
+        assert track_list.track_model.tracks[0]["file_missing"] is False
+
+
+class TestSort:
+    """TrackListModel.sort reorders rows in place with numpy keys."""
+
+    @staticmethod
+    def _model(qapp):  # type: ignore
+        track_list = TrackList(mode="jukebox")
+        track_list.track_model.load_tracks_batch(
+            [
+                {"filepath": "/m/a.mp3", "artist": "Zed", "genre": "H-*2", "date_added": "1"},
+                {"filepath": "/m/b.mp3", "artist": "abba", "genre": "*5", "date_added": "2"},
+                {"filepath": "/m/c.mp3", "artist": "Air", "genre": "*2", "date_added": "3"},
+                {"filepath": "/m/d.mp3", "artist": "air", "genre": "", "date_added": "4"},
+            ]
+        )
+        return track_list
+
+    @staticmethod
+    def _names(model) -> list[str]:  # type: ignore
+        return [t["filepath"].name for t in model.tracks]
+
+    def test_previous_sort_breaks_ties(self, qapp):  # type: ignore
+        track_list = self._model(qapp)
+        model = track_list.track_model
+        columns = model.cell_renderer.columns
+
+        model.sort(columns.index("artist"), Qt.SortOrder.AscendingOrder)
+        # casefold ; "Air"/"air" ex aequo : départagés par le tri précédent (date_added DESC)
+        assert self._names(model) == ["b.mp3", "d.mp3", "c.mp3", "a.mp3"]
+
+        model.sort(columns.index("rating"), Qt.SortOrder.DescendingOrder)
+        assert self._names(model) == ["b.mp3", "c.mp3", "a.mp3", "d.mp3"]  # *2 tie: by artist
+        assert model.find_row_by_filepath(Path("/m/a.mp3")) == 2
+
+        model.sort(-1)
+        assert self._names(model) == ["d.mp3", "c.mp3", "b.mp3", "a.mp3"]  # date_added DESC
+
+    def test_selection_follows_rows(self, qapp):  # type: ignore
+        track_list = self._model(qapp)
+        model = track_list.track_model
+        track_list.select_track_by_filepath(Path("/m/a.mp3"))
+        persistent = QPersistentModelIndex(model.index(0, 1))
+        reset: list[bool] = []
+        model.modelReset.connect(lambda: reset.append(True))
+
+        model.sort(model.cell_renderer.columns.index("artist"), Qt.SortOrder.AscendingOrder)
+
+        assert track_list.get_selected_track() == Path("/m/a.mp3")
+        assert persistent.row() == 3 and persistent.column() == 1
+        assert not reset
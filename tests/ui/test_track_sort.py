@@ -0,0 +1,105 @@
+"""Tests for the numpy sort keys of the track list."""
+
+import random
+from typing import Any
+
+import numpy as np
+import pytest
+
+from jukebox.ui.components.track_sort import TrackSortIndex, parse_rating
+
+
+def _tracks(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "filepath": f"/music/{rng.choice('ABC')}/{i}.mp3",
+            "filename": f"{i}.mp3",
+            "artist": rng.choice(["daft punk", "Air", "air", None, "Étienne", "zz top"]),
+            "title": f"title {rng.randint(0, 20)}",
+            "genre": rng.choice(["H-D-*3", "*5", "C", "", None, "D-*1-H"]),
+            "duration_seconds": rng.choice([None, 0.0, rng.random() * 600]),
+            "date_added": f"2026-01-{rng.randint(1, 28):02d}",
+        }
+        for i in range(count)
+    ]
+
+
+def _reference(tracks: list[dict[str, Any]], spec: list[tuple[str, bool]]) -> list[int]:
+    """Successive stable Python sorts, least significant key first."""
+    keys = {
+        "artist": lambda t: (t["artist"] or "").casefold(),
+        "title": lambda t: (t["title"] or "").casefold(),
+        "genre": lambda t: (t["genre"] or "").casefold(),
+        "duration": lambda t: t["duration_seconds"] or 0.0,
+        "rating": lambda t: parse_rating(t["genre"]),
+        "path": lambda t: t["filepath"].rsplit("/", 1)[0].casefold(),
+        "date_added": lambda t: t["date_added"] or "",
+    }
+    rows = list(range(len(tracks)))
+    for column, descending in reversed(spec):
+        rows.sort(key=lambda row, key=keys[column]: key(tracks[row]), reverse=descending)  # type: ignore[misc]
+    return rows
+
+
+def test_parse_rating() -> None:
+    assert parse_rating("C-D-*3") == 3
+    assert parse_rating("*5") == 5
+    assert parse_rating("C-*x") == 0
+    assert parse_rating(None) == 0
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        [("rating", False)],
+        [("rating", True)],
+        [("duration", True)],
+        [("artist", False)],
+        [("path", True)],
+        [("artist", False), ("title", True)],
+        [("rating", True), ("artist", False), ("date_added", True)],
+    ],
+)
+def test_order_matches_stable_python_sort(spec: list[tuple[str, bool]]) -> None:
+    """Same permutation as successive stable sorts (descending keeps ties in row order)."""
+    tracks = _tracks(500)
+
+    order = TrackSortIndex().order(tracks, spec)
+
+    assert order.tolist() == _reference(tracks, spec)
+
+
+class TestMaintenance:
+    """Cached keys follow the rows (append, remove, update, reorder)."""
+
+    def test_incremental_updates_match_fresh_index(self) -> None:
+        tracks = _tracks(300, seed=1)
+        index = TrackSortIndex()
+        spec = [("artist", False), ("rating", True)]
+        order = index.order(tracks, spec)
+        tracks = [tracks[row] for row in order.tolist()]
+        index.reorder(order, spec)
+
+        extra = _tracks(50, seed=2)
+        tracks.extend(extra)
+        index.append(extra)
+        del tracks[10]
+        index.remove(10)
+        tracks[20] = dict(tracks[20], artist="AAA first", genre="*4")
+        index.update(20, tracks[20])
+
+        assert np.array_equal(index.order(tracks, spec), TrackSortIndex().order(tracks, spec))
+
+    def test_sorting_again_is_a_no_op(self) -> None:
+        tracks = _tracks(100)
+        index = TrackSortIndex()
+        spec = [("duration", False)]
+        order = index.order(tracks, spec)
+        tracks = [tracks[row] for row in order.tolist()]
+        index.reorder(order, spec)
+
+        assert np.array_equal(index.order(tracks, spec), np.arange(100))
+        index.update(0, dict(tracks[0], duration_seconds=10_000.0))
+        tracks[0]["duration_seconds"] = 10_000.0
+        assert index.order(tracks, spec)[-1] == 0
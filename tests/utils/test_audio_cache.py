@@ -0,0 +1,314 @@
+"""Tests for the shared decoded-audio cache."""
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from jukebox.utils.audio_cache import DecodedAudioCache
+
+NATIVE_SR = 1000
+
+
+class CountingDecoder:
+    """Fake decoder returning a ramp and counting calls."""
+
+    def __init__(self, n_samples: int = 2000, delay: float = 0.0) -> None:
+        self.n_samples = n_samples
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, filepath: str) -> tuple[np.ndarray, int]:
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return np.linspace(-0.5, 0.5, self.n_samples, dtype=np.float32), NATIVE_SR
+
+
+def _halve(y: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """Naive resampler (decimation) good enough to check the wiring."""
+    step = orig_sr // target_sr
+    return y[::step]
+
+
+@pytest.fixture
+def audio_file(tmp_path: Path) -> Path:
+    """A real file so that the cache can stat it."""
+    path = tmp_path / "track.mp3"
+    path.write_bytes(b"fake audio")
+    return path
+
+
+class TestDecodedAudioCache:
+    """Tests for DecodedAudioCache."""
+
+    def test_decodes_once_for_repeated_loads(self, audio_file: Path) -> None:
+        """A second load of the same file is served from memory."""
+        decoder = CountingDecoder()
+        cache = DecodedAudioCache(decoder=decoder, resampler=_halve)
+
+        y1, sr1 = cache.load(audio_file)
+        y2, sr2 = cache.load(audio_file)
+
+        assert decoder.calls == 1
+        assert sr1 == sr2 == NATIVE_SR
+        assert y1 is y2
+        assert cache.stats.hits == 1
+
+    def test_resamples_from_single_decode(self, audio_file: Path) -> None:
+        """Different sample rates reuse the native decode."""
+        decoder = CountingDecoder()
+        cache = DecodedAudioCache(decoder=decoder, resampler=_halve)
+
+        y_native, _ = cache.load(audio_file)
+        y_half, sr = cache.load(audio_file, sr=NATIVE_SR // 2)
+
+        assert decoder.calls == 1
+        assert cache.stats.resamples == 1
+        assert sr == NATIVE_SR // 2
+        assert len(y_half) == len(y_native) // 2
+
+    def test_native_rate_request_does_not_resample(self, audio_file: Path) -> None:
+        """Requesting the native rate explicitly returns the native array."""
+        cache = DecodedAudioCache(decoder=CountingDecoder(), resampler=_halve)
+
+        y_native, _ = cache.load(audio_file)
+        y_same, _ = cache.load(audio_file, sr=NATIVE_SR)
+
+        assert y_same is y_native
+        assert cache.stats.resamples == 0
+
+    def test_offset_and_duration_slice(self, audio_file: Path) -> None:
+        """offset/duration mirror librosa.load semantics."""
+        cache = DecodedAudioCache(decoder=CountingDecoder(), resampler=_halve)
+
+        y_full, _ = cache.load(audio_file)
+        y_part, _ = cache.load(audio_file, offset=0.5, duration=0.25)
+
+        np.testing.assert_array_equal(y_part, y_full[500:750])
+
+    def test_returned_arrays_are_read_only(self, audio_file: Path) -> None:
+        """Shared arrays cannot be modified in place by a consumer."""
+        cache = DecodedAudioCache(decoder=CountingDecoder(), resampler=_halve)
+
+        y, _ = cache.load(audio_file)
+
+        with pytest.raises(ValueError):
+            y[0] = 1.0
+
+    def test_modified_file_is_decoded_again(self, audio_file: Path) -> None:
+        """A new mtime/size produces a new cache key."""
+        decoder = CountingDecoder()
+        cache = DecodedAudioCache(decoder=decoder, resampler=_halve)
+
+        cache.load(audio_file)
+        audio_file.write_bytes(b"fake audio, re-encoded")
+        cache.load(audio_file)
+
+        assert decoder.calls == 2
+
+    def test_lru_evicts_by_bytes(self, tmp_path: Path) -> None:
+        """The memory budget is enforced in bytes."""
+        decoder = CountingDecoder(n_samples=1000)  # 4000 bytes per file
+        cache = DecodedAudioCache(max_memory_bytes=10000, decoder=decoder, resampler=_halve)
+        files = []
+        for i in range(3):
+            path = tmp_path / f"{i}.mp3"
+            path.write_bytes(b"x" * (i + 1))
+            files.append(path)
+
+        for path in files:
+            cache.load(path)
+
+        assert cache.memory_bytes <= 10000
+        assert cache.stats.evictions == 1
+        assert not cache.contains(files[0])
+        assert cache.contains(files[2])
+
+    def test_concurrent_requests_share_one_decode(self, audio_file: Path) -> None:
+        """Threads asking for the same file wait on the in-flight decode."""
+        decoder = CountingDecoder(delay=0.1)
+        cache = DecodedAudioCache(decoder=decoder, resampler=_halve)
+        results: list[np.ndarray] = []
+
+        def worker() -> None:
+            y, _ = cache.load(audio_file)
+            results.append(y)
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert decoder.calls == 1
+        assert len(results) == 5
+        assert all(r is results[0] for r in results)
+
+    def test_decode_error_propagates_to_waiters(self, audio_file: Path) -> None:
+        """A failed decode raises for the caller and is not cached."""
+        calls = 0
+
+        def failing_decoder(filepath: str) -> tuple[np.ndarray, int]:
+            nonlocal calls
+            calls += 1
+            raise ValueError("corrupted")
+
+        cache = DecodedAudioCache(decoder=failing_decoder, resampler=_halve)
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="corrupted"):
+                cache.load(audio_file)
+        assert calls == 2
+
+    def test_missing_file_falls_back_to_decoder(self, tmp_path: Path) -> None:
+        """Paths that cannot be stat'ed are decoded without caching."""
+        decoder = CountingDecoder()
+        cache = DecodedAudioCache(decoder=decoder, resampler=_halve)
+
+        cache.load(tmp_path / "missing.mp3")
+        cache.load(tmp_path / "missing.mp3")
+
+        assert decoder.calls == 2
+        assert cache.memory_bytes == 0
+
+    def test_invalidate_drops_entries(self, audio_file: Path) -> None:
+        """invalidate() forces a new decode."""
+        decoder = CountingDecoder()
+        cache = DecodedAudioCache(decoder=decoder, resampler=_halve)
+
+        cache.load(audio_file, sr=NATIVE_SR // 2)
+        cache.invalidate(audio_file)
+        cache.load(audio_file, sr=NATIVE_SR // 2)
+
+        assert decoder.calls == 2
+        assert cache.memory_bytes > 0
+
+    def test_cleared_during_load_is_a_miss(self, audio_file: Path, monkeypatch) -> None:  # type: ignore
+        """A clear() between the decode and the rate lookup does not raise."""
+        decoder = CountingDecoder()
+        cache = DecodedAudioCache(decoder=decoder, resampler=_halve)
+        get_entry = cache._get_entry
+
+        def racing_get_entry(key, compute):  # type: ignore
+            result = get_entry(key, compute)
+            cache.clear()
+            return result
+
+        monkeypatch.setattr(cache, "_get_entry", racing_get_entry)
+        y, sr = cache.load(audio_file, sr=NATIVE_SR // 2)
+
+        assert sr == NATIVE_SR // 2
+        assert len(y) == 1000
+        assert decoder.calls == 2
+
+    def test_invalid_spill_dtype_rejected(self) -> None:
+        """Only int16/float16 spill formats are supported."""
+        with pytest.raises(ValueError):
+            DecodedAudioCache(spill_dtype="float64")
+
+
+class TestDiskSpill:
+    """Tests for the on-disk spill of evicted entries."""
+
+    @pytest.mark.parametrize("dtype", ["int16", "float16"])
+    def test_evicted_entry_reloaded_from_spill(
+        self, tmp_path: Path, audio_file: Path, dtype: str
+    ) -> None:
+        """An evicted entry is read back from disk instead of being re-decoded."""
+        decoder = CountingDecoder(n_samples=1000)
+        cache = DecodedAudioCache(
+            max_memory_bytes=5000,
+            spill_directory=tmp_path / "spill",
+            spill_dtype=dtype,
+            decoder=decoder,
+            resampler=_halve,
+        )
+        other = tmp_path / "other.mp3"
+        other.write_bytes(b"other")
+
+        y_first, _ = cache.load(audio_file)
+        y_first = y_first.copy()
+        cache.load(other)  # evicts audio_file → spill
+        y_again, sr = cache.load(audio_file)
+
+        assert decoder.calls == 2
+        assert cache.stats.spill_writes >= 1
+        assert cache.stats.spill_hits == 1
+        assert sr == NATIVE_SR
+        np.testing.assert_allclose(y_again, y_first, atol=1e-3)
+
+    def test_spill_shared_across_instances(self, tmp_path: Path, audio_file: Path) -> None:
+        """A second process (new instance) reuses the spill directory."""
+        spill = tmp_path / "spill"
+        first = DecodedAudioCache(
+            max_memory_bytes=100, spill_directory=spill, decoder=CountingDecoder()
+        )
+        first.load(audio_file)  # too large for memory → written to disk directly
+
+        decoder = CountingDecoder()
+        second = DecodedAudioCache(spill_directory=spill, decoder=decoder)
+        y, sr = second.load(audio_file)
+
+        assert decoder.calls == 0
+        assert sr == NATIVE_SR
+        assert len(y) == 2000
+
+    def test_spill_directory_pruned_to_budget(self, tmp_path: Path) -> None:
+        """Oldest spill files are removed above max_spill_bytes."""
+        spill = tmp_path / "spill"
+        cache = DecodedAudioCache(
+            max_memory_bytes=100,
+            spill_directory=spill,
+            max_spill_bytes=5000,
+            decoder=CountingDecoder(n_samples=1000),
+        )
+        for i in range(4):
+            path = tmp_path / f"{i}.mp3"
+            path.write_bytes(b"x" * (i + 1))
+            cache.load(path)
+
+        total = sum(p.stat().st_size for p in spill.glob("*.npy"))
+        assert total <= 5000
+
+
+class TestStream:
+    """stream(): one front-to-back decode, same samples as load()."""
+
+    @pytest.fixture
+    def wav_file(self, tmp_path: Path) -> Path:
+        import soundfile as sf
+
+        rng = np.random.default_rng(0)
+        stereo = rng.uniform(-0.5, 0.5, size=(44100 * 3, 2)).astype(np.float32)
+        path = tmp_path / "track.wav"
+        sf.write(path, stereo, 44100)
+        return path
+
+    def test_blocks_match_full_decode(self, wav_file: Path) -> None:
+        cache = DecodedAudioCache()
+
+        total, blocks = cache.stream(wav_file, sr=11025, block_duration=0.7)
+        streamed = list(blocks)
+
+        assert total == 11025 * 3
+        assert len(streamed) >= 4  # ~0.7 s par bloc (latence du rééchantillonneur en plus)
+        assert cache.stats.decodes == 0  # décodage en flux, pas mis en cache
+        y, _ = DecodedAudioCache().load(wav_file, sr=11025)
+        np.testing.assert_allclose(np.concatenate(streamed), y, atol=1e-6)
+
+    def test_cached_array_is_sliced(self, audio_file: Path) -> None:
+        """Cached (or undecodable by soundfile) files come from the cache."""
+        decoder = CountingDecoder()
+        cache = DecodedAudioCache(decoder=decoder, resampler=_halve)
+        cache.load(audio_file)
+
+        total, blocks = cache.stream(audio_file, sr=NATIVE_SR, block_duration=0.5)
+
+        assert total == 2000
+        assert [len(block) for block in blocks] == [500] * 4
+        assert decoder.calls == 1
@@ -0,0 +1,122 @@
+"""Tests for the shared-intermediate ML feature pipeline."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from jukebox.utils import audio_features
+from jukebox.utils.audio_cache import configure_audio_cache
+from jukebox.utils.audio_features import (
+    _extract_ml_features,
+    _extract_ml_features_reference,
+    analyze_audio_file,
+)
+
+SR = 22050
+
+
+def _synthetic_track(seconds: float = 6.0, sr: int = SR) -> np.ndarray:
+    """Chord + kick every half second + noise: exercises every feature family."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sr)) / sr
+    y = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 330 * t)
+    kick_len = int(0.1 * sr)
+    kick = np.sin(2 * np.pi * 60 * t[:kick_len]) * np.exp(-t[:kick_len] * 30)
+    for beat in np.arange(0, seconds - 0.1, 0.5):
+        start = int(beat * sr)
+        y[start : start + kick_len] += kick
+    y += 0.05 * rng.standard_normal(len(t))
+    return y.astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def track() -> np.ndarray:
+    return _synthetic_track()
+
+
+class TestSharedPipeline:
+    """The pipeline must reproduce the reference extractor."""
+
+    def test_same_feature_keys(self, track: np.ndarray) -> None:
+        """Both extractors return the same feature names."""
+        assert set(_extract_ml_features(track, SR)) == set(
+            _extract_ml_features_reference(track, SR)
+        )
+
+    def test_matches_reference_within_tolerance(self, track: np.ndarray) -> None:
+        """Every feature matches the one-call-per-feature extractor."""
+        pipeline = _extract_ml_features(track, SR)
+        reference = _extract_ml_features_reference(track, SR)
+
+        mismatches = {
+            key: (reference[key], pipeline[key])
+            for key in reference
+            if not np.isclose(pipeline[key], reference[key], rtol=1e-4, atol=1e-7)
+        }
+        assert mismatches == {}
+
+    def test_matches_reference_at_native_rate(self) -> None:
+        """Same check at 44.1 kHz, the native rate analyze_audio_file uses."""
+        track = _synthetic_track(seconds=4.0, sr=44100)
+        pipeline = _extract_ml_features(track, 44100)
+        reference = _extract_ml_features_reference(track, 44100)
+
+        mismatches = {
+            key: (reference[key], pipeline[key])
+            for key in reference
+            if not np.isclose(pipeline[key], reference[key], rtol=1e-4, atol=1e-7)
+        }
+        assert mismatches == {}
+
+    def test_timings_breakdown(self, track: np.ndarray) -> None:
+        """Per-stage timings are reported when a dict is provided."""
+        timings: dict[str, float] = {}
+
+        _extract_ml_features(track, SR, timings=timings)
+
+        for stage in ("stft", "mel", "hpss", "beat", "spectral", "mfcc", "chroma", "tonnetz"):
+            assert stage in timings
+            assert timings[stage] >= 0.0
+
+
+class TestAnalyzeAudioFile:
+    """Tests for analyze_audio_file."""
+
+    def test_returns_empty_without_ml_features(self) -> None:
+        """Nothing is decoded when ML features are not requested."""
+        assert analyze_audio_file("/does/not/exist.mp3") == {}
+
+    def test_loads_at_native_rate(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A 44.1 kHz file is analysed at 44.1 kHz, with a load timing."""
+        import soundfile as sf
+
+        configure_audio_cache()
+        path = tmp_path / "track.wav"
+        sf.write(path, _synthetic_track(seconds=3.0, sr=44100), 44100)
+        seen_rates: list[int] = []
+        original = audio_features._extract_ml_features
+
+        def spy(y: np.ndarray, sr: int, timings: dict[str, float] | None = None) -> dict:
+            seen_rates.append(sr)
+            return original(y, sr, timings=timings)
+
+        monkeypatch.setattr(audio_features, "_extract_ml_features", spy)
+        timings: dict[str, float] = {}
+
+        features = analyze_audio_file(str(path), extract_ml_features=True, timings=timings)
+
+        assert seen_rates == [44100]
+        assert "load" in timings
+        assert features["tempo"] > 0
+
+    def test_empty_file_raises(self, tmp_path: Path) -> None:
+        """An empty decode raises ValueError (reported as a skip by the worker)."""
+        import soundfile as sf
+
+        configure_audio_cache()
+        path = tmp_path / "empty.wav"
+        sf.write(path, np.zeros(0, dtype=np.float32), SR)
+
+        with pytest.raises(ValueError):
+            analyze_audio_file(str(path), extract_ml_features=True)
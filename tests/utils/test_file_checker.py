@@ -0,0 +1,185 @@
+"""Tests for the background file-existence check service."""
+
+import threading
+from collections import Counter
+from pathlib import Path
+
+from jukebox.utils import file_checker
+from jukebox.utils.file_checker import (
+    MISSING,
+    FileCheckService,
+    FileStatus,
+    mount_key,
+    probe_file,
+)
+
+MOUNTS = ["/mnt/nas", "/mnt/usb", "/"]
+
+
+def _run(service: FileCheckService, items: list[tuple[int | None, str]], **kwargs) -> dict:  # type: ignore
+    results = {}
+    for batch in service.check(items, **kwargs):
+        for track_id, filepath, status in batch:
+            results[filepath] = (track_id, status)
+    return results
+
+
+def test_probe_file(tmp_path: Path) -> None:
+    path = tmp_path / "a.mp3"
+    path.write_bytes(b"12345")
+
+    status = probe_file(str(path))
+
+    assert status.exists and status.size == 5
+    assert status.mtime_ns == path.stat().st_mtime_ns
+    assert probe_file(str(tmp_path / "missing.mp3")) == MISSING
+    assert probe_file(str(path / "not_a_dir.mp3")) == MISSING
+
+
+def test_mount_key_from_string_only() -> None:
+    assert mount_key("/mnt/nas/music/a.mp3", MOUNTS) == "/mnt/nas"
+    assert mount_key("/mnt/nasty/a.mp3", MOUNTS) == "/"
+    assert mount_key("/Volumes/USB/a.mp3", []) == "/Volumes/USB"
+    assert mount_key("/home/a.mp3", []) == "/"
+
+
+class TestCheck:
+    """check() streams every item back, once."""
+
+    def test_all_items_reported_in_batches(self, tmp_path: Path) -> None:
+        existing = tmp_path / "a.mp3"
+        existing.write_bytes(b"x")
+        items = [(i, str(tmp_path / f"missing{i}.mp3")) for i in range(300)]
+        items.append((300, str(existing)))
+        service = FileCheckService(max_workers=4, mount_points=[])
+
+        batches = list(service.check(items, batch_size=100))
+
+        assert all(len(batch) <= 100 for batch in batches)
+        results = {fp: (tid, status) for batch in batches for tid, fp, status in batch}
+        assert len(results) == 301
+        assert results[str(existing)] == (300, FileStatus(True, 1, existing.stat().st_mtime_ns))
+        assert results[items[0][1]] == (0, MISSING)
+
+    def test_results_cached_with_ttl(self) -> None:
+        calls: Counter[str] = Counter()
+        now = [0.0]
+
+        def probe(filepath: str) -> FileStatus:
+            calls[filepath] += 1
+            return MISSING
+
+        service = FileCheckService(probe=probe, ttl=10.0, clock=lambda: now[0], mount_points=[])
+        items = [(1, "/a.mp3"), (2, "/b.mp3")]
+
+        _run(service, items)
+        now[0] = 5.0
+        _run(service, items)
+        assert calls == {"/a.mp3": 1, "/b.mp3": 1}
+        assert service.cached("/a.mp3") == MISSING
+
+        service.invalidate("/a.mp3")
+        now[0] = 8.0
+        _run(service, items)
+        assert calls == {"/a.mp3": 2, "/b.mp3": 1}
+
+        now[0] = 20.0
+        _run(service, items)
+        assert calls == {"/a.mp3": 3, "/b.mp3": 2}
+
+    def test_per_mount_limit(self, monkeypatch) -> None:  # type: ignore
+        monkeypatch.setattr(file_checker, "PROBE_CHUNK", 1)
+        lock = threading.Lock()
+        running: Counter[str] = Counter()
+        peak: Counter[str] = Counter()
+        barrier = threading.Event()
+
+        def probe(filepath: str) -> FileStatus:
+            mount = mount_key(filepath, MOUNTS)
+            with lock:
+                running[mount] += 1
+                peak[mount] = max(peak[mount], running[mount])
+            barrier.wait(0.02)
+            with lock:
+                running[mount] -= 1
+            return MISSING
+
+        service = FileCheckService(
+            max_workers=6, per_mount_limit=2, probe=probe, mount_points=MOUNTS
+        )
+        items = [(i, f"/mnt/nas/{i}.mp3") for i in range(20)]
+        items += [(i, f"/mnt/usb/{i}.mp3") for i in range(20, 40)]
+
+        assert len(_run(service, items)) == 40
+        assert peak["/mnt/nas"] == 2
+        assert peak["/mnt/usb"] == 2
+
+    def test_stalled_mount_reported_unknown(self) -> None:
+        release = threading.Event()
+
+        def probe(filepath: str) -> FileStatus:
+            if filepath.startswith("/mnt/nas/"):
+                release.wait(10)
+            return MISSING
+
+        service = FileCheckService(timeout=0.2, probe=probe, mount_points=MOUNTS)
+        items = [(i, f"/mnt/nas/{i}.mp3") for i in range(200)]
+        items += [(i, f"/mnt/usb/{i}.mp3") for i in range(200, 210)]
+
+        try:
+            results = _run(service, items)
+
+            assert len(results) == 210
+            assert all(results[f"/mnt/nas/{i}.mp3"][1].unknown for i in range(200))
+            assert all(results[f"/mnt/usb/{i}.mp3"][1] == MISSING for i in range(200, 210))
+            assert service.is_stalled("/mnt/nas")
+            assert service.cached("/mnt/nas/0.mp3") is None  # unknown: not cached
+        finally:
+            release.set()
+        for _ in range(100):
+            if not service.is_stalled("/mnt/nas"):
+                break
+            threading.Event().wait(0.02)
+        assert not service.is_stalled("/mnt/nas")
+
+    def test_slow_responsive_mount_not_stalled(self) -> None:
+        def probe(filepath: str) -> FileStatus:
+            threading.Event().wait(0.01)
+            return MISSING
+
+        # 64 stats de 10 ms par chunk : bien plus long que le timeout, mais chaque probe répond
+        service = FileCheckService(timeout=0.2, probe=probe, mount_points=MOUNTS)
+        items = [(i, f"/mnt/nas/{i}.mp3") for i in range(130)]
+
+        results = _run(service, items)
+
+        assert len(results) == 130
+        assert all(status == MISSING for _, status in results.values())
+        assert not service.is_stalled("/mnt/nas")
+
+    def test_stopped_check_does_not_stall_the_next_one(self) -> None:
+        probed: Counter[str] = Counter()
+
+        def probe(filepath: str) -> FileStatus:
+            probed[filepath.rsplit("/", 1)[1][:3]] += 1
+            threading.Event().wait(0.01)
+            return MISSING
+
+        # Chunks de 64 stats de 10 ms : bien plus longs que le timeout
+        service = FileCheckService(max_workers=2, timeout=0.2, probe=probe, mount_points=MOUNTS)
+        stops = iter([False, False])
+        old = [(i, f"/mnt/nas/old{i}.mp3") for i in range(256)]
+        assert list(service.check(old, should_stop=lambda: next(stops, True))) == []
+
+        # Rechargement immédiat : ses chunks ne doivent pas attendre ceux du check arrêté
+        results = _run(service, [(i, f"/mnt/nas/new{i}.mp3") for i in range(130)])
+
+        assert all(status == MISSING for _, status in results.values())
+        assert not service.is_stalled("/mnt/nas")
+        assert probed["old"] < 128  # chunks du check arrêté abandonnés
+
+    def test_should_stop(self) -> None:
+        service = FileCheckService(probe=lambda fp: MISSING, mount_points=[])
+        items = [(i, f"/{i}.mp3") for i in range(1000)]
+
+        assert list(service.check(items, should_stop=lambda: True)) == []
@@ -0,0 +1,136 @@
+"""Tests for the MinHash/LSH fuzzy string index."""
+
+from difflib import SequenceMatcher
+
+import numpy as np
+import pytest
+
+from jukebox.utils import fuzzy_index
+from jukebox.utils.fuzzy_index import FuzzyIndex
+
+WORDS = [
+    "love", "night", "dance", "remix", "original", "mix", "feat", "edit", "summer",
+    "dream", "fire", "heart", "city", "lights", "deep", "house", "radio", "club",
+    "daft", "punk", "lucky", "get", "one", "more", "time", "around", "world",
+]  # fmt: skip
+
+
+def _brute_force(texts: dict[int, str], query: str, threshold: float) -> float:
+    """Best SequenceMatcher ratio over every text (0.0 below the threshold)."""
+    best = max((SequenceMatcher(None, query, t).ratio() for t in texts.values()), default=0.0)
+    return best if best >= threshold else 0.0
+
+
+def _library(size: int, seed: int = 0) -> dict[int, str]:
+    rng = np.random.default_rng(seed)
+    return {i: " ".join(rng.choice(WORDS, size=rng.integers(2, 7)).tolist()) for i in range(size)}
+
+
+def _variant(text: str, rng: np.random.Generator) -> str:
+    """Near-duplicate of a text: a few character edits."""
+    chars = list(text)
+    for _ in range(rng.integers(0, 3)):
+        pos = int(rng.integers(0, len(chars)))
+        chars[pos] = str(rng.choice(list("abcdefghijklmnopqrstuvwxyz ")))
+    return "".join(chars)
+
+
+class TestBestMatch:
+    """best_match must agree with a brute-force SequenceMatcher scan."""
+
+    def test_matches_brute_force(self) -> None:
+        texts = _library(400)
+        index = FuzzyIndex(0.8)
+        index.add_many(texts.items())
+        rng = np.random.default_rng(1)
+
+        for i in range(80):
+            query = _variant(texts[i * 5], rng) if i % 2 else " ".join(rng.choice(WORDS, 3))
+            expected = _brute_force(texts, query, 0.8)
+            match = index.best_match(query)
+
+            if expected:
+                assert match is not None
+                key, ratio = match
+                assert ratio == pytest.approx(expected)
+                assert SequenceMatcher(None, query, texts[key]).ratio() == ratio  # type: ignore[index]
+            else:
+                assert match is None
+
+    def test_long_texts_use_histogram_bound(self) -> None:
+        """Texts longer than LCS_WIDTH are still matched exactly."""
+        long_text = "the quick brown fox jumps over the lazy dog " * 3
+        index = FuzzyIndex(0.8)
+        index.add("long", long_text)
+        index.add("other", "completely unrelated words")
+
+        match = index.best_match(long_text.replace("lazy", "lasy"))
+
+        assert match is not None
+        assert match[0] == "long"
+
+    def test_empty_inputs(self) -> None:
+        index = FuzzyIndex()
+        assert index.best_match("anything") is None
+        index.add("a", "")
+        assert "a" not in index
+        index.add("b", "daft punk")
+        assert index.best_match("") is None
+
+
+class TestMaintenance:
+    """Incremental add/remove and compaction."""
+
+    def test_add_replace_remove(self) -> None:
+        index = FuzzyIndex(0.8)
+        index.add("a", "daft punk get lucky")
+        assert index.best_match("daft punk get lucky") == ("a", 1.0)
+
+        index.add("a", "one more time")
+        assert index.best_match("daft punk get lucky") is None
+        assert len(index) == 1
+
+        assert index.remove("a")
+        assert not index.remove("a")
+        assert index.best_match("one more time") is None
+        assert len(index) == 0
+
+    def test_compaction_keeps_results(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(fuzzy_index, "_MIN_DELTA", 16)
+        texts = _library(200, seed=2)
+        index = FuzzyIndex(0.8)
+        for key, text in texts.items():  # one by one: delta buckets, then compactions
+            index.add(key, text)
+        for key in range(0, 200, 2):
+            index.remove(key)
+            del texts[key]
+
+        assert len(index) == 100
+        assert index._dead < 100  # dead slots were compacted away
+        for text in list(texts.values())[:20]:
+            match = index.best_match(text)
+            assert match is not None
+            assert match[1] == 1.0
+            assert texts[match[0]] == text  # type: ignore[index]
+
+
+def test_lcs_lengths_match_dynamic_programming() -> None:
+    """The bit-parallel LCS equals the textbook dynamic programming one."""
+
+    def lcs(a: str, b: str) -> int:
+        previous = [0] * (len(b) + 1)
+        for ca in a:
+            current = [0]
+            for j, cb in enumerate(b):
+                current.append(previous[j] + 1 if ca == cb else max(previous[j + 1], current[j]))
+            previous = current
+        return previous[-1]
+
+    texts = _library(50, seed=3)
+    texts[50] = "x" * fuzzy_index.LCS_WIDTH  # full-width text
+    index = FuzzyIndex()
+    index.add_many(texts.items())
+    slots = np.array([index._slot_of[key] for key in texts])
+    query = "daft punk lucky house mix"
+
+    assert index._lcs_lengths(query, slots).tolist() == [lcs(query, t) for t in texts.values()]
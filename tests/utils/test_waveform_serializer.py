@@ -3,7 +3,20 @@
 import numpy as np
 import pytest
 
-from jukebox.utils.waveform_serializer import deserialize_waveform, serialize_waveform
+from jukebox.utils.waveform_serializer import (
+    MIN_LEVEL_LENGTH,
+    _serialize_npz,
+    deserialize_waveform,
+    is_legacy_waveform,
+    read_waveform_pyramid,
+    serialize_waveform,
+    upgrade_waveform,
+)
+
+
+def _waveform(length: int, seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return {band: rng.random(length) for band in ("bass", "mid", "treble")}
 
 
 class TestSerializeWaveform:
@@ -20,9 +33,10 @@ class TestSerializeWaveform:
         data = serialize_waveform(waveform)
         result = deserialize_waveform(data)
 
-        np.testing.assert_array_almost_equal(result["bass"], waveform["bass"])
-        np.testing.assert_array_almost_equal(result["mid"], waveform["mid"])
-        np.testing.assert_array_almost_equal(result["treble"], waveform["treble"])
+        # Quantification uint8 : erreur ≤ max(band) / 510
+        np.testing.assert_array_almost_equal(result["bass"], waveform["bass"], decimal=2)
+        np.testing.assert_array_almost_equal(result["mid"], waveform["mid"], decimal=2)
+        np.testing.assert_array_almost_equal(result["treble"], waveform["treble"], decimal=2)
 
     def test_round_trip_preserves_float64(self) -> None:
         """Round-trip preserves float64 array values."""
@@ -35,9 +49,15 @@ class TestSerializeWaveform:
         data = serialize_waveform(waveform)
         result = deserialize_waveform(data)
 
-        np.testing.assert_array_almost_equal(result["bass"], waveform["bass"])
-        np.testing.assert_array_almost_equal(result["mid"], waveform["mid"])
-        np.testing.assert_array_almost_equal(result["treble"], waveform["treble"])
+        # Quantification uint8 : erreur ≤ max(band) / 510
+        np.testing.assert_array_almost_equal(result["bass"], waveform["bass"], decimal=2)
+        np.testing.assert_array_almost_equal(result["mid"], waveform["mid"], decimal=2)
+        np.testing.assert_array_almost_equal(result["treble"], waveform["treble"], decimal=2)
+
+    def test_bands_must_have_same_length(self) -> None:
+        """Bands of different lengths are rejected."""
+        with pytest.raises(ValueError):
+            serialize_waveform({"bass": np.ones(3), "mid": np.ones(4)})
 
     def test_serialize_returns_bytes(self) -> None:
         """serialize_waveform returns bytes."""
@@ -86,7 +106,7 @@ class TestSerializeWaveform:
         data = serialize_waveform(waveform)
         result = deserialize_waveform(data)
 
-        np.testing.assert_array_almost_equal(result["bass"], np.array([1.0, 2.0]))
+        np.testing.assert_array_almost_equal(result["bass"], np.array([1.0, 2.0]), decimal=2)
         assert result["mid"].size == 0
         assert result["treble"].size == 0
 
@@ -128,3 +148,67 @@ class TestDeserializeWaveform:
 
         with pytest.raises(ValueError):
             deserialize_waveform(truncated)
+
+    def test_unsupported_version_raises_value_error(self) -> None:
+        """A pyramid written by a newer version is rejected."""
+        data = bytearray(serialize_waveform(_waveform(10)))
+        data[4] = 99
+
+        with pytest.raises(ValueError):
+            deserialize_waveform(bytes(data))
+
+
+class TestWaveformPyramid:
+    """Tests for the multi-resolution pyramid reader."""
+
+    def test_levels_halve_down_to_min_length(self) -> None:
+        pyramid = read_waveform_pyramid(serialize_waveform(_waveform(1001)))
+
+        lengths = [pyramid.level_length(level) for level in range(pyramid.num_levels)]
+        assert lengths[0] == 1001
+        assert all(b == (a + 1) // 2 for a, b in zip(lengths, lengths[1:], strict=False))
+        assert lengths[-1] <= MIN_LEVEL_LENGTH < lengths[-2]
+
+    def test_levels_keep_min_and_max(self) -> None:
+        """Each coarse column covers the extrema of the full-resolution columns."""
+        waveform = _waveform(300, seed=1)
+        pyramid = read_waveform_pyramid(serialize_waveform(waveform))
+        full = pyramid.minmax(0)[:, :, 1]
+
+        for level in range(1, pyramid.num_levels):
+            step = 2**level
+            values = pyramid.minmax(level)
+            for column in (0, 7, len(values) - 1):
+                chunk = full[column * step : (column + 1) * step]
+                assert values[column, :, 0].tolist() == chunk.min(axis=0).tolist()
+                assert values[column, :, 1].tolist() == chunk.max(axis=0).tolist()
+
+    def test_range_read_and_level_choice(self) -> None:
+        waveform = _waveform(4000, seed=2)
+        pyramid = read_waveform_pyramid(serialize_waveform(waveform))
+
+        level = pyramid.level_for(800)
+        assert pyramid.level_length(level) >= 800
+        assert pyramid.level_length(level + 1) < 800
+        assert pyramid.level_for(10**6) == 0
+
+        peaks = pyramid.peaks(0, 100, 110)
+        assert peaks["mid"].dtype == np.float32
+        np.testing.assert_allclose(peaks["mid"], waveform["mid"][100:110], atol=1 / 255)
+
+    def test_legacy_npz_is_still_read_and_upgraded(self) -> None:
+        waveform = _waveform(500, seed=3)
+        legacy = _serialize_npz(waveform)
+
+        assert is_legacy_waveform(legacy)
+        np.testing.assert_array_equal(deserialize_waveform(legacy)["bass"], waveform["bass"])
+        assert read_waveform_pyramid(legacy).length == 500
+
+        upgraded = upgrade_waveform(legacy)
+        assert upgraded is not None
+        assert not is_legacy_waveform(upgraded)
+        assert upgrade_waveform(upgraded) is None
+        assert len(upgraded) < len(legacy)
+        np.testing.assert_allclose(
+            deserialize_waveform(upgraded)["treble"], waveform["treble"], atol=1 / 255
+        )
@@ -0,0 +1,86 @@
+"""Tests for the streaming 3-band waveform reduction."""
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from jukebox.core.constants import FREQ_BASS_HIGH, FREQ_MID_HIGH
+from jukebox.utils.waveform_stream import BandWaveformBuilder
+
+SR = 11025
+HOP = 512
+
+
+@pytest.fixture
+def audio() -> np.ndarray:
+    rng = np.random.default_rng(1)
+    t = np.arange(SR * 4) / SR
+    y = 0.4 * np.sin(2 * np.pi * 80 * t) + 0.1 * rng.standard_normal(len(t))
+    return y.astype(np.float32)
+
+
+def _feed(y: np.ndarray, block_sizes: list[int]) -> tuple[BandWaveformBuilder, list]:
+    builder = BandWaveformBuilder(SR, HOP)
+    deltas = []
+    start = 0
+    for size in block_sizes:
+        deltas.append(builder.feed(y[start : start + size]))
+        start += size
+    deltas.append(builder.feed(y[start:]))
+    deltas.append(builder.finish())
+    return builder, [d for d in deltas if d is not None]
+
+
+def test_blockwise_equals_whole_track(audio: np.ndarray) -> None:
+    """Filter state carried across blocks: no seam at block boundaries."""
+    whole, _ = _feed(audio, [])
+    chunked, deltas = _feed(audio, [1000, 300, 7001, 4096, 17])
+
+    expected = whole.result()
+    result = chunked.result()
+    for band in ("bass", "mid", "treble"):
+        np.testing.assert_allclose(
+            result["waveform_data"][band], expected["waveform_data"][band], atol=1e-6
+        )
+    assert result["energy"] == pytest.approx(expected["energy"])
+    # Deltas contigus : chaque trame émise une seule fois
+    assert [d.start for d in deltas] == list(np.cumsum([0] + [len(d) for d in deltas[:-1]]))
+    assert chunked.frames == -(-len(audio) // HOP)
+
+
+def test_peaks_match_reference_filters(audio: np.ndarray) -> None:
+    builder, _ = _feed(audio, [5000])
+    sos = [
+        signal.butter(4, FREQ_BASS_HIGH, "lp", fs=SR, output="sos"),
+        signal.butter(4, [FREQ_BASS_HIGH, FREQ_MID_HIGH], "bandpass", fs=SR, output="sos"),
+        signal.butter(4, FREQ_MID_HIGH, "hp", fs=SR, output="sos"),
+    ]
+    result = builder.result()
+
+    for band, coeffs in zip(("bass", "mid", "treble"), sos, strict=True):
+        filtered = np.abs(signal.sosfilt(coeffs, audio))
+        padded = np.pad(filtered, (0, -len(filtered) % HOP))
+        peaks = padded.reshape(-1, HOP).max(axis=1)
+        np.testing.assert_allclose(result["waveform_data"][band], peaks / peaks.max(), atol=1e-5)
+
+
+def test_transient_between_decimation_points_is_kept() -> None:
+    """A click that [::hop] decimation would skip shows up in the peaks."""
+    y = np.zeros(SR, dtype=np.float32)
+    y[HOP * 3 + HOP // 2] = 1.0
+    builder, _ = _feed(y, [])
+
+    treble = builder.result()["waveform_data"]["treble"]
+
+    assert treble[3] == pytest.approx(1.0)
+    assert treble[:3].max() == 0.0
+
+
+def test_empty_input() -> None:
+    builder = BandWaveformBuilder(SR, HOP)
+
+    assert builder.feed(np.zeros(0, dtype=np.float32)) is None
+    assert builder.finish() is None
+    result = builder.result()
+    assert result["duration"] == 0.0
+    assert len(result["waveform_data"]["bass"]) == 0
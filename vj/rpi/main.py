@@ -111,7 +111,7 @@ _AUTO_CTX_FFT = np.full(32, 0.4, dtype=np.float32)
 
 
 def _discover_effects() -> list[str]:
-    internal = {"with_transitions", "gpu_effect"}
+    internal = {"gpu_effect"}
     known = list(VJingLayer.AVAILABLE_EFFECTS)
     known_set = set(known)
     for name in sorted(dir(VJingLayer)):
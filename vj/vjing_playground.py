@@ -85,7 +85,7 @@ def _discover_effects() -> list[str]:
     methods not already listed (excluding internal orchestration methods).
     """
     # Internal methods that follow _render_* naming but aren't actual effects
-    internal = {"with_transitions", "gpu_effect"}
+    internal = {"gpu_effect"}
 
     known = list(VJingLayer.AVAILABLE_EFFECTS)
     known_set = set(known)